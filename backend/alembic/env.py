@@ -31,6 +31,15 @@ from models.donors.donor import Donor
 from models.donors.gift import Gift
 from models.donors.communication import Communication
 from models.donors.tag import Tag, DonorTag
+from models.donors.donor_counter import DonorCounter
+from models.donors.receipt_sequence import ReceiptSequence
+from models.donors.geo_rollup import GeoRollup
+from models.donors.donor_audit import DonorAuditEntry
+from models.donors.change_sequence import ChangeSequence
+from models.donors.donor_tombstone import DonorTombstone
+from models.donors.archive_chunk import ArchiveChunk
+from models.donors.archived_transaction import ArchivedTransaction
+from models.donors.campaign_total import CampaignTotal, CampaignDonor
 
 target_metadata = SQLModel.metadata
 
@@ -0,0 +1,56 @@
+"""Add maintained donor segment counters
+
+Revision ID: 3f9b2c7d1e04
+Revises: 8c7dc72df793
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9b2c7d1e04'
+down_revision: Union[str, Sequence[str], None] = '8c7dc72df793'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('donor_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('dimension', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dimension', 'value', name='uq_donor_counters_dimension_value')
+    )
+
+    # Backfill counters and tag counts from existing rows
+    op.execute(
+        "INSERT INTO donor_counters (created_at, dimension, value, count) "
+        "SELECT CURRENT_TIMESTAMP, 'all', '*', COUNT(*) FROM donors"
+    )
+    op.execute(
+        "INSERT INTO donor_counters (created_at, dimension, value, count) "
+        "SELECT CURRENT_TIMESTAMP, 'status', donor_status, COUNT(*) FROM donors GROUP BY donor_status"
+    )
+    op.execute(
+        "INSERT INTO donor_counters (created_at, dimension, value, count) "
+        "SELECT CURRENT_TIMESTAMP, 'type', donor_type, COUNT(*) FROM donors GROUP BY donor_type"
+    )
+    op.execute(
+        "UPDATE tags SET donor_count = "
+        "(SELECT COUNT(*) FROM donor_tags WHERE donor_tags.tag_id = tags.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('donor_counters')
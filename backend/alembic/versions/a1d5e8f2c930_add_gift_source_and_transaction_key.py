@@ -0,0 +1,35 @@
+"""Add gift source and unique (source, transaction_id)
+
+Revision ID: a1d5e8f2c930
+Revises: 3f9b2c7d1e04
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d5e8f2c930'
+down_revision: Union[str, Sequence[str], None] = '3f9b2c7d1e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('gifts') as batch_op:
+        batch_op.add_column(sa.Column('source', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.create_unique_constraint(
+            'uq_gifts_source_transaction_id', ['source', 'transaction_id']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('gifts') as batch_op:
+        batch_op.drop_constraint('uq_gifts_source_transaction_id', type_='unique')
+        batch_op.drop_column('source')
@@ -0,0 +1,117 @@
+"""Add campaign running totals
+
+Revision ID: a6d2f8c4e913
+Revises: f3b9d1e7a428
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+import json
+import zlib
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f8c4e913'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d1e7a428'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _backfill_archived(connection) -> None:
+    """Add archived completed campaign gifts of live donors, one chunk page at a time."""
+    upsert = sa.text(
+        "INSERT INTO campaign_donors (created_at, campaign_id, donor_id, total_amount, gift_count) "
+        "VALUES (CURRENT_TIMESTAMP, :campaign_id, :donor_id, :total_amount, :gift_count) "
+        "ON CONFLICT (campaign_id, donor_id) DO UPDATE SET "
+        "total_amount = campaign_donors.total_amount + excluded.total_amount, "
+        "gift_count = campaign_donors.gift_count + excluded.gift_count"
+    )
+    last_id = 0
+    while True:
+        chunks = connection.execute(
+            sa.text(
+                "SELECT archive_chunks.id, archive_chunks.donor_id, archive_chunks.payload "
+                "FROM archive_chunks JOIN donors ON donors.id = archive_chunks.donor_id "
+                "WHERE archive_chunks.table_name = 'gifts' AND donors.deleted_at IS NULL "
+                "AND archive_chunks.id > :last_id ORDER BY archive_chunks.id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}
+        ).all()
+        if not chunks:
+            return
+        pairs = defaultdict(lambda: [0.0, 0])
+        for chunk in chunks:
+            columns = json.loads(zlib.decompress(chunk.payload))
+            for campaign_id, amount, status in zip(
+                columns["campaign_id"], columns["amount"], columns["gift_status"]
+            ):
+                if campaign_id is not None and status == "completed":
+                    pair = pairs[(campaign_id, chunk.donor_id)]
+                    pair[0] += amount
+                    pair[1] += 1
+        if pairs:
+            connection.execute(upsert, [
+                {"campaign_id": campaign_id, "donor_id": donor_id, "total_amount": amount, "gift_count": count}
+                for (campaign_id, donor_id), (amount, count) in sorted(pairs.items())
+            ])
+        last_id = chunks[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('campaign_totals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('gift_count', sa.Integer(), nullable=False),
+    sa.Column('donor_count', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', name='uq_campaign_totals_campaign_id')
+    )
+    op.create_index('ix_campaign_totals_change_seq', 'campaign_totals', ['change_seq'], unique=False)
+    op.create_table('campaign_donors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('donor_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('gift_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'donor_id', name='uq_campaign_donors_campaign_donor')
+    )
+    op.create_index('ix_campaign_donors_donor_id', 'campaign_donors', ['donor_id'], unique=False)
+
+    # Backfill from hot and archived completed gifts of live donors
+    op.execute(
+        "INSERT INTO campaign_donors (created_at, campaign_id, donor_id, total_amount, gift_count) "
+        "SELECT CURRENT_TIMESTAMP, gifts.campaign_id, gifts.donor_id, SUM(gifts.amount), COUNT(*) "
+        "FROM gifts JOIN donors ON donors.id = gifts.donor_id "
+        "WHERE gifts.campaign_id IS NOT NULL AND gifts.gift_status = 'completed' "
+        "AND donors.deleted_at IS NULL GROUP BY gifts.campaign_id, gifts.donor_id"
+    )
+    _backfill_archived(op.get_bind())
+    op.execute(
+        "INSERT INTO campaign_totals "
+        "(created_at, campaign_id, total_amount, gift_count, donor_count, change_seq) "
+        "SELECT CURRENT_TIMESTAMP, campaign_id, SUM(total_amount), SUM(gift_count), COUNT(*), "
+        "COALESCE((SELECT value FROM change_sequences WHERE name = 'donors'), 0) "
+        "FROM campaign_donors GROUP BY campaign_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_campaign_donors_donor_id', table_name='campaign_donors')
+    op.drop_table('campaign_donors')
+    op.drop_index('ix_campaign_totals_change_seq', table_name='campaign_totals')
+    op.drop_table('campaign_totals')
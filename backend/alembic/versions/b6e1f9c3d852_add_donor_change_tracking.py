@@ -0,0 +1,61 @@
+"""Add donor change tracking for delta sync
+
+Revision ID: b6e1f9c3d852
+Revises: a9c4e2f7b318
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1f9c3d852'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e2f7b318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing donors start at change 0, so a full load (no token) returns them
+    op.add_column('donors', sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_donors_change_seq_id', 'donors', ['change_seq', 'id'], unique=False)
+
+    op.create_table('change_sequences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_change_sequences_name'), 'change_sequences', ['name'], unique=True)
+
+    op.create_table('donor_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('donor_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.Integer(), nullable=False),
+    sa.Column('merged_into_id', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_donor_tombstones_change_seq_donor_id', 'donor_tombstones', ['change_seq', 'donor_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_donor_tombstones_change_seq_donor_id', table_name='donor_tombstones')
+    op.drop_table('donor_tombstones')
+    op.drop_index(op.f('ix_change_sequences_name'), table_name='change_sequences')
+    op.drop_table('change_sequences')
+    op.drop_index('ix_donors_change_seq_id', table_name='donors')
+    with op.batch_alter_table('donors') as batch_op:
+        batch_op.drop_column('change_seq')
@@ -0,0 +1,80 @@
+"""Add archived gift transaction keys
+
+Revision ID: b8e4a2f6d153
+Revises: a6d2f8c4e913
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4a2f6d153'
+down_revision: Union[str, Sequence[str], None] = 'a6d2f8c4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _backfill(connection) -> None:
+    """Record the keys of gifts already archived, one chunk page at a time."""
+    insert = sa.text(
+        "INSERT INTO archived_transactions (created_at, source, transaction_id, gift_id, donor_id) "
+        "VALUES (CURRENT_TIMESTAMP, :source, :transaction_id, :gift_id, :donor_id) "
+        "ON CONFLICT (source, transaction_id) DO NOTHING"
+    )
+    last_id = 0
+    while True:
+        chunks = connection.execute(
+            sa.text(
+                "SELECT id, donor_id, payload FROM archive_chunks "
+                "WHERE table_name = 'gifts' AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}
+        ).all()
+        if not chunks:
+            return
+        keys = []
+        for chunk in chunks:
+            columns = json.loads(zlib.decompress(chunk.payload))
+            for gift_id, source, transaction_id in zip(
+                columns["id"], columns["source"], columns["transaction_id"]
+            ):
+                if source is not None and transaction_id is not None:
+                    keys.append({
+                        "source": source, "transaction_id": transaction_id,
+                        "gift_id": gift_id, "donor_id": chunk.donor_id,
+                    })
+        if keys:
+            connection.execute(insert, keys)
+        last_id = chunks[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('source', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('transaction_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('gift_id', sa.Integer(), nullable=False),
+    sa.Column('donor_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'transaction_id', name='uq_archived_transactions_source_transaction_id')
+    )
+    op.create_index('ix_archived_transactions_donor_id', 'archived_transactions', ['donor_id'], unique=False)
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archived_transactions_donor_id', table_name='archived_transactions')
+    op.drop_table('archived_transactions')
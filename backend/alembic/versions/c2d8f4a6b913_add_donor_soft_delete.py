@@ -0,0 +1,47 @@
+"""Add donor soft delete
+
+Revision ID: c2d8f4a6b913
+Revises: b6e1f9c3d852
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8f4a6b913'
+down_revision: Union[str, Sequence[str], None] = 'b6e1f9c3d852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AUTOCOMPLETE_KEYS = ('name_key', 'email_key', 'company_key')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('donors', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_donors_deleted_at', 'donors', ['deleted_at'], unique=False,
+        sqlite_where=sa.text('deleted_at IS NOT NULL'),
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+    # Autocomplete indexes carry deleted_at so skipping deleted donors stays covering
+    for key in AUTOCOMPLETE_KEYS:
+        op.drop_index(f'ix_donors_{key}_total_gifts', table_name='donors')
+        op.create_index(
+            f'ix_donors_{key}_total_gifts', 'donors', [key, 'total_gifts', 'deleted_at'],
+            unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for key in AUTOCOMPLETE_KEYS:
+        op.drop_index(f'ix_donors_{key}_total_gifts', table_name='donors')
+        op.create_index(f'ix_donors_{key}_total_gifts', 'donors', [key, 'total_gifts'], unique=False)
+    op.drop_index('ix_donors_deleted_at', table_name='donors')
+    with op.batch_alter_table('donors') as batch_op:
+        batch_op.drop_column('deleted_at')
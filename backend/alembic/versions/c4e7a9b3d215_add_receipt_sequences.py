@@ -0,0 +1,44 @@
+"""Add receipt sequences and pending-receipt index
+
+Revision ID: c4e7a9b3d215
+Revises: a1d5e8f2c930
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a9b3d215'
+down_revision: Union[str, Sequence[str], None] = 'a1d5e8f2c930'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('receipt_sequences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('next_number', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_receipt_sequences_year'), 'receipt_sequences', ['year'], unique=True)
+    op.create_index(
+        'ix_gifts_receipt_pending', 'gifts', ['gift_date', 'id'], unique=False,
+        sqlite_where=sa.text("receipt_sent IS 0 AND gift_status = 'completed'"),
+        postgresql_where=sa.text("receipt_sent IS false AND gift_status = 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gifts_receipt_pending', table_name='gifts')
+    op.drop_index(op.f('ix_receipt_sequences_year'), table_name='receipt_sequences')
+    op.drop_table('receipt_sequences')
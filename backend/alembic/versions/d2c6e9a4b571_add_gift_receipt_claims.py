@@ -0,0 +1,30 @@
+"""Add receipt claims to gifts
+
+Revision ID: d2c6e9a4b571
+Revises: b8e4a2f6d153
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c6e9a4b571'
+down_revision: Union[str, Sequence[str], None] = 'b8e4a2f6d153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('gifts', sa.Column('receipt_claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('gifts') as batch_op:
+        batch_op.drop_column('receipt_claimed_at')
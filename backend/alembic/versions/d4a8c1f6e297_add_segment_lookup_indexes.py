@@ -0,0 +1,33 @@
+"""Add segment lookup indexes
+
+Revision ID: d4a8c1f6e297
+Revises: c2d8f4a6b913
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c1f6e297'
+down_revision: Union[str, Sequence[str], None] = 'c2d8f4a6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_donors_donor_status'), 'donors', ['donor_status'], unique=False)
+    # donor_tags' primary key leads with id, which no lookup filters on
+    op.create_index('ix_donor_tags_donor_id_tag_id', 'donor_tags', ['donor_id', 'tag_id'], unique=False)
+    op.create_index('ix_donor_tags_tag_id_donor_id', 'donor_tags', ['tag_id', 'donor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_donor_tags_tag_id_donor_id', table_name='donor_tags')
+    op.drop_index('ix_donor_tags_donor_id_tag_id', table_name='donor_tags')
+    op.drop_index(op.f('ix_donors_donor_status'), table_name='donors')
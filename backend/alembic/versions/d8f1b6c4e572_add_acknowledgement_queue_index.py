@@ -0,0 +1,32 @@
+"""Add acknowledgement queue index
+
+Revision ID: d8f1b6c4e572
+Revises: c4e7a9b3d215
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f1b6c4e572'
+down_revision: Union[str, Sequence[str], None] = 'c4e7a9b3d215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_gifts_ack_pending', 'gifts', ['donor_id', 'gift_date', 'id'], unique=False,
+        sqlite_where=sa.text("acknowledged IS 0 AND gift_status = 'completed'"),
+        postgresql_where=sa.text("acknowledged IS false AND gift_status = 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gifts_ack_pending', table_name='gifts')
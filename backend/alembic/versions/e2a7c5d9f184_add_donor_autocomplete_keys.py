@@ -0,0 +1,54 @@
+"""Add donor autocomplete keys
+
+Revision ID: e2a7c5d9f184
+Revises: d8f1b6c4e572
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5d9f184'
+down_revision: Union[str, Sequence[str], None] = 'd8f1b6c4e572'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(value: str) -> str:
+    """Same normalization the donor service applies to names and companies."""
+    return ' '.join(re.sub(r'[^\w\s]', '', value.lower()).split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('donors', sa.Column('company_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    # Few distinct companies, so backfill one UPDATE per company name
+    connection = op.get_bind()
+    companies = connection.execute(
+        sa.text("SELECT DISTINCT company FROM donors WHERE company IS NOT NULL")
+    ).scalars().all()
+    if companies:
+        connection.execute(
+            sa.text("UPDATE donors SET company_key = :company_key WHERE company = :company"),
+            [{"company": company, "company_key": _normalize(company)} for company in companies]
+        )
+
+    op.create_index('ix_donors_name_key_total_gifts', 'donors', ['name_key', 'total_gifts'], unique=False)
+    op.create_index('ix_donors_email_key_total_gifts', 'donors', ['email_key', 'total_gifts'], unique=False)
+    op.create_index('ix_donors_company_key_total_gifts', 'donors', ['company_key', 'total_gifts'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_donors_company_key_total_gifts', table_name='donors')
+    op.drop_index('ix_donors_email_key_total_gifts', table_name='donors')
+    op.drop_index('ix_donors_name_key_total_gifts', table_name='donors')
+    with op.batch_alter_table('donors') as batch_op:
+        batch_op.drop_column('company_key')
@@ -0,0 +1,45 @@
+"""Add archive chunks for old gifts and communications
+
+Revision ID: e7c3a9d5b160
+Revises: d4a8c1f6e297
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a9d5b160'
+down_revision: Union[str, Sequence[str], None] = 'd4a8c1f6e297'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archive_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('donor_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('donor_id', 'table_name', 'year', name='uq_archive_chunks_donor_table_year')
+    )
+    op.create_index(
+        'ix_archive_chunks_table_name_year_donor_id', 'archive_chunks',
+        ['table_name', 'year', 'donor_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archive_chunks_table_name_year_donor_id', table_name='archive_chunks')
+    op.drop_table('archive_chunks')
@@ -0,0 +1,31 @@
+"""Add archive chunk index for analytics snapshot refreshes
+
+Revision ID: f3b9d1e7a428
+Revises: e7c3a9d5b160
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d1e7a428'
+down_revision: Union[str, Sequence[str], None] = 'e7c3a9d5b160'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_archive_chunks_table_name_updated_at', 'archive_chunks',
+        ['table_name', 'updated_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archive_chunks_table_name_updated_at', table_name='archive_chunks')
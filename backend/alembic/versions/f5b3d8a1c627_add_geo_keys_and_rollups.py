@@ -0,0 +1,112 @@
+"""Add donor geo keys and geo rollups
+
+Revision ID: f5b3d8a1c627
+Revises: e2a7c5d9f184
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from api.utils.normalization import normalize_city, normalize_postal_code, normalize_state
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b3d8a1c627'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c5d9f184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _backfill_keys(connection) -> None:
+    """Fill the geo keys in id order, one executemany UPDATE per chunk."""
+    update = sa.text(
+        "UPDATE donors SET state_key = :state_key, city_key = :city_key, "
+        "postal_key = :postal_key WHERE id = :id"
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, state, city, postal_code, country FROM donors "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}
+        ).all()
+        if not rows:
+            return
+        connection.execute(update, [
+            {
+                "id": row.id,
+                "state_key": normalize_state(row.state or ""),
+                "city_key": normalize_city(row.city or ""),
+                "postal_key": normalize_postal_code(row.postal_code or "", row.country or "US"),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('donors', sa.Column('state_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('donors', sa.Column('city_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('donors', sa.Column('postal_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    _backfill_keys(op.get_bind())
+    op.create_index('ix_donors_state_key_postal_key', 'donors', ['state_key', 'postal_key'], unique=False)
+    op.create_index('ix_donors_state_key_city_key', 'donors', ['state_key', 'city_key'], unique=False)
+
+    op.create_table('geo_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('level', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('state', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('parent_code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('donor_count', sa.Integer(), nullable=False),
+    sa.Column('total_gifts', sa.Float(), nullable=False),
+    sa.Column('gift_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('level', 'state', 'parent_code', 'code', name='uq_geo_rollups_area')
+    )
+
+    # Backfill rollups from the donor aggregates
+    state = "COALESCE(state_key, '')"
+    postal = "COALESCE(postal_key, '')"
+    prefix = f"SUBSTR({postal}, 1, 3)"
+    columns = "created_at, level, state, parent_code, code, donor_count, total_gifts, gift_count"
+    totals = "COUNT(*), COALESCE(SUM(total_gifts), 0), COALESCE(SUM(total_gift_count), 0)"
+    op.execute(
+        f"INSERT INTO geo_rollups ({columns}) SELECT CURRENT_TIMESTAMP, 'state', {state}, '', '', "
+        f"{totals} FROM donors GROUP BY {state}"
+    )
+    op.execute(
+        f"INSERT INTO geo_rollups ({columns}) SELECT CURRENT_TIMESTAMP, 'city', {state}, '', city_key, "
+        f"{totals} FROM donors WHERE city_key <> '' GROUP BY {state}, city_key"
+    )
+    op.execute(
+        f"INSERT INTO geo_rollups ({columns}) SELECT CURRENT_TIMESTAMP, 'postal_prefix', {state}, '', "
+        f"{prefix}, {totals} FROM donors WHERE postal_key <> '' GROUP BY {state}, {prefix}"
+    )
+    op.execute(
+        f"INSERT INTO geo_rollups ({columns}) SELECT CURRENT_TIMESTAMP, 'postal_code', {state}, "
+        f"{prefix}, postal_key, {totals} FROM donors WHERE postal_key <> '' "
+        f"GROUP BY {state}, postal_key"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('geo_rollups')
+    op.drop_index('ix_donors_state_key_city_key', table_name='donors')
+    op.drop_index('ix_donors_state_key_postal_key', table_name='donors')
+    with op.batch_alter_table('donors') as batch_op:
+        batch_op.drop_column('postal_key')
+        batch_op.drop_column('city_key')
+        batch_op.drop_column('state_key')
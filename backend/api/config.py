@@ -0,0 +1,195 @@
+"""Application settings."""
+import os
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+
+class Settings(BaseModel):
+    """Runtime settings loaded from the environment."""
+    environment: str = "development"
+    database_url: str = "sqlite:///./fsh_funds.db"
+    log_level: str = "INFO"
+
+    # Authentication
+    secret_key: str = "dev-secret-key-change-me-before-deploying"
+    jwt_algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    token_cache_ttl_seconds: int = 300
+    user_cache_ttl_seconds: int = 300
+    auth_cache_size: int = 10_000
+    bcrypt_rounds: int = 12
+    password_hash_concurrency: int = 2
+    password_hash_max_pending: int = 64
+
+    # Cache invalidation shared by the workers on a host (memory-mapped file;
+    # empty keeps invalidations inside one process)
+    cache_bus_path: str = ""
+    cache_bus_slots: int = 65_536
+
+    # Donor entity cache
+    donor_cache_ttl_seconds: int = 60
+    donor_cache_size: int = 50_000
+
+    # Donor counts
+    donor_count_cache_ttl_seconds: int = 30
+    donor_count_cache_size: int = 10_000
+    donor_count_scan_limit: int = 10_000
+
+    # Donor autocomplete
+    autocomplete_cache_ttl_seconds: int = 300
+    autocomplete_cache_size: int = 10_000
+    autocomplete_cached_prefix_length: int = 3
+
+    # Donor audit log (background writer)
+    audit_log_enabled: bool = True
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 0.5
+    audit_durable: bool = True
+    audit_enqueue_timeout_seconds: float = 1.0
+
+    # Donor deletes (soft delete and retention purge)
+    donor_soft_delete: bool = False
+    donor_retention_days: int = 30
+    donor_purge_interval_seconds: int = 0
+    donor_purge_chunk_size: int = 500
+
+    # Archive of old gifts and communications (hot/cold tiering)
+    archive_keep_years: int = 7
+    archive_batch_size: int = 1_000
+
+    # Columnar analytics snapshot (memory-mapped files; empty disables the
+    # analytics endpoints)
+    analytics_snapshot_path: str = ""
+    analytics_refresh_batch_size: int = 10_000
+
+    # Live streams (server-sent events): one database poll per interval per
+    # process, whatever the number of clients
+    stream_poll_interval_seconds: float = 1.0
+    stream_max_queued: int = 100
+    stream_heartbeat_seconds: float = 15.0
+
+    # Response compression (brotli or gzip) from this many bytes; 0 disables
+    compression_min_bytes: int = 1_024
+
+    # Tax receipts
+    receipt_organization_name: str = "FSH Funds"
+    receipt_organization_tax_id: str = ""
+
+    # Query guard (per-request SQL counting and N+1 detection)
+    query_guard_enabled: bool = True
+    query_guard_raise: bool = False
+    n_plus_one_threshold: int = 5
+
+    @property
+    def is_production(self) -> bool:
+        """Whether the app runs in production."""
+        return self.environment == "production"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables (and a .env file)."""
+        load_dotenv()
+        environment = os.environ.get("ENVIRONMENT", "development")
+        return cls(
+            environment=environment,
+            database_url=os.environ.get("DATABASE_URL", "sqlite:///./fsh_funds.db"),
+            log_level=os.environ.get("LOG_LEVEL", "INFO"),
+            secret_key=_secret_key(environment),
+            jwt_algorithm=os.environ.get("JWT_ALGORITHM", "HS256"),
+            access_token_expire_minutes=int(
+                os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+            ),
+            token_cache_ttl_seconds=int(os.environ.get("TOKEN_CACHE_TTL_SECONDS", "300")),
+            user_cache_ttl_seconds=int(os.environ.get("USER_CACHE_TTL_SECONDS", "300")),
+            auth_cache_size=int(os.environ.get("AUTH_CACHE_SIZE", "10000")),
+            bcrypt_rounds=int(os.environ.get("BCRYPT_ROUNDS", "12")),
+            password_hash_concurrency=int(
+                os.environ.get(
+                    "PASSWORD_HASH_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))
+                )
+            ),
+            password_hash_max_pending=int(
+                os.environ.get("PASSWORD_HASH_MAX_PENDING", "64")
+            ),
+            cache_bus_path=os.environ.get("CACHE_BUS_PATH", ""),
+            cache_bus_slots=int(os.environ.get("CACHE_BUS_SLOTS", "65536")),
+            donor_cache_ttl_seconds=int(os.environ.get("DONOR_CACHE_TTL_SECONDS", "60")),
+            donor_cache_size=int(os.environ.get("DONOR_CACHE_SIZE", "50000")),
+            donor_count_cache_ttl_seconds=int(
+                os.environ.get("DONOR_COUNT_CACHE_TTL_SECONDS", "30")
+            ),
+            donor_count_cache_size=int(os.environ.get("DONOR_COUNT_CACHE_SIZE", "10000")),
+            donor_count_scan_limit=int(os.environ.get("DONOR_COUNT_SCAN_LIMIT", "10000")),
+            autocomplete_cache_ttl_seconds=int(
+                os.environ.get("AUTOCOMPLETE_CACHE_TTL_SECONDS", "300")
+            ),
+            autocomplete_cache_size=int(os.environ.get("AUTOCOMPLETE_CACHE_SIZE", "10000")),
+            autocomplete_cached_prefix_length=int(
+                os.environ.get("AUTOCOMPLETE_CACHED_PREFIX_LENGTH", "3")
+            ),
+            audit_log_enabled=_env_bool("AUDIT_LOG", default=True),
+            audit_queue_size=int(os.environ.get("AUDIT_QUEUE_SIZE", "10000")),
+            audit_batch_size=int(os.environ.get("AUDIT_BATCH_SIZE", "500")),
+            audit_flush_interval_seconds=float(
+                os.environ.get("AUDIT_FLUSH_INTERVAL_SECONDS", "0.5")
+            ),
+            audit_durable=_env_bool("AUDIT_DURABLE", default=True),
+            audit_enqueue_timeout_seconds=float(
+                os.environ.get("AUDIT_ENQUEUE_TIMEOUT_SECONDS", "1.0")
+            ),
+            donor_soft_delete=_env_bool("DONOR_SOFT_DELETE", default=False),
+            donor_retention_days=int(os.environ.get("DONOR_RETENTION_DAYS", "30")),
+            donor_purge_interval_seconds=int(
+                os.environ.get("DONOR_PURGE_INTERVAL_SECONDS", "0")
+            ),
+            donor_purge_chunk_size=int(os.environ.get("DONOR_PURGE_CHUNK_SIZE", "500")),
+            archive_keep_years=int(os.environ.get("ARCHIVE_KEEP_YEARS", "7")),
+            archive_batch_size=int(os.environ.get("ARCHIVE_BATCH_SIZE", "1000")),
+            analytics_snapshot_path=os.environ.get("ANALYTICS_SNAPSHOT_PATH", ""),
+            analytics_refresh_batch_size=int(
+                os.environ.get("ANALYTICS_REFRESH_BATCH_SIZE", "10000")
+            ),
+            stream_poll_interval_seconds=float(
+                os.environ.get("STREAM_POLL_INTERVAL_SECONDS", "1.0")
+            ),
+            stream_max_queued=int(os.environ.get("STREAM_MAX_QUEUED", "100")),
+            stream_heartbeat_seconds=float(os.environ.get("STREAM_HEARTBEAT_SECONDS", "15.0")),
+            compression_min_bytes=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+            receipt_organization_name=os.environ.get("RECEIPT_ORGANIZATION_NAME", "FSH Funds"),
+            receipt_organization_tax_id=os.environ.get("RECEIPT_ORGANIZATION_TAX_ID", ""),
+            query_guard_enabled=_env_bool(
+                "QUERY_GUARD", default=environment in ("development", "test")
+            ),
+            query_guard_raise=_env_bool(
+                "QUERY_GUARD_RAISE", default=environment == "test"
+            ),
+            n_plus_one_threshold=int(os.environ.get("N_PLUS_ONE_THRESHOLD", "5")),
+        )
+
+
+def _secret_key(environment: str) -> str:
+    """Read the JWT signing key; production refuses to use the dev default."""
+    secret_key = os.environ.get("SECRET_KEY")
+    if secret_key:
+        return secret_key
+    if environment == "production":
+        raise RuntimeError("SECRET_KEY must be set in production")
+    return "dev-secret-key-change-me-before-deploying"
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value: Optional[str] = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get cached application settings."""
+    return Settings.from_env()
@@ -2,6 +2,10 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlmodel import Session
+
+from api.dependencies.database import get_session
+from api.services.users.auth_service import AuthService
 from models.user import User
 
 
@@ -9,32 +13,36 @@ security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    session: Session = Depends(get_session)
 ) -> User:
-    """Get current authenticated user."""
-    # For now, return a mock user for development
-    # In production, this would validate JWT tokens and fetch user from database
+    """Get current authenticated user from the bearer token."""
+    if not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
     
-    # Create a mock user for development
-    mock_user = User(
-        id=1,
-        username="admin",
-        email="admin@fshfunds.com", 
-        hashed_password="mock_hash",
-        is_active=True,
-        is_superuser=True
-    )
-    return mock_user
+    user = AuthService(session).authenticate(credentials.credentials)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return user
 
 
 async def get_optional_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
-) -> Optional[dict]:
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    session: Session = Depends(get_session)
+) -> Optional[User]:
     """Get current user if authenticated, None otherwise."""
     if not credentials:
         return None
     
     try:
-        return await get_current_user(credentials)
+        return await get_current_user(credentials, session)
     except HTTPException:
-        return None
\ No newline at end of file
+        return None
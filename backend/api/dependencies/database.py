@@ -1,16 +1,44 @@
 """Database dependencies."""
+from typing import Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
 from sqlmodel import Session
 
-# For now, use SQLite for development
-DATABASE_URL = "sqlite:///./fsh_funds.db"
+from api.config import get_settings
+from api.utils.query_tracker import install_query_tracking
+
+
+_engine: Optional[Engine] = None
+
+
+def get_engine() -> Engine:
+    """Get the process-wide engine, creating it on first use.
+
+    Defaults to a local SQLite file; set DATABASE_URL to use Postgres.
+    """
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        database_url = settings.database_url
+        _engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+        )
+        if settings.query_guard_enabled:
+            install_query_tracking(_engine)
+    return _engine
+
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def dispose_engine() -> None:
+    """Close pooled connections and forget the engine."""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
 
 
 def get_session() -> Session:
     """Get database session."""
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    with Session(get_engine()) as session:
+        yield session
@@ -1,36 +1,44 @@
 """Main FastAPI application."""
-import logging
 import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import uuid
+from contextlib import asynccontextmanager, suppress
+from typing import List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from api.routers import auth, users
-from api.utils.logger import get_logger
+from api.config import Settings, get_settings
+from api.utils.logger import configure_logging, get_logger
+from api.utils.startup_profiler import StartupProfiler
 
 # Initialize logger
-app_logger = get_logger()
+app_logger = get_logger(__name__)
 
-# Keep basic Python logging for uvicorn compatibility
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logger = logging.getLogger(__name__)
+# (module, attribute, prefix, tags) - imported during startup, not at import
+ROUTERS: List[Tuple[str, str, str, Optional[List[str]]]] = [
+    ("api.routers.auth", "router", "/api/v1/auth", ["auth"]),
+    ("api.routers.users", "router", "/api/v1/users", ["users"]),
+    ("api.routers.donors", "donors_router", "/api/v1", None),
+    ("api.routers.donors", "gifts_router", "/api/v1", None),
+    ("api.routers.donors", "analytics_router", "/api/v1", None),
+    ("api.routers.donors", "campaigns_router", "/api/v1", None),
+]
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log requests and responses."""
-    
+
     async def dispatch(self, request: Request, call_next):
         """Process request and log details."""
         request_id = str(uuid.uuid4())
         start_time = time.time()
-        
+
         # Log incoming request
         app_logger.info(
             "Request started",
@@ -41,13 +49,13 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "client": request.client.host if request.client else None
             }
         )
-        
+
         # Process request
         response = await call_next(request)
-        
+
         # Calculate processing time
         process_time = time.time() - start_time
-        
+
         # Log response
         app_logger.info(
             "Request completed",
@@ -57,83 +65,172 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "process_time": round(process_time, 3)
             }
         )
-        
+
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
-        
+
         return response
 
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="FastAPI Boilerplate",
-    description="A minimal FastAPI boilerplate application",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure as needed
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add request logging middleware
-app.add_middleware(RequestLoggingMiddleware)
-
-
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException):
-    """Handle HTTP exceptions."""
-    app_logger.warning(
-        f"HTTP exception: {exc.status_code} - {exc.detail}",
-        extra={"url": str(request.url), "method": request.method}
-    )
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception):
-    """Handle general exceptions."""
-    app_logger.error(
-        f"Unhandled exception: {str(exc)}",
-        extra={"url": str(request.url), "method": request.method},
-        exc_info=True
-    )
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "Internal server error"}
-    )
-
-
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {"message": "FastAPI Boilerplate is running!"}
-
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "fastapi-boilerplate"}
-
-
-# Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
-
-# Import and include donor router
-from api.routers.donors import donors_router
-app.include_router(donors_router, prefix="/api/v1/donors", tags=["donors"])
+def include_routers(app: FastAPI, profiler: StartupProfiler) -> None:
+    """Import and mount the API routers once per application."""
+    if getattr(app.state, "routers_loaded", False):
+        return
+    for module_path, attribute, prefix, tags in ROUTERS:
+        module = profiler.import_module(module_path)
+        with profiler.step(f"include {module_path}"):
+            app.include_router(getattr(module, attribute), prefix=prefix, tags=tags)
+    app.state.routers_loaded = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load routers, open the connection pool and start background sweeps; release on shutdown."""
+    profiler: StartupProfiler = app.state.startup_profiler
+    include_routers(app, profiler)
+
+    with profiler.step("import api.dependencies.database"):
+        from api.dependencies.database import dispose_engine, get_engine
+    with profiler.step("create engine"):
+        get_engine()
+
+    app.state.startup_report = profiler.log()
+
+    purge_task = None
+    settings: Settings = app.state.settings
+    if settings.donor_purge_interval_seconds > 0:
+        from api.services.donors.deletion_service import purge_sweep
+        purge_task = asyncio.create_task(
+            purge_sweep(get_engine(), settings.donor_purge_interval_seconds)
+        )
+
+    yield
+
+    if purge_task is not None:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+
+    from api.services.donors.audit_log import shutdown_audit_writer
+    from api.services.donors.campaign_service import close_campaign_totals_feed
+    from api.services.donors.gift_feed import close_gift_feed
+    from api.services.users.auth_service import clear_auth_caches
+    from api.utils.security import shutdown_hashing_executor
+
+    # End live streams so open connections do not hold up shutdown
+    close_campaign_totals_feed()
+    close_gift_feed()
+    # Write queued audit entries while the engine is still usable
+    shutdown_audit_writer()
+    dispose_engine()
+    clear_auth_caches()
+    shutdown_hashing_executor()
+    app_logger.info("Shutdown complete")
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the application.
+
+    Routers, the database engine and other heavy dependencies are loaded
+    in the lifespan startup hook, so importing this module stays cheap for
+    tests and tooling. Startup costs are logged and kept on
+    ``app.state.startup_report``.
+    """
+    settings = settings or get_settings()
+    profiler = StartupProfiler(started_at=_IMPORT_STARTED)
+    profiler.record("import api.main", _IMPORT_STARTED)
+
+    with profiler.step("configure app"):
+        configure_logging(settings.log_level)
+
+        # Initialize FastAPI app
+        app = FastAPI(
+            title="FastAPI Boilerplate",
+            description="A minimal FastAPI boilerplate application",
+            version="1.0.0",
+            docs_url="/docs",
+            redoc_url="/redoc",
+            lifespan=lifespan
+        )
+        app.state.settings = settings
+        app.state.startup_profiler = profiler
+        app.state.startup_report = None
+
+        # Add CORS middleware
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # Configure as needed
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+        # Add request logging middleware
+        app.add_middleware(RequestLoggingMiddleware)
+
+        # Count SQL statements per request and flag N+1 patterns outside production
+        if settings.query_guard_enabled:
+            from api.utils.query_tracker import QueryGuardMiddleware
+            app.add_middleware(QueryGuardMiddleware)
+
+        # Outermost, so every response and header passes through it
+        if settings.compression_min_bytes > 0:
+            from api.utils.compression import CompressionMiddleware
+            app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
+        _register_handlers(app)
+
+    return app
+
+
+def _register_handlers(app: FastAPI) -> None:
+    """Attach exception handlers and the built-in endpoints."""
+
+    @app.exception_handler(HTTPException)
+    async def http_exception_handler(request: Request, exc: HTTPException):
+        """Handle HTTP exceptions."""
+        app_logger.warning(
+            f"HTTP exception: {exc.status_code} - {exc.detail}",
+            extra={"url": str(request.url), "method": request.method}
+        )
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers=getattr(exc, "headers", None)
+        )
+
+    @app.exception_handler(Exception)
+    async def general_exception_handler(request: Request, exc: Exception):
+        """Handle general exceptions."""
+        app_logger.error(
+            f"Unhandled exception: {str(exc)}",
+            extra={"url": str(request.url), "method": request.method},
+            exc_info=True
+        )
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "Internal server error"}
+        )
+
+    @app.get("/")
+    async def root():
+        """Root endpoint."""
+        return {"message": "FastAPI Boilerplate is running!"}
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint."""
+        return {"status": "healthy", "service": "fastapi-boilerplate"}
+
+    @app.get("/health/startup")
+    async def startup_report(request: Request):
+        """Import and initialization costs recorded at startup."""
+        return request.app.state.startup_report or {"status": "starting"}
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,7 +1,11 @@
 """Authentication router."""
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
+from sqlmodel import Session
+from api.dependencies.database import get_session
+from api.services.users.user_service import UserService
 from api.utils.logger import get_logger
+from api.utils.security import PasswordHashingBusy, create_access_token
 
 
 router = APIRouter()
@@ -28,20 +32,32 @@ class RegisterRequest(BaseModel):
     username: str
 
 
+def _hashing_busy() -> HTTPException:
+    """Response for login storms that exceed the hashing queue."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many requests, try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, session: Session = Depends(get_session)):
     """Authenticate user and return access token."""
     logger.info(f"Login attempt for email: {request.email}")
     
-    # This is a placeholder implementation
-    # In a real app, you would validate credentials against the database
-    if request.email == "admin@example.com" and request.password == "password":
+    try:
+        user = await UserService(session).authenticate(request.email, request.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
+    if user:
         return LoginResponse(
-            access_token="mock_jwt_token",
+            access_token=create_access_token(user.id),
             user={
-                "id": 1,
-                "email": request.email,
-                "username": "admin"
+                "id": user.id,
+                "email": user.email,
+                "username": user.username
             }
         )
     
@@ -52,17 +68,31 @@ async def login(request: LoginRequest):
 
 
 @router.post("/register")
-async def register(request: RegisterRequest):
+async def register(request: RegisterRequest, session: Session = Depends(get_session)):
     """Register a new user."""
     logger.info(f"Registration attempt for email: {request.email}")
     
-    # This is a placeholder implementation
-    # In a real app, you would save the user to the database
+    try:
+        user = await UserService(session).create_user(
+            username=request.username,
+            email=request.email,
+            password=request.password
+        )
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered"
+        )
+    
     return {
         "message": "User registered successfully",
         "user": {
-            "email": request.email,
-            "username": request.username
+            "id": user.id,
+            "email": user.email,
+            "username": user.username
         }
     }
 
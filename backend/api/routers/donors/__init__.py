@@ -1,4 +1,7 @@
 """Donor API router modules."""
 from .donors import router as donors_router
+from .gifts import router as gifts_router
+from .analytics import router as analytics_router
+from .campaigns import router as campaigns_router
 
-__all__ = ["donors_router"]
\ No newline at end of file
+__all__ = ["donors_router", "gifts_router", "analytics_router", "campaigns_router"]
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Gift analytics API endpoints, served from the columnar snapshot."""
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from api.dependencies.auth import get_current_user
+from api.services.donors.analytics_service import DIMENSIONS, PERIODS, GiftAnalyticsService, UnknownDimension
+from api.services.donors.analytics_snapshot import SnapshotUnavailable, current_snapshot
+from models.user import User
+
+
+class AnalyticsGroup(BaseModel):
+    """Gifts sharing one value of the grouping dimension."""
+    key: Optional[Union[int, str]] = None
+    count: int
+    total: float
+    average: float
+
+
+class GroupByResponse(BaseModel):
+    """Gift totals per value of a dimension."""
+    by: str
+    refreshed_at: datetime
+    groups: List[AnalyticsGroup]
+
+
+class TimeSeriesPoint(BaseModel):
+    """Gift totals for one period."""
+    period: str
+    count: int
+    total: float
+
+
+class TimeSeriesResponse(BaseModel):
+    """Gift totals per period, oldest first."""
+    interval: str
+    refreshed_at: datetime
+    points: List[TimeSeriesPoint]
+
+
+class PercentileGroup(BaseModel):
+    """Gift amount percentiles for one group, in the requested order."""
+    key: Optional[Union[int, str]] = None
+    count: int
+    values: List[float]
+
+
+class PercentilesResponse(BaseModel):
+    """Gift amount percentiles overall or per value of a dimension."""
+    percentiles: List[float]
+    by: Optional[str] = None
+    refreshed_at: datetime
+    groups: List[PercentileGroup]
+
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def analytics_service() -> GiftAnalyticsService:
+    """Reports over the latest published snapshot; 503 when there is none."""
+    try:
+        return GiftAnalyticsService(current_snapshot())
+    except SnapshotUnavailable as error:
+        raise HTTPException(status_code=503, detail=f"Analytics snapshot unavailable: {error}")
+
+
+def _unknown(value: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Unknown dimension: {value}")
+
+
+@router.get("/gifts/group-by", response_model=GroupByResponse)
+async def gifts_by_dimension(
+    by: str = Query(..., description=f"One of: {', '.join(DIMENSIONS)}"),
+    start: Optional[datetime] = Query(None, description="Gifts dated on or after"),
+    end: Optional[datetime] = Query(None, description="Gifts dated before"),
+    status: Optional[str] = Query("completed", description="Gift status; empty for every status"),
+    service: GiftAnalyticsService = Depends(analytics_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Count, total and average gift per value of a dimension."""
+    try:
+        groups = await asyncio.to_thread(service.group_by, by, start, end, status or None)
+    except UnknownDimension:
+        raise _unknown(by)
+    return {"by": by, "refreshed_at": service.snapshot.refreshed_at, "groups": groups}
+
+
+@router.get("/gifts/time-series", response_model=TimeSeriesResponse)
+async def gifts_over_time(
+    interval: str = Query("month", description=f"One of: {', '.join(PERIODS)}"),
+    start: Optional[datetime] = Query(None, description="Gifts dated on or after"),
+    end: Optional[datetime] = Query(None, description="Gifts dated before"),
+    status: Optional[str] = Query("completed", description="Gift status; empty for every status"),
+    service: GiftAnalyticsService = Depends(analytics_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Count and total per day, month or year."""
+    try:
+        points = await asyncio.to_thread(service.time_series, interval, start, end, status or None)
+    except UnknownDimension:
+        raise _unknown(interval)
+    return {"interval": interval, "refreshed_at": service.snapshot.refreshed_at, "points": points}
+
+
+@router.get("/gifts/percentiles", response_model=PercentilesResponse)
+async def gift_amount_percentiles(
+    p: List[float] = Query([50.0, 90.0, 99.0], description="Percentiles between 0 and 100"),
+    by: Optional[str] = Query(None, description=f"One of: {', '.join(DIMENSIONS)}"),
+    start: Optional[datetime] = Query(None, description="Gifts dated on or after"),
+    end: Optional[datetime] = Query(None, description="Gifts dated before"),
+    status: Optional[str] = Query("completed", description="Gift status; empty for every status"),
+    service: GiftAnalyticsService = Depends(analytics_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Gift amount percentiles overall or per value of a dimension."""
+    if any(point < 0 or point > 100 for point in p):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    try:
+        groups = await asyncio.to_thread(service.percentiles, p, by, start, end, status or None)
+    except UnknownDimension:
+        raise _unknown(by)
+    return {"percentiles": p, "by": by, "refreshed_at": service.snapshot.refreshed_at, "groups": groups}
@@ -0,0 +1,131 @@
+"""Campaign progress API endpoints, including a live server-sent event stream."""
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlmodel import Session
+from starlette.background import BackgroundTask
+
+from api.config import get_settings
+from api.dependencies.auth import get_current_user
+from api.dependencies.database import get_session
+from api.services.donors.campaign_service import CampaignService, campaign_totals_feed
+from api.utils.broadcast import RECONNECT_MILLISECONDS, Subscription, SubscriptionClosed, server_sent_event
+from api.utils.query_tracker import query_budget
+from models.user import User
+
+
+class CampaignTotals(BaseModel):
+    """Running totals of one campaign's completed gifts."""
+    campaign_id: int
+    total_amount: float
+    gift_count: int
+    donor_count: int
+    change_seq: int
+
+
+class CampaignTotalsResponse(BaseModel):
+    """Running totals of several campaigns."""
+    campaigns: List[CampaignTotals]
+
+
+router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+
+
+async def totals_events(
+    subscription: Subscription,
+    snapshot: List[Dict[str, Any]],
+    campaign_ids: Optional[List[int]],
+    heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """Server-sent events: the current totals, then every change to them.
+
+    A campaign's update is skipped when the client already has that
+    change, which happens for changes made between subscribing and
+    reading the snapshot. Idle streams get a comment line every
+    ``heartbeat_seconds`` so proxies keep them open. A client too slow
+    to keep up is disconnected; browsers reconnect on their own and start
+    again from a fresh snapshot.
+    """
+    wanted = set(campaign_ids) if campaign_ids is not None else None
+    seen: Dict[int, int] = {}
+    async with subscription:
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+        for totals in snapshot:
+            seen[totals["campaign_id"]] = totals["change_seq"]
+            yield server_sent_event("totals", totals)
+        while True:
+            try:
+                changed = await subscription.next(heartbeat_seconds)
+            except SubscriptionClosed:
+                return
+            if changed is None:
+                yield ": keepalive\n\n"
+                continue
+            for totals in changed:
+                campaign_id = totals["campaign_id"]
+                if wanted is not None and campaign_id not in wanted:
+                    continue
+                if totals["change_seq"] <= seen.get(campaign_id, 0):
+                    continue
+                seen[campaign_id] = totals["change_seq"]
+                yield server_sent_event("totals", totals)
+
+
+@router.get(
+    "/totals",
+    response_model=CampaignTotalsResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_campaign_totals(
+    campaign_id: Optional[List[int]] = Query(None, description="Campaigns to read; omit for every campaign"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Amount raised, gift count and distinct donors per campaign."""
+    service = CampaignService(session)
+    return {"campaigns": service.totals(campaign_id)}
+
+
+@router.get("/totals/stream")
+async def stream_campaign_totals(
+    campaign_id: Optional[List[int]] = Query(None, description="Campaigns to follow; omit for every campaign"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Server-sent ``totals`` events: current totals first, then each change as it commits.
+
+    Every stream in a worker is fed by the same poll of changed totals,
+    so the database load does not grow with the number of viewers.
+    """
+    subscription = await campaign_totals_feed(session.get_bind()).subscribe()
+    try:
+        snapshot = CampaignService(session).totals(campaign_id)
+    except Exception:
+        subscription.close()
+        raise
+    # The stream outlives the request's transaction; give the connection back now
+    session.close()
+
+    return StreamingResponse(
+        totals_events(subscription, snapshot, campaign_id, get_settings().stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs when the client leaves before the first event
+        background=BackgroundTask(subscription.close),
+    )
+
+
+@router.get(
+    "/{campaign_id}/totals",
+    response_model=CampaignTotals,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_campaign_total(
+    campaign_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Amount raised, gift count and distinct donors for one campaign."""
+    service = CampaignService(session)
+    return service.totals([campaign_id])[0]
@@ -1,13 +1,26 @@
 """Donor management API endpoints."""
-from typing import List, Optional
+import csv
+import io
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from api.dependencies.auth import get_current_user
 from models.user import User
 from models.donors.donor import Donor
 from api.services.donors.donor_service import DonorService
+from api.services.donors.count_service import DonorCountService
+from api.services.donors.deletion_service import DonorDeletionService
+from api.services.donors.autocomplete_service import AutocompleteService
+from api.services.donors.geography_service import GeographyService
+from api.services.donors.sync_service import DonorSyncService, InvalidSyncToken
+from api.services.donors.timeline_service import DonorTimelineService, InvalidTimelineToken
+from api.services.donors.donor_fields import UnknownFieldsError, parse_fields
+from api.utils.query_tracker import query_budget
+from api.utils.response_formats import MEDIA_TYPES, columnar_blocks, columnar_response, response_format
 
 
 # Import database session
@@ -89,6 +102,149 @@ class DonorResponse(BaseModel):
     created_at: str
 
 
+class SparseDonorResponse(BaseModel):
+    """Donor response holding only the fields that were selected."""
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    full_name: Optional[str] = None
+    preferred_name: Optional[str] = None
+    title: Optional[str] = None
+    suffix: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    mobile_phone: Optional[str] = None
+    work_phone: Optional[str] = None
+    address_line_1: Optional[str] = None
+    address_line_2: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    country: Optional[str] = None
+    company: Optional[str] = None
+    job_title: Optional[str] = None
+    preferred_contact_method: Optional[str] = None
+    communication_preferences: Optional[str] = None
+    do_not_email: Optional[bool] = None
+    do_not_call: Optional[bool] = None
+    do_not_mail: Optional[bool] = None
+    total_gifts: Optional[float] = None
+    total_gift_count: Optional[int] = None
+    first_gift_date: Optional[datetime] = None
+    last_gift_date: Optional[datetime] = None
+    largest_gift: Optional[float] = None
+    average_gift: Optional[float] = None
+    donor_status: Optional[str] = None
+    donor_type: Optional[str] = None
+    wealth_rating: Optional[str] = None
+    capacity_rating: Optional[int] = None
+    notes: Optional[str] = None
+    source: Optional[str] = None
+
+
+class DonorCountResponse(BaseModel):
+    """Number of donors matching a list, segment or search filter."""
+    count: int
+    exact: bool
+    source: str  # counter, cache, query, estimate
+
+
+class DonorSuggestion(BaseModel):
+    """Autocomplete match for a donor picker."""
+    id: int
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    company: Optional[str] = None
+    total_gifts: float
+
+
+class GeoArea(BaseModel):
+    """Donor count and giving totals for one area."""
+    code: str
+    donor_count: int
+    total_gifts: float
+    gift_count: int
+
+
+class GeographyResponse(BaseModel):
+    """One level of the geographic drill-down."""
+    level: str  # state, city, postal_prefix, postal_code
+    state: Optional[str] = None
+    postal_prefix: Optional[str] = None
+    areas: List[GeoArea]
+
+
+class DonorHistoryEntry(BaseModel):
+    """One audited change to a donor."""
+    id: int
+    action: str
+    actor: Optional[str] = None
+    changes: Dict[str, List[Any]]
+    created_at: datetime
+
+
+class TimelineEvent(BaseModel):
+    """A gift or communication on a donor's timeline; fields depend on the kind."""
+    kind: str  # gift, communication
+    id: int
+    date: datetime
+    archived: bool
+    amount: Optional[float] = None
+    gift_type: Optional[str] = None
+    designation: Optional[str] = None
+    gift_status: Optional[str] = None
+    communication_type: Optional[str] = None
+    direction: Optional[str] = None
+    subject: Optional[str] = None
+
+
+class DonorTimelineResponse(BaseModel):
+    """One page of a donor's timeline, newest first."""
+    events: List[TimelineEvent]
+    next_before: Optional[str] = None
+
+
+class DeletedDonor(BaseModel):
+    """A donor removed since the change token; merged donors name the survivor."""
+    id: int
+    merged_into_id: Optional[int] = None
+
+
+class DonorChangesResponse(BaseModel):
+    """Donors created, updated or deleted since a change token."""
+    donors: List[SparseDonorResponse]
+    deleted: List[DeletedDonor]
+    next_token: str
+    has_more: bool
+
+
+class BatchDonorsRequest(BaseModel):
+    """Request model for fetching donors by id."""
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class BatchDonorsResponse(BaseModel):
+    """Donors in request order plus the ids that were not found."""
+    donors: List[DonorResponse]
+    missing: List[int]
+
+
+class BulkDeleteRequest(BaseModel):
+    """Donors to delete: an id list, or a segment given by status, type and/or tag."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    status: Optional[str] = None
+    donor_type: Optional[str] = None
+    tag: Optional[str] = None
+    soft: Optional[bool] = None  # defaults to the DONOR_SOFT_DELETE setting
+
+
+class BulkDeleteResponse(BaseModel):
+    """Number of donors deleted."""
+    deleted: int
+
+
 class MergeDonorsRequest(BaseModel):
     """Request model for merging donors."""
     primary_donor_id: int
@@ -100,20 +256,8 @@ class AddTagRequest(BaseModel):
     tag_name: str
 
 
-# Router
-router = APIRouter(prefix="/donors", tags=["donors"])
-
-
-@router.post("/", response_model=DonorResponse)
-async def create_donor(
-    donor_data: DonorCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    """Create a new donor."""
-    service = DonorService(session)
-    donor = service.create_donor(donor_data.dict())
-    
+def _to_response(donor: Donor) -> DonorResponse:
+    """Build the response model from a donor row."""
     return DonorResponse(
         id=donor.id,
         first_name=donor.first_name,
@@ -132,97 +276,268 @@ async def create_donor(
     )
 
 
-@router.get("/", response_model=List[DonorResponse])
+def donor_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated donor fields to return; defaults to the summary fields"
+    )
+) -> List[str]:
+    """Validate ``fields`` against the allow-list of donor columns."""
+    try:
+        return parse_fields(fields)
+    except UnknownFieldsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _csv_chunks(fields: List[str], rows: Iterable[Dict[str, Any]], rows_per_chunk: int = 500) -> Iterator[str]:
+    """Encode rows as CSV, yielding a few hundred rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([row[name] for name in fields])
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# Formats of the row-heavy endpoints, the default first
+row_format = response_format("json", "columnar", "msgpack")
+export_format = response_format("csv", "columnar", "msgpack")
+
+# Columnar alternatives, for the OpenAPI schema
+COLUMNAR_CONTENT = {
+    200: {"content": {MEDIA_TYPES["columnar"]: {}, MEDIA_TYPES["msgpack"]: {}}},
+}
+EXPORT_FILE_NAMES = {"csv": "donors.csv", "columnar": "donors.json", "msgpack": "donors.msgpack"}
+
+
+# Router
+router = APIRouter(prefix="/donors", tags=["donors"])
+
+
+@router.post("/", response_model=DonorResponse)
+async def create_donor(
+    donor_data: DonorCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a new donor."""
+    service = DonorService(session)
+    donor = service.create_donor(donor_data.dict())
+    
+    return _to_response(donor)
+
+
+@router.get(
+    "/",
+    response_model=List[SparseDonorResponse],
+    response_model_exclude_unset=True,
+    responses=COLUMNAR_CONTENT,
+    dependencies=[Depends(query_budget(3))],
+)
 async def list_donors(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    fields: List[str] = Depends(donor_fields),
+    format: str = Depends(row_format),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    """List donors with pagination."""
+    """List donors with pagination; columnar JSON or MessagePack on request."""
     service = DonorService(session)
-    donors = service.list_donors(skip=skip, limit=limit)
-    
-    return [
-        DonorResponse(
-            id=donor.id,
-            first_name=donor.first_name,
-            last_name=donor.last_name,
-            full_name=donor.full_name,
-            email=donor.email,
-            phone=donor.phone,
-            city=donor.city,
-            state=donor.state,
-            company=donor.company,
-            donor_status=donor.donor_status,
-            donor_type=donor.donor_type,
-            total_gifts=donor.total_gifts,
-            total_gift_count=donor.total_gift_count,
-            created_at=donor.created_at.isoformat()
-        ) for donor in donors
-    ]
-
-
-@router.get("/search", response_model=List[DonorResponse])
+    rows = service.list_donor_fields(fields, skip=skip, limit=limit)
+    if format != "json":
+        return columnar_response(format, fields, rows)
+    return rows
+
+
+@router.get(
+    "/search",
+    response_model=List[SparseDonorResponse],
+    response_model_exclude_unset=True,
+    responses=COLUMNAR_CONTENT,
+    dependencies=[Depends(query_budget(3))],
+)
 async def search_donors(
     q: str = Query(..., min_length=2),
     limit: int = Query(50, ge=1, le=100),
+    fields: List[str] = Depends(donor_fields),
+    format: str = Depends(row_format),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Search donors by name, email, or phone."""
+    """Search donors by name, email, or phone; columnar JSON or MessagePack on request."""
     service = DonorService(session)
-    donors = service.search_donors(q, limit)
+    rows = service.search_donor_fields(q, fields, limit)
+    if format != "json":
+        return columnar_response(format, fields, rows)
+    return rows
+
+
+@router.get(
+    "/count",
+    response_model=DonorCountResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def count_donors(
+    status: Optional[str] = Query(None, description="Donor status, e.g. active"),
+    donor_type: Optional[str] = Query(None, description="Donor type, e.g. individual"),
+    tag: Optional[str] = Query(None, description="Tag name"),
+    q: Optional[str] = Query(None, min_length=2, description="Search text, as for /search"),
+    approximate: bool = Query(False, description="Allow a planner estimate instead of counting"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Count donors for "showing 1-100 of N" without paying for a full COUNT(*)."""
+    service = DonorCountService(session)
+    return service.count(
+        status=status, donor_type=donor_type, tag_name=tag, query=q, approximate=approximate
+    )
+
+
+@router.get(
+    "/autocomplete",
+    response_model=List[DonorSuggestion],
+    dependencies=[Depends(query_budget(3))],
+)
+async def autocomplete_donors(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Donors whose name, company or email starts with ``q``, largest givers first."""
+    service = AutocompleteService(session)
+    return service.suggest(q, limit)
+
+
+@router.get(
+    "/geography",
+    response_model=GeographyResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def donor_geography(
+    state: Optional[str] = Query(None, description="State code or name to drill into"),
+    postal_prefix: Optional[str] = Query(None, description="Postal prefix within the state"),
+    group_by: str = Query("postal", pattern="^(postal|city)$"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Donor counts and giving totals by state, then postal prefix or city, then postal code."""
+    if postal_prefix is not None and state is None:
+        raise HTTPException(status_code=400, detail="postal_prefix requires state")
     
-    return [
-        DonorResponse(
-            id=donor.id,
-            first_name=donor.first_name,
-            last_name=donor.last_name,
-            full_name=donor.full_name,
-            email=donor.email,
-            phone=donor.phone,
-            city=donor.city,
-            state=donor.state,
-            company=donor.company,
-            donor_status=donor.donor_status,
-            donor_type=donor.donor_type,
-            total_gifts=donor.total_gifts,
-            total_gift_count=donor.total_gift_count,
-            created_at=donor.created_at.isoformat()
-        ) for donor in donors
-    ]
-
-
-@router.get("/{donor_id}", response_model=DonorResponse)
+    service = GeographyService(session)
+    return service.drill_down(
+        state=state, postal_prefix=postal_prefix, by_city=group_by == "city"
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=DonorChangesResponse,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(query_budget(3))],
+)
+async def donor_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous poll; omit for a full load"),
+    limit: int = Query(500, ge=1, le=5000),
+    fields: List[str] = Depends(donor_fields),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Donors created, updated or deleted since ``since``; poll again with ``next_token``."""
+    service = DonorSyncService(session)
+    try:
+        return service.changes(since, fields, limit)
+    except InvalidSyncToken:
+        raise HTTPException(status_code=400, detail="Invalid change token")
+
+
+@router.get("/export", responses=COLUMNAR_CONTENT)
+async def export_donors(
+    fields: List[str] = Depends(donor_fields),
+    format: str = Depends(export_format),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every donor with the selected fields as CSV, or as columnar blocks on request."""
+    service = DonorService(session)
+    rows = service.export_donor_fields(fields)
+    chunks = _csv_chunks(fields, rows) if format == "csv" else columnar_blocks(format, fields, rows)
+    
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{EXPORT_FILE_NAMES[format]}"',
+            "Vary": "Accept",
+        }
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=BatchDonorsResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_donors_batch(
+    request: BatchDonorsRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Get up to 500 donors by id in one round trip, in request order."""
+    service = DonorService(session)
+    donors, missing = service.get_donors_by_ids(request.ids)
+    
+    return BatchDonorsResponse(
+        donors=[_to_response(donor) for donor in donors],
+        missing=missing
+    )
+
+
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_donors(
+    request: BulkDeleteRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete donors by id or by segment, with their gifts, communications and tags, in one transaction."""
+    segment = {"status": request.status, "donor_type": request.donor_type, "tag_name": request.tag}
+    has_segment = any(value is not None for value in segment.values())
+    if (request.ids is None) == (not has_segment):
+        raise HTTPException(status_code=400, detail="Give either ids or segment filters")
+    
+    service = DonorDeletionService(session)
+    if request.ids is not None:
+        deleted = service.delete(request.ids, soft=request.soft, actor=current_user.username)
+    else:
+        deleted = service.delete_segment(**segment, soft=request.soft, actor=current_user.username)
+    
+    return BulkDeleteResponse(deleted=deleted)
+
+
+@router.get(
+    "/{donor_id}",
+    response_model=SparseDonorResponse,
+    response_model_exclude_unset=True,
+)
 async def get_donor(
     donor_id: int,
+    fields: List[str] = Depends(donor_fields),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get donor by ID."""
     service = DonorService(session)
-    donor = service.get_donor(donor_id)
+    donor = service.get_donor_fields(donor_id, fields)
     
     if not donor:
         raise HTTPException(status_code=404, detail="Donor not found")
     
-    return DonorResponse(
-        id=donor.id,
-        first_name=donor.first_name,
-        last_name=donor.last_name,
-        full_name=donor.full_name,
-        email=donor.email,
-        phone=donor.phone,
-        city=donor.city,
-        state=donor.state,
-        company=donor.company,
-        donor_status=donor.donor_status,
-        donor_type=donor.donor_type,
-        total_gifts=donor.total_gifts,
-        total_gift_count=donor.total_gift_count,
-        created_at=donor.created_at.isoformat()
-    )
+    return donor
 
 
 @router.put("/{donor_id}", response_model=DonorResponse)
@@ -234,30 +549,21 @@ async def update_donor(
 ):
     """Update donor information."""
     service = DonorService(session)
-    donor = service.update_donor(donor_id, donor_data.dict(exclude_unset=True))
+    donor = service.update_donor(
+        donor_id, donor_data.dict(exclude_unset=True), actor=current_user.username
+    )
     
     if not donor:
         raise HTTPException(status_code=404, detail="Donor not found")
     
-    return DonorResponse(
-        id=donor.id,
-        first_name=donor.first_name,
-        last_name=donor.last_name,
-        full_name=donor.full_name,
-        email=donor.email,
-        phone=donor.phone,
-        city=donor.city,
-        state=donor.state,
-        company=donor.company,
-        donor_status=donor.donor_status,
-        donor_type=donor.donor_type,
-        total_gifts=donor.total_gifts,
-        total_gift_count=donor.total_gift_count,
-        created_at=donor.created_at.isoformat()
-    )
+    return _to_response(donor)
 
 
-@router.get("/{donor_id}/duplicates", response_model=List[DonorResponse])
+@router.get(
+    "/{donor_id}/duplicates",
+    response_model=List[DonorResponse],
+    dependencies=[Depends(query_budget(4))],
+)
 async def find_potential_duplicates(
     donor_id: int,
     session: Session = Depends(get_session),
@@ -272,24 +578,50 @@ async def find_potential_duplicates(
     
     duplicates = service.find_potential_duplicates(donor)
     
-    return [
-        DonorResponse(
-            id=dup.id,
-            first_name=dup.first_name,
-            last_name=dup.last_name,
-            full_name=dup.full_name,
-            email=dup.email,
-            phone=dup.phone,
-            city=dup.city,
-            state=dup.state,
-            company=dup.company,
-            donor_status=dup.donor_status,
-            donor_type=dup.donor_type,
-            total_gifts=dup.total_gifts,
-            total_gift_count=dup.total_gift_count,
-            created_at=dup.created_at.isoformat()
-        ) for dup in duplicates
-    ]
+    return [_to_response(dup) for dup in duplicates]
+
+
+@router.get(
+    "/{donor_id}/history",
+    response_model=List[DonorHistoryEntry],
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_donor_history(
+    donor_id: int,
+    before_id: Optional[int] = Query(None, description="Return entries older than this entry id"),
+    limit: int = Query(50, ge=1, le=200),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Field-level change history of a donor, newest first; kept after deletes and merges."""
+    service = DonorService(session)
+    return service.get_history(donor_id, before_id, limit)
+
+
+@router.get(
+    "/{donor_id}/timeline",
+    response_model=DonorTimelineResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(query_budget(5))],
+)
+async def get_donor_timeline(
+    donor_id: int,
+    before: Optional[str] = Query(None, description="next_before from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Gifts and communications of a donor, newest first, including archived years."""
+    service = DonorTimelineService(session)
+    try:
+        timeline = service.timeline(donor_id, before, limit)
+    except InvalidTimelineToken:
+        raise HTTPException(status_code=400, detail="Invalid timeline token")
+    
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Donor not found")
+    
+    return timeline
 
 
 @router.post("/merge", response_model=DonorResponse)
@@ -299,31 +631,20 @@ async def merge_donors(
     current_user: User = Depends(get_current_user)
 ):
     """Merge two donor records."""
+    if request.primary_donor_id == request.duplicate_donor_id:
+        raise HTTPException(status_code=400, detail="Cannot merge a donor into itself")
+    
     service = DonorService(session)
     merged_donor = service.merge_donors(
         request.primary_donor_id, 
-        request.duplicate_donor_id
+        request.duplicate_donor_id,
+        actor=current_user.username
     )
     
     if not merged_donor:
         raise HTTPException(status_code=404, detail="One or both donors not found")
     
-    return DonorResponse(
-        id=merged_donor.id,
-        first_name=merged_donor.first_name,
-        last_name=merged_donor.last_name,
-        full_name=merged_donor.full_name,
-        email=merged_donor.email,
-        phone=merged_donor.phone,
-        city=merged_donor.city,
-        state=merged_donor.state,
-        company=merged_donor.company,
-        donor_status=merged_donor.donor_status,
-        donor_type=merged_donor.donor_type,
-        total_gifts=merged_donor.total_gifts,
-        total_gift_count=merged_donor.total_gift_count,
-        created_at=merged_donor.created_at.isoformat()
-    )
+    return _to_response(merged_donor)
 
 
 @router.post("/{donor_id}/tags")
@@ -335,7 +656,7 @@ async def add_tag_to_donor(
 ):
     """Add a tag to a donor."""
     service = DonorService(session)
-    success = service.add_tag_to_donor(donor_id, request.tag_name)
+    success = service.add_tag_to_donor(donor_id, request.tag_name, actor=current_user.username)
     
     if not success:
         raise HTTPException(status_code=404, detail="Donor not found")
@@ -346,15 +667,13 @@ async def add_tag_to_donor(
 @router.delete("/{donor_id}")
 async def delete_donor(
     donor_id: int,
+    soft: Optional[bool] = Query(None, description="Soft delete; defaults to the DONOR_SOFT_DELETE setting"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a donor."""
+    """Delete a donor with its gifts, communications and tags."""
     service = DonorService(session)
-    donor = service.get_donor(donor_id)
-    
-    if not donor:
+    if not service.delete_donor(donor_id, actor=current_user.username, soft=soft):
         raise HTTPException(status_code=404, detail="Donor not found")
     
-    service.repository.delete(donor_id)
     return {"message": "Donor deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""Gift ingestion API endpoints and the live gift ticker."""
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlmodel import Session
+from starlette.background import BackgroundTask
+
+from api.config import get_settings
+from api.dependencies.auth import get_current_user
+from api.dependencies.database import get_session
+from api.services.donors.gift_feed import gift_feed, recent_gifts
+from api.services.donors.gift_service import INGEST_CHUNK_SIZE, GiftService
+from api.utils.broadcast import RECONNECT_MILLISECONDS, Subscription, SubscriptionClosed, server_sent_event
+from api.utils.query_tracker import allow_repeated_statements, query_budget
+from models.user import User
+
+
+MAX_BATCH_GIFTS = 5_000
+
+
+class GiftIngestItem(BaseModel):
+    """One gift from a payment processor webhook or settlement file."""
+    donor_id: int
+    amount: float = Field(..., gt=0)
+    gift_date: datetime
+    source: str = Field(..., min_length=1)
+    transaction_id: str = Field(..., min_length=1)
+    gift_type: str = "cash"
+    payment_method: Optional[str] = None
+    campaign_id: Optional[int] = None
+    designation: Optional[str] = "general"
+    fund_name: Optional[str] = None
+    check_number: Optional[str] = None
+    gift_status: str = "completed"
+    is_anonymous: bool = False
+    tax_deductible_amount: Optional[float] = None
+    notes: Optional[str] = None
+
+
+class GiftBatchRequest(BaseModel):
+    """Gifts to ingest; items are validated one by one."""
+    gifts: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_GIFTS)
+
+
+class GiftIngestResult(BaseModel):
+    """Outcome for one submitted gift."""
+    index: int
+    status: str  # created, duplicate, error
+    gift_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class GiftBatchResponse(BaseModel):
+    """Per-item outcomes plus totals."""
+    created: int
+    duplicates: int
+    errors: int
+    results: List[GiftIngestResult]
+
+
+class QueuedGift(BaseModel):
+    """A gift waiting for acknowledgement."""
+    gift_id: int
+    amount: float
+    gift_date: datetime
+    gift_type: str
+    designation: Optional[str]
+
+
+class QueuedDonor(BaseModel):
+    """A donor with gifts waiting for acknowledgement."""
+    donor_id: int
+    donor_name: Optional[str]
+    email: Optional[str]
+    preferred_contact_method: Optional[str]
+    total_amount: float
+    gifts: List[QueuedGift]
+
+
+class AcknowledgementQueueResponse(BaseModel):
+    """One page of the acknowledgement queue."""
+    donors: List[QueuedDonor]
+    next_after_donor_id: Optional[int]
+
+
+class AcknowledgeRequest(BaseModel):
+    """Gifts to acknowledge and how the donors were thanked."""
+    gift_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_GIFTS)
+    method: str = Field("letter", pattern="^(letter|email|phone|meeting)$")
+
+
+class AcknowledgeResponse(BaseModel):
+    """Outcome of a bulk acknowledgement."""
+    acknowledged: int
+    communications: int
+    skipped_gift_ids: List[int]
+
+
+# Router
+router = APIRouter(prefix="/gifts", tags=["gifts"])
+
+
+async def gift_events(
+    subscription: Subscription, recent: List[Dict[str, Any]], heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """Server-sent events: the recent gifts, then batches of new gifts as they commit.
+
+    Gifts already sent with the recent ones are not sent again. A
+    ``skipped`` event tells a downsampled client how many gifts it missed.
+    Idle streams get a comment line every ``heartbeat_seconds`` so proxies
+    keep them open.
+    """
+    sent = {gift["id"] for gift in recent}
+    async with subscription:
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+        if recent:
+            yield server_sent_event("gifts", recent)
+        while True:
+            try:
+                batch = await subscription.next(heartbeat_seconds)
+            except SubscriptionClosed:
+                return
+            skipped = subscription.take_skipped()
+            if skipped:
+                yield server_sent_event("skipped", {"gifts": skipped})
+            if batch is None:
+                yield ": keepalive\n\n"
+                continue
+            gifts = [gift for gift in batch if gift["id"] not in sent]
+            if gifts:
+                yield server_sent_event("gifts", gifts)
+
+
+@router.post(
+    "/batch",
+    response_model=GiftBatchResponse,
+    dependencies=[Depends(allow_repeated_statements(MAX_BATCH_GIFTS // INGEST_CHUNK_SIZE))],
+)
+async def ingest_gifts(
+    request: GiftBatchRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Ingest up to 5,000 gifts; resubmitting the same transactions is safe."""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(request.gifts)
+    valid_indexes: List[int] = []
+    valid_gifts: List[Dict[str, Any]] = []
+    
+    for index, raw in enumerate(request.gifts):
+        try:
+            gift = GiftIngestItem.model_validate(raw)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            results[index] = {"status": "error", "detail": f"{location}: {error['msg']}"}
+            continue
+        valid_indexes.append(index)
+        valid_gifts.append(gift.model_dump())
+    
+    service = GiftService(session)
+    for index, outcome in zip(valid_indexes, service.ingest_gifts(valid_gifts)):
+        results[index] = outcome
+    
+    statuses = [result["status"] for result in results]
+    return GiftBatchResponse(
+        created=statuses.count("created"),
+        duplicates=statuses.count("duplicate"),
+        errors=statuses.count("error"),
+        results=[GiftIngestResult(index=index, **result) for index, result in enumerate(results)]
+    )
+
+
+@router.get(
+    "/acknowledgements",
+    response_model=AcknowledgementQueueResponse,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_acknowledgement_queue(
+    after_donor_id: Optional[int] = Query(None, description="Last donor id of the previous page"),
+    limit: int = Query(50, ge=1, le=500, description="Donors per page"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Completed gifts not yet acknowledged, grouped by donor."""
+    service = GiftService(session)
+    return service.acknowledgement_queue(after_donor_id=after_donor_id, limit=limit)
+
+
+@router.post("/acknowledgements", response_model=AcknowledgeResponse)
+async def acknowledge_gifts(
+    request: AcknowledgeRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Acknowledge gifts in bulk and log a communication for each donor."""
+    service = GiftService(session)
+    return service.acknowledge_gifts(request.gift_ids, current_user.username, request.method)
+
+
+@router.get("/live")
+async def stream_new_gifts(
+    recent: int = Query(20, ge=0, le=200, description="Newest gifts to send first"),
+    slow: str = Query(
+        "skip", pattern="^(skip|drop)$",
+        description="For a client that falls behind: skip its oldest batches, or disconnect it",
+    ),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Server-sent ``gifts`` events for live tickers: recent gifts first, then each new batch.
+
+    Every ticker in a worker is fed by the same poll of new gifts, so the
+    database load does not grow with the number of screens.
+    """
+    subscription = await gift_feed(session.get_bind()).subscribe(slow)
+    try:
+        gifts = recent_gifts(session, recent) if recent else []
+    except Exception:
+        subscription.close()
+        raise
+    # The stream outlives the request's transaction; give the connection back now
+    session.close()
+
+    return StreamingResponse(
+        gift_events(subscription, gifts, get_settings().stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs when the client leaves before the first event
+        background=BackgroundTask(subscription.close),
+    )
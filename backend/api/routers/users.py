@@ -1,17 +1,22 @@
 """Users router."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, EmailStr
+from sqlmodel import Session
 from api.dependencies.auth import get_current_user, get_optional_current_user
+from api.dependencies.database import get_session
+from api.services.users.user_service import UserService
 from api.utils.logger import get_logger
+from api.utils.security import PasswordHashingBusy
+from models.user import User
 
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
-class User(BaseModel):
-    """User model."""
+class UserResponse(BaseModel):
+    """User response model."""
     id: int
     username: str
     email: EmailStr
@@ -27,115 +32,137 @@ class UserCreate(BaseModel):
 
 class UserUpdate(BaseModel):
     """User update model."""
-    username: str = None
-    email: EmailStr = None
-    is_active: bool = None
-
-
-# Mock data - in a real app, this would be from a database
-MOCK_USERS = [
-    User(id=1, username="admin", email="admin@example.com"),
-    User(id=2, username="user1", email="user1@example.com"),
-]
+    username: Optional[str] = None
+    email: Optional[EmailStr] = None
+    is_active: Optional[bool] = None
+
+
+def _to_response(user: User) -> UserResponse:
+    """Build the response model from a user row."""
+    return UserResponse(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        is_active=user.is_active
+    )
 
 
-@router.get("/", response_model=List[User])
-async def get_users(current_user: dict = Depends(get_optional_current_user)):
+@router.get("/", response_model=List[UserResponse])
+async def get_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    session: Session = Depends(get_session),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
     """Get all users."""
     logger.info("Fetching all users")
-    return MOCK_USERS
+    service = UserService(session)
+    return [_to_response(user) for user in service.list_users(skip=skip, limit=limit)]
 
 
-@router.get("/me", response_model=User)
-async def get_current_user_info(current_user: dict = Depends(get_current_user)):
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information."""
-    logger.info(f"Fetching current user info for user: {current_user['username']}")
-    return User(
-        id=current_user["id"],
-        username=current_user["username"],
-        email=current_user["email"]
-    )
+    logger.info(f"Fetching current user info for user: {current_user.username}")
+    return _to_response(current_user)
 
 
-@router.get("/{user_id}", response_model=User)
-async def get_user(user_id: int, current_user: dict = Depends(get_current_user)):
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(
+    user_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
     """Get user by ID."""
     logger.info(f"Fetching user with ID: {user_id}")
-    
-    user = next((u for u in MOCK_USERS if u.id == user_id), None)
+
+    user = UserService(session).get_user(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    return user
+
+    return _to_response(user)
 
 
-@router.post("/", response_model=User)
+@router.post("/", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    current_user: dict = Depends(get_current_user)
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
 ):
     """Create a new user."""
     logger.info(f"Creating new user: {user_data.username}")
-    
-    # Check if user already exists
-    if any(u.email == user_data.email for u in MOCK_USERS):
+
+    try:
+        user = await UserService(session).create_user(
+            username=user_data.username,
+            email=user_data.email,
+            password=user_data.password
+        )
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
+            detail="Email or username already registered"
         )
-    
-    # Create new user
-    new_user = User(
-        id=len(MOCK_USERS) + 1,
-        username=user_data.username,
-        email=user_data.email
-    )
-    MOCK_USERS.append(new_user)
-    
-    return new_user
 
+    return _to_response(user)
 
-@router.put("/{user_id}", response_model=User)
+
+@router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    current_user: dict = Depends(get_current_user)
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
 ):
     """Update user by ID."""
     logger.info(f"Updating user with ID: {user_id}")
-    
-    user = next((u for u in MOCK_USERS if u.id == user_id), None)
+
+    service = UserService(session)
+    update_data = user_data.model_dump(exclude_unset=True)
+
+    if "email" in update_data or "username" in update_data:
+        existing = service.repository.find_by_email_or_username(
+            update_data.get("email", ""), update_data.get("username", "")
+        )
+        if existing and existing.id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email or username already registered"
+            )
+
+    user = service.update_user(user_id, update_data)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    # Update user fields
-    update_data = user_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(user, field, value)
-    
-    return user
+
+    return _to_response(user)
 
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
-    current_user: dict = Depends(get_current_user)
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
 ):
     """Delete user by ID."""
     logger.info(f"Deleting user with ID: {user_id}")
-    
-    user = next((u for u in MOCK_USERS if u.id == user_id), None)
-    if not user:
+
+    if not UserService(session).delete_user(user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    MOCK_USERS.remove(user)
-    return {"message": "User deleted successfully"}
\ No newline at end of file
+
+    return {"message": "User deleted successfully"}
@@ -1,4 +1,22 @@
 """Donor service modules."""
 from .donor_service import DonorService
+from .autocomplete_service import AutocompleteService
+from .count_service import DonorCountService
+from .deletion_service import DonorDeletionService
+from .geography_service import GeographyService
+from .gift_service import GiftService
+from .receipt_service import ReceiptService
+from .statement_service import StatementService
+from .sync_service import DonorSyncService
+from .archive_service import ArchiveService
+from .timeline_service import DonorTimelineService
+from .analytics_service import GiftAnalyticsService
+from .analytics_snapshot import AnalyticsSnapshotService
+from .campaign_service import CampaignService
 
-__all__ = ["DonorService"]
\ No newline at end of file
+__all__ = [
+    "DonorService", "AutocompleteService", "DonorCountService", "DonorDeletionService",
+    "GeographyService", "GiftService", "ReceiptService", "StatementService", "DonorSyncService",
+    "ArchiveService", "DonorTimelineService", "GiftAnalyticsService", "AnalyticsSnapshotService",
+    "CampaignService",
+]
\ No newline at end of file
@@ -0,0 +1,456 @@
+"""Columnar analytics snapshot of gifts and donor dimensions.
+
+Reports read gifts from memory-mapped column files instead of the
+database. A refresh appends the gifts added since its id watermark,
+including gifts archived since the previous refresh and gifts committed
+behind the watermark since, then applies donor
+changes, merges and deletes from the delta sync feed. Needs numpy, which
+is imported on first use so the API runs without it.
+
+Usage::
+    
+    python -m api.services.donors.analytics_snapshot --path /var/lib/fsh/analytics
+"""
+import argparse
+import fcntl
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlmodel import Session
+from api.config import get_settings
+from api.services.donors.sync_service import DonorSyncService
+from api.utils.logger import get_logger
+from repositories.donors.archive_repository import ArchiveRepository
+from repositories.donors.gift_repository import GiftRepository
+
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# How long an id skipped by the watermark is looked for again, and how many at most
+GAP_SECONDS = 3_600.0
+MAX_GAPS = 1_000
+
+# One row per gift, in the order gifts were added; categories are int16
+# codes into the manifest's labels, where code 0 is None
+GIFT_COLUMNS = {
+    "id": "<i8",
+    "donor_id": "<i8",
+    "amount": "<f8",
+    "gift_date": "<M8[s]",
+    "gift_status": "<i2",
+    "gift_type": "<i2",
+    "designation": "<i2",
+    "campaign_id": "<i8",  # 0 when the gift has no campaign
+}
+
+# One row per donor id; ids with no live donor have live 0
+DONOR_COLUMNS = {
+    "state": "<i2",
+    "donor_status": "<i2",
+    "donor_type": "<i2",
+    "live": "u1",
+}
+
+# Donor columns and the donor fields they are read from
+DONOR_FIELDS = {"state": "state_key", "donor_status": "donor_status", "donor_type": "donor_type"}
+
+CATEGORY_COLUMNS = ("gift_status", "gift_type", "designation", "state", "donor_status", "donor_type")
+
+
+class SnapshotUnavailable(RuntimeError):
+    """Raised when there is no snapshot to read or numpy is not installed."""
+
+
+def require_numpy():
+    """The numpy module, imported on first use."""
+    try:
+        import numpy
+    except ImportError:
+        raise SnapshotUnavailable("numpy is not installed")
+    return numpy
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path / MANIFEST) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return None
+    if manifest["format"] != FORMAT_VERSION:
+        raise SnapshotUnavailable(f"Snapshot at {path} has format {manifest['format']}; rebuild it")
+    return manifest
+
+
+def _empty_manifest() -> Dict[str, Any]:
+    return {
+        "format": FORMAT_VERSION,
+        "gift_rows": 0,
+        "donor_rows": 0,
+        "gift_watermark": 0,
+        "gift_gaps": [],
+        "donor_token": None,
+        "refreshed_at": None,
+        "labels": {column: [None] for column in CATEGORY_COLUMNS},
+    }
+
+
+def _column_file(path: Path, table: str, column: str) -> Path:
+    return path / f"{table}.{column}.bin"
+
+
+def _map_columns(path: Path, table: str, columns: Dict[str, str], rows: int, mode: str):
+    """Memory-map the first ``rows`` rows of each column file."""
+    np = require_numpy()
+    return {
+        name: np.memmap(_column_file(path, table, name), dtype=dtype, mode=mode, shape=(rows,))
+        if rows else np.zeros(0, dtype=dtype)
+        for name, dtype in columns.items()
+    }
+
+
+class AnalyticsSnapshot:
+    """A published snapshot's columns, mapped read-only.
+    
+    Row counts come from the manifest, so rows a refresh is still
+    appending stay out of view until it publishes the next manifest.
+    """
+    
+    def __init__(self, path: Path, stamp: Tuple[int, int] = (0, 0)):
+        manifest = _read_manifest(path)
+        if manifest is None:
+            raise SnapshotUnavailable(f"No analytics snapshot at {path}")
+        self.path = path
+        self.stamp = stamp
+        self.refreshed_at = datetime.fromisoformat(manifest["refreshed_at"])
+        self.labels: Dict[str, List[Optional[str]]] = manifest["labels"]
+        self.gifts = _map_columns(path, "gifts", GIFT_COLUMNS, manifest["gift_rows"], "r")
+        self.donors = _map_columns(path, "donors", DONOR_COLUMNS, manifest["donor_rows"], "r")
+
+
+_snapshot: Optional[AnalyticsSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def current_snapshot() -> AnalyticsSnapshot:
+    """The configured snapshot, mapped again whenever a refresh has published."""
+    global _snapshot
+    configured = get_settings().analytics_snapshot_path
+    if not configured:
+        raise SnapshotUnavailable("ANALYTICS_SNAPSHOT_PATH is not set")
+    path = Path(configured)
+    try:
+        status = os.stat(path / MANIFEST)
+    except FileNotFoundError:
+        raise SnapshotUnavailable(f"No analytics snapshot at {path}")
+    # Publishing replaces the manifest, which gives it a new inode
+    stamp = (status.st_ino, status.st_mtime_ns)
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.path != path or _snapshot.stamp != stamp:
+            _snapshot = AnalyticsSnapshot(path, stamp)
+        return _snapshot
+
+
+class SnapshotWriter:
+    """Appends and updates a snapshot's column files; ``publish`` makes it visible.
+    
+    Bytes left past the manifest's row counts by an interrupted refresh are
+    cut off on open. Updates to existing rows are idempotent, so a refresh
+    that stops before publishing is simply repeated by the next one.
+    """
+    
+    def __init__(self, path: Path):
+        self.np = require_numpy()
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        self.manifest = _read_manifest(path) or _empty_manifest()
+        self._codes = {
+            column: {label: code for code, label in enumerate(labels)}
+            for column, labels in self.manifest["labels"].items()
+        }
+        for table, columns, rows in (
+            ("gifts", GIFT_COLUMNS, self.manifest["gift_rows"]),
+            ("donors", DONOR_COLUMNS, self.manifest["donor_rows"]),
+        ):
+            for name, dtype in columns.items():
+                with open(_column_file(path, table, name), "ab") as file:
+                    file.truncate(rows * self.np.dtype(dtype).itemsize)
+    
+    def append_gifts(self, rows: List[Dict[str, Any]]) -> None:
+        """Add gifts at the end of the gift columns."""
+        if not rows:
+            return
+        values = {
+            "id": [row["id"] for row in rows],
+            "donor_id": [row["donor_id"] for row in rows],
+            "amount": [row["amount"] for row in rows],
+            "gift_date": [row["gift_date"] for row in rows],
+            "campaign_id": [row["campaign_id"] or 0 for row in rows],
+        }
+        for name in ("gift_status", "gift_type", "designation"):
+            values[name] = [self._code(name, row[name]) for row in rows]
+        for name, dtype in GIFT_COLUMNS.items():
+            with open(_column_file(self.path, "gifts", name), "ab") as file:
+                file.write(self.np.asarray(values[name], dtype=dtype).tobytes())
+        self.manifest["gift_rows"] += len(rows)
+        self._grow_donors(max(values["donor_id"]) + 1)
+    
+    def unseen_gifts(
+        self, rows: List[Dict[str, Any]], first_row: int, end_row: int
+    ) -> List[Dict[str, Any]]:
+        """Rows whose ids are not in gift rows ``first_row`` to ``end_row``, which must be in id order."""
+        np = self.np
+        appended = self._gifts("r")["id"][first_row:end_row]
+        if not rows or not len(appended):
+            return rows
+        ids = np.array([row["id"] for row in rows], dtype="<i8")
+        positions = np.minimum(np.searchsorted(appended, ids), len(appended) - 1)
+        seen = appended[positions] == ids
+        return [row for row, known in zip(rows, seen) if not known]
+    
+    def unseen_ids(self, ids: List[int], first_row: int) -> List[int]:
+        """The ids not among gift rows ``first_row`` onwards, in any order."""
+        np = self.np
+        appended = self._gifts("r")["id"][first_row:]
+        ids = np.array(ids, dtype="<i8")
+        return ids[~np.isin(ids, appended)].tolist()
+    
+    def update_donors(self, rows: List[Dict[str, Any]]) -> None:
+        """Write the dimension columns of donors created or changed."""
+        if not rows:
+            return
+        ids = self.np.array([row["id"] for row in rows], dtype="<i8")
+        self._grow_donors(int(ids.max()) + 1)
+        donors = self._donors("r+")
+        for name, field in DONOR_FIELDS.items():
+            donors[name][ids] = [self._code(name, row[field]) for row in rows]
+        donors["live"][ids] = 1
+        _flush(donors)
+    
+    def remove_donors(self, tombstones: List[Dict[str, Any]]) -> None:
+        """Merged donors' gifts move to the surviving donor; deleted donors stop counting."""
+        if not tombstones:
+            return
+        np = self.np
+        merged = {row["donor_id"]: row["merged_into_id"] for row in tombstones if row["merged_into_id"]}
+        if merged and self.manifest["gift_rows"]:
+            sources = np.array(sorted(merged), dtype="<i8")
+            targets = np.array([_survivor(merged, donor_id) for donor_id in sources], dtype="<i8")
+            gifts = self._gifts("r+")
+            donor_ids = gifts["donor_id"]
+            positions = np.minimum(np.searchsorted(sources, donor_ids), len(sources) - 1)
+            moved = sources[positions] == donor_ids
+            donor_ids[moved] = targets[positions[moved]]
+            _flush(gifts)
+        ids = np.array([row["donor_id"] for row in tombstones], dtype="<i8")
+        donors = self._donors("r+")
+        donors["live"][ids[ids < self.manifest["donor_rows"]]] = 0
+        _flush(donors)
+    
+    def publish(
+        self, gift_watermark: int, gift_gaps: Dict[int, datetime], donor_token: Optional[str],
+        refreshed_at: datetime,
+    ) -> None:
+        """Atomically replace the manifest, making every change so far visible."""
+        self.manifest.update(
+            gift_watermark=gift_watermark,
+            gift_gaps=[[gift_id, since.isoformat()] for gift_id, since in sorted(gift_gaps.items())],
+            donor_token=donor_token,
+            refreshed_at=refreshed_at.isoformat(),
+        )
+        staged = self.path / f"{MANIFEST}.tmp"
+        with open(staged, "w") as file:
+            json.dump(self.manifest, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(staged, self.path / MANIFEST)
+    
+    def _code(self, column: str, label: Optional[str]) -> int:
+        codes = self._codes[column]
+        if label not in codes:
+            codes[label] = len(codes)
+            self.manifest["labels"][column].append(label)
+        return codes[label]
+    
+    def _grow_donors(self, rows: int) -> None:
+        """Extend the donor columns with zeroed rows up to ``rows``."""
+        if rows <= self.manifest["donor_rows"]:
+            return
+        for name, dtype in DONOR_COLUMNS.items():
+            with open(_column_file(self.path, "donors", name), "ab") as file:
+                file.truncate(rows * self.np.dtype(dtype).itemsize)
+        self.manifest["donor_rows"] = rows
+    
+    def _gifts(self, mode: str):
+        return _map_columns(self.path, "gifts", GIFT_COLUMNS, self.manifest["gift_rows"], mode)
+    
+    def _donors(self, mode: str):
+        return _map_columns(self.path, "donors", DONOR_COLUMNS, self.manifest["donor_rows"], mode)
+
+
+def _survivor(merged: Dict[int, int], donor_id: int) -> int:
+    """The donor a merged donor ended up in, following merges of merged donors."""
+    while donor_id in merged:
+        donor_id = merged[donor_id]
+    return donor_id
+
+
+def _flush(columns) -> None:
+    for column in columns.values():
+        if hasattr(column, "flush"):
+            column.flush()
+
+
+@contextmanager
+def _refresh_lock(path: Path) -> Iterator[None]:
+    """Serialize refreshes of one snapshot, across processes."""
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / ".refresh.lock", "w") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class AnalyticsSnapshotService:
+    """Brings a snapshot up to date with the database, reading only what changed.
+    
+    Gifts are read after the id watermark from the gifts table and from
+    archive chunks written since the last refresh, hot rows first so a
+    gift archived in between is found in one or the other; ids seen in
+    both are appended once. Gift ids are handed out at insert time, not
+    commit time, so ids the watermark passed without seeing are kept in
+    the manifest and read again by each refresh for ``GAP_SECONDS``.
+    Donor dimensions, merges and deletes come from the delta sync feed
+    after the stored change token.
+    """
+    
+    def __init__(self, session: Session, path: Path):
+        self.session = session
+        self.path = Path(path)
+        self.gifts = GiftRepository(session)
+        self.archive = ArchiveRepository(session)
+        self.sync = DonorSyncService(session)
+    
+    def refresh(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Apply changes since the last refresh and publish; returns counts of what changed."""
+        batch_size = batch_size or get_settings().analytics_refresh_batch_size
+        with _refresh_lock(self.path):
+            writer = SnapshotWriter(self.path)
+            started = datetime.utcnow()
+            watermark = writer.manifest["gift_watermark"]
+            first_row = writer.manifest["gift_rows"]
+            gaps = {
+                gift_id: datetime.fromisoformat(since)
+                for gift_id, since in writer.manifest.get("gift_gaps", [])
+            }
+            
+            # Gaps are all below the watermark, so hot rows stay in id order
+            writer.append_gifts(self.gifts.snapshot_rows_by_id(sorted(gaps)))
+            position = watermark
+            while True:
+                rows = self.gifts.snapshot_rows(position, batch_size)
+                writer.append_gifts(rows)
+                if rows:
+                    position = rows[-1]["id"]
+                if len(rows) < batch_size:
+                    break
+            hot_rows = writer.manifest["gift_rows"] - first_row
+            
+            last_refresh = writer.manifest["refreshed_at"]
+            archived = 0
+            pending: List[Dict[str, Any]] = []
+            chunks = self.archive.chunks_since(
+                "gifts", datetime.fromisoformat(last_refresh) if last_refresh else None
+            )
+            for _, rows in chunks:
+                pending += [row for row in rows if row["id"] > watermark or row["id"] in gaps]
+                if len(pending) >= batch_size:
+                    archived += self._append_archived(writer, pending, first_row, hot_rows)
+                    position = max(position, max(row["id"] for row in pending))
+                    pending = []
+            if pending:
+                archived += self._append_archived(writer, pending, first_row, hot_rows)
+                position = max(position, max(row["id"] for row in pending))
+            gaps = self._missing_ids(writer, gaps, first_row, watermark, position, started)
+            
+            token = writer.manifest["donor_token"]
+            donors = removed = 0
+            while True:
+                page = self.sync.changes(token, ["id", *DONOR_FIELDS.values()], batch_size)
+                writer.update_donors(page["donors"])
+                writer.remove_donors([
+                    {"donor_id": row["id"], "merged_into_id": row["merged_into_id"]}
+                    for row in page["deleted"]
+                ])
+                donors += len(page["donors"])
+                removed += len(page["deleted"])
+                token = page["next_token"]
+                if not page["has_more"]:
+                    break
+            
+            writer.publish(position, gaps, token, started)
+        
+        counts = {"gifts": hot_rows + archived, "donors": donors, "removed": removed}
+        logger.info(f"Refreshed analytics snapshot at {self.path}: {counts}")
+        return counts
+    
+    def _append_archived(
+        self, writer: SnapshotWriter, rows: List[Dict[str, Any]], first_row: int, hot_rows: int
+    ) -> int:
+        """Append archived gifts not already appended from the gifts table in this refresh."""
+        rows = writer.unseen_gifts(rows, first_row, first_row + hot_rows)
+        writer.append_gifts(rows)
+        return len(rows)
+    
+    def _missing_ids(
+        self, writer: SnapshotWriter, gaps: Dict[int, datetime], first_row: int,
+        watermark: int, position: int, now: datetime,
+    ) -> Dict[int, datetime]:
+        """Earlier gaps still not found and ids the watermark passed in this refresh, with when first missed.
+        
+        Gaps that never filled (rolled back or deleted gifts) are dropped
+        after ``GAP_SECONDS``, lowest ids first past ``MAX_GAPS``.
+        """
+        passed = range(max(watermark, position - MAX_GAPS) + 1, position)
+        missing = {
+            gift_id: gaps.get(gift_id, now)
+            for gift_id in writer.unseen_ids([*gaps, *passed], first_row)
+        }
+        missing = {
+            gift_id: since for gift_id, since in missing.items()
+            if (now - since).total_seconds() <= GAP_SECONDS
+        }
+        for gift_id in sorted(missing)[:max(len(missing) - MAX_GAPS, 0)]:
+            del missing[gift_id]
+        return missing
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from api.dependencies.database import get_engine
+    
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Refresh the columnar analytics snapshot.")
+    parser.add_argument("--path", default=settings.analytics_snapshot_path)
+    parser.add_argument("--batch-size", type=int, default=settings.analytics_refresh_batch_size)
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("--path or ANALYTICS_SNAPSHOT_PATH is required")
+    
+    with Session(get_engine()) as session:
+        counts = AnalyticsSnapshotService(session, Path(args.path)).refresh(args.batch_size)
+    print(f"Added {counts['gifts']} gifts, updated {counts['donors']} donors, removed {counts['removed']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
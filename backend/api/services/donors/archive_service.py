@@ -0,0 +1,91 @@
+"""Hot/cold tiering: old gifts and communications move to compressed archive chunks.
+
+Usage::
+    
+    python -m api.services.donors.archive_service --keep-years 7
+"""
+import argparse
+import sys
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import Session
+from api.config import get_settings
+from api.utils.logger import get_logger
+from repositories.donors.archive_repository import ARCHIVED_TABLES, ArchiveRepository
+
+
+logger = get_logger(__name__)
+
+
+def archive_cutoff(keep_years: int, today: Optional[date] = None) -> datetime:
+    """Start of the oldest calendar year that stays hot."""
+    return datetime((today or date.today()).year - keep_years, 1, 1)
+
+
+class ArchiveService:
+    """Moves gifts and communications dated before a cutoff into archive chunks.
+    
+    A chunk holds one donor's rows of one table for one calendar year,
+    compressed column by column. Each batch copies up to ``batch_size``
+    rows into their chunks and deletes them from the hot table in one
+    transaction, so an interrupted run loses nothing and the next run
+    carries on with the rows still hot. Gifts awaiting a receipt or an
+    acknowledgement and communications with an open follow-up stay hot
+    until that work is done. Donor aggregates are left alone; they
+    already include the archived gifts.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = ArchiveRepository(session)
+    
+    def archive(self, before: datetime, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Archive every closed row dated before ``before``; returns rows moved per table."""
+        batch_size = batch_size or get_settings().archive_batch_size
+        return {
+            table_name: self._archive_table(table_name, before, batch_size)
+            for table_name in ARCHIVED_TABLES
+        }
+    
+    def _archive_table(self, table_name: str, before: datetime, batch_size: int) -> int:
+        date_column = ARCHIVED_TABLES[table_name][1]
+        position: Optional[Tuple[datetime, int]] = None
+        moved = 0
+        while True:
+            rows = self.repository.archivable(table_name, before, position, batch_size)
+            if not rows:
+                break
+            self.repository.archive_rows(table_name, rows)
+            self.session.commit()
+            moved += len(rows)
+            position = (rows[-1][date_column], rows[-1]["id"])
+            if len(rows) < batch_size:
+                break
+        
+        if moved:
+            logger.info(f"Archived {moved} {table_name} dated before {before:%Y-%m-%d}")
+        return moved
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from api.dependencies.database import get_engine
+    
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Move old gifts and communications to the archive.")
+    parser.add_argument(
+        "--keep-years", type=int, default=settings.archive_keep_years,
+        help="full calendar years kept hot before the current one"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    args = parser.parse_args(argv)
+    
+    before = archive_cutoff(args.keep_years)
+    with Session(get_engine()) as session:
+        moved = ArchiveService(session).archive(before, args.batch_size)
+    print(", ".join(f"Archived {count} {table_name}" for table_name, count in moved.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Field-level donor audit trail written off the request path.
+
+Services compute before/after diffs once their change is committed and
+hand the rows to ``record``. A single background thread drains the
+bounded queue and stores each batch with one executemany INSERT, so a
+donor write pays for a queue put instead of an extra round trip.
+"""
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from api.config import get_settings
+from api.utils.logger import get_logger
+from models.donors.donor_audit import DonorAuditEntry
+
+
+logger = get_logger(__name__)
+
+# Derived and bookkeeping columns never appear in diffs
+UNAUDITED_FIELDS = frozenset({
+    "id", "created_at", "updated_at", "name_key", "email_key", "phone_key", "company_key",
+    "state_key", "city_key", "postal_key", "change_seq",
+})
+
+_FLUSH = object()
+_STOP = object()
+
+
+def snapshot(donor: Any) -> Dict[str, Any]:
+    """Audited field values of a donor or of a donors row mapping."""
+    values = donor if isinstance(donor, dict) else donor.model_dump()
+    return {key: value for key, value in values.items() if key not in UNAUDITED_FIELDS}
+
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Fields whose value changed, as field -> [before, after]."""
+    return {
+        key: [before.get(key), after.get(key)]
+        for key in sorted(set(before) | set(after))
+        if before.get(key) != after.get(key)
+    }
+
+
+def entry(
+    donor_id: int, action: str, changes: Dict[str, List[Any]], actor: Optional[str] = None
+) -> Dict[str, Any]:
+    """One audit row, stamped with the time of the change."""
+    return {
+        "donor_id": donor_id,
+        "action": action,
+        "actor": actor,
+        "changes": json.dumps(changes, default=str, sort_keys=True),
+        "created_at": datetime.utcnow(),
+    }
+
+
+class AuditLogWriter:
+    """Bounded queue of audit rows drained by one daemon thread.
+
+    The thread waits up to ``flush_interval`` for a batch to fill, then
+    inserts it. In durable mode a full queue makes each ``submit`` wait up
+    to ``enqueue_timeout`` in all for space, however many rows it carries,
+    and ``shutdown`` writes everything still queued; otherwise a full queue
+    drops rows and shutdown discards them.
+    Dropped and failed rows are counted and logged.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        durable: bool = True,
+        enqueue_timeout: float = 1.0
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durable = durable
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, bind: Engine, rows: Iterable[Dict[str, Any]]) -> None:
+        """Queue rows for ``bind``'s database without waiting for the write."""
+        self._ensure_started()
+        # One deadline for the whole call, so a bulk change waits no longer than a single row
+        deadline = time.monotonic() + self.enqueue_timeout
+        dropped = []
+        for row in rows:
+            try:
+                if self.durable:
+                    self._queue.put((bind, row), timeout=max(deadline - time.monotonic(), 0.0))
+                else:
+                    self._queue.put_nowait((bind, row))
+            except queue.Full:
+                dropped.append(row["donor_id"])
+        if dropped:
+            self.dropped += len(dropped)
+            logger.warning(f"Audit queue full; dropped {len(dropped)} entries for donors {dropped[:10]}")
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        """Stop the thread, writing queued rows first in durable mode."""
+        if self._thread is None:
+            return
+        if not self.durable:
+            discarded = self._discard_pending()
+            if discarded:
+                logger.warning(f"Discarded {discarded} queued audit entries at shutdown")
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="donor-audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _discard_pending(self) -> int:
+        discarded = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return discarded
+            self._queue.task_done()
+            discarded += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[Engine, Dict[str, Any]]] = []
+            markers = 0
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                if item is _FLUSH or item is _STOP:
+                    markers += 1
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+
+    def _write(self, batch: List[Tuple[Engine, Dict[str, Any]]]) -> None:
+        """Insert a batch with one executemany per database."""
+        by_bind: Dict[Engine, List[Dict[str, Any]]] = defaultdict(list)
+        for bind, row in batch:
+            by_bind[bind].append(row)
+        table = DonorAuditEntry.__table__
+        for bind, rows in by_bind.items():
+            try:
+                with bind.begin() as connection:
+                    connection.execute(table.insert(), rows)
+                self.written += len(rows)
+            except Exception:
+                self.failed += len(rows)
+                logger.exception(f"Failed to write {len(rows)} audit entries")
+
+
+_writer: Optional[AuditLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def audit_log_writer() -> AuditLogWriter:
+    """The process-wide writer, created from settings on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                settings = get_settings()
+                _writer = AuditLogWriter(
+                    max_queue=settings.audit_queue_size,
+                    batch_size=settings.audit_batch_size,
+                    flush_interval=settings.audit_flush_interval_seconds,
+                    durable=settings.audit_durable,
+                    enqueue_timeout=settings.audit_enqueue_timeout_seconds,
+                )
+    return _writer
+
+
+def record(bind: Engine, rows: Iterable[Dict[str, Any]]) -> None:
+    """Queue audit rows for asynchronous storage."""
+    rows = list(rows)
+    if rows and get_settings().audit_log_enabled:
+        audit_log_writer().submit(bind, rows)
+
+
+def flush_audit_log() -> None:
+    """Wait for every queued audit row to be written."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def shutdown_audit_writer() -> None:
+    """Stop the background writer; durable mode writes what is still queued."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.shutdown()
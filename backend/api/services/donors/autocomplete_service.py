@@ -0,0 +1,131 @@
+"""Donor autocomplete over normalized name, company and email prefixes."""
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, attributes
+from sqlmodel import Session
+
+from api.config import get_settings
+from api.utils import invalidation
+from api.utils.normalization import normalize_email, normalize_name
+from api.utils.cache import TTLCache
+from models.donors.donor import Donor
+from repositories.donors.donor_repository import DonorRepository
+
+
+_settings = get_settings()
+
+SUGGESTION_FIELDS = ["id", "full_name", "email", "company", "total_gifts"]
+
+# Donor attributes whose change can alter someone's suggestions
+PREFIX_KEYS = ("name_key", "email_key", "company_key")
+RANKING_KEYS = ("total_gifts",)
+
+# Invalidation key covering every cached suggestion
+ALL_SUGGESTIONS = ("autocomplete", "*")
+
+# (name prefix, email prefix, limit) -> suggestions, for short prefixes only
+_prefix_cache: TTLCache[Tuple[str, str, int], List[Dict[str, Any]]] = TTLCache(
+    maxsize=_settings.autocomplete_cache_size, ttl=_settings.autocomplete_cache_ttl_seconds
+)
+
+
+class AutocompleteService:
+    """Type-ahead suggestions for donor pickers.
+    
+    Short prefixes match the most donors and are typed most often, so
+    their results are cached until a committed donor write in any worker
+    touches a matching key. Longer prefixes are selective enough to read
+    directly.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = DonorRepository(session)
+    
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top donors by total giving whose name, company or email starts with ``query``."""
+        name_prefix = normalize_name(query)
+        email_prefix = normalize_email(query)
+        if not name_prefix and not email_prefix:
+            return []
+        
+        cached_length = _settings.autocomplete_cached_prefix_length
+        cacheable = len(name_prefix) <= cached_length and len(email_prefix) <= cached_length
+        cache_key = (name_prefix, email_prefix, limit)
+        if cacheable:
+            version = invalidation.versions(
+                ALL_SUGGESTIONS, _prefix_key(name_prefix), _prefix_key(email_prefix)
+            )
+            cached = _prefix_cache.get(cache_key, version=version)
+            if cached is not None:
+                return cached
+        
+        suggestions = self.repository.top_by_prefix(
+            name_prefix, email_prefix, SUGGESTION_FIELDS, limit
+        )
+        if cacheable:
+            _prefix_cache.set(cache_key, suggestions, version=version)
+        return suggestions
+
+
+def _prefix_key(prefix: str) -> Tuple[str, str]:
+    return ("autocomplete", prefix)
+
+
+def _prefix_keys(keys: Iterable[str]) -> set:
+    """Invalidation keys of every cacheable prefix of the given donor keys."""
+    cached_length = _settings.autocomplete_cached_prefix_length
+    return {
+        _prefix_key(key[:length])
+        for key in keys if key
+        for length in range(min(len(key), cached_length) + 1)
+    }
+
+
+def invalidate_keys(keys: Iterable[str]) -> None:
+    """Drop cached suggestions in every worker for every prefix of the given donor keys."""
+    invalidation.bump(_prefix_keys(keys))
+
+
+def invalidate_after_commit(session: OrmSession, keys: Iterable[str]) -> None:
+    """Drop suggestions for keys changed by a bulk write once ``session`` commits."""
+    invalidation.bump_after_commit(session, _prefix_keys(keys))
+
+
+def clear_autocomplete_cache() -> None:
+    """Drop every cached suggestion in every worker; bulk writes that bypass the ORM call this."""
+    _prefix_cache.clear()
+    invalidation.bump([ALL_SUGGESTIONS])
+
+
+def _changed_keys(donor: Donor, deleted: bool) -> set:
+    """Old and new prefix keys of a donor whose suggestions may have changed."""
+    state = attributes.instance_state(donor)
+    current = {getattr(donor, key) for key in PREFIX_KEYS}
+    if state.pending or deleted:
+        return current
+    
+    histories = [
+        state.get_history(key, attributes.PASSIVE_NO_INITIALIZE)
+        for key in PREFIX_KEYS + RANKING_KEYS
+    ]
+    if not any(history.has_changes() for history in histories):
+        return set()
+    previous = {value for history in histories[:len(PREFIX_KEYS)] for value in history.deleted}
+    return current | previous
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _collect_changed_keys(session, flush_context, instances) -> None:
+    """Expire suggestions for donors created, deleted or re-ranked once this transaction commits."""
+    changed = set()
+    for donor, deleted in chain(
+        ((obj, False) for obj in chain(session.new, session.dirty)),
+        ((obj, True) for obj in session.deleted),
+    ):
+        if isinstance(donor, Donor):
+            changed.update(_changed_keys(donor, deleted))
+    if changed:
+        invalidate_after_commit(session, changed)
@@ -0,0 +1,88 @@
+"""Campaign progress from the maintained running totals, and its live feed."""
+import sys
+from typing import Any, Dict, List, Optional
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from api.config import get_settings
+from api.utils.broadcast import PollingBroadcaster
+from repositories.donors.campaign_total_repository import CampaignTotalRepository
+
+
+# Changed campaigns read per poll
+FEED_BATCH_SIZE = 1_000
+
+
+def _empty(campaign_id: int) -> Dict[str, Any]:
+    return {
+        "campaign_id": campaign_id, "total_amount": 0.0, "gift_count": 0,
+        "donor_count": 0, "change_seq": 0,
+    }
+
+
+class CampaignService:
+    """Campaign progress read from ``campaign_totals``, one indexed read per request."""
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = CampaignTotalRepository(session)
+    
+    def totals(self, campaign_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Running totals of the given campaigns, or of every campaign with gifts.
+        
+        Requested campaigns without completed gifts are listed with zeros.
+        """
+        rows = self.repository.totals(campaign_ids)
+        if campaign_ids is None:
+            return rows
+        found = {row["campaign_id"]: row for row in rows}
+        return [found.get(campaign_id) or _empty(campaign_id) for campaign_id in sorted(set(campaign_ids))]
+
+
+class CampaignTotalsFeed(PollingBroadcaster):
+    """Pushes changed campaign totals to every subscribed stream of this process.
+    
+    Each poll reads the totals changed since the last one, in change
+    number order, and publishes them as one list; every stream filters
+    the campaigns it follows. Change numbers are taken under a row lock
+    held until commit, so a poll never sees a later change before an
+    earlier one.
+    """
+    
+    def __init__(self, engine: Engine, interval_seconds: float = 1.0, max_queued: int = 100):
+        super().__init__(interval_seconds, max_queued)
+        self.engine = engine
+        self.position = (0, 0)
+    
+    def start(self) -> None:
+        with Session(self.engine) as session:
+            self.position = (CampaignTotalRepository(session).latest_change_seq(), sys.maxsize)
+    
+    def poll(self) -> List[List[Dict[str, Any]]]:
+        with Session(self.engine) as session:
+            rows = CampaignTotalRepository(session).changed_since(self.position, FEED_BATCH_SIZE)
+        if not rows:
+            return []
+        self.position = (rows[-1]["change_seq"], rows[-1]["campaign_id"])
+        return [rows]
+
+
+_feed: Optional[CampaignTotalsFeed] = None
+
+
+def campaign_totals_feed(engine: Engine) -> CampaignTotalsFeed:
+    """The process-wide campaign totals feed for ``engine``."""
+    global _feed
+    if _feed is None or (_feed.engine is not engine and not _feed.subscriber_count):
+        settings = get_settings()
+        _feed = CampaignTotalsFeed(
+            engine, settings.stream_poll_interval_seconds, settings.stream_max_queued
+        )
+    return _feed
+
+
+def close_campaign_totals_feed() -> None:
+    """End every campaign totals stream; used at shutdown."""
+    global _feed
+    if _feed is not None:
+        _feed.close()
+        _feed = None
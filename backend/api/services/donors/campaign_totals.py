@@ -0,0 +1,154 @@
+"""Campaign running totals kept in step with gift and donor writes.
+
+Gift ingestion adds each batch's completed campaign gifts to
+``campaign_donors`` (one row per campaign and donor) and
+``campaign_totals`` in the same transaction, through
+``apply_campaign_deltas``. A campaign's donor count grows when a pair row
+is first created, so distinct donors are counted without re-reading any
+gifts. Donor deletes take the donor's pair rows back out of the totals;
+merges fold the duplicate's rows into the survivor's. Every write stamps
+the change number of its transaction on the totals it moved. Archiving
+does not change totals, and soft-deleted donors are not counted.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.engine import Connection
+
+from models.donors.campaign_total import CampaignDonor, CampaignTotal
+from repositories.base import dialect_insert
+
+
+# (campaign_id, donor_id) -> [total amount, gift count]
+CampaignDeltas = Dict[Tuple[int, int], List[float]]
+# campaign_id -> [total amount, gift count, donor count]
+CampaignTotals = Dict[int, List[float]]
+
+
+def campaign_deltas(gifts: Iterable[Dict[str, Any]]) -> CampaignDeltas:
+    """Completed campaign gifts summed per campaign and donor."""
+    deltas: CampaignDeltas = defaultdict(lambda: [0.0, 0])
+    for gift in gifts:
+        if gift.get("campaign_id") is None or gift.get("gift_status", "completed") != "completed":
+            continue
+        delta = deltas[(gift["campaign_id"], gift["donor_id"])]
+        delta[0] += gift["amount"]
+        delta[1] += 1
+    return deltas
+
+
+def apply_campaign_deltas(
+    connection: Connection,
+    deltas: CampaignDeltas,
+    change_seq: int,
+    totals: Optional[CampaignTotals] = None
+) -> None:
+    """Add per-donor giving to the pair rows and the campaign totals.
+    
+    ``totals`` carries campaign changes the caller already knows, such as
+    deleted pair rows, so every campaign is written once. Rows are written
+    in key order so concurrent batches lock shared rows in the same order.
+    """
+    now = datetime.utcnow()
+    totals = totals if totals is not None else _totals()
+    rows = [
+        {
+            "campaign_id": campaign_id, "donor_id": donor_id, "total_amount": amount,
+            "gift_count": count, "created_at": now,
+        }
+        for (campaign_id, donor_id), (amount, count) in sorted(deltas.items())
+        if count
+    ]
+    if rows:
+        pairs = CampaignDonor.__table__
+        statement = dialect_insert(connection, pairs)
+        statement = statement.on_conflict_do_update(
+            index_elements=["campaign_id", "donor_id"],
+            set_={
+                "total_amount": pairs.c.total_amount + statement.excluded.total_amount,
+                "gift_count": pairs.c.gift_count + statement.excluded.gift_count,
+                "updated_at": statement.excluded.created_at,
+            },
+        ).returning(pairs.c.campaign_id, pairs.c.donor_id, pairs.c.gift_count)
+        for campaign_id, donor_id, gift_count in connection.execute(statement, rows):
+            amount, count = deltas[(campaign_id, donor_id)]
+            total = totals[campaign_id]
+            total[0] += amount
+            total[1] += count
+            # Pair rows only exist with gifts, so a row holding just these is new
+            if gift_count == count:
+                total[2] += 1
+    _apply_totals(connection, totals, change_seq, now)
+
+
+def forget_campaign_donors(
+    connection: Connection,
+    donor_ids: List[int],
+    change_seq: int,
+    merged_into: Optional[Dict[int, int]] = None
+) -> None:
+    """Take deleted donors' pair rows out of the campaign totals.
+    
+    Merged duplicates, listed in ``merged_into``, hand their giving to the
+    survivor's pair rows, so only the donor count drops where both gave
+    to the same campaign.
+    """
+    if not donor_ids:
+        return
+    merged_into = merged_into or {}
+    pairs = CampaignDonor.__table__
+    removed = connection.execute(
+        delete(pairs)
+        .where(pairs.c.donor_id.in_(donor_ids))
+        .returning(pairs.c.campaign_id, pairs.c.donor_id, pairs.c.total_amount, pairs.c.gift_count)
+    ).all()
+    if not removed:
+        return
+    
+    totals = _totals()
+    survivors: CampaignDeltas = defaultdict(lambda: [0.0, 0])
+    for campaign_id, donor_id, amount, count in removed:
+        total = totals[campaign_id]
+        total[0] -= amount
+        total[1] -= count
+        total[2] -= 1
+        if donor_id in merged_into:
+            delta = survivors[(campaign_id, merged_into[donor_id])]
+            delta[0] += amount
+            delta[1] += count
+    apply_campaign_deltas(connection, survivors, change_seq, totals)
+
+
+def _totals() -> CampaignTotals:
+    return defaultdict(lambda: [0.0, 0, 0])
+
+
+def _apply_totals(
+    connection: Connection, totals: CampaignTotals, change_seq: int, now: datetime
+) -> None:
+    """Upsert campaign total changes with one executemany statement."""
+    rows = [
+        {
+            "campaign_id": campaign_id, "total_amount": amount, "gift_count": count,
+            "donor_count": donors, "change_seq": change_seq, "created_at": now,
+        }
+        for campaign_id, (amount, count, donors) in sorted(totals.items())
+        if amount or count or donors
+    ]
+    if not rows:
+        return
+    table = CampaignTotal.__table__
+    statement = dialect_insert(connection, table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["campaign_id"],
+        set_={
+            "total_amount": table.c.total_amount + statement.excluded.total_amount,
+            "gift_count": table.c.gift_count + statement.excluded.gift_count,
+            "donor_count": table.c.donor_count + statement.excluded.donor_count,
+            "change_seq": statement.excluded.change_seq,
+            "updated_at": statement.excluded.created_at,
+        },
+    )
+    connection.execute(statement, rows)
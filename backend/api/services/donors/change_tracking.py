@@ -0,0 +1,84 @@
+"""Change numbers and tombstones for donor delta sync.
+
+Every flush that creates, changes or deletes donors takes the next
+number from ``change_sequences`` and stamps it on those donors'
+``change_seq``; deleted donors leave a ``donor_tombstones`` row with the
+same number. The sequence row stays locked until the transaction ends,
+so numbers become visible in commit order and a client that has seen
+number N never later misses a change numbered below N. Bulk writes that
+bypass the ORM take a number with ``next_change_seq`` and stamp it
+themselves, writing tombstones with ``add_tombstones``.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.donors.change_sequence import ChangeSequence
+from models.donors.donor import Donor
+from models.donors.donor_tombstone import DonorTombstone
+from repositories.base import dialect_insert
+
+
+DONORS_SEQUENCE = "donors"
+
+
+def next_change_seq(connection: Connection, name: str = DONORS_SEQUENCE) -> int:
+    """Take the next change number with one upsert."""
+    table = ChangeSequence.__table__
+    now = datetime.utcnow()
+    statement = (
+        dialect_insert(connection, table)
+        .values(name=name, value=1, created_at=now)
+        .returning(table.c.value)
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": table.c.value + 1, "updated_at": now},
+    )
+    return connection.execute(statement).scalar_one()
+
+
+def add_tombstones(
+    connection: Connection,
+    donor_ids: Iterable[int],
+    change_seq: int,
+    merged_into: Optional[Dict[int, int]] = None
+) -> None:
+    """Record deleted donors; ``merged_into`` maps merged duplicates to the survivor."""
+    merged_into = merged_into or {}
+    now = datetime.utcnow()
+    rows = [
+        {
+            "donor_id": donor_id,
+            "change_seq": change_seq,
+            "merged_into_id": merged_into.get(donor_id),
+            "created_at": now,
+        }
+        for donor_id in donor_ids
+    ]
+    if rows:
+        connection.execute(DonorTombstone.__table__.insert(), rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_donor_changes(session, flush_context, instances):
+    """Stamp changed donors and tombstone deleted ones with one change number."""
+    changed = [
+        obj for obj in session.new if isinstance(obj, Donor)
+    ] + [
+        obj for obj in session.dirty
+        if isinstance(obj, Donor) and session.is_modified(obj, include_collections=False)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Donor)]
+    if not changed and not deleted:
+        return
+    
+    connection = session.connection()
+    change_seq = next_change_seq(connection)
+    for donor in changed:
+        donor.change_seq = change_seq
+    
+    add_tombstones(connection, [donor.id for donor in deleted], change_seq)
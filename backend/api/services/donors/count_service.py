@@ -0,0 +1,95 @@
+"""Donor count service for paginated list totals."""
+from typing import Any, Dict, Optional, Tuple
+from sqlmodel import Session
+from api.config import get_settings
+from api.services.donors.donor_counters import ALL_DONORS
+from api.utils import invalidation
+from api.utils.cache import TTLCache
+from repositories.donors.donor_counter_repository import DonorCounterRepository
+from repositories.donors.donor_repository import DonorRepository
+
+
+_settings = get_settings()
+
+# Invalidation key covering every cached count
+COUNTS_KEY = ("donor_counts",)
+
+# sorted filter items -> (count, exact)
+_count_cache: TTLCache[Tuple, Tuple[int, bool]] = TTLCache(
+    maxsize=_settings.donor_count_cache_size, ttl=_settings.donor_count_cache_ttl_seconds
+)
+
+
+class DonorCountService:
+    """Answers "how many donors match" without scanning when it can.
+    
+    Single-segment counts (all donors, one status, one type, one tag) come
+    from maintained counters and are exact. Other filter combinations are
+    counted with a capped query and cached for a short TTL, or until a
+    donor or tag write in any worker; counts past the cap are reported as
+    inexact. ``approximate=True`` uses the planner's row
+    estimate instead of counting where the database provides one.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = DonorRepository(session)
+        self.counters = DonorCounterRepository(session)
+    
+    def count(
+        self,
+        status: Optional[str] = None,
+        donor_type: Optional[str] = None,
+        tag_name: Optional[str] = None,
+        query: Optional[str] = None,
+        approximate: bool = False
+    ) -> Dict[str, Any]:
+        """Count donors matching the filters."""
+        filters = {
+            "status": status, "donor_type": donor_type, "tag_name": tag_name, "query": query
+        }
+        active = {key: value for key, value in filters.items() if value is not None}
+        
+        counted = self._from_counters(active)
+        if counted is not None:
+            return {"count": counted, "exact": True, "source": "counter"}
+        
+        cache_key = tuple(sorted(active.items()))
+        version = invalidation.versions(COUNTS_KEY)
+        cached = _count_cache.get(cache_key, version=version)
+        if cached is not None:
+            count, exact = cached
+            return {"count": count, "exact": exact, "source": "cache"}
+        
+        if approximate:
+            estimate = self.repository.estimate_matching(**active)
+            if estimate is not None:
+                return {"count": estimate, "exact": False, "source": "estimate"}
+        
+        cap = _settings.donor_count_scan_limit
+        matched = self.repository.count_matching(**active, cap=cap + 1)
+        count, exact = min(matched, cap), matched <= cap
+        _count_cache.set(cache_key, (count, exact), version=version)
+        return {"count": count, "exact": exact, "source": "query"}
+    
+    def _from_counters(self, active: Dict[str, str]) -> Optional[int]:
+        """Exact count from a maintained counter, if one covers the filters."""
+        if not active:
+            return self.counters.get_count(*ALL_DONORS)
+        if len(active) != 1:
+            return None
+        
+        (key, value), = active.items()
+        if key == "status":
+            return self.counters.get_count("status", value)
+        if key == "donor_type":
+            return self.counters.get_count("type", value)
+        if key == "tag_name":
+            return self.counters.get_tag_count(value)
+        return None
+
+
+def clear_count_cache() -> None:
+    """Drop cached filter counts in every worker."""
+    _count_cache.clear()
+    invalidation.bump([COUNTS_KEY])
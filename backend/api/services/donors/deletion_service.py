@@ -0,0 +1,239 @@
+"""Set-based donor deletes, soft deletes and the retention purge.
+
+Usage::
+
+    python -m api.services.donors.deletion_service --retention-days 30
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from api.config import get_settings
+from api.services.donors import audit_log, donor_cache
+from api.services.donors.autocomplete_service import PREFIX_KEYS, invalidate_after_commit
+from api.services.donors.campaign_totals import forget_campaign_donors
+from api.services.donors.change_tracking import add_tombstones, next_change_seq
+from api.services.donors.count_service import clear_count_cache
+from api.services.donors.donor_counters import (
+    ALL_DONORS, SEGMENT_DIMENSIONS, apply_counter_deltas
+)
+from api.services.donors.geo_rollups import LOCATION_KEYS, GeoDeltas, add_delta, apply_geo_deltas
+from api.utils.logger import get_logger
+from repositories.donors.donor_repository import DonorRepository
+
+
+logger = get_logger(__name__)
+
+# Donor ids per IN list
+DELETE_CHUNK_SIZE = 500
+
+
+def _chunks(donor_ids: List[int]) -> Iterator[List[int]]:
+    for start in range(0, len(donor_ids), DELETE_CHUNK_SIZE):
+        yield donor_ids[start:start + DELETE_CHUNK_SIZE]
+
+
+class DonorDeletionService:
+    """Deletes donors together with everything that belongs to them.
+    
+    A hard delete removes the donors' tag assignments, communications and
+    gifts, then the donors, with one DELETE per table per chunk of ids, all
+    in one transaction. A soft delete only stamps ``deleted_at``, which
+    hides the donor from every read; the retention purge hard-deletes those
+    donors later, one small transaction per chunk. These statements bypass
+    the ORM listeners, so segment counters, geographic rollups, tombstones
+    and suggestion caches are updated here.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = DonorRepository(session)
+    
+    def delete(
+        self, donor_ids: List[int], soft: Optional[bool] = None, actor: Optional[str] = None
+    ) -> int:
+        """Delete live donors in one transaction; returns how many were deleted.
+        
+        ``soft`` defaults to the ``donor_soft_delete`` setting. Unknown and
+        already deleted ids are skipped.
+        """
+        if soft is None:
+            soft = get_settings().donor_soft_delete
+        donor_ids = list(dict.fromkeys(donor_ids))
+        if not donor_ids:
+            return 0
+        
+        change_seq = next_change_seq(self.session.connection())
+        deleted_at = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        for chunk in _chunks(donor_ids):
+            if soft:
+                rows.extend(self._soft_delete(chunk, deleted_at, change_seq))
+            else:
+                rows.extend(self._hard_delete(chunk, change_seq))
+        self.session.commit()
+        
+        deleted_ids = [row["id"] for row in rows]
+        donor_cache.invalidate(*deleted_ids)
+        if rows:
+            clear_count_cache()
+        if soft:
+            changes = {"deleted_at": [None, deleted_at]}
+            self._audit([audit_log.entry(donor_id, "delete", changes, actor) for donor_id in deleted_ids])
+        else:
+            self._audit([
+                audit_log.entry(row["id"], "delete", audit_log.diff(audit_log.snapshot(row), {}), actor)
+                for row in rows
+            ])
+        return len(rows)
+    
+    def delete_segment(
+        self,
+        status: Optional[str] = None,
+        donor_type: Optional[str] = None,
+        tag_name: Optional[str] = None,
+        soft: Optional[bool] = None,
+        actor: Optional[str] = None
+    ) -> int:
+        """Delete every live donor in a segment in one transaction."""
+        return self.delete(self.repository.segment_ids(status, donor_type, tag_name), soft, actor)
+    
+    def delete_merged(self, duplicate_donor_id: int, primary_donor_id: int) -> bool:
+        """Hard-delete a merged duplicate in the caller's transaction, without committing.
+        
+        The duplicate's gifts, communications and tags must already have
+        been moved to the primary donor; its tombstone names the primary.
+        """
+        change_seq = next_change_seq(self.session.connection())
+        rows = self._hard_delete(
+            [duplicate_donor_id], change_seq, merged_into={duplicate_donor_id: primary_donor_id}
+        )
+        return bool(rows)
+    
+    def purge_expired(
+        self,
+        retention_days: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """Hard-delete donors soft-deleted longer ago than the retention period.
+        
+        Each chunk of donors is purged and committed on its own, so the
+        sweep never holds locks for long. Counters, rollups, campaign totals
+        and tombstones were already updated by the soft delete.
+        """
+        settings = get_settings()
+        retention_days = settings.donor_retention_days if retention_days is None else retention_days
+        chunk_size = chunk_size or settings.donor_purge_chunk_size
+        cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+        
+        purged = 0
+        while True:
+            donor_ids = self.repository.expired_ids(cutoff, chunk_size)
+            if not donor_ids:
+                break
+            rows, _ = self.repository.delete_cascade(donor_ids, soft_deleted=True)
+            self.session.commit()
+            self._audit([
+                audit_log.entry(row["id"], "purge", audit_log.diff(audit_log.snapshot(row), {}))
+                for row in rows
+            ])
+            purged += len(rows)
+            if len(donor_ids) < chunk_size:
+                break
+        
+        if purged:
+            logger.info(f"Purged {purged} donors deleted before {cutoff:%Y-%m-%d}")
+        return purged
+    
+    def _hard_delete(
+        self, donor_ids: List[int], change_seq: int, merged_into: Optional[Dict[int, int]] = None
+    ) -> List[Dict[str, Any]]:
+        rows, tag_ids = self.repository.delete_cascade(donor_ids)
+        self._forget(rows, tag_ids, change_seq, merged_into)
+        return rows
+    
+    def _soft_delete(
+        self, donor_ids: List[int], deleted_at: datetime, change_seq: int
+    ) -> List[Dict[str, Any]]:
+        rows = self.repository.soft_delete(donor_ids, deleted_at, change_seq)
+        if rows:
+            tag_ids = self.repository.tag_ids([row["id"] for row in rows])
+            self._forget(rows, tag_ids, change_seq)
+        return rows
+    
+    def _forget(
+        self,
+        rows: List[Dict[str, Any]],
+        tag_ids: List[int],
+        change_seq: int,
+        merged_into: Optional[Dict[int, int]] = None
+    ) -> None:
+        """Take deleted donors out of counters, rollups and campaign totals and leave their tombstones."""
+        if not rows:
+            return
+        donor_deltas: Counter = Counter()
+        tag_deltas: Counter = Counter()
+        geo_deltas: GeoDeltas = defaultdict(lambda: [0, 0.0, 0])
+        for row in rows:
+            donor_deltas[ALL_DONORS] -= 1
+            for key, dimension in SEGMENT_DIMENSIONS.items():
+                donor_deltas[(dimension, row[key])] -= 1
+            location = tuple(row[key] or "" for key in LOCATION_KEYS)
+            add_delta(
+                geo_deltas, location, -1, -(row["total_gifts"] or 0.0), -(row["total_gift_count"] or 0)
+            )
+        for tag_id in tag_ids:
+            tag_deltas[tag_id] -= 1
+        
+        connection = self.session.connection()
+        apply_counter_deltas(connection, donor_deltas, tag_deltas)
+        apply_geo_deltas(connection, geo_deltas)
+        forget_campaign_donors(connection, [row["id"] for row in rows], change_seq, merged_into)
+        add_tombstones(connection, [row["id"] for row in rows], change_seq, merged_into)
+        invalidate_after_commit(self.session, (row[key] for row in rows for key in PREFIX_KEYS))
+    
+    def _audit(self, entries: List[Dict[str, Any]]) -> None:
+        """Hand committed deletes to the background audit writer."""
+        audit_log.record(self.session.get_bind(), entries)
+
+
+def purge_once(engine: Engine) -> int:
+    """One retention purge pass with its own session."""
+    with Session(engine) as session:
+        return DonorDeletionService(session).purge_expired()
+
+
+async def purge_sweep(engine: Engine, interval_seconds: float) -> None:
+    """Run the retention purge every ``interval_seconds`` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(purge_once, engine)
+        except Exception:
+            logger.exception("Donor retention purge failed")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from api.dependencies.database import get_engine
+    
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Purge donors soft-deleted past the retention period.")
+    parser.add_argument("--retention-days", type=int, default=settings.donor_retention_days)
+    parser.add_argument("--chunk-size", type=int, default=settings.donor_purge_chunk_size)
+    args = parser.parse_args(argv)
+    
+    with Session(get_engine()) as session:
+        purged = DonorDeletionService(session).purge_expired(args.retention_days, args.chunk_size)
+    audit_log.shutdown_audit_writer()
+    print(f"Purged {purged} donors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
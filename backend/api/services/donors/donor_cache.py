@@ -0,0 +1,57 @@
+"""In-process cache of donor rows keyed by id, expired across workers."""
+from typing import Dict, Iterable, List
+
+from api.config import get_settings
+from api.utils import invalidation
+from api.utils.cache import TTLCache
+from models.donors.donor import Donor
+
+
+_settings = get_settings()
+
+# donor id -> detached snapshot of the donors row
+_donor_cache: TTLCache[int, Donor] = TTLCache(
+    maxsize=_settings.donor_cache_size, ttl=_settings.donor_cache_ttl_seconds
+)
+
+
+def _key(donor_id: int):
+    return ("donor", donor_id)
+
+
+def versions(donor_ids: Iterable[int]) -> Dict[int, int]:
+    """Current version of each donor; read before loading the rows to cache."""
+    donor_ids = list(donor_ids)
+    return dict(zip(donor_ids, invalidation.versions(*map(_key, donor_ids))))
+
+
+def get_many(donor_ids: Iterable[int]) -> Dict[int, Donor]:
+    """Cached snapshots for whichever of the ids are present and current."""
+    found = {}
+    for donor_id, version in versions(donor_ids).items():
+        donor = _donor_cache.get(donor_id, version=version)
+        if donor is not None:
+            found[donor_id] = donor
+    return found
+
+
+def put_many(donors: Iterable[Donor], versions: Dict[int, int]) -> List[Donor]:
+    """Cache detached snapshots of loaded donors under the versions read before loading."""
+    snapshots = []
+    for donor in donors:
+        snapshot = Donor(**donor.model_dump())
+        _donor_cache.set(donor.id, snapshot, version=versions[donor.id])
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def invalidate(*donor_ids: int) -> None:
+    """Drop cached donors in every worker after they were changed or deleted."""
+    for donor_id in donor_ids:
+        _donor_cache.pop(donor_id)
+    invalidation.bump(map(_key, donor_ids))
+
+
+def clear() -> None:
+    """Empty this process's cache."""
+    _donor_cache.clear()
@@ -0,0 +1,127 @@
+"""Segment counters kept in step with donor and tag writes.
+
+Every ORM flush that creates, deletes or re-segments donors applies the
+matching +/- deltas to ``donor_counters`` and ``tags.donor_count`` in the
+same transaction, so segment counts can be read without scanning donors.
+Bulk writes that bypass the ORM apply their own deltas with
+``apply_counter_deltas`` or call ``rebuild_donor_counters``. Soft-deleted
+donors are not counted.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from models.donors.donor import Donor
+from models.donors.donor_counter import DonorCounter
+from models.donors.tag import DonorTag, Tag
+from repositories.base import dialect_insert
+
+
+ALL_DONORS: Tuple[str, str] = ("all", "*")
+
+# Donor attribute -> counter dimension
+SEGMENT_DIMENSIONS = {"donor_status": "status", "donor_type": "type"}
+
+
+def _segments(donor: Donor) -> Iterable[Tuple[str, str]]:
+    yield ALL_DONORS
+    for key, dimension in SEGMENT_DIMENSIONS.items():
+        yield dimension, getattr(donor, key)
+
+
+def _upsert(connection: Connection, dimension: str, value: str, delta: int) -> None:
+    """Add ``delta`` to a counter row, creating it if needed."""
+    table = DonorCounter.__table__
+    now = datetime.utcnow()
+    statement = dialect_insert(connection, table).values(
+        dimension=dimension, value=value, count=delta, created_at=now
+    ).on_conflict_do_update(
+        index_elements=["dimension", "value"],
+        set_={"count": table.c.count + delta, "updated_at": now},
+    )
+    connection.execute(statement)
+
+
+def apply_counter_deltas(
+    connection: Connection,
+    donor_deltas: Dict[Tuple[str, str], int],
+    tag_deltas: Dict[int, int],
+) -> None:
+    """Apply donor segment and tag count changes."""
+    for (dimension, value), delta in donor_deltas.items():
+        if delta:
+            _upsert(connection, dimension, value, delta)
+    tags = Tag.__table__
+    for tag_id, delta in tag_deltas.items():
+        if delta:
+            connection.execute(
+                update(tags).where(tags.c.id == tag_id).values(donor_count=tags.c.donor_count + delta)
+            )
+
+
+def rebuild_donor_counters(connection: Connection) -> None:
+    """Recompute every counter from the live donors and their donor_tags rows."""
+    counters = DonorCounter.__table__
+    donors = Donor.__table__
+    live = donors.c.deleted_at.is_(None)
+    now = datetime.utcnow()
+    connection.execute(counters.delete())
+    
+    total = connection.execute(select(func.count()).select_from(donors).where(live)).scalar_one()
+    dimension, value = ALL_DONORS
+    rows = [{"dimension": dimension, "value": value, "count": total, "created_at": now}]
+    for key, dimension in SEGMENT_DIMENSIONS.items():
+        column = donors.c[key]
+        for value, count in connection.execute(
+            select(column, func.count()).where(live).group_by(column)
+        ):
+            rows.append({"dimension": dimension, "value": value, "count": count, "created_at": now})
+    connection.execute(counters.insert(), rows)
+    
+    tags = Tag.__table__
+    donor_tags = DonorTag.__table__
+    connection.execute(
+        update(tags).values(
+            donor_count=select(func.count())
+            .select_from(donor_tags.join(donors, donors.c.id == donor_tags.c.donor_id))
+            .where(donor_tags.c.tag_id == tags.c.id, live)
+            .scalar_subquery()
+        )
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _track_counter_changes(session, flush_context, instances):
+    """Turn pending donor and donor-tag changes into counter deltas."""
+    donor_deltas: Counter = Counter()
+    tag_deltas: Counter = Counter()
+    
+    for obj in session.new:
+        if isinstance(obj, Donor):
+            for segment in _segments(obj):
+                donor_deltas[segment] += 1
+        elif isinstance(obj, DonorTag) and obj.tag_id is not None:
+            tag_deltas[obj.tag_id] += 1
+    
+    for obj in session.deleted:
+        if isinstance(obj, Donor):
+            for segment in _segments(obj):
+                donor_deltas[segment] -= 1
+        elif isinstance(obj, DonorTag):
+            tag_deltas[obj.tag_id] -= 1
+    
+    for obj in session.dirty:
+        if not isinstance(obj, Donor):
+            continue
+        for key, dimension in SEGMENT_DIMENSIONS.items():
+            history = attributes.get_history(obj, key)
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                donor_deltas[(dimension, history.deleted[0])] -= 1
+                donor_deltas[(dimension, history.added[0])] += 1
+    
+    if donor_deltas or tag_deltas:
+        apply_counter_deltas(session.connection(), donor_deltas, tag_deltas)
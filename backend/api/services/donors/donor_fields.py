@@ -0,0 +1,48 @@
+"""Field selection for sparse donor reads."""
+from typing import List, Optional, Sequence, Tuple
+
+
+# Columns a client may ask for with ``fields=``; the normalized match keys stay internal
+DONOR_FIELDS: Tuple[str, ...] = (
+    "id", "created_at", "updated_at",
+    "first_name", "last_name", "full_name", "preferred_name", "title", "suffix",
+    "email", "phone", "mobile_phone", "work_phone",
+    "address_line_1", "address_line_2", "city", "state", "postal_code", "country",
+    "company", "job_title",
+    "preferred_contact_method", "communication_preferences",
+    "do_not_email", "do_not_call", "do_not_mail",
+    "total_gifts", "total_gift_count", "first_gift_date", "last_gift_date",
+    "largest_gift", "average_gift",
+    "donor_status", "donor_type", "wealth_rating", "capacity_rating",
+    "notes", "source",
+)
+
+# Columns returned when ``fields`` is omitted (the original donor response)
+DEFAULT_DONOR_FIELDS: Tuple[str, ...] = (
+    "id", "first_name", "last_name", "full_name", "email", "phone",
+    "city", "state", "company", "donor_status", "donor_type",
+    "total_gifts", "total_gift_count", "created_at",
+)
+
+
+class UnknownFieldsError(ValueError):
+    """Raised when ``fields`` names columns outside the allow-list."""
+
+    def __init__(self, unknown: Sequence[str]):
+        self.unknown = list(unknown)
+        super().__init__(f"Unknown fields: {', '.join(self.unknown)}")
+
+
+def parse_fields(raw: Optional[str]) -> List[str]:
+    """Turn a comma-separated ``fields`` value into the columns to select.
+    
+    ``id`` is always included so rows can be keyed by the client.
+    """
+    if not raw or not raw.strip():
+        return list(DEFAULT_DONOR_FIELDS)
+    
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(DONOR_FIELDS))
+    if unknown:
+        raise UnknownFieldsError(unknown)
+    return list(dict.fromkeys(["id", *requested]))
@@ -1,9 +1,21 @@
 """Donor service for business logic."""
-import re
-from typing import List, Optional, Dict, Any
-from sqlmodel import Session
+import json
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from sqlmodel import Session, select
+from api.services.donors import audit_log, donor_cache
+from api.services.donors import autocomplete_service  # noqa: F401 - drops stale suggestions
+from api.services.donors import change_tracking  # noqa: F401 - stamps changes for delta sync
+from api.services.donors import donor_counters
+from api.services.donors import geo_rollups  # noqa: F401 - keeps geographic rollups current
+from api.services.donors.count_service import clear_count_cache
+from api.services.donors.deletion_service import DonorDeletionService
+from api.utils.normalization import (
+    normalize_city, normalize_email, normalize_name, normalize_phone, normalize_postal_code,
+    normalize_state
+)
 from models.donors.donor import Donor
 from models.donors.tag import Tag, DonorTag
+from repositories.donors.donor_audit_repository import DonorAuditRepository
 from repositories.donors.donor_repository import DonorRepository
 
 
@@ -22,18 +34,21 @@ class DonorService:
         if not donor.full_name and donor.first_name and donor.last_name:
             donor.full_name = f"{donor.first_name} {donor.last_name}".strip()
         
-        # Set normalized keys for duplicate detection
-        donor.name_key = self._normalize_name(donor.full_name or "")
-        donor.email_key = self._normalize_email(donor.email or "")
-        donor.phone_key = self._normalize_phone(donor.phone or "")
+        # Set normalized keys for duplicate detection, lookups and rollups
+        self._set_keys(donor)
         
-        return self.repository.create(donor)
+        created = self.repository.create(donor)
+        clear_count_cache()
+        return created
     
-    def update_donor(self, donor_id: int, donor_data: Dict[str, Any]) -> Optional[Donor]:
+    def update_donor(
+        self, donor_id: int, donor_data: Dict[str, Any], actor: Optional[str] = None
+    ) -> Optional[Donor]:
         """Update donor with normalized fields."""
         donor = self.repository.get_by_id(donor_id)
         if not donor:
             return None
+        before = audit_log.snapshot(donor)
         
         # Update fields
         for key, value in donor_data.items():
@@ -46,16 +61,41 @@ class DonorService:
                 donor.full_name = f"{donor.first_name} {donor.last_name}".strip()
         
         # Update normalized keys
-        donor.name_key = self._normalize_name(donor.full_name or "")
-        donor.email_key = self._normalize_email(donor.email or "")
-        donor.phone_key = self._normalize_phone(donor.phone or "")
+        self._set_keys(donor)
         
-        return self.repository.update(donor)
+        updated = self.repository.update(donor)
+        donor_cache.invalidate(donor_id)
+        clear_count_cache()
+        
+        changes = audit_log.diff(before, audit_log.snapshot(updated))
+        if changes:
+            self._audit([audit_log.entry(donor_id, "update", changes, actor)])
+        return updated
     
     def get_donor(self, donor_id: int) -> Optional[Donor]:
         """Get donor by ID."""
         return self.repository.get_by_id(donor_id)
     
+    def get_donors_by_ids(self, donor_ids: List[int]) -> Tuple[List[Donor], List[int]]:
+        """Get donors in request order, plus the requested ids that do not exist.
+        
+        Cached donors are served from the entity cache; the rest are loaded
+        with a single IN query and cached under the versions read beforehand,
+        so a write committed meanwhile in any worker leaves them stale.
+        Repeated ids are returned once.
+        """
+        ordered_ids = list(dict.fromkeys(donor_ids))
+        found = donor_cache.get_many(ordered_ids)
+        uncached = [donor_id for donor_id in ordered_ids if donor_id not in found]
+        if uncached:
+            versions = donor_cache.versions(uncached)
+            for donor in donor_cache.put_many(self.repository.get_by_ids(uncached), versions):
+                found[donor.id] = donor
+        
+        donors = [found[donor_id] for donor_id in ordered_ids if donor_id in found]
+        missing = [donor_id for donor_id in ordered_ids if donor_id not in found]
+        return donors, missing
+    
     def list_donors(self, skip: int = 0, limit: int = 100) -> List[Donor]:
         """List donors with pagination."""
         return self.repository.get_all(skip=skip, limit=limit)
@@ -64,17 +104,53 @@ class DonorService:
         """Search donors by name, email, or phone."""
         return self.repository.search_donors(query, limit)
     
+    def get_donor_fields(self, donor_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only the given fields of one donor."""
+        return self.repository.get_fields(donor_id, fields)
+    
+    def list_donor_fields(self, fields: List[str], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """List donors with pagination, reading only the given fields."""
+        return self.repository.list_fields(fields, skip=skip, limit=limit)
+    
+    def search_donor_fields(self, query: str, fields: List[str], limit: int = 50) -> List[Dict[str, Any]]:
+        """Search donors by name, email, or phone, reading only the given fields."""
+        return self.repository.search_fields(query, fields, limit)
+    
+    def export_donor_fields(self, fields: List[str]) -> Iterator[Dict[str, Any]]:
+        """Stream all donors in id order, reading only the given fields."""
+        return self.repository.iter_fields(fields)
+    
+    def get_history(
+        self, donor_id: int, before_id: Optional[int] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """A donor's audit entries, newest first, with the changes decoded."""
+        entries = DonorAuditRepository(self.session).history(donor_id, before_id, limit)
+        return [
+            {
+                "id": entry.id,
+                "action": entry.action,
+                "actor": entry.actor,
+                "changes": json.loads(entry.changes),
+                "created_at": entry.created_at,
+            }
+            for entry in entries
+        ]
+    
     def find_potential_duplicates(self, donor: Donor) -> List[Donor]:
         """Find potential duplicate donors."""
         return self.repository.find_potential_duplicates(donor)
     
-    def merge_donors(self, primary_donor_id: int, duplicate_donor_id: int) -> Optional[Donor]:
+    def merge_donors(
+        self, primary_donor_id: int, duplicate_donor_id: int, actor: Optional[str] = None
+    ) -> Optional[Donor]:
         """Merge two donor records."""
         primary = self.repository.get_by_id(primary_donor_id)
         duplicate = self.repository.get_by_id(duplicate_donor_id)
         
         if not primary or not duplicate:
             return None
+        primary_before = audit_log.snapshot(primary)
+        duplicate_before = audit_log.snapshot(duplicate)
         
         # Merge logic: keep primary donor's data, but fill in missing fields from duplicate
         merge_fields = [
@@ -89,7 +165,16 @@ class DonorService:
             if not primary_value and duplicate_value:
                 setattr(primary, field, duplicate_value)
         
-        # Update gift totals (would need to move actual gifts in a real implementation)
+        self._set_keys(primary)
+        
+        # Move gifts, communications and tags; tags the primary already has are dropped
+        dropped_tag_ids = self.repository.reassign_dependents(duplicate_donor_id, primary_donor_id)
+        if dropped_tag_ids:
+            donor_counters.apply_counter_deltas(
+                self.session.connection(), {}, {tag_id: -1 for tag_id in dropped_tag_ids}
+            )
+        
+        # Update gift totals
         primary.total_gifts += duplicate.total_gifts
         primary.total_gift_count += duplicate.total_gift_count
         
@@ -108,25 +193,39 @@ class DonorService:
         if primary.total_gift_count > 0:
             primary.average_gift = primary.total_gifts / primary.total_gift_count
         
-        # Save primary and delete duplicate
+        # Delete duplicate and save primary in one transaction
+        DonorDeletionService(self.session).delete_merged(duplicate_donor_id, primary_donor_id)
         updated_primary = self.repository.update(primary)
-        self.repository.delete(duplicate_donor_id)
+        primary_after = audit_log.snapshot(updated_primary)
+        donor_cache.invalidate(primary_donor_id, duplicate_donor_id)
+        clear_count_cache()
         
+        merged = audit_log.diff(primary_before, primary_after)
+        merged["merged_donor_id"] = [None, duplicate_donor_id]
+        removed = audit_log.diff(duplicate_before, {})
+        removed["merged_into_donor_id"] = [None, primary_donor_id]
+        self._audit([
+            audit_log.entry(primary_donor_id, "merge", merged, actor),
+            audit_log.entry(duplicate_donor_id, "merged", removed, actor),
+        ])
         return updated_primary
     
-    def add_tag_to_donor(self, donor_id: int, tag_name: str) -> bool:
+    def delete_donor(
+        self, donor_id: int, actor: Optional[str] = None, soft: Optional[bool] = None
+    ) -> bool:
+        """Delete a donor with its gifts, communications and tags; False if not found."""
+        return DonorDeletionService(self.session).delete([donor_id], soft, actor) == 1
+    
+    def add_tag_to_donor(self, donor_id: int, tag_name: str, actor: Optional[str] = None) -> bool:
         """Add a tag to a donor."""
         donor = self.repository.get_by_id(donor_id)
         if not donor:
             return False
         
         # Find or create tag
-        tag_statement = f"SELECT * FROM tags WHERE name = '{tag_name}'"
-        existing_tags = self.session.exec(tag_statement).all()
+        tag = self.session.exec(select(Tag).where(Tag.name == tag_name)).first()
         
-        if existing_tags:
-            tag = existing_tags[0]
-        else:
+        if not tag:
             tag = Tag(name=tag_name)
             self.session.add(tag)
             self.session.commit()
@@ -134,34 +233,40 @@ class DonorService:
         
         # Check if association already exists
         existing_association = self.session.exec(
-            f"SELECT * FROM donor_tags WHERE donor_id = {donor_id} AND tag_id = {tag.id}"
+            select(DonorTag).where(DonorTag.donor_id == donor_id, DonorTag.tag_id == tag.id)
         ).first()
         
         if not existing_association:
             donor_tag = DonorTag(donor_id=donor_id, tag_id=tag.id)
             self.session.add(donor_tag)
             self.session.commit()
+            clear_count_cache()
+            self._audit([audit_log.entry(donor_id, "tag", {"tags": [None, tag_name]}, actor)])
         
         return True
     
+    def _audit(self, entries: List[Dict[str, Any]]) -> None:
+        """Hand committed changes to the background audit writer."""
+        audit_log.record(self.session.get_bind(), entries)
+    
+    def _set_keys(self, donor: Donor) -> None:
+        """Recompute every normalized key from the donor's current fields."""
+        donor.name_key = self._normalize_name(donor.full_name or "")
+        donor.email_key = self._normalize_email(donor.email or "")
+        donor.phone_key = self._normalize_phone(donor.phone or "")
+        donor.company_key = self._normalize_name(donor.company or "")
+        donor.state_key = normalize_state(donor.state or "")
+        donor.city_key = normalize_city(donor.city or "")
+        donor.postal_key = normalize_postal_code(donor.postal_code or "", donor.country or "US")
+    
     def _normalize_name(self, name: str) -> str:
         """Normalize name for duplicate detection."""
-        if not name:
-            return ""
-        # Remove extra spaces, convert to lowercase, remove punctuation
-        normalized = re.sub(r'[^\w\s]', '', name.lower())
-        normalized = ' '.join(normalized.split())
-        return normalized
+        return normalize_name(name)
     
     def _normalize_email(self, email: str) -> str:
         """Normalize email for duplicate detection."""
-        if not email:
-            return ""
-        return email.lower().strip()
+        return normalize_email(email)
     
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone for duplicate detection."""
-        if not phone:
-            return ""
-        # Remove all non-numeric characters
-        return re.sub(r'[^\d]', '', phone)
\ No newline at end of file
+        return normalize_phone(phone)
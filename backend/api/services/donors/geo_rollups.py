@@ -0,0 +1,177 @@
+"""Geographic rollups kept in step with donor and gift writes.
+
+Every ORM flush that creates, deletes, moves or re-totals donors applies
+the matching donor-count and giving deltas to ``geo_rollups`` in the same
+transaction. Gift ingestion, which updates donor totals in bulk, applies
+its deltas through ``apply_geo_deltas``, as do bulk deletes; other bulk
+writes that bypass the ORM must call ``rebuild_geo_rollups``. Soft-deleted
+donors are not counted.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from models.donors.donor import Donor
+from models.donors.geo_rollup import GeoRollup
+from repositories.base import dialect_insert
+
+
+POSTAL_PREFIX_LENGTH = 3
+
+# (state key, city key, postal key) of one donor
+Location = Tuple[str, str, str]
+# rollup area -> [donor count, total gifts, gift count]
+GeoDeltas = Dict[Tuple[str, str, str, str], List[float]]
+
+LOCATION_KEYS = ("state_key", "city_key", "postal_key")
+TOTAL_KEYS = ("total_gifts", "total_gift_count")
+
+
+def _areas(location: Location) -> Iterable[Tuple[str, str, str, str]]:
+    """Every (level, state, parent_code, code) area a donor is counted in."""
+    state, city, postal = location
+    prefix = postal[:POSTAL_PREFIX_LENGTH]
+    yield "state", state, "", ""
+    if city:
+        yield "city", state, "", city
+    if postal:
+        yield "postal_prefix", state, "", prefix
+        yield "postal_code", state, prefix, postal
+
+
+def add_delta(
+    deltas: GeoDeltas, location: Location, donors: int, amount: float, gifts: int
+) -> None:
+    """Accumulate one donor's change into every area it belongs to."""
+    for area in _areas(location):
+        delta = deltas[area]
+        delta[0] += donors
+        delta[1] += amount
+        delta[2] += gifts
+
+
+def apply_geo_deltas(connection: Connection, deltas: GeoDeltas) -> None:
+    """Upsert the accumulated changes with one executemany statement."""
+    rows = [
+        {
+            "level": level, "state": state, "parent_code": parent_code, "code": code,
+            "donor_count": donors, "total_gifts": amount, "gift_count": gifts,
+            "created_at": datetime.utcnow(),
+        }
+        for (level, state, parent_code, code), (donors, amount, gifts) in deltas.items()
+        if donors or amount or gifts
+    ]
+    if not rows:
+        return
+    table = GeoRollup.__table__
+    statement = dialect_insert(connection, table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["level", "state", "parent_code", "code"],
+        set_={
+            "donor_count": table.c.donor_count + statement.excluded.donor_count,
+            "total_gifts": table.c.total_gifts + statement.excluded.total_gifts,
+            "gift_count": table.c.gift_count + statement.excluded.gift_count,
+            "updated_at": statement.excluded.created_at,
+        },
+    )
+    connection.execute(statement, rows)
+
+
+def rebuild_geo_rollups(connection: Connection) -> None:
+    """Recompute every rollup row from the live donors."""
+    rollups = GeoRollup.__table__
+    donors = Donor.__table__
+    connection.execute(rollups.delete())
+    
+    state = func.coalesce(donors.c.state_key, "")
+    city = func.coalesce(donors.c.city_key, "")
+    postal = func.coalesce(donors.c.postal_key, "")
+    prefix = func.substr(postal, 1, POSTAL_PREFIX_LENGTH)
+    empty = literal("")
+    # level -> (parent_code, code, extra GROUP BY expressions)
+    levels = {
+        "state": (empty, empty, ()),
+        "city": (empty, city, (city,)),
+        "postal_prefix": (empty, prefix, (prefix,)),
+        "postal_code": (prefix, postal, (prefix, postal)),
+    }
+    for level, (parent_code, code, group_by) in levels.items():
+        statement = select(
+            literal(level), state, parent_code, code,
+            func.count(), func.coalesce(func.sum(donors.c.total_gifts), 0.0),
+            func.coalesce(func.sum(donors.c.total_gift_count), 0),
+            literal(datetime.utcnow()),
+        ).where(donors.c.deleted_at.is_(None)).group_by(state, *group_by)
+        if group_by:
+            statement = statement.where(code != "")
+        connection.execute(
+            rollups.insert().from_select(
+                ["level", "state", "parent_code", "code", "donor_count",
+                 "total_gifts", "gift_count", "created_at"],
+                statement,
+            )
+        )
+
+
+def location(donor: Donor) -> Location:
+    """Normalized location keys of a donor."""
+    return tuple(getattr(donor, key) or "" for key in LOCATION_KEYS)
+
+
+def _previous(donor: Donor, key: str):
+    """Committed value of an attribute that may have changed in this flush."""
+    history = attributes.get_history(donor, key)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(donor, key)
+
+
+def _moved_or_retotaled(donor: Donor) -> Optional[Tuple[Location, float, int]]:
+    """Previous (location, total, count) when any of them changed, else None."""
+    changed = any(
+        attributes.get_history(donor, key).has_changes()
+        for key in LOCATION_KEYS + TOTAL_KEYS
+    )
+    if not changed:
+        return None
+    previous_location = tuple(_previous(donor, key) or "" for key in LOCATION_KEYS)
+    return (
+        previous_location,
+        _previous(donor, "total_gifts") or 0.0,
+        _previous(donor, "total_gift_count") or 0,
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _track_geo_changes(session, flush_context, instances):
+    """Turn pending donor changes into rollup deltas."""
+    deltas: GeoDeltas = defaultdict(lambda: [0, 0.0, 0])
+    
+    for obj in session.new:
+        if isinstance(obj, Donor):
+            add_delta(deltas, location(obj), 1, obj.total_gifts or 0.0, obj.total_gift_count or 0)
+    
+    for obj in session.deleted:
+        if isinstance(obj, Donor):
+            previous = _moved_or_retotaled(obj)
+            old_location, old_total, old_count = previous or (
+                location(obj), obj.total_gifts or 0.0, obj.total_gift_count or 0
+            )
+            add_delta(deltas, old_location, -1, -old_total, -old_count)
+    
+    for obj in session.dirty:
+        if not isinstance(obj, Donor):
+            continue
+        previous = _moved_or_retotaled(obj)
+        if previous is None:
+            continue
+        old_location, old_total, old_count = previous
+        add_delta(deltas, old_location, -1, -old_total, -old_count)
+        add_delta(deltas, location(obj), 1, obj.total_gifts or 0.0, obj.total_gift_count or 0)
+    
+    if deltas:
+        apply_geo_deltas(session.connection(), deltas)
@@ -0,0 +1,59 @@
+"""Geographic drill-downs served from maintained rollups."""
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+from api.services.donors.geo_rollups import POSTAL_PREFIX_LENGTH
+from api.utils.normalization import normalize_postal_code, normalize_state
+from repositories.donors.geo_rollup_repository import GeoRollupRepository
+
+
+class GeographyService:
+    """Donor counts and giving totals by state, city and postal area.
+    
+    Every level reads precomputed ``geo_rollups`` rows, so a drill-down
+    costs one indexed lookup regardless of how many donors or gifts exist.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = GeoRollupRepository(session)
+    
+    def drill_down(
+        self,
+        state: Optional[str] = None,
+        postal_prefix: Optional[str] = None,
+        by_city: bool = False
+    ) -> Dict[str, Any]:
+        """One level of the state -> postal prefix -> postal code hierarchy.
+        
+        Without a state, lists states. With a state, lists its postal
+        prefixes (or cities when ``by_city``); adding a postal prefix lists
+        the postal codes under it.
+        """
+        state_key = normalize_state(state or "")
+        prefix = normalize_postal_code(postal_prefix or "")[:POSTAL_PREFIX_LENGTH]
+        
+        if state is None:
+            level = "state"
+            rows = self.repository.areas(level)
+            for row in rows:
+                row["code"] = row["state"]
+        elif by_city:
+            level = "city"
+            rows = self.repository.areas(level, state_key)
+        elif prefix:
+            level = "postal_code"
+            rows = self.repository.areas(level, state_key, prefix)
+        else:
+            level = "postal_prefix"
+            rows = self.repository.areas(level, state_key)
+        
+        return {
+            "level": level,
+            "state": state_key if state is not None else None,
+            "postal_prefix": prefix if level == "postal_code" else None,
+            "areas": [
+                {key: row[key] for key in ("code", "donor_count", "total_gifts", "gift_count")}
+                for row in rows
+            ],
+        }
+
@@ -0,0 +1,100 @@
+"""Live feed of new gifts for dashboard tickers, shared by every stream of a process."""
+import time
+from typing import Any, Dict, List, Optional
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from api.config import get_settings
+from api.utils.broadcast import PollingBroadcaster
+from repositories.donors.gift_repository import GiftRepository
+
+
+# Gifts read per poll, and gifts per published batch
+FEED_READ_SIZE = 1_000
+FEED_BATCH_SIZE = 50
+
+# How long an id skipped by the watermark is looked for again, and how many at most
+GAP_SECONDS = 30.0
+MAX_GAPS = 1_000
+
+
+def ticker_gift(row: Dict[str, Any]) -> Dict[str, Any]:
+    """A gift as tickers show it; anonymous gifts carry no donor."""
+    gift = {key: value for key, value in row.items() if key != "is_anonymous"}
+    if row["is_anonymous"]:
+        gift["donor_id"] = None
+        gift["donor_name"] = "Anonymous"
+    return gift
+
+
+def recent_gifts(session: Session, limit: int) -> List[Dict[str, Any]]:
+    """The newest gifts, oldest of them first, for a ticker that just connected."""
+    return [ticker_gift(row) for row in GiftRepository(session).latest_feed_rows(limit)]
+
+
+class GiftFeed(PollingBroadcaster):
+    """Tails new gifts by id and publishes them in small batches.
+    
+    Each poll reads the gifts added since the last one, so however many
+    tickers are open, a worker reads the gifts table once per interval.
+    Gift ids are handed out at insert time, not commit time: a batch still
+    being written can commit after a later one was already seen. Ids the
+    watermark has passed without seeing are looked for again for
+    ``GAP_SECONDS``, so such gifts arrive late rather than never.
+    """
+    
+    def __init__(self, engine: Engine, interval_seconds: float = 1.0, max_queued: int = 100):
+        super().__init__(interval_seconds, max_queued)
+        self.engine = engine
+        self.position = 0
+        self.gaps: Dict[int, float] = {}
+    
+    def start(self) -> None:
+        with Session(self.engine) as session:
+            self.position = GiftRepository(session).latest_id()
+        self.gaps.clear()
+    
+    def poll(self) -> List[List[Dict[str, Any]]]:
+        with Session(self.engine) as session:
+            rows = GiftRepository(session).feed_rows(self.position, FEED_READ_SIZE, sorted(self.gaps))
+        now = time.monotonic()
+        seen = {row["id"] for row in rows}
+        for gift_id in seen:
+            self.gaps.pop(gift_id, None)
+        newest = max(seen, default=self.position)
+        if self.position < newest <= self.position + MAX_GAPS:
+            for gift_id in range(self.position + 1, newest):
+                if gift_id not in seen:
+                    self.gaps[gift_id] = now
+        self.position = max(self.position, newest)
+        self._expire_gaps(now)
+        
+        gifts = [ticker_gift(row) for row in rows]
+        return [gifts[start:start + FEED_BATCH_SIZE] for start in range(0, len(gifts), FEED_BATCH_SIZE)]
+    
+    def _expire_gaps(self, now: float) -> None:
+        """Forget gaps that never filled (rolled back or deleted gifts), oldest first past the cap."""
+        expired = [gift_id for gift_id, since in self.gaps.items() if now - since > GAP_SECONDS]
+        for gift_id in expired:
+            del self.gaps[gift_id]
+        for gift_id in sorted(self.gaps)[:max(len(self.gaps) - MAX_GAPS, 0)]:
+            del self.gaps[gift_id]
+
+
+_feed: Optional[GiftFeed] = None
+
+
+def gift_feed(engine: Engine) -> GiftFeed:
+    """The process-wide new-gift feed for ``engine``."""
+    global _feed
+    if _feed is None or (_feed.engine is not engine and not _feed.subscriber_count):
+        settings = get_settings()
+        _feed = GiftFeed(engine, settings.stream_poll_interval_seconds, settings.stream_max_queued)
+    return _feed
+
+
+def close_gift_feed() -> None:
+    """End every new-gift stream; used at shutdown."""
+    global _feed
+    if _feed is not None:
+        _feed.close()
+        _feed = None
@@ -0,0 +1,215 @@
+"""Gift service for business logic."""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session
+from api.services.donors import donor_cache
+from api.services.donors.autocomplete_service import clear_autocomplete_cache
+from api.services.donors.campaign_totals import apply_campaign_deltas, campaign_deltas
+from api.services.donors.change_tracking import next_change_seq
+from api.services.donors.geo_rollups import GeoDeltas, add_delta, apply_geo_deltas
+from repositories.donors.archive_repository import ArchiveRepository
+from repositories.donors.communication_repository import CommunicationRepository
+from repositories.donors.donor_repository import DonorRepository
+from repositories.donors.gift_repository import GiftRepository, TransactionKey
+
+
+# Rows per multi-row INSERT
+INGEST_CHUNK_SIZE = 500
+
+
+def _result(status: str, gift_id: Optional[int] = None, detail: Optional[str] = None) -> Dict[str, Any]:
+    return {"status": status, "gift_id": gift_id, "detail": detail}
+
+
+class GiftService:
+    """Service for gift business logic."""
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = GiftRepository(session)
+        self.donor_repository = DonorRepository(session)
+        self.communication_repository = CommunicationRepository(session)
+        self.archive_repository = ArchiveRepository(session)
+    
+    def ingest_gifts(self, gifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert a batch of gifts idempotently; returns one result per gift.
+        
+        Gifts are keyed on (source, transaction_id): a key that already exists,
+        in the gifts table or the archive, or repeats within the batch, is
+        reported as a duplicate with the id of the stored gift. New gifts are
+        written with one INSERT ... ON CONFLICT DO NOTHING per chunk, and
+        donor aggregates and campaign totals are updated once per donor for
+        the whole batch, all in one transaction.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(gifts)
+        known_donors = self.donor_repository.existing_ids(list({g["donor_id"] for g in gifts}))
+        
+        first_seen: Dict[TransactionKey, int] = {}
+        repeats: Dict[int, TransactionKey] = {}
+        pending: List[int] = []
+        for index, gift in enumerate(gifts):
+            key = (gift["source"], gift["transaction_id"])
+            if gift["donor_id"] not in known_donors:
+                results[index] = _result("error", detail="Donor not found")
+            elif key in first_seen:
+                repeats[index] = key
+            else:
+                first_seen[key] = index
+                pending.append(index)
+        
+        gift_ids = self._archived_gift_ids([gifts[index] for index in pending])
+        for index in pending:
+            key = (gifts[index]["source"], gifts[index]["transaction_id"])
+            if key in gift_ids:
+                results[index] = _result("duplicate", gift_ids[key])
+        pending = [index for index in pending if results[index] is None]
+        
+        now = datetime.utcnow()
+        created: List[Dict[str, Any]] = []
+        for start in range(0, len(pending), INGEST_CHUNK_SIZE):
+            chunk = pending[start:start + INGEST_CHUNK_SIZE]
+            inserted = self.repository.insert_new([{**gifts[i], "created_at": now} for i in chunk])
+            skipped = [
+                (gifts[i]["source"], gifts[i]["transaction_id"])
+                for i in chunk
+                if (gifts[i]["source"], gifts[i]["transaction_id"]) not in inserted
+            ]
+            gift_ids.update(inserted)
+            gift_ids.update(self.repository.ids_for_transactions(skipped))
+            
+            for index in chunk:
+                key = (gifts[index]["source"], gifts[index]["transaction_id"])
+                if key in inserted:
+                    results[index] = _result("created", inserted[key])
+                    created.append(gifts[index])
+                else:
+                    results[index] = _result("duplicate", gift_ids.get(key))
+        
+        for index, key in repeats.items():
+            results[index] = _result("duplicate", gift_ids.get(key))
+        
+        totals = self._donor_totals(created)
+        change_seq = next_change_seq(self.session.connection()) if totals else None
+        self.donor_repository.add_gift_totals(totals, change_seq)
+        self._add_geo_totals(totals)
+        if change_seq is not None:
+            apply_campaign_deltas(self.session.connection(), campaign_deltas(created), change_seq)
+        self.session.commit()
+        donor_cache.invalidate(*(item["donor_id"] for item in totals))
+        if totals:
+            clear_autocomplete_cache()
+        
+        return results
+    
+    def _archived_gift_ids(self, gifts: List[Dict[str, Any]]) -> Dict[TransactionKey, int]:
+        """Ids of archived gifts with the same keys, whatever donor or date the replay carries.
+        
+        Archiving records each gift's key in ``archived_transactions``, so
+        one indexed read covers every chunk.
+        """
+        return self.archive_repository.archived_gift_ids(
+            (gift["source"], gift["transaction_id"]) for gift in gifts
+        )
+    
+    def acknowledgement_queue(self, after_donor_id: Optional[int] = None, limit: int = 50) -> Dict[str, Any]:
+        """Gifts awaiting acknowledgement, grouped by donor, one page of donors."""
+        donors: Dict[int, Dict[str, Any]] = {}
+        for row in self.repository.acknowledgement_queue(after_donor_id, limit):
+            donor = donors.get(row["donor_id"])
+            if donor is None:
+                donor = donors[row["donor_id"]] = {
+                    "donor_id": row["donor_id"],
+                    "donor_name": row["donor_name"],
+                    "email": row["email"],
+                    "preferred_contact_method": row["preferred_contact_method"],
+                    "total_amount": 0.0,
+                    "gifts": [],
+                }
+            donor["total_amount"] += row["amount"]
+            donor["gifts"].append({
+                "gift_id": row["id"],
+                "amount": row["amount"],
+                "gift_date": row["gift_date"],
+                "gift_type": row["gift_type"],
+                "designation": row["designation"],
+            })
+        
+        page = list(donors.values())
+        next_after = page[-1]["donor_id"] if len(page) == limit else None
+        return {"donors": page, "next_after_donor_id": next_after}
+    
+    def acknowledge_gifts(self, gift_ids: List[int], acknowledged_by: str, method: str = "letter") -> Dict[str, Any]:
+        """Acknowledge gifts in one UPDATE and log one communication per donor.
+        
+        Gifts outside the acknowledgement queue (not completed, of a deleted
+        donor, already acknowledged) or that do not exist are skipped and
+        reported back.
+        """
+        now = datetime.utcnow()
+        requested = list(dict.fromkeys(gift_ids))
+        stamped = self.repository.acknowledge(requested, acknowledged_by, now)
+        
+        per_donor: Dict[int, List[Dict[str, Any]]] = {}
+        for gift in stamped:
+            per_donor.setdefault(gift["donor_id"], []).append(gift)
+        
+        communication_ids = self.communication_repository.insert_many([
+            {
+                "created_at": now,
+                "donor_id": donor_id,
+                "communication_type": method,
+                "direction": "outgoing",
+                "subject": "Gift acknowledgement",
+                "content": (
+                    f"Acknowledged {len(gifts)} gift(s) totalling ${sum(g['amount'] for g in gifts):,.2f}: "
+                    + ", ".join(f"#{g['id']}" for g in gifts)
+                ),
+                "contact_person": acknowledged_by,
+                "contact_date": now,
+                "follow_up_required": False,
+                "follow_up_completed": False,
+                "priority": "normal",
+                "status": "completed",
+            }
+            for donor_id, gifts in per_donor.items()
+        ])
+        self.session.commit()
+        
+        acknowledged_ids = {gift["id"] for gift in stamped}
+        return {
+            "acknowledged": len(stamped),
+            "communications": len(communication_ids),
+            "skipped_gift_ids": [gift_id for gift_id in requested if gift_id not in acknowledged_ids],
+        }
+    
+    def _add_geo_totals(self, totals: List[Dict[str, Any]]) -> None:
+        """Fold the donors' new giving into the geographic rollups."""
+        if not totals:
+            return
+        locations = self.donor_repository.locations([item["donor_id"] for item in totals])
+        deltas: GeoDeltas = defaultdict(lambda: [0, 0.0, 0])
+        for item in totals:
+            add_delta(deltas, locations[item["donor_id"]], 0, item["amount"], item["count"])
+        apply_geo_deltas(self.session.connection(), deltas)
+    
+    def _donor_totals(self, gifts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-donor sums of completed gifts, for one aggregate update per donor."""
+        totals: Dict[int, Dict[str, Any]] = {}
+        for gift in gifts:
+            if gift.get("gift_status", "completed") != "completed":
+                continue
+            amount, gift_date = gift["amount"], gift["gift_date"]
+            item = totals.get(gift["donor_id"])
+            if item is None:
+                totals[gift["donor_id"]] = {
+                    "donor_id": gift["donor_id"], "amount": amount, "count": 1,
+                    "largest": amount, "first_date": gift_date, "last_date": gift_date,
+                }
+                continue
+            item["amount"] += amount
+            item["count"] += 1
+            item["largest"] = max(item["largest"], amount)
+            item["first_date"] = min(item["first_date"], gift_date)
+            item["last_date"] = max(item["last_date"], gift_date)
+        return list(totals.values())
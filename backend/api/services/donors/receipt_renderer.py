@@ -0,0 +1,127 @@
+"""Tax receipt and giving statement rendering.
+
+Kept free of database and app imports so process-pool workers start fast;
+every function takes and returns plain, picklable values.
+"""
+from html import escape
+from string import Template
+from typing import Any, Dict, List, Tuple
+
+
+RECEIPT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Receipt $receipt_number</title></head>
+<body>
+<h1>$organization_name</h1>
+<p>$organization_tax_id</p>
+<h2>Official Donation Receipt $receipt_number</h2>
+<p>$donor_name<br>$address</p>
+<table>
+<tr><th>Date received</th><td>$gift_date</td></tr>
+<tr><th>Gift type</th><td>$gift_type</td></tr>
+<tr><th>Designation</th><td>$designation</td></tr>
+<tr><th>Amount received</th><td>$$$amount</td></tr>
+<tr><th>Tax-deductible amount</th><td>$$$deductible</td></tr>
+</table>
+<p>No goods or services were provided in exchange for this contribution
+except as noted above. Please keep this receipt for your tax records.</p>
+</body>
+</html>
+""")
+
+
+def _deductible(gift: Dict[str, Any]) -> float:
+    """Tax-deductible amount, defaulting to the full gift amount."""
+    deductible = gift.get("tax_deductible_amount")
+    return gift["amount"] if deductible is None else deductible
+
+
+def receipt_filename(receipt: Dict[str, Any]) -> str:
+    """File name for a receipt inside the output archive or directory."""
+    return f"receipt-{receipt['receipt_number']}.html"
+
+
+def render_receipt(receipt: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Render one receipt; returns (file name, document bytes)."""
+    address_lines = [
+        receipt.get("address_line_1"),
+        receipt.get("address_line_2"),
+        " ".join(
+            part for part in (receipt.get("city"), receipt.get("state"), receipt.get("postal_code")) if part
+        ),
+    ]
+    tax_id = receipt.get("organization_tax_id")
+    document = RECEIPT_TEMPLATE.substitute(
+        receipt_number=escape(receipt["receipt_number"]),
+        organization_name=escape(receipt["organization_name"]),
+        organization_tax_id=f"Tax ID {escape(tax_id)}" if tax_id else "",
+        donor_name=escape(receipt.get("donor_name") or ""),
+        address="<br>".join(escape(line) for line in address_lines if line),
+        gift_date=receipt["gift_date"].strftime("%B %d, %Y"),
+        gift_type=escape(receipt.get("gift_type") or ""),
+        designation=escape(receipt.get("designation") or ""),
+        amount=f"{receipt['amount']:,.2f}",
+        deductible=f"{_deductible(receipt):,.2f}",
+    )
+    return receipt_filename(receipt), document.encode("utf-8")
+
+
+STATEMENT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>$year Giving Statement</title></head>
+<body>
+<h1>$organization_name</h1>
+<p>$organization_tax_id</p>
+<h2>$year Giving Statement</h2>
+<p>$donor_name<br>$address</p>
+<table>
+<tr><th>Date</th><th>Receipt</th><th>Type</th><th>Designation</th><th>Amount</th><th>Deductible</th></tr>
+$rows
+<tr><th colspan="4">Total ($gift_count gifts)</th><th>$$$total_amount</th><th>$$$deductible_amount</th></tr>
+</table>
+<p>Thank you for your generosity in $year.</p>
+</body>
+</html>
+""")
+
+STATEMENT_ROW = Template(
+    "<tr><td>$gift_date</td><td>$receipt_number</td><td>$gift_type</td>"
+    "<td>$designation</td><td>$$$amount</td><td>$$$deductible</td></tr>"
+)
+
+
+def render_statement(
+    year: int, summary: Dict[str, Any], gifts: List[Dict[str, Any]], organization: Dict[str, str]
+) -> Tuple[str, bytes]:
+    """Render one donor's yearly statement; returns (file name, document bytes)."""
+    address_lines = [
+        summary.get("address_line_1"),
+        summary.get("address_line_2"),
+        " ".join(
+            part for part in (summary.get("city"), summary.get("state"), summary.get("postal_code")) if part
+        ),
+    ]
+    rows = "\n".join(
+        STATEMENT_ROW.substitute(
+            gift_date=gift["gift_date"].strftime("%Y-%m-%d"),
+            receipt_number=escape(gift.get("receipt_number") or ""),
+            gift_type=escape(gift.get("gift_type") or ""),
+            designation=escape(gift.get("designation") or ""),
+            amount=f"{gift['amount']:,.2f}",
+            deductible=f"{_deductible(gift):,.2f}",
+        )
+        for gift in gifts
+    )
+    tax_id = organization.get("organization_tax_id")
+    document = STATEMENT_TEMPLATE.substitute(
+        year=year,
+        organization_name=escape(organization["organization_name"]),
+        organization_tax_id=f"Tax ID {escape(tax_id)}" if tax_id else "",
+        donor_name=escape(summary.get("donor_name") or ""),
+        address="<br>".join(escape(line) for line in address_lines if line),
+        rows=rows,
+        gift_count=summary["gift_count"],
+        total_amount=f"{summary['total_amount']:,.2f}",
+        deductible_amount=f"{summary['deductible_amount']:,.2f}",
+    )
+    return f"statement-{year}-{summary['donor_id']}.html", document.encode("utf-8")
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Tax receipt generation for completed gifts.
+
+Usage::
+
+    python -m api.services.donors.receipt_service --year 2025 --output receipts-2025.zip
+"""
+import argparse
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlmodel import Session
+from api.config import get_settings
+from api.services.donors.receipt_renderer import render_receipt
+from api.utils.logger import get_logger
+from repositories.donors.gift_repository import GiftRepository
+
+
+logger = get_logger(__name__)
+
+RECEIPT_CHUNK_SIZE = 1_000
+
+# Claims older than this belong to a run that died, and its receipts are issued again
+RECEIPT_CLAIM_HOURS = 24
+
+
+@contextmanager
+def document_writer(output: Path, per_file: bool) -> Iterator[Callable[[str, bytes], Any]]:
+    """Yield a ``write(name, data)`` callable into a zip file or a directory."""
+    if per_file:
+        output.mkdir(parents=True, exist_ok=True)
+        yield lambda name, data: (output / name).write_bytes(data)
+        return
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        yield archive.writestr
+
+
+class ReceiptService:
+    """Issues tax receipts for completed gifts in chunks.
+    
+    Each chunk is read through the pending-receipt index, claimed so that
+    concurrent runs skip it, numbered from the year's sequence in one
+    reservation, rendered across a process pool and written to the output.
+    Gifts are flagged sent only once the output is complete, since a zip
+    cut short has no central directory and loses every receipt in it. A
+    run that fails releases its claims and can be restarted: gifts keep
+    the numbers they were given and only unsent receipts are produced
+    again. Claims of a run that was killed expire after
+    ``RECEIPT_CLAIM_HOURS``.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = GiftRepository(session)
+    
+    def generate(
+        self,
+        year: int,
+        output: Path,
+        per_file: bool = False,
+        workers: Optional[int] = None,
+        chunk_size: int = RECEIPT_CHUNK_SIZE,
+        limit: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Render pending receipts for ``year``; ``workers=0`` renders in-process."""
+        settings = get_settings()
+        organization = {
+            "organization_name": settings.receipt_organization_name,
+            "organization_tax_id": settings.receipt_organization_tax_id,
+        }
+        pool = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+        issued = 0
+        numbered = 0
+        claimed: List[int] = []
+        try:
+            with document_writer(output, per_file) as write:
+                while limit is None or issued < limit:
+                    size = chunk_size if limit is None else min(chunk_size, limit - issued)
+                    now = datetime.utcnow()
+                    gifts = self.repository.pending_receipts(
+                        year, size, now - timedelta(hours=RECEIPT_CLAIM_HOURS)
+                    )
+                    if not gifts:
+                        break
+                    
+                    gift_ids = [gift["id"] for gift in gifts]
+                    self.repository.claim_receipts(gift_ids, now)
+                    numbered += self._assign_numbers(year, gifts)
+                    self.session.commit()
+                    claimed += gift_ids
+                    receipts = [{**gift, **organization} for gift in gifts]
+                    if pool is None:
+                        rendered = map(render_receipt, receipts)
+                    else:
+                        rendered = pool.map(render_receipt, receipts, chunksize=64)
+                    for name, document in rendered:
+                        write(name, document)
+                    issued += len(gifts)
+                    logger.info(f"Rendered {issued} receipts for {year}")
+            
+            sent_at = datetime.utcnow()
+            for start in range(0, len(claimed), chunk_size):
+                self.repository.mark_receipts_sent(claimed[start:start + chunk_size], sent_at)
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            for start in range(0, len(claimed), chunk_size):
+                self.repository.claim_receipts(claimed[start:start + chunk_size], None)
+            self.session.commit()
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        return {"receipts": issued, "numbered": numbered}
+    
+    def _assign_numbers(self, year: int, gifts: List[Dict[str, Any]]) -> int:
+        """Number the gifts that have no receipt number yet."""
+        unnumbered = [gift for gift in gifts if not gift["receipt_number"]]
+        if not unnumbered:
+            return 0
+        
+        first = self.repository.reserve_receipt_numbers(year, len(unnumbered))
+        numbers = {}
+        for offset, gift in enumerate(unnumbered):
+            gift["receipt_number"] = f"{year}-{first + offset:06d}"
+            numbers[gift["id"]] = gift["receipt_number"]
+        self.repository.set_receipt_numbers(numbers)
+        return len(unnumbered)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from api.dependencies.database import get_engine
+    
+    parser = argparse.ArgumentParser(description="Generate tax receipts for completed gifts.")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--output", type=Path, required=True, help="zip file, or directory with --per-file")
+    parser.add_argument("--per-file", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=RECEIPT_CHUNK_SIZE)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    with Session(get_engine()) as session:
+        summary = ReceiptService(session).generate(
+            args.year, args.output, per_file=args.per_file, workers=args.workers,
+            chunk_size=args.chunk_size, limit=args.limit
+        )
+    print(f"Issued {summary['receipts']} receipts ({summary['numbered']} newly numbered) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
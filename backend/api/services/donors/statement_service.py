@@ -0,0 +1,178 @@
+"""Year-end giving statements for donors.
+
+Usage::
+
+    python -m api.services.donors.statement_service --year 2025 --output statements-2025.zip
+"""
+import argparse
+import heapq
+import sys
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlmodel import Session
+from api.config import get_settings
+from api.services.donors.receipt_renderer import render_statement
+from api.services.donors.receipt_service import document_writer
+from api.utils.logger import get_logger
+from repositories.donors.archive_repository import ArchiveRepository
+from repositories.donors.donor_repository import DonorRepository
+from repositories.donors.gift_repository import GiftRepository
+
+
+logger = get_logger(__name__)
+
+# Donors whose details are loaded per query
+STATEMENT_DONOR_BATCH = 500
+
+STATEMENT_LINE_FIELDS = (
+    "id", "donor_id", "gift_date", "amount", "tax_deductible_amount", "gift_type", "designation",
+    "receipt_number",
+)
+
+
+class StatementService:
+    """Writes one giving statement per donor for a calendar year.
+    
+    Gift lines come from a single cursor ordered by donor id, so each
+    statement is written as soon as its donor's gifts have been read.
+    Totals are summed from those lines rather than read by a second query,
+    which could see gifts ingested after the cursor started, and donor
+    names and addresses are loaded one batch of donors at a time. Memory
+    holds one batch of donors' gifts; runtime grows linearly with the
+    year's gift count. Years with archived gifts merge the archive chunks
+    into the gift stream.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = GiftRepository(session)
+        self.archive = ArchiveRepository(session)
+        self.donors = DonorRepository(session)
+    
+    def generate(self, year: int, output: Path, per_file: bool = False) -> Dict[str, int]:
+        """Write statements for every donor who gave in ``year``."""
+        settings = get_settings()
+        organization = {
+            "organization_name": settings.receipt_organization_name,
+            "organization_tax_id": settings.receipt_organization_tax_id,
+        }
+        if self.archive.holds_year("gifts", year):
+            donor_statements = self._with_archive(year)
+        else:
+            donor_statements = self._from_hot_tables(year)
+        statements = 0
+        gifts = 0
+        
+        with document_writer(output, per_file) as write:
+            for summary, lines in donor_statements:
+                write(*render_statement(year, summary, lines, organization))
+                statements += 1
+                gifts += len(lines)
+                if statements % 10_000 == 0:
+                    logger.info(f"Wrote {statements} statements for {year}")
+        
+        return {"statements": statements, "gifts": gifts}
+    
+    def _from_hot_tables(self, year: int) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """(summary, gift lines) per donor from the gift cursor."""
+        return self._in_batches(self._hot_lines(year))
+    
+    def _with_archive(self, year: int) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """(summary, gift lines) per donor for a year that is partly archived.
+        
+        Archive chunks and the gifts still hot are both read in donor order
+        and merged.
+        """
+        hot = self._hot_lines(year)
+        archived = (
+            (donor_id, [_line(row) for row in rows if row["gift_status"] == "completed"])
+            for donor_id, rows in self.archive.year_rows("gifts", year)
+        )
+        merged = groupby(heapq.merge(hot, archived, key=itemgetter(0)), key=itemgetter(0))
+        donor_lines = (
+            (
+                donor_id,
+                sorted((line for _, part in parts for line in part), key=itemgetter("gift_date", "id")),
+            )
+            for donor_id, parts in merged
+        )
+        return self._in_batches(donor_lines)
+    
+    def _hot_lines(self, year: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """(donor id, gift lines) from the gifts table, in donor order."""
+        for donor_id, rows in groupby(
+            self.repository.yearly_gift_details(year), key=itemgetter("donor_id")
+        ):
+            yield donor_id, list(rows)
+    
+    def _in_batches(
+        self, donor_lines: Iterator[Tuple[int, List[Dict[str, Any]]]]
+    ) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Summarize (donor id, gift lines) pairs ``STATEMENT_DONOR_BATCH`` donors at a time."""
+        batch: List[Tuple[int, List[Dict[str, Any]]]] = []
+        for donor_id, lines in donor_lines:
+            if lines:
+                batch.append((donor_id, lines))
+            if len(batch) >= STATEMENT_DONOR_BATCH:
+                yield from self._summarize(batch)
+                batch = []
+        yield from self._summarize(batch)
+    
+    def _summarize(
+        self, batch: List[Tuple[int, List[Dict[str, Any]]]]
+    ) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Attach donor details and totals; soft-deleted donors get no statement."""
+        if not batch:
+            return
+        donor_ids = [donor_id for donor_id, _ in batch]
+        donors = {donor.id: donor for donor in self.donors.get_by_ids(donor_ids)}
+        for donor_id, lines in batch:
+            donor = donors.get(donor_id)
+            if donor is None:
+                continue
+            summary = {
+                "donor_id": donor_id,
+                "donor_name": donor.full_name,
+                "address_line_1": donor.address_line_1,
+                "address_line_2": donor.address_line_2,
+                "city": donor.city,
+                "state": donor.state,
+                "postal_code": donor.postal_code,
+                "gift_count": len(lines),
+                "total_amount": sum(line["amount"] for line in lines),
+                "deductible_amount": sum(
+                    line["amount"] if line["tax_deductible_amount"] is None
+                    else line["tax_deductible_amount"]
+                    for line in lines
+                ),
+                "first_gift_date": lines[0]["gift_date"],
+                "last_gift_date": lines[-1]["gift_date"],
+            }
+            yield summary, lines
+
+
+def _line(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Statement line of an archived gift, shaped like a yearly_gift_details row."""
+    return {key: row[key] for key in STATEMENT_LINE_FIELDS}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    from api.dependencies.database import get_engine
+    
+    parser = argparse.ArgumentParser(description="Generate year-end giving statements.")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--output", type=Path, required=True, help="zip file, or directory with --per-file")
+    parser.add_argument("--per-file", action="store_true")
+    args = parser.parse_args(argv)
+    
+    with Session(get_engine()) as session:
+        summary = StatementService(session).generate(args.year, args.output, per_file=args.per_file)
+    print(f"Wrote {summary['statements']} statements covering {summary['gifts']} gifts to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Donor delta sync for clients that keep a local copy."""
+from typing import Any, Dict, List, Optional, Tuple
+from sqlmodel import Session
+from repositories.donors.donor_repository import DonorRepository
+from repositories.donors.donor_tombstone_repository import DonorTombstoneRepository
+
+
+class InvalidSyncToken(ValueError):
+    """Raised when a change token was not issued by this API."""
+
+
+def parse_token(token: Optional[str]) -> Tuple[int, int]:
+    """(change_seq, id) position encoded in a change token; None means the start."""
+    if not token:
+        return 0, 0
+    change_seq, sep, donor_id = token.partition("-")
+    if not sep or not change_seq.isdigit() or not donor_id.isdigit():
+        raise InvalidSyncToken(token)
+    return int(change_seq), int(donor_id)
+
+
+def format_token(position: Tuple[int, int]) -> str:
+    """Opaque change token for a (change_seq, id) position."""
+    return f"{position[0]}-{position[1]}"
+
+
+class DonorSyncService:
+    """Donors created, changed or deleted after a change token.
+    
+    Live donors and tombstones are both read with keyset scans on
+    (change_seq, id) and merged, so a page can end inside a bulk write
+    that stamped many donors with the same change number.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = DonorRepository(session)
+        self.tombstones = DonorTombstoneRepository(session)
+    
+    def changes(self, since: Optional[str], fields: List[str], limit: int = 500) -> Dict[str, Any]:
+        """One page of changes after ``since``, with the token to poll from next."""
+        after = parse_token(since)
+        changed = [
+            ((row.pop("_change_seq"), row.pop("_id")), row)
+            for row in self.repository.changed_since(fields, after, limit + 1)
+        ]
+        deleted = [
+            ((row["change_seq"], row["donor_id"]), None, row)
+            for row in self.tombstones.deleted_since(after, limit + 1)
+        ]
+        merged = sorted(
+            [(position, row, None) for position, row in changed] + deleted,
+            key=lambda item: item[0]
+        )
+        page = merged[:limit]
+        
+        return {
+            "donors": [row for _, row, _ in page if row is not None],
+            "deleted": [
+                {"id": tombstone["donor_id"], "merged_into_id": tombstone["merged_into_id"]}
+                for _, _, tombstone in page
+                if tombstone is not None
+            ],
+            "next_token": format_token(page[-1][0]) if page else format_token(after),
+            "has_more": len(merged) > limit,
+        }
@@ -0,0 +1,135 @@
+"""Donor timeline of gifts and communications, hot and archived."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlmodel import Session
+from repositories.donors.archive_repository import ArchiveRepository
+from repositories.donors.communication_repository import CommunicationRepository
+from repositories.donors.donor_repository import DonorRepository
+from repositories.donors.gift_repository import GiftRepository
+
+
+# Event kinds in timeline order for events with the same date: the key is
+# (date, rank, id), newest first
+KIND_RANKS = {"communication": 0, "gift": 1}
+
+# Larger than any row id, for "everything at this date" bounds
+_ALL_IDS = 2 ** 62
+
+Position = Tuple[datetime, int, int]  # (date, kind rank, id)
+
+
+class InvalidTimelineToken(ValueError):
+    """Raised when a timeline token was not issued by this API."""
+
+
+def parse_token(token: Optional[str]) -> Optional[Position]:
+    """Position of the last event already returned; None means the newest event."""
+    if not token:
+        return None
+    try:
+        date, rank, event_id = token.split("~")
+        position = (datetime.fromisoformat(date), int(rank), int(event_id))
+    except ValueError:
+        raise InvalidTimelineToken(token)
+    if position[1] not in KIND_RANKS.values():
+        raise InvalidTimelineToken(token)
+    return position
+
+
+def format_token(position: Position) -> str:
+    """Opaque token for a timeline position."""
+    return f"{position[0].isoformat()}~{position[1]}~{position[2]}"
+
+
+def _bound(kind: str, position: Optional[Position]) -> Optional[Tuple[datetime, int]]:
+    """(date, id) upper bound for one kind's rows that sort after ``position``."""
+    if position is None:
+        return None
+    date, rank, event_id = position
+    if KIND_RANKS[kind] == rank:
+        return date, event_id
+    # Lower-ranked kinds follow at the same date; higher-ranked ones precede it
+    return date, _ALL_IDS if KIND_RANKS[kind] < rank else 0
+
+
+class DonorTimelineService:
+    """Gifts and communications of a donor, newest first, across the hot and archived tiers.
+    
+    The newest ``limit`` + 1 rows of each hot table decide how far back a
+    page can reach; archive chunks are read only for the years from there
+    back, which for recent pages is a lookup that finds nothing.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.gifts = GiftRepository(session)
+        self.communications = CommunicationRepository(session)
+        self.archive = ArchiveRepository(session)
+        self.donors = DonorRepository(session)
+    
+    def timeline(
+        self, donor_id: int, before: Optional[str] = None, limit: int = 50
+    ) -> Optional[Dict[str, Any]]:
+        """One page of events after the ``before`` token, with the token for the next page.
+        
+        Returns None for unknown and deleted donors.
+        """
+        position = parse_token(before)
+        if not self.donors.existing_ids([donor_id]):
+            return None
+        events = [
+            _gift_event(row, archived=False)
+            for row in self.gifts.for_donor(donor_id, _bound("gift", position), limit + 1)
+        ] + [
+            _communication_event(row, archived=False)
+            for row in self.communications.for_donor(
+                donor_id, _bound("communication", position), limit + 1
+            )
+        ]
+        events.sort(key=_key, reverse=True)
+        
+        # Archived events older than the oldest candidate cannot make the page
+        first_year = events[limit]["date"].year if len(events) > limit else None
+        last_year = position[0].year if position else None
+        archived = self.archive.donor_rows(donor_id, ("gifts", "communications"), first_year, last_year)
+        events += [_gift_event(row, archived=True) for row in archived.get("gifts", [])]
+        events += [_communication_event(row, archived=True) for row in archived.get("communications", [])]
+        if position is not None:
+            events = [event for event in events if _key(event) < position]
+        events.sort(key=_key, reverse=True)
+        
+        page = events[:limit]
+        has_more = len(events) > limit
+        return {
+            "events": page,
+            "next_before": format_token(_key(page[-1])) if has_more else None,
+        }
+
+
+def _key(event: Dict[str, Any]) -> Position:
+    return event["date"], KIND_RANKS[event["kind"]], event["id"]
+
+
+def _gift_event(row: Dict[str, Any], archived: bool) -> Dict[str, Any]:
+    return {
+        "kind": "gift",
+        "id": row["id"],
+        "date": row["gift_date"],
+        "archived": archived,
+        "amount": row["amount"],
+        "gift_type": row["gift_type"],
+        "designation": row["designation"],
+        "gift_status": row["gift_status"],
+    }
+
+
+def _communication_event(row: Dict[str, Any], archived: bool) -> Dict[str, Any]:
+    return {
+        "kind": "communication",
+        "id": row["id"],
+        "date": row["contact_date"],
+        "archived": archived,
+        "communication_type": row["communication_type"],
+        "direction": row["direction"],
+        "subject": row["subject"],
+    }
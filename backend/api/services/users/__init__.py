@@ -0,0 +1,5 @@
+"""User service modules."""
+from .auth_service import AuthService, clear_auth_caches, invalidate_user
+from .user_service import UserService
+
+__all__ = ["AuthService", "UserService", "clear_auth_caches", "invalidate_user"]
@@ -0,0 +1,112 @@
+"""Access token verification with cached claims and user lookups."""
+import time
+from itertools import chain
+from typing import Any, Dict, Optional
+
+import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from api.config import get_settings
+from api.utils import invalidation
+from api.utils.cache import TTLCache
+from api.utils.security import decode_access_token
+from models.user import User
+from repositories.users.user_repository import UserRepository
+
+
+_settings = get_settings()
+
+# token -> verified claims, kept no longer than the token itself is valid
+_token_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    maxsize=_settings.auth_cache_size, ttl=_settings.token_cache_ttl_seconds
+)
+# user id -> detached snapshot of the users row
+_user_cache: TTLCache[int, User] = TTLCache(
+    maxsize=_settings.auth_cache_size, ttl=_settings.user_cache_ttl_seconds
+)
+
+
+class AuthService:
+    """Resolve bearer tokens to active users."""
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = UserRepository(session)
+    
+    def authenticate(self, token: str) -> Optional[User]:
+        """Return the active user for a token, or None if it is not valid.
+
+        Warm calls are two dictionary hits: one for the verified claims
+        and one for the user snapshot.
+        """
+        claims = self._verify(token)
+        if claims is None:
+            return None
+        
+        user = self.get_user(int(claims["sub"]))
+        if not user or not user.is_active:
+            return None
+        return user
+    
+    def get_user(self, user_id: int) -> Optional[User]:
+        """Get a user snapshot from the cache, loading it on a miss."""
+        version = invalidation.versions(("user", user_id))
+        user = _user_cache.get(user_id, version=version)
+        if user is None:
+            db_user = self.repository.get_by_id(user_id)
+            if not db_user:
+                return None
+            user = User(**db_user.model_dump())
+            _user_cache.set(user_id, user, version=version)
+        return user
+    
+    def _verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Decode a token once and cache its claims until it expires."""
+        claims = _token_cache.get(token)
+        if claims is not None:
+            return claims
+        
+        try:
+            claims = decode_access_token(token)
+        except jwt.InvalidTokenError:
+            return None
+        
+        _token_cache.set(token, claims, ttl=claims["exp"] - time.time())
+        return claims
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user's cached snapshot in every worker and every cached token issued to them."""
+    _user_cache.pop(user_id)
+    _token_cache.pop_where(lambda _, claims: claims.get("sub") == str(user_id))
+    invalidation.bump([("user", user_id)])
+
+
+def clear_auth_caches() -> None:
+    """Empty both auth caches."""
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_changed_users(session, flush_context) -> None:
+    """Remember users updated or deleted in this transaction."""
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_changed_users(session) -> None:
+    """Invalidate cached users once their changes are committed."""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _forget_changed_users(session, previous_transaction) -> None:
+    """Rolled-back changes never reached other sessions."""
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,76 @@
+"""User service for business logic."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session
+from api.utils.security import hash_password_async, verify_password_async
+from models.user import User
+from repositories.users.user_repository import UserRepository
+
+
+class UserService:
+    """Service for user accounts and credentials.
+    
+    Password hashing and verification are async because bcrypt runs in a
+    dedicated thread pool rather than on the event loop.
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.repository = UserRepository(session)
+    
+    async def create_user(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        **fields: Any
+    ) -> Optional[User]:
+        """Create a user; returns None if the email or username is taken."""
+        if self.repository.find_by_email_or_username(email, username):
+            return None
+        
+        user = User(
+            username=username,
+            email=email,
+            hashed_password=await hash_password_async(password),
+            **fields
+        )
+        return self.repository.create(user)
+    
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """Return the active user matching the credentials, or None."""
+        user = self.repository.find_by_email(email)
+        password_ok = await verify_password_async(
+            password, user.hashed_password if user else None
+        )
+        if not user or not password_ok or not user.is_active:
+            return None
+        return user
+    
+    def get_user(self, user_id: int) -> Optional[User]:
+        """Get user by ID."""
+        return self.repository.get_by_id(user_id)
+    
+    def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+        """List users with pagination."""
+        return self.repository.get_all(skip=skip, limit=limit)
+    
+    def update_user(self, user_id: int, user_data: Dict[str, Any]) -> Optional[User]:
+        """Update user fields; cached copies are invalidated on commit."""
+        user = self.repository.get_by_id(user_id)
+        if not user:
+            return None
+        
+        for key, value in user_data.items():
+            if hasattr(user, key):
+                setattr(user, key, value)
+        user.updated_at = datetime.utcnow()
+        
+        return self.repository.update(user)
+    
+    def delete_user(self, user_id: int) -> bool:
+        """Delete user by ID."""
+        if not self.repository.get_by_id(user_id):
+            return False
+        self.repository.delete(user_id)
+        return True
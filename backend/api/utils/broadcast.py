@@ -0,0 +1,213 @@
+"""Fan-out of one in-process feed to many streaming clients."""
+import asyncio
+import contextvars
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Optional, Set
+
+from api.utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# What a subscriber whose queue is full loses
+OVERFLOW_POLICIES = ("drop", "skip")
+
+# Milliseconds a disconnected browser waits before reconnecting to a stream
+RECONNECT_MILLISECONDS = 3_000
+
+
+def server_sent_event(event: str, data: Any) -> str:
+    """One server-sent event carrying ``data`` as compact JSON."""
+    payload = json.dumps(data, separators=(",", ":"), default=datetime.isoformat)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class SubscriptionClosed(Exception):
+    """Raised when reading from a subscription that was closed or dropped."""
+
+
+class Subscription:
+    """One client's bounded queue of messages from a broadcaster.
+
+    Messages are lists of items. Publishing never waits on a client; when
+    a subscriber's queue is full, ``overflow="drop"`` disconnects it, so
+    its reader sees ``SubscriptionClosed`` instead of a stream with silent
+    gaps, and ``overflow="skip"`` discards its oldest queued message and
+    counts the items in ``skipped``, so a slow reader keeps to the latest
+    messages.
+    """
+
+    def __init__(self, broadcaster: "Broadcaster", max_queued: int, overflow: str = "drop"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._broadcaster = broadcaster
+        self._messages: Deque[Any] = deque()
+        self._ready = asyncio.Event()
+        self.max_queued = max(max_queued, 1)
+        self.overflow = overflow
+        self.skipped = 0
+        self.closed = False
+        self.dropped = False
+
+    def offer(self, message: Any) -> bool:
+        """Queue a message without waiting; returns False if the subscriber is gone."""
+        if self.closed:
+            return False
+        if len(self._messages) >= self.max_queued:
+            if self.overflow == "drop":
+                self.dropped = True
+                self.close()
+                return False
+            self.skipped += len(self._messages.popleft())
+        self._messages.append(message)
+        self._ready.set()
+        return True
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """The next message, or None when ``timeout`` seconds pass without one."""
+        if not self._messages and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.closed:
+            raise SubscriptionClosed("dropped" if self.dropped else "closed")
+        return self._messages.popleft()
+
+    def take_skipped(self) -> int:
+        """Items skipped since the last call."""
+        skipped, self.skipped = self.skipped, 0
+        return skipped
+
+    def close(self) -> None:
+        """Stop delivery, discard queued messages and wake the reader."""
+        if self.closed:
+            return
+        self.closed = True
+        self._messages.clear()
+        self._ready.set()
+        self._broadcaster._remove(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Broadcaster:
+    """Publishes every message to every subscriber's bounded queue."""
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+        self._subscribers: Set[Subscription] = set()
+
+    async def subscribe(self, overflow: str = "drop") -> Subscription:
+        """A new subscription; close it, or use it as a context manager, when done."""
+        subscription = Subscription(self, self.max_queued, overflow)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def publish(self, message: Any) -> int:
+        """Offer a message to every subscriber; returns how many took it."""
+        delivered = 0
+        for subscription in list(self._subscribers):
+            if subscription.offer(message):
+                delivered += 1
+            elif subscription.dropped:
+                logger.info(f"Dropped a slow {type(self).__name__} subscriber")
+        return delivered
+
+    def close(self) -> None:
+        """Close every subscription."""
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _remove(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+
+class PollingBroadcaster(Broadcaster, ABC):
+    """A broadcaster fed by one polling loop that runs while anyone is subscribed.
+
+    However many clients follow the feed, the process polls its source
+    once per interval. Subclasses implement ``start``, which takes the
+    source's current position, and ``poll``, which returns the messages
+    after it and advances it; both block and run in a worker thread. The
+    loop stops with the last subscriber and takes a fresh position when
+    the next one arrives, so idle workers never poll and a restart never
+    replays a backlog.
+    """
+
+    def __init__(self, interval_seconds: float = 1.0, max_queued: int = 100):
+        super().__init__(max_queued)
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._started: Optional[asyncio.Future] = None
+
+    @abstractmethod
+    def start(self) -> None:
+        """Take the source's current position."""
+
+    @abstractmethod
+    def poll(self) -> list:
+        """Messages since the position, advancing it."""
+
+    async def subscribe(self, overflow: str = "drop") -> Subscription:
+        """Subscribe once the loop has taken its position, so no later change is missed."""
+        subscription = await super().subscribe(overflow)
+        if self._task is None:
+            self._started = asyncio.get_running_loop().create_future()
+            # The shared loop must not carry the first subscriber's request context
+            self._task = contextvars.Context().run(asyncio.create_task, self._run(self._started))
+        started = self._started
+        try:
+            await asyncio.shield(started)
+        except BaseException:
+            subscription.close()
+            raise
+        return subscription
+
+    def close(self) -> None:
+        """Close every subscription and stop the loop."""
+        super().close()
+        self._stop()
+
+    def _remove(self, subscription: Subscription) -> None:
+        super()._remove(subscription)
+        if not self._subscribers:
+            self._stop()
+
+    def _stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            if not self._started.done():
+                self._started.cancel()
+            self._task = None
+            self._started = None
+
+    async def _run(self, started: asyncio.Future) -> None:
+        try:
+            await asyncio.to_thread(self.start)
+        except Exception as error:
+            started.set_exception(error)
+            self._task = None
+            return
+        started.set_result(None)
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                messages = await asyncio.to_thread(self.poll)
+            except Exception:
+                logger.exception(f"{type(self).__name__} poll failed")
+                continue
+            for message in messages:
+                self.publish(message)
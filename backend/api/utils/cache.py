@@ -0,0 +1,81 @@
+"""In-process caching utilities."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    A lookup is a dictionary hit plus a clock read; the least recently
+    used entry is evicted once ``maxsize`` is reached. Entries stored with
+    a ``version`` are only returned to lookups passing the same version,
+    so callers can expire them early when the source data changes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, Any, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, version: Any = None) -> Optional[V]:
+        """Get a live entry, or None if missing, expired or stored under another version."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, stored_version, value = entry
+            if expires_at <= time.monotonic() or stored_version != version:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None, version: Any = None) -> None:
+        """Store an entry, optionally with a shorter TTL than the default.
+
+        ``version`` should be read before the value was loaded, so a change
+        that lands in between leaves the entry already stale.
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + lifetime, version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove an entry and return its value if it was present."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[2] if entry else None
+
+    def pop_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """Remove every entry matching ``predicate``; returns the count."""
+        with self._lock:
+            doomed = [key for key, (_, _, value) in self._data.items() if predicate(key, value)]
+            for key in doomed:
+                del self._data[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None  # type: ignore[arg-type]
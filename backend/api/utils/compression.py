@@ -0,0 +1,147 @@
+"""Brotli or gzip compression of large and streamed responses.
+
+Unlike Starlette's ``GZipMiddleware``, streamed bodies are flushed chunk
+by chunk, so a client reading an export receives each chunk as it is
+produced rather than when the compressor's buffer fills. Brotli needs the
+optional ``brotli`` package; without it clients get gzip.
+"""
+import zlib
+from functools import lru_cache
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.response_formats import quality_values
+
+
+GZIP_LEVEL = 6
+# Quality for responses compressed on the fly; 11 is for static assets
+BROTLI_QUALITY = 5
+
+# Bodies that are already compressed, or must reach the client event by event
+SKIPPED_MEDIA_TYPES = (
+    "text/event-stream", "image/", "audio/", "video/", "application/zip", "application/gzip",
+)
+
+
+@lru_cache(maxsize=None)
+def brotli_module():
+    """The brotli module, or None when it is not installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """``br`` or ``gzip``, whichever the client ranks higher (brotli on a tie), or None."""
+    available = ["br", "gzip"] if brotli_module() is not None else ["gzip"]
+    qualities = dict(quality_values(accept_encoding))
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental compressor whose output so far is always decodable."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli_module().Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def flush(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+class CompressionMiddleware:
+    """Compress responses of at least ``minimum_size`` bytes for clients that accept it.
+
+    Streamed bodies are held back only until they reach ``minimum_size``;
+    a stream that ends sooner goes out uncompressed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(encoding, self.minimum_size, send))
+
+
+class _CompressingSend:
+    """The ``send`` callable of one compressed response."""
+
+    def __init__(self, encoding: str, minimum_size: int, send: Send):
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = send
+        self.start: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or media_type.startswith(SKIPPED_MEDIA_TYPES)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            data = self.compressor.flush(body) if more_body else self.compressor.finish(body)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if more_body and self.pending_size < self.minimum_size:
+            return
+        body, self.pending = b"".join(self.pending), []
+        if self.pending_size < self.minimum_size:
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        self.compressor = _Compressor(self.encoding)
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+            data = self.compressor.flush(body)
+        else:
+            data = self.compressor.finish(body)
+            headers["Content-Length"] = str(len(data))
+        await self.send({**self.start, "headers": headers.raw})
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
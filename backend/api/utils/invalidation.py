@@ -0,0 +1,111 @@
+"""Cache invalidation shared by every worker process on a host.
+
+Cached entries remember the version stamps of the keys they were loaded
+under and count as stale once any of those stamps changes. Writers give
+each changed key a fresh random stamp after their transaction commits.
+With ``cache_bus_path`` set the stamps live in a memory-mapped file that
+all workers map, so a write in one worker expires entries in every other
+worker without messages or polling; reading a stamp is a hash and a
+memory load. Keys share a fixed number of slots, so an unrelated write
+can expire an entry early but never leaves one stale.
+"""
+import mmap
+import os
+import secrets
+import struct
+import threading
+import zlib
+from typing import Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.config import get_settings
+
+
+# One unsigned 64-bit stamp per slot
+_STAMP = struct.Struct("<Q")
+
+
+class VersionTable:
+    """Fixed-size table of version stamps, optionally backed by a shared file.
+
+    Stamps are random rather than incremented, so concurrent writers need
+    no lock: whichever stamp lands last still differs from every stamp a
+    reader could have seen before the write.
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: int = 65_536):
+        self.path = path
+        self.slots = slots
+        size = slots * _STAMP.size
+        if path:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._buffer = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        else:
+            self._buffer = mmap.mmap(-1, size)
+
+    def versions(self, keys: Iterable[Hashable]) -> Tuple[int, ...]:
+        """Current stamps of the keys, in order."""
+        return tuple(_STAMP.unpack_from(self._buffer, self._offset(key))[0] for key in keys)
+
+    def bump(self, keys: Iterable[Hashable]) -> None:
+        """Give every key a new stamp."""
+        for key in keys:
+            _STAMP.pack_into(self._buffer, self._offset(key), secrets.randbits(64))
+
+    def _offset(self, key: Hashable) -> int:
+        # repr() is stable across processes, unlike hash() of strings
+        return zlib.crc32(repr(key).encode()) % self.slots * _STAMP.size
+
+
+_table: Optional[VersionTable] = None
+_table_lock = threading.Lock()
+
+# session.info key: invalidation keys to bump once the transaction commits
+PENDING_KEYS = "invalidation_keys"
+
+
+def version_table() -> VersionTable:
+    """The process-wide table, opened from settings on first use."""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                settings = get_settings()
+                _table = VersionTable(settings.cache_bus_path or None, settings.cache_bus_slots)
+    return _table
+
+
+def versions(*keys: Hashable) -> Tuple[int, ...]:
+    """Current stamps of the keys; read them before loading the data to cache."""
+    return version_table().versions(keys)
+
+
+def bump(keys: Iterable[Hashable]) -> None:
+    """Expire cached entries for the keys in every worker."""
+    version_table().bump(keys)
+
+
+def bump_after_commit(session: Session, keys: Iterable[Hashable]) -> None:
+    """Expire cached entries for the keys once ``session`` commits."""
+    session.info.setdefault(PENDING_KEYS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_keys(session) -> None:
+    """Publish the keys changed by the committed transaction."""
+    keys = session.info.pop(PENDING_KEYS, None)
+    if keys:
+        bump(keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_pending_keys(session, previous_transaction) -> None:
+    """Rolled-back changes never reached other sessions."""
+    session.info.pop(PENDING_KEYS, None)
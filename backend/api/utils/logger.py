@@ -4,28 +4,32 @@ import sys
 from typing import Optional
 
 
-def get_logger(name: Optional[str] = None) -> logging.Logger:
-    """Get configured logger instance."""
-    logger_name = name or __name__
-    logger = logging.getLogger(logger_name)
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """Install the console handler on the root logger once and set the level."""
+    global _handler
+    root = logging.getLogger()
     
-    if not logger.handlers:
+    if _handler is None:
         # Create console handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
+        _handler = logging.StreamHandler(sys.stdout)
         
         # Create formatter
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
-        handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-        
-        # Prevent duplicate logs
-        logger.propagate = False
+        _handler.setFormatter(formatter)
+        root.addHandler(_handler)
+        root.setLevel(logging.INFO)
     
-    return logger
\ No newline at end of file
+    if level:
+        root.setLevel(level.upper())
+
+
+def get_logger(name: Optional[str] = None) -> logging.Logger:
+    """Get configured logger instance."""
+    configure_logging()
+    return logging.getLogger(name or __name__)
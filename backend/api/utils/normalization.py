@@ -0,0 +1,64 @@
+"""Normalized donor keys used for matching and prefix lookups."""
+import re
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    if not name:
+        return ""
+    normalized = re.sub(r'[^\w\s]', '', name.lower())
+    return ' '.join(normalized.split())
+
+
+def normalize_email(email: str) -> str:
+    """Lowercase and trim an email address."""
+    if not email:
+        return ""
+    return email.lower().strip()
+
+
+def normalize_phone(phone: str) -> str:
+    """Keep only the digits of a phone number."""
+    if not phone:
+        return ""
+    return re.sub(r'[^\d]', '', phone)
+
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT", "delaware": "DE",
+    "district of columbia": "DC", "florida": "FL", "georgia": "GA", "hawaii": "HI",
+    "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA", "kansas": "KS",
+    "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK",
+    "oregon": "OR", "pennsylvania": "PA", "puerto rico": "PR", "rhode island": "RI",
+    "south carolina": "SC", "south dakota": "SD", "tennessee": "TN", "texas": "TX",
+    "utah": "UT", "vermont": "VT", "virginia": "VA", "washington": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+
+
+def normalize_state(state: str) -> str:
+    """Uppercase state code; full US state names map to their code."""
+    name = normalize_name(state)
+    if not name:
+        return ""
+    return US_STATES.get(name, name.replace(" ", "").upper())
+
+
+def normalize_city(city: str) -> str:
+    """City names compare like donor names."""
+    return normalize_name(city)
+
+
+def normalize_postal_code(postal_code: str, country: str = "US") -> str:
+    """Five-digit ZIP for US addresses (ZIP+4 dropped); uppercase, no spaces elsewhere."""
+    if not postal_code:
+        return ""
+    compact = re.sub(r'[^0-9A-Za-z]', '', postal_code).upper()
+    if (country or "US").upper() in ("US", "USA") and compact[:5].isdigit():
+        return compact[:5]
+    return compact
@@ -0,0 +1,229 @@
+"""Per-request SQL statement counting, N+1 detection and query budgets.
+
+Statements are counted through SQLAlchemy engine events into the tracker
+bound to the current context. Repeated statements with the same shape
+(same SQL once literals and IN-lists are collapsed) are reported as N+1
+patterns, and a tracker can carry a budget that fails loudly once exceeded.
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.config import get_settings
+from api.utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_current_tracker: ContextVar[Optional["QueryTracker"]] = ContextVar(
+    "query_tracker", default=None
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryGuardError(RuntimeError):
+    """Base error raised by the query guard."""
+
+
+class QueryBudgetExceeded(QueryGuardError):
+    """Raised when more statements run than the declared budget allows."""
+
+
+class NPlusOneDetected(QueryGuardError):
+    """Raised when the same statement shape repeats past the threshold."""
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so repeated lookups compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = re.sub(r"%\(\w+\)s|:\w+|\$\d+|%s", "?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    shape = _ROW_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryTracker:
+    """Collects the statements executed within one request or test block."""
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        n_plus_one_threshold: int = 5,
+        raise_on_violation: bool = True,
+        label: str = "",
+    ):
+        self.budget = budget
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.raise_on_violation = raise_on_violation
+        self.label = label
+        self.statements: List[str] = []
+        self.shapes: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed so far."""
+        return len(self.statements)
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the statement count exceeds the budget."""
+        return self.budget is not None and self.count > self.budget
+
+    def n_plus_one_suspects(self) -> List[Tuple[str, int]]:
+        """Statement shapes repeated at least ``n_plus_one_threshold`` times."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def record(self, statement: str) -> None:
+        """Record a statement, raising immediately on a violation if strict."""
+        shape = statement_shape(statement)
+        self.statements.append(statement)
+        self.shapes[shape] += 1
+
+        if not self.raise_on_violation:
+            return
+        if self.over_budget:
+            raise QueryBudgetExceeded(self._budget_message())
+        if self.shapes[shape] == self.n_plus_one_threshold:
+            raise NPlusOneDetected(self._n_plus_one_message(shape))
+
+    def check(self) -> None:
+        """Raise if the tracker ended over budget or with N+1 patterns."""
+        if self.over_budget:
+            raise QueryBudgetExceeded(self._budget_message())
+        suspects = self.n_plus_one_suspects()
+        if suspects:
+            raise NPlusOneDetected(self._n_plus_one_message(suspects[0][0]))
+
+    def report(self) -> None:
+        """Log budget overruns and N+1 patterns without raising."""
+        if self.over_budget:
+            logger.error(self._budget_message())
+        for shape, count in self.n_plus_one_suspects():
+            logger.warning(
+                f"Possible N+1 in {self.label or 'block'}: "
+                f"{count} x {shape}"
+            )
+
+    def _budget_message(self) -> str:
+        executed = "\n".join(f"  {s}" for s in self.statements)
+        return (
+            f"Query budget exceeded in {self.label or 'block'}: "
+            f"{self.count} statements, budget {self.budget}\n{executed}"
+        )
+
+    def _n_plus_one_message(self, shape: str) -> str:
+        return (
+            f"N+1 pattern in {self.label or 'block'}: "
+            f"{self.shapes[shape]} x {shape}"
+        )
+
+
+def current_tracker() -> Optional[QueryTracker]:
+    """Get the tracker bound to the current context, if any."""
+    return _current_tracker.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+
+def install_query_tracking(engine: Engine) -> None:
+    """Attach the statement counter to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def track_queries(
+    budget: Optional[int] = None,
+    n_plus_one_threshold: int = 5,
+    label: str = "",
+) -> Iterator[QueryTracker]:
+    """Track statements in a block and fail on budget or N+1 violations.
+
+    Intended for service and repository tests::
+
+        with track_queries(budget=1):
+            DonorRepository(session).get_all(limit=100)
+    """
+    tracker = QueryTracker(
+        budget=budget,
+        n_plus_one_threshold=n_plus_one_threshold,
+        raise_on_violation=True,
+        label=label,
+    )
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+    tracker.check()
+
+
+def query_budget(max_queries: int):
+    """Dependency factory declaring a statement budget for a route.
+
+    Usage: ``@router.get("/", dependencies=[Depends(query_budget(3))])``.
+    The budget only applies while the query guard middleware is active.
+    """
+    async def _apply_budget() -> None:
+        tracker = _current_tracker.get()
+        if tracker is not None and tracker.budget is None:
+            tracker.budget = max_queries
+
+    return _apply_budget
+
+
+def allow_repeated_statements(max_repeats: int):
+    """Dependency factory for routes that deliberately repeat a statement.
+
+    Chunked bulk writes issue one statement per chunk; declaring the chunk
+    limit keeps them from being reported as N+1 patterns.
+    """
+    async def _raise_threshold() -> None:
+        tracker = _current_tracker.get()
+        if tracker is not None:
+            tracker.n_plus_one_threshold = max(tracker.n_plus_one_threshold, max_repeats + 1)
+
+    return _raise_threshold
+
+
+class QueryGuardMiddleware(BaseHTTPMiddleware):
+    """Count statements per request and flag N+1 patterns (dev/test only)."""
+
+    async def dispatch(self, request: Request, call_next):
+        """Bind a tracker to the request and report on it afterwards."""
+        settings = get_settings()
+        tracker = QueryTracker(
+            n_plus_one_threshold=settings.n_plus_one_threshold,
+            raise_on_violation=settings.query_guard_raise,
+            label=f"{request.method} {request.url.path}",
+        )
+        token = _current_tracker.set(tracker)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_tracker.reset(token)
+
+        tracker.report()
+        response.headers["X-Query-Count"] = str(tracker.count)
+        return response
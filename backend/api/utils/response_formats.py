@@ -0,0 +1,163 @@
+"""Content negotiation for row-heavy responses: row JSON, columnar JSON and MessagePack.
+
+The columnar layout names each field once and carries its values as an
+array, so a page of donors does not repeat every key on every row:
+``{"columns": {"id": [1, 2], "last_name": ["Lee", "Ng"]}}``. MessagePack
+responses carry the same columnar document and need the optional
+``msgpack`` package; without it the format is simply not offered.
+"""
+import json
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+
+# Media type of each response format
+MEDIA_TYPES: Dict[str, str] = {
+    "json": "application/json",
+    "columnar": "application/vnd.columnar+json",
+    "msgpack": "application/msgpack",
+    "csv": "text/csv",
+}
+
+# Other names clients use for the same formats
+_ALIASES: Dict[str, str] = {
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+}
+
+# Rows per columnar block of a streamed export
+EXPORT_BLOCK_ROWS = 500
+
+
+@lru_cache(maxsize=None)
+def msgpack_module():
+    """The msgpack module, or None when it is not installed."""
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def quality_values(header: str) -> List[Tuple[str, float]]:
+    """Items of an Accept or Accept-Encoding header with their quality values."""
+    ranges = []
+    for item in header.split(","):
+        media_range, *params = [part.strip() for part in item.split(";")]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media_range.lower(), quality))
+    return ranges
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str]) -> Optional[str]:
+    """The offered format the client prefers; the first one when it has no preference.
+
+    Each format takes the quality of the most specific media range that
+    matches it. Returns None when the client accepts none of them.
+    """
+    if not accept:
+        return offered[0]
+    ranges = quality_values(accept)
+    best, best_quality = None, 0.0
+    for name in offered:
+        media_type = MEDIA_TYPES[name]
+        aliases = {media_type} | {alias for alias, target in _ALIASES.items() if target == name}
+        wildcard = media_type.split("/")[0] + "/*"
+        specificity = {"*/*": 0, wildcard: 1, **{alias: 2 for alias in aliases}}
+        quality, rank = None, -1
+        for media_range, range_quality in ranges:
+            if specificity.get(media_range, -1) > rank:
+                quality, rank = range_quality, specificity[media_range]
+        if quality is not None and quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def response_format(*offered: str) -> Callable[[Request, Response], str]:
+    """Dependency choosing one of ``offered`` from the Accept header; the first is the default.
+
+    MessagePack is left out while msgpack is not installed. Clients that
+    accept none of the formats get a 406.
+    """
+    available = [name for name in offered if name != "msgpack" or msgpack_module() is not None]
+
+    def choose_format(request: Request, response: Response) -> str:
+        chosen = negotiate(request.headers.get("accept"), available)
+        if chosen is None:
+            accepted = ", ".join(MEDIA_TYPES[name] for name in available)
+            raise HTTPException(status_code=406, detail=f"Acceptable formats: {accepted}")
+        # Caches must key the default format on Accept too
+        response.headers["Vary"] = "Accept"
+        return chosen
+
+    return choose_format
+
+
+def columns(fields: Sequence[str], rows: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """The rows as one array of values per field."""
+    values: Dict[str, List[Any]] = {name: [] for name in fields}
+    for row in rows:
+        for name in fields:
+            values[name].append(row[name])
+    return values
+
+
+def encode(format: str, document: Any) -> bytes:
+    """``document`` as compact JSON or MessagePack."""
+    if format == "msgpack":
+        return msgpack_module().packb(document, default=_encode_value)
+    return json.dumps(document, separators=(",", ":"), default=_encode_value).encode()
+
+
+def columnar_response(format: str, fields: Sequence[str], rows: Iterable[Dict[str, Any]]) -> Response:
+    """Rows as a columnar JSON or MessagePack response."""
+    return Response(
+        encode(format, {"columns": columns(fields, rows)}),
+        media_type=MEDIA_TYPES[format],
+        headers={"Vary": "Accept"},
+    )
+
+
+def columnar_blocks(
+    format: str, fields: Sequence[str], rows: Iterable[Dict[str, Any]],
+    rows_per_block: int = EXPORT_BLOCK_ROWS,
+) -> Iterator[bytes]:
+    """Stream rows as columnar blocks of a few hundred rows each.
+
+    Columnar JSON is one document, ``{"blocks": [{...}, ...]}``; MessagePack
+    is a sequence of block maps, read with ``msgpack.Unpacker``.
+    """
+    wrapped = format == "columnar"
+    if wrapped:
+        yield b'{"blocks":['
+    rows = iter(rows)
+    written = 0
+    while True:
+        block = list(islice(rows, rows_per_block))
+        if not block:
+            break
+        separator = b"," if wrapped and written else b""
+        yield separator + encode(format, columns(fields, block))
+        written += 1
+    if wrapped:
+        yield b"]}"
@@ -0,0 +1,134 @@
+"""JWT token and password hashing helpers."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import bcrypt
+import jwt
+
+from api.config import get_settings
+
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when too many hash operations are already queued."""
+
+
+def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
+    """Create a signed access token for a user."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    expires_at = now + (
+        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    )
+    claims = {"sub": str(user_id), "iat": now, "exp": expires_at, "type": "access"}
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.jwt_algorithm)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verify a token's signature and expiry and return its claims.
+
+    Raises ``jwt.InvalidTokenError`` for bad, expired or non-access tokens.
+    """
+    settings = get_settings()
+    claims = jwt.decode(
+        token,
+        settings.secret_key,
+        algorithms=[settings.jwt_algorithm],
+        options={"require": ["sub", "exp"]},
+    )
+    if claims.get("type") != "access":
+        raise jwt.InvalidTokenError("Not an access token")
+    return claims
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt (blocking, ~250ms at 12 rounds)."""
+    salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash (blocking)."""
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Malformed or deliberately unusable hash
+        return False
+
+
+@lru_cache
+def _dummy_hash() -> str:
+    """Hash with the configured cost, checked against for unknown accounts."""
+    return hash_password("not-a-password")
+
+
+def _reject_unknown_account(password: str) -> bool:
+    """Spend the same time as a real check so unknown emails aren't revealed."""
+    verify_password(password, _dummy_hash())
+    return False
+
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    """Dedicated bcrypt threads, separate from the shared worker pool."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=get_settings().password_hash_concurrency,
+            thread_name_prefix="password-hash",
+        )
+    return _hash_executor
+
+
+async def _run_hashing(fn: Callable[..., T], *args: Any) -> T:
+    """Run a hash operation off the event loop with bounded concurrency.
+
+    At most ``password_hash_concurrency`` operations run at once and at
+    most ``password_hash_max_pending`` wait; beyond that the call fails
+    fast instead of queueing without limit.
+    """
+    global _pending
+    with _pending_lock:
+        if _pending >= get_settings().password_hash_max_pending:
+            raise PasswordHashingBusy("Too many password operations in progress")
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: Optional[str]) -> bool:
+    """Verify a password without blocking the event loop.
+
+    Pass ``None`` for unknown accounts: the check still costs the same
+    time but always fails.
+    """
+    if hashed_password is None:
+        return await _run_hashing(_reject_unknown_account, password)
+    return await _run_hashing(verify_password, password, hashed_password)
+
+
+def shutdown_hashing_executor() -> None:
+    """Stop the bcrypt threads (called on application shutdown)."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
@@ -0,0 +1,68 @@
+"""Startup time profiling.
+
+Records how long each import and initialization step takes while the
+application starts, so cold-start regressions show up in the logs and in
+``app.state.startup_report``.
+"""
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional
+
+from api.utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class StartupProfiler:
+    """Times named startup steps and the modules each one imports."""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.steps: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a block and count the modules it pulled in."""
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                "step": name,
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "new_modules": len(sys.modules) - modules_before,
+            })
+
+    def record(self, name: str, started_at: float) -> None:
+        """Record a step that began before the profiler existed."""
+        self.steps.append({
+            "step": name,
+            "ms": round((time.perf_counter() - started_at) * 1000, 2),
+            "new_modules": None,
+        })
+
+    def import_module(self, path: str) -> ModuleType:
+        """Import a module as its own profiled step."""
+        with self.step(f"import {path}"):
+            return importlib.import_module(path)
+
+    def report(self) -> Dict[str, Any]:
+        """Steps sorted slowest first, plus the total since start."""
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            "steps": sorted(self.steps, key=lambda s: s["ms"], reverse=True),
+        }
+
+    def log(self) -> Dict[str, Any]:
+        """Log the report and return it."""
+        report = self.report()
+        logger.info(f"Startup finished in {report['total_ms']}ms")
+        for step in report["steps"]:
+            modules = "" if step["new_modules"] is None else f" ({step['new_modules']} modules)"
+            logger.info(f"  {step['ms']:>9.2f}ms  {step['step']}{modules}")
+        return report
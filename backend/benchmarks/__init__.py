@@ -0,0 +1 @@
+"""Synthetic data generation and performance benchmarks."""
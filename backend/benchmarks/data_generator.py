@@ -0,0 +1,330 @@
+"""Deterministic bulk data generator for the donor models.
+
+The same seed and size always produce the same rows, so benchmark runs
+are comparable across machines and commits. Rows are written with
+multi-row inserts in chunks and donor giving aggregates are computed from
+the generated gifts, so they stay consistent with the ``gifts`` table.
+"""
+import random
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from api.services.donors.donor_counters import rebuild_donor_counters
+from api.services.donors.geo_rollups import rebuild_geo_rollups
+from api.utils.normalization import (
+    normalize_city, normalize_email, normalize_name, normalize_phone, normalize_postal_code,
+    normalize_state,
+)
+from models.donors import Communication, Donor, DonorTag, Gift, Tag
+from models.user import User
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    """Row counts for one generated dataset."""
+    donors: int
+    gifts: int
+    communications: int
+    tags: int = 50
+
+
+SIZES: Dict[str, DatasetSize] = {
+    "tiny": DatasetSize(donors=1_000, gifts=1_000, communications=300, tags=10),
+    "small": DatasetSize(donors=10_000, gifts=100_000, communications=50_000),
+    "medium": DatasetSize(donors=100_000, gifts=1_000_000, communications=500_000),
+    "large": DatasetSize(
+        donors=1_000_000, gifts=10_000_000, communications=5_000_000, tags=200
+    ),
+}
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+    "Linda", "William", "Elizabeth", "David", "Barbara", "Richard", "Susan",
+    "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Daniel",
+    "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Margaret",
+    "Donald", "Sandra", "Steven", "Ashley", "Paul", "Kimberly", "Andrew",
+    "Emily", "Joshua", "Donna", "Kenneth", "Michelle",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez",
+    "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark",
+    "Ramirez", "Lewis", "Robinson", "Walker", "Young", "Allen", "King",
+    "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+]
+LOCATIONS = [
+    ("Anchorage", "AK", "995"), ("Fairbanks", "AK", "997"),
+    ("Juneau", "AK", "998"), ("Seattle", "WA", "981"),
+    ("Portland", "OR", "972"), ("Boise", "ID", "837"),
+    ("Denver", "CO", "802"), ("Austin", "TX", "787"),
+    ("Chicago", "IL", "606"), ("Boston", "MA", "021"),
+    ("New York", "NY", "100"), ("Atlanta", "GA", "303"),
+]
+COMPANIES = [
+    "Northwind Traders", "Contoso", "Fabrikam", "Tailspin Toys",
+    "Alpine Ski House", "Wide World Importers", "Adventure Works",
+    "Blue Yonder Airlines", "Coho Winery", "Litware",
+]
+EMAIL_DOMAINS = ["example.com", "mail.test", "inbox.test", "fsh.test"]
+GIFT_TYPES = ["cash", "check", "credit_card", "credit_card", "credit_card", "stock"]
+COMMUNICATION_TYPES = ["email", "phone", "meeting", "letter", "event"]
+TAG_CATEGORIES = ["general", "giving_level", "interest", "event"]
+
+EPOCH = datetime(2015, 1, 1)
+BENCHMARK_USER_ID = 1
+SPAN_SECONDS = int(timedelta(days=365 * 10).total_seconds())
+
+
+class SyntheticDataGenerator:
+    """Generate reproducible donors, gifts, communications and tags."""
+
+    def __init__(self, seed: int = 42, chunk_size: int = 5_000):
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def _rng(self, table: str) -> random.Random:
+        """Independent random stream per table so sizes don't shift others."""
+        return random.Random(f"{self.seed}:{table}")
+
+    def _timestamp(self, rng: random.Random) -> datetime:
+        return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+    def gift_plan(self, size: DatasetSize) -> Iterator[Tuple[int, float, datetime, str]]:
+        """Yield (donor_id, amount, gift_date, gift_status) for every gift.
+
+        Donor ids are skewed so a minority of donors gives most gifts.
+        """
+        rng = self._rng("gifts")
+        for _ in range(size.gifts):
+            donor_id = int(size.donors * rng.random() ** 2) + 1
+            amount = round(min(rng.lognormvariate(4.0, 1.1), 250_000.0), 2)
+            gift_date = self._timestamp(rng)
+            status = "completed" if rng.random() < 0.97 else "refunded"
+            yield donor_id, amount, gift_date, status
+
+    def donor_aggregates(self, size: DatasetSize) -> Dict[str, Any]:
+        """Compute per-donor giving aggregates from the gift plan."""
+        totals = array("d", [0.0]) * (size.donors + 1)
+        counts = array("l", [0]) * (size.donors + 1)
+        largest = array("d", [0.0]) * (size.donors + 1)
+        first: Dict[int, datetime] = {}
+        last: Dict[int, datetime] = {}
+        for donor_id, amount, gift_date, status in self.gift_plan(size):
+            if status != "completed":
+                continue
+            totals[donor_id] += amount
+            counts[donor_id] += 1
+            if amount > largest[donor_id]:
+                largest[donor_id] = amount
+            if donor_id not in first or gift_date < first[donor_id]:
+                first[donor_id] = gift_date
+            if donor_id not in last or gift_date > last[donor_id]:
+                last[donor_id] = gift_date
+        return {
+            "totals": totals, "counts": counts, "largest": largest,
+            "first": first, "last": last,
+        }
+
+    def donor_rows(self, size: DatasetSize) -> Iterator[Dict[str, Any]]:
+        """Yield donor rows with consistent giving aggregates.
+
+        About 2% of donors reuse an earlier donor's name and email so the
+        duplicate detection paths have real work to do.
+        """
+        rng = self._rng("donors")
+        aggregates = self.donor_aggregates(size)
+        identities: List[Tuple[str, str, Optional[str]]] = []
+        for donor_id in range(1, size.donors + 1):
+            if donor_id > 10 and rng.random() < 0.02:
+                first_name, last_name, email = identities[rng.randrange(len(identities))]
+            else:
+                first_name = rng.choice(FIRST_NAMES)
+                last_name = rng.choice(LAST_NAMES)
+                email = (
+                    f"{first_name}.{last_name}{donor_id}@{rng.choice(EMAIL_DOMAINS)}"
+                    if rng.random() < 0.9
+                    else None
+                )
+            identities.append((first_name, last_name, email))
+            city, state, zip_prefix = rng.choice(LOCATIONS)
+            phone = f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+            full_name = f"{first_name} {last_name}"
+            count = aggregates["counts"][donor_id]
+            total = round(aggregates["totals"][donor_id], 2)
+            row = {
+                "id": donor_id,
+                "created_at": self._timestamp(rng),
+                "first_name": first_name,
+                "last_name": last_name,
+                "full_name": full_name,
+                "email": email,
+                "phone": phone,
+                "address_line_1": f"{rng.randint(1, 9999)} Main St",
+                "city": city,
+                "state": state,
+                "postal_code": f"{zip_prefix}{rng.randint(0, 99):02d}",
+                "country": "US",
+                "company": rng.choice(COMPANIES) if rng.random() < 0.3 else None,
+                "preferred_contact_method": "email",
+                "do_not_email": rng.random() < 0.05,
+                "do_not_call": rng.random() < 0.1,
+                "do_not_mail": rng.random() < 0.05,
+                "total_gifts": total,
+                "total_gift_count": count,
+                "first_gift_date": aggregates["first"].get(donor_id),
+                "last_gift_date": aggregates["last"].get(donor_id),
+                "largest_gift": aggregates["largest"][donor_id],
+                "average_gift": round(total / count, 2) if count else 0.0,
+                "donor_status": rng.choices(
+                    ["active", "lapsed", "prospect"], weights=[70, 20, 10]
+                )[0],
+                "donor_type": rng.choices(
+                    ["individual", "organization", "foundation"], weights=[90, 8, 2]
+                )[0],
+                "notes": "Met at annual gala. " * 10 if rng.random() < 0.05 else None,
+                "source": rng.choice(["event", "web", "mail", "referral"]),
+                "name_key": normalize_name(full_name),
+                "email_key": normalize_email(email or ""),
+                "phone_key": normalize_phone(phone),
+            }
+            # Keys built exactly as DonorService builds them for real rows
+            row["company_key"] = normalize_name(row["company"] or "")
+            row["state_key"] = normalize_state(state)
+            row["city_key"] = normalize_city(city)
+            row["postal_key"] = normalize_postal_code(row["postal_code"], row["country"])
+            yield row
+
+    def gift_rows(self, size: DatasetSize) -> Iterator[Dict[str, Any]]:
+        """Yield gift rows following the gift plan."""
+        rng = self._rng("gift-details")
+        for gift_id, (donor_id, amount, gift_date, status) in enumerate(
+            self.gift_plan(size), start=1
+        ):
+            acknowledged = rng.random() < 0.8
+            yield {
+                "id": gift_id,
+                "created_at": gift_date,
+                "donor_id": donor_id,
+                "amount": amount,
+                "gift_date": gift_date,
+                "gift_type": rng.choice(GIFT_TYPES),
+                "payment_method": rng.choice(["visa", "mastercard", "amex", "check"]),
+                "campaign_id": rng.randint(1, 50) if rng.random() < 0.6 else None,
+                "designation": rng.choice(["general", "general", "scholarship", "capital"]),
+                "source": "generator",
+                "transaction_id": f"txn-{gift_id:010d}",
+                "acknowledged": acknowledged,
+                "acknowledged_date": gift_date + timedelta(days=3) if acknowledged else None,
+                "acknowledged_by": "generator" if acknowledged else None,
+                "gift_status": status,
+                "is_anonymous": rng.random() < 0.02,
+                "is_tribute": rng.random() < 0.03,
+                "tax_deductible_amount": amount,
+                "receipt_sent": acknowledged,
+            }
+
+    def communication_rows(self, size: DatasetSize) -> Iterator[Dict[str, Any]]:
+        """Yield communication rows."""
+        rng = self._rng("communications")
+        for communication_id in range(1, size.communications + 1):
+            contact_date = self._timestamp(rng)
+            yield {
+                "id": communication_id,
+                "created_at": contact_date,
+                "donor_id": rng.randint(1, size.donors),
+                "communication_type": rng.choice(COMMUNICATION_TYPES),
+                "direction": "outgoing" if rng.random() < 0.8 else "incoming",
+                "subject": "Thank you for your support",
+                "contact_date": contact_date,
+                "follow_up_required": rng.random() < 0.1,
+                "follow_up_completed": False,
+                "priority": "normal",
+                "status": "completed",
+            }
+
+    def tag_rows(self, size: DatasetSize) -> Iterator[Dict[str, Any]]:
+        """Yield tag rows."""
+        rng = self._rng("tags")
+        for tag_id in range(1, size.tags + 1):
+            yield {
+                "id": tag_id,
+                "created_at": EPOCH,
+                "name": f"tag-{tag_id:04d}",
+                "category": rng.choice(TAG_CATEGORIES),
+                "color": "#3B82F6",
+                "is_active": True,
+                "donor_count": 0,
+            }
+
+    def donor_tag_rows(self, size: DatasetSize) -> Iterator[Dict[str, Any]]:
+        """Yield donor/tag associations, zero to three per donor."""
+        rng = self._rng("donor-tags")
+        row_id = 0
+        for donor_id in range(1, size.donors + 1):
+            for tag_id in sorted(rng.sample(range(1, size.tags + 1), rng.randint(0, 3))):
+                row_id += 1
+                yield {
+                    "id": row_id,
+                    "created_at": EPOCH,
+                    "donor_id": donor_id,
+                    "tag_id": tag_id,
+                    "assigned_by": "generator",
+                }
+
+    def user_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield the benchmark user; its password hash is deliberately unusable."""
+        yield {
+            "id": BENCHMARK_USER_ID,
+            "created_at": EPOCH,
+            "username": "benchmark",
+            "email": "benchmark@example.com",
+            "hashed_password": "!",
+            "is_active": True,
+            "is_superuser": True,
+        }
+
+    def _insert(self, engine: Engine, model: type, rows: Iterator[Dict[str, Any]]) -> int:
+        """Insert rows with one multi-row statement per chunk."""
+        table = model.__table__
+        inserted = 0
+        chunk: List[Dict[str, Any]] = []
+        with engine.begin() as connection:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    connection.execute(table.insert(), chunk)
+                    inserted += len(chunk)
+                    chunk = []
+            if chunk:
+                connection.execute(table.insert(), chunk)
+                inserted += len(chunk)
+        return inserted
+
+    def populate(self, engine: Engine, size: DatasetSize) -> Dict[str, int]:
+        """Create all tables and fill them; returns row counts per table."""
+        SQLModel.metadata.create_all(engine)
+        counts = {
+            "users": self._insert(engine, User, self.user_rows()),
+            "donors": self._insert(engine, Donor, self.donor_rows(size)),
+            "tags": self._insert(engine, Tag, self.tag_rows(size)),
+            "donor_tags": self._insert(engine, DonorTag, self.donor_tag_rows(size)),
+            "gifts": self._insert(engine, Gift, self.gift_rows(size)),
+            "communications": self._insert(
+                engine, Communication, self.communication_rows(size)
+            ),
+        }
+        with engine.begin() as connection:
+            rebuild_donor_counters(connection)
+            rebuild_geo_rollups(connection)
+        return counts
+
+
+def describe(size: DatasetSize) -> Dict[str, int]:
+    """Plain dict form of a dataset size, for result files."""
+    return asdict(size)
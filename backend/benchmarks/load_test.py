@@ -0,0 +1,277 @@
+"""Concurrent load test for the donor API.
+
+Starts the app under uvicorn against a seeded database and drives a
+weighted mix of donor list/search/get/update/merge requests from many
+concurrent async clients, then reports throughput, latency percentiles
+and error rates per endpoint.
+
+Usage::
+
+    python -m benchmarks.load_test --size small --concurrency 64 \\
+        --duration 30 --mix list=40,search=25,get=20,update=10,merge=5
+
+Pass ``--database-url`` to run against an already seeded local Postgres
+instead of a generated SQLite file.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import create_engine
+from sqlmodel import Session
+
+from api.utils.security import create_access_token
+from benchmarks.data_generator import BENCHMARK_USER_ID, FIRST_NAMES, LAST_NAMES, SIZES
+from benchmarks.suite import merge_pairs, sqlite_database
+
+
+DEFAULT_MIX = "list=40,search=25,get=20,update=10,merge=5"
+BASE_PATH = "/api/v1/donors"
+
+
+@dataclass
+class LoadResult:
+    """Latencies and failures collected for one endpoint."""
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse ``list=40,search=25`` into endpoint weights."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight)
+    unknown = set(weights) - {"list", "search", "get", "update", "merge"}
+    if unknown:
+        raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(results: Dict[str, LoadResult], elapsed: float) -> Dict[str, Any]:
+    """Build the per-endpoint and overall report."""
+    report: Dict[str, Any] = {}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for name, result in sorted(results.items()):
+        latencies = sorted(result.latencies_ms)
+        all_latencies.extend(latencies)
+        total_errors += result.errors
+        report[name] = _summary(latencies, result.errors, elapsed)
+        report[name]["status_counts"] = dict(result.status_counts)
+    report["total"] = _summary(sorted(all_latencies), total_errors, elapsed)
+    return report
+
+
+def _summary(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+class LoadDriver:
+    """Issues the request mix from concurrent clients until the deadline."""
+
+    def __init__(
+        self,
+        base_url: str,
+        weights: Dict[str, int],
+        donor_count: int,
+        merge_candidates: List[Tuple[int, int]],
+        seed: int = 42,
+    ):
+        self.base_url = base_url
+        self.names = list(weights)
+        self.weights = [weights[name] for name in self.names]
+        self.donor_count = donor_count
+        self.merge_candidates = list(merge_candidates)
+        self.seed = seed
+        self.results: Dict[str, LoadResult] = defaultdict(LoadResult)
+
+    def _request(self, name: str, rng: random.Random) -> Optional[Tuple[str, str, Any]]:
+        """Build (method, path, json) for one operation."""
+        donor_id = rng.randint(1, self.donor_count)
+        if name == "list":
+            skip = rng.randrange(0, max(1, self.donor_count - 50))
+            return "GET", f"{BASE_PATH}/?skip={skip}&limit=50", None
+        if name == "search":
+            term = rng.choice(FIRST_NAMES + LAST_NAMES)[: rng.randint(2, 5)]
+            return "GET", f"{BASE_PATH}/search?q={term}", None
+        if name == "get":
+            return "GET", f"{BASE_PATH}/{donor_id}", None
+        if name == "update":
+            body = {"notes": f"load test {rng.random():.6f}", "do_not_call": rng.random() < 0.5}
+            return "PUT", f"{BASE_PATH}/{donor_id}", body
+        if name == "merge":
+            if not self.merge_candidates:
+                return None
+            primary, duplicate = self.merge_candidates.pop()
+            return "POST", f"{BASE_PATH}/merge", {
+                "primary_donor_id": primary,
+                "duplicate_donor_id": duplicate,
+            }
+        raise ValueError(name)
+
+    async def _client(self, client: httpx.AsyncClient, index: int, deadline: float) -> None:
+        rng = random.Random(f"{self.seed}:{index}")
+        while time.perf_counter() < deadline:
+            name = rng.choices(self.names, weights=self.weights)[0]
+            request = self._request(name, rng)
+            if request is None:
+                continue
+            method, path, body = request
+            result = self.results[name]
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+            result.status_counts[status] += 1
+            if status == 0 or status >= 500:
+                result.errors += 1
+
+    async def run(self, concurrency: int, duration: float) -> Dict[str, Any]:
+        """Run all clients for ``duration`` seconds and return the report."""
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        headers = {"Authorization": f"Bearer {create_access_token(BENCHMARK_USER_ID)}"}
+        async with httpx.AsyncClient(
+            base_url=self.base_url, headers=headers, limits=limits, timeout=30.0
+        ) as client:
+            started = time.perf_counter()
+            deadline = started + duration
+            await asyncio.gather(
+                *(self._client(client, i, deadline) for i in range(concurrency))
+            )
+            elapsed = time.perf_counter() - started
+        return summarize(self.results, elapsed)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn serving the app and wait until it answers /health."""
+    env = dict(os.environ, DATABASE_URL=database_url, QUERY_GUARD="false")
+    env.setdefault("ENVIRONMENT", "loadtest")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report as a table."""
+    header = f"{'endpoint':<10}{'reqs':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in report.items():
+        print(
+            f"{name:<10}{row['requests']:>8}{row['throughput_rps']:>9}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+            f"{row['error_rate'] * 100:>7.2f}%"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="small", choices=sorted(SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-dir", type=Path, default=Path(".benchmarks"))
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix)
+    size = SIZES[args.size]
+    database_url = args.database_url or (
+        f"sqlite:///{sqlite_database(args.size, size, args.seed, args.db_dir).resolve()}"
+    )
+    engine = create_engine(database_url)
+    with Session(engine) as session:
+        candidates = merge_pairs(session, 5_000)
+    engine.dispose()
+
+    port = _free_port()
+    server = start_server(database_url, port, args.workers)
+    try:
+        driver = LoadDriver(
+            f"http://127.0.0.1:{port}", weights, size.donors, candidates, args.seed
+        )
+        report = asyncio.run(driver.run(args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    document = {
+        "config": {
+            "size": args.size,
+            "database": database_url.split("://")[0],
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": weights,
+        },
+        "endpoints": report,
+    }
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""Benchmark suite for donor repository methods and endpoints.
+
+Usage::
+
+    python -m benchmarks.suite --sizes tiny small --output results.json \\
+        --baseline benchmarks/baselines/default.json --threshold 0.25
+
+Each size gets its own generated SQLite database (or ``--database-url``
+for a single Postgres run). Results are written as JSON and, when a
+baseline is given, compared per case; the exit code is 1 on regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, select
+
+from api.config import get_settings
+from benchmarks.data_generator import (
+    BENCHMARK_USER_ID,
+    SIZES,
+    DatasetSize,
+    SyntheticDataGenerator,
+    describe,
+)
+
+
+DEFAULT_REPEAT = 20
+WARMUP = 2
+MERGE_REPEAT = 10
+DEFAULT_THRESHOLD = 0.25
+# Differences below this many milliseconds are treated as noise.
+NOISE_FLOOR_MS = 0.5
+
+
+@dataclass
+class BenchmarkCase:
+    """One timed operation; ``fn`` receives the iteration number."""
+    name: str
+    fn: Callable[[int], Any]
+    repeat: int = DEFAULT_REPEAT
+
+
+def time_case(case: BenchmarkCase, warmup: int = WARMUP) -> Dict[str, float]:
+    """Run a case and summarize its timings in milliseconds."""
+    for i in range(warmup):
+        case.fn(i)
+    samples = []
+    for i in range(warmup, warmup + case.repeat):
+        start = time.perf_counter()
+        case.fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def prepare_database(
+    size_name: str,
+    size: DatasetSize,
+    seed: int,
+    db_dir: Path,
+    database_url: Optional[str] = None,
+) -> Engine:
+    """Create a populated database for one dataset size.
+
+    For SQLite the generated file is kept as a pristine copy and each run
+    works on a fresh copy of it, since the merge cases modify data.
+    """
+    if database_url:
+        engine = create_engine(database_url)
+        SQLModel.metadata.drop_all(engine)
+        SyntheticDataGenerator(seed=seed).populate(engine, size)
+        return engine
+
+    working = sqlite_database(size_name, size, seed, db_dir)
+    return create_engine(
+        f"sqlite:///{working}", connect_args={"check_same_thread": False}
+    )
+
+
+def sqlite_database(size_name: str, size: DatasetSize, seed: int, db_dir: Path) -> Path:
+    """Generate the pristine SQLite file once and return a fresh working copy."""
+    db_dir.mkdir(parents=True, exist_ok=True)
+    pristine = db_dir / f"bench_{size_name}_{seed}.db"
+    working = db_dir / f"bench_{size_name}_{seed}.run.db"
+    if not pristine.exists():
+        engine = create_engine(f"sqlite:///{pristine}")
+        SyntheticDataGenerator(seed=seed).populate(engine, size)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        engine.dispose()
+    shutil.copyfile(pristine, working)
+    return working
+
+
+def merge_pairs(session: Session, count: int, skip: int = 0) -> List[tuple]:
+    """Pick (primary, duplicate) id pairs whose duplicate has no dependent rows.
+
+    ``DonorService.merge_donors`` deletes the duplicate through the ORM,
+    which cannot detach gifts, communications or tags, so only donors
+    without them are safe to merge repeatedly.
+    """
+    from models.donors import Communication, Donor, DonorTag, Gift
+
+    statement = (
+        select(Donor.id)
+        .where(
+            Donor.id.not_in(select(Gift.donor_id)),
+            Donor.id.not_in(select(Communication.donor_id)),
+            Donor.id.not_in(select(DonorTag.donor_id)),
+        )
+        .order_by(Donor.id.desc())
+        .offset(skip * 2)
+        .limit(count * 2)
+    )
+    ids = list(session.exec(statement).all())
+    return list(zip(ids[0::2], ids[1::2]))
+
+
+def repository_cases(engine: Engine, size: DatasetSize) -> List[BenchmarkCase]:
+    """Cases timing repository and service methods directly."""
+    from api.services.donors.donor_service import DonorService
+    from models.donors.donor import Donor
+    from repositories.donors.donor_repository import DonorRepository
+
+    session = Session(engine)
+    repository = DonorRepository(session)
+    service = DonorService(session)
+    sample = session.exec(select(Donor).where(Donor.email.is_not(None)).limit(1)).one()
+    duplicate = session.exec(
+        select(Donor)
+        .where(Donor.name_key == select(Donor.name_key)
+               .group_by(Donor.name_key)
+               .having(func.count() > 1)
+               .limit(1)
+               .scalar_subquery())
+        .limit(1)
+    ).first() or sample
+    session.expunge_all()
+    pairs = merge_pairs(session, WARMUP + MERGE_REPEAT)
+
+    def merge(i: int) -> None:
+        # Each iteration merges a fresh pair so no run hits a deleted donor.
+        service.merge_donors(*pairs[i])
+        session.expunge_all()
+
+    def run(fn: Callable[[], Any]) -> Callable[[int], Any]:
+        def _run(_: int) -> Any:
+            result = fn()
+            session.expunge_all()
+            return result
+        return _run
+
+    return [
+        BenchmarkCase("repo.get_all.first_page", run(lambda: repository.get_all(0, 100))),
+        BenchmarkCase(
+            "repo.get_all.deep_page",
+            run(lambda: repository.get_all(size.donors // 2, 100)),
+        ),
+        BenchmarkCase("repo.get_by_id", lambda i: repository.get_by_id(1 + i)),
+        BenchmarkCase("repo.search_donors", run(lambda: repository.search_donors("smi", 50))),
+        BenchmarkCase("repo.find_by_email", run(lambda: repository.find_by_email(sample.email))),
+        BenchmarkCase(
+            "repo.find_potential_duplicates",
+            run(lambda: repository.find_potential_duplicates(duplicate)),
+        ),
+        BenchmarkCase("repo.get_donors_by_tag", run(lambda: repository.get_donors_by_tag("tag-0001")), repeat=5),
+        BenchmarkCase("service.merge_donors", merge, repeat=MERGE_REPEAT),
+    ]
+
+
+def endpoint_cases(engine: Engine, size: DatasetSize, stack: ExitStack) -> List[BenchmarkCase]:
+    """Cases timing the HTTP endpoints in-process through the full stack.
+
+    The client's lifespan runs until ``stack`` closes.
+    """
+    from fastapi.testclient import TestClient
+
+    from api.dependencies.database import get_session
+    from api.main import app
+    from api.utils.security import create_access_token
+
+    def _get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _get_session
+    # Run the lifespan startup so routers are mounted
+    client = stack.enter_context(TestClient(app))
+    client.headers["Authorization"] = f"Bearer {create_access_token(BENCHMARK_USER_ID)}"
+    base = "/api/v1/donors"
+    with Session(engine) as session:
+        pairs = merge_pairs(session, WARMUP + MERGE_REPEAT, skip=WARMUP + MERGE_REPEAT)
+
+    def get(path: str) -> Callable[[int], Any]:
+        def _get(_: int) -> Any:
+            response = client.get(path)
+            response.raise_for_status()
+            return response
+        return _get
+
+    def merge(i: int) -> None:
+        response = client.post(
+            f"{base}/merge",
+            json={"primary_donor_id": pairs[i][0], "duplicate_donor_id": pairs[i][1]},
+        )
+        response.raise_for_status()
+
+    return [
+        BenchmarkCase("http.list_donors", get(f"{base}/?limit=100")),
+        BenchmarkCase("http.search_donors", get(f"{base}/search?q=smi")),
+        BenchmarkCase("http.get_donor", get(f"{base}/1")),
+        BenchmarkCase("http.find_potential_duplicates", get(f"{base}/1/duplicates")),
+        BenchmarkCase("http.merge_donors", merge, repeat=MERGE_REPEAT),
+    ]
+
+
+def run_suite(
+    sizes: List[str],
+    seed: int = 42,
+    db_dir: Path = Path(".benchmarks"),
+    database_url: Optional[str] = None,
+    include_http: bool = True,
+) -> Dict[str, Any]:
+    """Run every case at every size and return the result document."""
+    # Measure the app as production runs it, without the query guard. The
+    # services imported with the generator have already read the settings.
+    os.environ.setdefault("QUERY_GUARD", "false")
+    get_settings.cache_clear()
+
+    results: Dict[str, Any] = {}
+    for size_name in sizes:
+        size = SIZES[size_name]
+        started = time.perf_counter()
+        engine = prepare_database(size_name, size, seed, db_dir, database_url)
+        setup_seconds = round(time.perf_counter() - started, 2)
+
+        with ExitStack() as stack:
+            cases = repository_cases(engine, size)
+            if include_http:
+                cases += endpoint_cases(engine, size, stack)
+            results[size_name] = {
+                "dataset": describe(size),
+                "setup_seconds": setup_seconds,
+                "cases": {case.name: time_case(case) for case in cases},
+            }
+        engine.dispose()
+
+    return {
+        "meta": {
+            "seed": seed,
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database_url.split("://")[0] if database_url else "sqlite",
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """List cases whose median regressed by more than ``threshold``."""
+    regressions = []
+    for size_name, size_result in current["results"].items():
+        baseline_cases = baseline.get("results", {}).get(size_name, {}).get("cases", {})
+        for case_name, stats in size_result["cases"].items():
+            reference = baseline_cases.get(case_name)
+            if not reference:
+                continue
+            before, after = reference["median_ms"], stats["median_ms"]
+            if after - before > NOISE_FLOOR_MS and after > before * (1 + threshold):
+                regressions.append({
+                    "size": size_name,
+                    "case": case_name,
+                    "baseline_ms": before,
+                    "current_ms": after,
+                    "change": round(after / before - 1, 3) if before else None,
+                })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["tiny", "small"], choices=sorted(SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-dir", type=Path, default=Path(".benchmarks"))
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--no-http", action="store_true")
+    args = parser.parse_args(argv)
+
+    document = run_suite(
+        args.sizes, args.seed, args.db_dir, args.database_url, not args.no_http
+    )
+    output = json.dumps(document, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    if args.baseline and args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(output)
+        return 0
+
+    if args.baseline and args.baseline.exists():
+        regressions = compare(document, json.loads(args.baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['size']}/{regression['case']}: "
+                f"{regression['baseline_ms']}ms -> {regression['current_ms']}ms",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,5 +3,18 @@ from .donor import Donor
 from .gift import Gift
 from .communication import Communication
 from .tag import Tag, DonorTag
+from .donor_counter import DonorCounter
+from .receipt_sequence import ReceiptSequence
+from .geo_rollup import GeoRollup
+from .donor_audit import DonorAuditEntry
+from .change_sequence import ChangeSequence
+from .donor_tombstone import DonorTombstone
+from .archive_chunk import ArchiveChunk
+from .archived_transaction import ArchivedTransaction
+from .campaign_total import CampaignTotal, CampaignDonor
 
-__all__ = ["Donor", "Gift", "Communication", "Tag", "DonorTag"]
\ No newline at end of file
+__all__ = [
+    "Donor", "Gift", "Communication", "Tag", "DonorTag", "DonorCounter", "ReceiptSequence",
+    "GeoRollup", "DonorAuditEntry", "ChangeSequence", "DonorTombstone", "ArchiveChunk",
+    "ArchivedTransaction", "CampaignTotal", "CampaignDonor",
+]
\ No newline at end of file
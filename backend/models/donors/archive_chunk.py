@@ -0,0 +1,29 @@
+"""Archive chunk model for gifts and communications moved to cold storage."""
+from sqlalchemy import Column, Index, LargeBinary, UniqueConstraint
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class ArchiveChunk(BaseModel, table=True):
+    """One donor's archived rows of one table for one calendar year, compressed."""
+    __tablename__ = "archive_chunks"
+    __table_args__ = (
+        # Donor timeline: a donor's chunks by year
+        UniqueConstraint("donor_id", "table_name", "year", name="uq_archive_chunks_donor_table_year"),
+        # Year-end statements: a year's chunks in donor order
+        Index("ix_archive_chunks_table_name_year_donor_id", "table_name", "year", "donor_id"),
+        # Analytics snapshot refresh: chunks written since the last refresh
+        Index("ix_archive_chunks_table_name_updated_at", "table_name", "updated_at"),
+    )
+    
+    table_name: str = Field()  # gifts or communications
+    donor_id: int = Field()  # not a foreign key; donor deletes remove chunks explicitly
+    year: int = Field()
+    row_count: int = Field(default=0)
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    
+    def __repr__(self) -> str:
+        return (
+            f"<ArchiveChunk(table_name='{self.table_name}', donor_id={self.donor_id}, "
+            f"year={self.year}, row_count={self.row_count})>"
+        )
@@ -0,0 +1,29 @@
+"""Transaction keys of archived gifts, for idempotent gift ingestion."""
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class ArchivedTransaction(BaseModel, table=True):
+    """The (source, transaction_id) of one archived gift and where it lives.
+    
+    Stands in for the gifts table's unique key once a gift has moved to an
+    archive chunk, whatever donor or date a replay of it carries.
+    """
+    __tablename__ = "archived_transactions"
+    __table_args__ = (
+        UniqueConstraint("source", "transaction_id", name="uq_archived_transactions_source_transaction_id"),
+        # Donor merges and deletes
+        Index("ix_archived_transactions_donor_id", "donor_id"),
+    )
+    
+    source: str = Field()
+    transaction_id: str = Field()
+    gift_id: int = Field()
+    donor_id: int = Field()  # not a foreign key; kept in step with the donor's chunks
+    
+    def __repr__(self) -> str:
+        return (
+            f"<ArchivedTransaction(source='{self.source}', transaction_id='{self.transaction_id}', "
+            f"gift_id={self.gift_id})>"
+        )
@@ -0,0 +1,51 @@
+"""Maintained giving totals per campaign."""
+from sqlalchemy import Index
+from sqlmodel import Field, UniqueConstraint
+from models.base import BaseModel
+
+
+class CampaignTotal(BaseModel, table=True):
+    """Completed giving to one campaign, kept current on every gift and donor write.
+    
+    ``change_seq`` is the donor change number of the last write that moved
+    the totals, so readers can follow changes in commit order.
+    """
+    __tablename__ = "campaign_totals"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", name="uq_campaign_totals_campaign_id"),
+        # Live progress feed: totals changed since a change number
+        Index("ix_campaign_totals_change_seq", "change_seq"),
+    )
+    
+    campaign_id: int = Field()
+    total_amount: float = Field(default=0.0)
+    gift_count: int = Field(default=0)
+    donor_count: int = Field(default=0)
+    change_seq: int = Field(default=0)
+    
+    def __repr__(self) -> str:
+        return (
+            f"<CampaignTotal(campaign_id={self.campaign_id}, total_amount={self.total_amount}, "
+            f"gift_count={self.gift_count}, donor_count={self.donor_count})>"
+        )
+
+
+class CampaignDonor(BaseModel, table=True):
+    """One donor's completed giving to one campaign; a row per distinct campaign donor."""
+    __tablename__ = "campaign_donors"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "donor_id", name="uq_campaign_donors_campaign_donor"),
+        # Donor deletes and merges: a donor's campaigns
+        Index("ix_campaign_donors_donor_id", "donor_id"),
+    )
+    
+    campaign_id: int = Field()
+    donor_id: int = Field()  # not a foreign key; donor deletes remove these rows explicitly
+    total_amount: float = Field(default=0.0)
+    gift_count: int = Field(default=0)
+    
+    def __repr__(self) -> str:
+        return (
+            f"<CampaignDonor(campaign_id={self.campaign_id}, donor_id={self.donor_id}, "
+            f"gift_count={self.gift_count})>"
+        )
@@ -0,0 +1,14 @@
+"""Change sequence model."""
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class ChangeSequence(BaseModel, table=True):
+    """Last change number handed out for a synced table."""
+    __tablename__ = "change_sequences"
+    
+    name: str = Field(unique=True, index=True)  # e.g. "donors"
+    value: int = Field(default=0)
+    
+    def __repr__(self) -> str:
+        return f"<ChangeSequence(name='{self.name}', value={self.value})>"
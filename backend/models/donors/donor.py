@@ -1,6 +1,7 @@
 """Donor model."""
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship
 from models.base import BaseModel
 
@@ -8,6 +9,24 @@ from models.base import BaseModel
 class Donor(BaseModel, table=True):
     """Donor database model."""
     __tablename__ = "donors"
+    __table_args__ = (
+        # Autocomplete: prefix range scan on the key, top donors first; deleted_at
+        # keeps the scan covering when soft-deleted donors are skipped
+        Index("ix_donors_name_key_total_gifts", "name_key", "total_gifts", "deleted_at"),
+        Index("ix_donors_email_key_total_gifts", "email_key", "total_gifts", "deleted_at"),
+        Index("ix_donors_company_key_total_gifts", "company_key", "total_gifts", "deleted_at"),
+        # Geographic filters and rollup rebuilds
+        Index("ix_donors_state_key_postal_key", "state_key", "postal_key"),
+        Index("ix_donors_state_key_city_key", "state_key", "city_key"),
+        # Delta sync: keyset scan of changes after a (change_seq, id) token
+        Index("ix_donors_change_seq_id", "change_seq", "id"),
+        # Retention purge: only soft-deleted donors are indexed
+        Index(
+            "ix_donors_deleted_at", "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
     
     # Personal Information
     first_name: str = Field(index=True)
@@ -51,7 +70,7 @@ class Donor(BaseModel, table=True):
     average_gift: float = Field(default=0.0)
     
     # Status and Segmentation
-    donor_status: str = Field(default="active")  # active, lapsed, prospect
+    donor_status: str = Field(default="active", index=True)  # active, lapsed, prospect
     donor_type: str = Field(default="individual")  # individual, organization, foundation
     wealth_rating: Optional[str] = Field(default=None)  # A, B, C, D
     capacity_rating: Optional[int] = Field(default=None)  # 1-10 scale
@@ -64,6 +83,18 @@ class Donor(BaseModel, table=True):
     name_key: Optional[str] = Field(default=None, index=True)  # Normalized name for matching
     email_key: Optional[str] = Field(default=None, index=True)  # Normalized email for matching
     phone_key: Optional[str] = Field(default=None, index=True)  # Normalized phone for matching
+    company_key: Optional[str] = Field(default=None)  # Normalized company for autocomplete
+    
+    # Geographic Keys (normalized address parts)
+    state_key: Optional[str] = Field(default=None)  # Two-letter code for US states
+    city_key: Optional[str] = Field(default=None)
+    postal_key: Optional[str] = Field(default=None)  # Five-digit ZIP for US addresses
+    
+    # Delta Sync
+    change_seq: int = Field(default=0)  # Change number of the last write
+    
+    # Soft Delete
+    deleted_at: Optional[datetime] = Field(default=None)  # Hidden from reads once set
     
     # Relationships
     gifts: List["Gift"] = Relationship(back_populates="donor")
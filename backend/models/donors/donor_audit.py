@@ -0,0 +1,22 @@
+"""Donor audit log model."""
+from typing import Optional
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class DonorAuditEntry(BaseModel, table=True):
+    """One donor write with its field-level before/after values.
+    
+    ``created_at`` is when the change was made, not when the background
+    writer stored it. ``donor_id`` is not a foreign key so history outlives
+    deleted and merged donors.
+    """
+    __tablename__ = "donor_audit_log"
+    
+    donor_id: int = Field(index=True)
+    action: str = Field()  # update, merge, merged, delete, tag
+    actor: Optional[str] = Field(default=None)  # username of the requesting user
+    changes: str = Field()  # JSON object: field -> [before, after]
+    
+    def __repr__(self) -> str:
+        return f"<DonorAuditEntry(donor_id={self.donor_id}, action='{self.action}', actor='{self.actor}')>"
@@ -0,0 +1,16 @@
+"""Maintained donor counts per segment."""
+from sqlmodel import Field, UniqueConstraint
+from models.base import BaseModel
+
+
+class DonorCounter(BaseModel, table=True):
+    """Number of donors in one segment, kept current on every donor write."""
+    __tablename__ = "donor_counters"
+    __table_args__ = (UniqueConstraint("dimension", "value", name="uq_donor_counters_dimension_value"),)
+    
+    dimension: str = Field()  # all, status, type
+    value: str = Field()  # segment value; "*" for the all-donors total
+    count: int = Field(default=0)
+    
+    def __repr__(self) -> str:
+        return f"<DonorCounter(dimension='{self.dimension}', value='{self.value}', count={self.count})>"
@@ -0,0 +1,20 @@
+"""Donor tombstone model."""
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class DonorTombstone(BaseModel, table=True):
+    """Marker left when a donor is deleted, so syncing clients can drop it."""
+    __tablename__ = "donor_tombstones"
+    __table_args__ = (
+        Index("ix_donor_tombstones_change_seq_donor_id", "change_seq", "donor_id"),
+    )
+    
+    donor_id: int = Field()  # the deleted donor; not a foreign key
+    change_seq: int = Field()
+    merged_into_id: Optional[int] = Field(default=None)  # surviving donor of a merge
+    
+    def __repr__(self) -> str:
+        return f"<DonorTombstone(donor_id={self.donor_id}, change_seq={self.change_seq})>"
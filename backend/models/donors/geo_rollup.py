@@ -0,0 +1,29 @@
+"""Maintained donor and giving totals per geographic area."""
+from sqlmodel import Field, UniqueConstraint
+from models.base import BaseModel
+
+
+class GeoRollup(BaseModel, table=True):
+    """Donor count and giving totals for one area, kept current on donor and gift writes.
+    
+    Areas nest as state -> postal prefix (first three characters) -> postal
+    code, with cities as a second breakdown of each state.
+    """
+    __tablename__ = "geo_rollups"
+    __table_args__ = (
+        UniqueConstraint("level", "state", "parent_code", "code", name="uq_geo_rollups_area"),
+    )
+    
+    level: str = Field()  # state, city, postal_prefix, postal_code
+    state: str = Field()  # normalized state key; "" when unknown
+    parent_code: str = Field(default="")  # postal prefix of a postal_code row, else ""
+    code: str = Field(default="")  # city key, postal prefix or postal code; "" for state rows
+    donor_count: int = Field(default=0)
+    total_gifts: float = Field(default=0.0)
+    gift_count: int = Field(default=0)
+    
+    def __repr__(self) -> str:
+        return (
+            f"<GeoRollup(level='{self.level}', state='{self.state}', "
+            f"code='{self.code}', donor_count={self.donor_count})>"
+        )
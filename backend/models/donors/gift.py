@@ -1,13 +1,29 @@
 """Gift model for tracking donations."""
 from datetime import datetime
 from typing import Optional
-from sqlmodel import Field, Relationship
+from sqlalchemy import Index, text
+from sqlmodel import Field, Relationship, UniqueConstraint
 from models.base import BaseModel
 
 
 class Gift(BaseModel, table=True):
     """Gift/Donation database model."""
     __tablename__ = "gifts"
+    __table_args__ = (
+        UniqueConstraint("source", "transaction_id", name="uq_gifts_source_transaction_id"),
+        # Completed gifts still waiting for a tax receipt, in receipt order
+        Index(
+            "ix_gifts_receipt_pending", "gift_date", "id",
+            sqlite_where=text("receipt_sent IS 0 AND gift_status = 'completed'"),
+            postgresql_where=text("receipt_sent IS false AND gift_status = 'completed'"),
+        ),
+        # Completed gifts waiting for a thank-you, grouped by donor
+        Index(
+            "ix_gifts_ack_pending", "donor_id", "gift_date", "id",
+            sqlite_where=text("acknowledged IS 0 AND gift_status = 'completed'"),
+            postgresql_where=text("acknowledged IS false AND gift_status = 'completed'"),
+        ),
+    )
     
     # Donor Relationship
     donor_id: int = Field(foreign_key="donors.id", index=True)
@@ -25,7 +41,8 @@ class Gift(BaseModel, table=True):
     fund_name: Optional[str] = Field(default=None)
     
     # Transaction Details
-    transaction_id: Optional[str] = Field(default=None)  # External transaction reference
+    source: Optional[str] = Field(default=None)  # Feed that delivered the gift: stripe, settlement, manual
+    transaction_id: Optional[str] = Field(default=None)  # External transaction reference, unique per source
     check_number: Optional[str] = Field(default=None)
     receipt_number: Optional[str] = Field(default=None)
     
@@ -44,6 +61,7 @@ class Gift(BaseModel, table=True):
     tax_deductible_amount: Optional[float] = Field(default=None)
     receipt_sent: bool = Field(default=False)
     receipt_sent_date: Optional[datetime] = Field(default=None)
+    receipt_claimed_at: Optional[datetime] = Field(default=None)  # Set while a receipt run is issuing it
     
     # Notes
     notes: Optional[str] = Field(default=None)
@@ -0,0 +1,14 @@
+"""Receipt number sequence model."""
+from sqlmodel import Field
+from models.base import BaseModel
+
+
+class ReceiptSequence(BaseModel, table=True):
+    """Next tax receipt number for a calendar year."""
+    __tablename__ = "receipt_sequences"
+    
+    year: int = Field(unique=True, index=True)
+    next_number: int = Field(default=1)
+    
+    def __repr__(self) -> str:
+        return f"<ReceiptSequence(year={self.year}, next_number={self.next_number})>"
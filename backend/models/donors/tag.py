@@ -1,5 +1,6 @@
 """Tag models for donor segmentation and categorization."""
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 from models.base import BaseModel
 
@@ -27,6 +28,12 @@ class Tag(BaseModel, table=True):
 class DonorTag(BaseModel, table=True):
     """Association table for many-to-many relationship between donors and tags."""
     __tablename__ = "donor_tags"
+    __table_args__ = (
+        # The primary key leads with id, so lookups need their own indexes:
+        # a donor's tags, and a tag's donors
+        Index("ix_donor_tags_donor_id_tag_id", "donor_id", "tag_id"),
+        Index("ix_donor_tags_tag_id_donor_id", "tag_id", "donor_id"),
+    )
     
     # Foreign Keys
     donor_id: int = Field(foreign_key="donors.id", primary_key=True)
@@ -1,5 +1,7 @@
 """Base repository class."""
 from typing import Generic, TypeVar, Type, List, Optional
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
 from sqlmodel import Session, select
 from models.base import BaseModel
 
@@ -7,6 +9,15 @@ from models.base import BaseModel
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
+def dialect_insert(connection: Connection, table: Table):
+    """INSERT for ``table`` supporting ON CONFLICT on Postgres and SQLite."""
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations."""
     
@@ -1,4 +1,16 @@
 """Donor repository modules."""
 from .donor_repository import DonorRepository
+from .donor_audit_repository import DonorAuditRepository
+from .donor_counter_repository import DonorCounterRepository
+from .donor_tombstone_repository import DonorTombstoneRepository
+from .geo_rollup_repository import GeoRollupRepository
+from .gift_repository import GiftRepository
+from .communication_repository import CommunicationRepository
+from .archive_repository import ArchiveRepository
+from .campaign_total_repository import CampaignTotalRepository
 
-__all__ = ["DonorRepository"]
\ No newline at end of file
+__all__ = [
+    "DonorRepository", "DonorAuditRepository", "DonorCounterRepository",
+    "DonorTombstoneRepository", "GeoRollupRepository", "GiftRepository",
+    "CommunicationRepository", "ArchiveRepository", "CampaignTotalRepository",
+]
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""Archive repository for gifts and communications kept in cold storage."""
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import DateTime, Table, and_, delete, or_, select, tuple_, update
+from sqlmodel import Session
+from models.donors.archive_chunk import ArchiveChunk
+from models.donors.archived_transaction import ArchivedTransaction
+from models.donors.communication import Communication
+from models.donors.gift import Gift
+from repositories.base import BaseRepository, dialect_insert
+
+
+# Archived tables and the column that dates their rows
+ARCHIVED_TABLES: Dict[str, Tuple[Table, str]] = {
+    "gifts": (Gift.__table__, "gift_date"),
+    "communications": (Communication.__table__, "contact_date"),
+}
+
+ChunkKey = Tuple[int, int]  # (donor_id, year)
+TransactionKey = Tuple[str, str]  # (source, transaction_id)
+
+
+def _still_open(table_name: str, table: Table):
+    """Rows with work outstanding, which stay in the hot table."""
+    if table_name == "gifts":
+        return and_(
+            table.c.gift_status == "completed",
+            or_(table.c.acknowledged.is_(False), table.c.receipt_sent.is_(False))
+        )
+    return and_(table.c.follow_up_required.is_(True), table.c.follow_up_completed.is_(False))
+
+
+def encode_rows(table: Table, rows: List[Dict[str, Any]]) -> bytes:
+    """Compress rows column by column; donor_id is part of the chunk key and left out."""
+    columns = {
+        column.name: [row.get(column.name) for row in rows]
+        for column in table.c
+        if column.name != "donor_id"
+    }
+    document = json.dumps(columns, separators=(",", ":"), default=datetime.isoformat)
+    return zlib.compress(document.encode(), 9)
+
+
+def decode_rows(table: Table, donor_id: int, payload: bytes) -> List[Dict[str, Any]]:
+    """Rows of a chunk with every current column; columns added since archiving are None."""
+    columns = json.loads(zlib.decompress(payload))
+    count = len(columns["id"])
+    values = {}
+    for column in table.c:
+        stored = columns.get(column.name, [None] * count)
+        if isinstance(column.type, DateTime):
+            stored = [datetime.fromisoformat(value) if value else None for value in stored]
+        values[column.name] = stored
+    values["donor_id"] = [donor_id] * count
+    names = list(values)
+    return [dict(zip(names, row)) for row in zip(*values.values())]
+
+
+class ArchiveRepository(BaseRepository[ArchiveChunk]):
+    """Repository for archive chunks: one donor's rows of one table for one year.
+    
+    Callers see decoded row dicts shaped like the hot table's rows; the
+    compressed encoding stays inside this module.
+    """
+    
+    def __init__(self, session: Session):
+        super().__init__(session, ArchiveChunk)
+    
+    def archivable(
+        self,
+        table_name: str,
+        before: datetime,
+        after: Optional[Tuple[datetime, int]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` closed hot rows dated before ``before``, after a (date, id) position.
+        
+        The rows are locked on databases that support it, so nothing
+        changes them between being copied and deleted.
+        """
+        table, date_column = ARCHIVED_TABLES[table_name]
+        dated = table.c[date_column]
+        statement = (
+            select(table)
+            .where(dated < before, ~_still_open(table_name, table))
+            .order_by(dated, table.c.id)
+            .limit(limit)
+            .with_for_update()
+        )
+        if after is not None:
+            statement = statement.where(tuple_(dated, table.c.id) > tuple_(*after))
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def archive_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+        """Fold hot rows into their chunks and delete them from the hot table."""
+        if not rows:
+            return
+        table, date_column = ARCHIVED_TABLES[table_name]
+        incoming: Dict[ChunkKey, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            incoming[(row["donor_id"], row[date_column].year)].append(row)
+        
+        existing = self.chunk_rows(table_name, incoming)
+        self._save(table_name, {
+            key: existing.get(key, []) + new_rows for key, new_rows in incoming.items()
+        })
+        if table_name == "gifts":
+            self._remember_transactions(rows)
+        self.session.execute(delete(table).where(table.c.id.in_([row["id"] for row in rows])))
+    
+    def chunk_rows(
+        self, table_name: str, keys: Iterable[ChunkKey]
+    ) -> Dict[ChunkKey, List[Dict[str, Any]]]:
+        """Decoded rows of the chunks with the given (donor_id, year) keys that exist."""
+        keys = set(keys)
+        if not keys:
+            return {}
+        table = ARCHIVED_TABLES[table_name][0]
+        # Two IN lists and a filter here; a row-value IN would scan the index
+        statement = select(ArchiveChunk.donor_id, ArchiveChunk.year, ArchiveChunk.payload).where(
+            ArchiveChunk.donor_id.in_({donor_id for donor_id, _ in keys}),
+            ArchiveChunk.table_name == table_name,
+            ArchiveChunk.year.in_({year for _, year in keys})
+        )
+        return {
+            (donor_id, year): decode_rows(table, donor_id, payload)
+            for donor_id, year, payload in self.session.execute(statement)
+            if (donor_id, year) in keys
+        }
+    
+    def archived_gift_ids(self, keys: Iterable[TransactionKey]) -> Dict[TransactionKey, int]:
+        """Ids of archived gifts with the given (source, transaction_id) keys, in any chunk."""
+        keys = {key for key in keys if None not in key}
+        if not keys:
+            return {}
+        statement = select(
+            ArchivedTransaction.source, ArchivedTransaction.transaction_id, ArchivedTransaction.gift_id
+        ).where(
+            ArchivedTransaction.source.in_({source for source, _ in keys}),
+            ArchivedTransaction.transaction_id.in_({transaction_id for _, transaction_id in keys})
+        )
+        return {
+            (source, transaction_id): gift_id
+            for source, transaction_id, gift_id in self.session.execute(statement)
+            if (source, transaction_id) in keys
+        }
+    
+    def donor_rows(
+        self,
+        donor_id: int,
+        table_names: Iterable[str],
+        first_year: Optional[int] = None,
+        last_year: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """A donor's archived rows per table, optionally limited to a range of years."""
+        statement = select(ArchiveChunk.table_name, ArchiveChunk.payload).where(
+            ArchiveChunk.donor_id == donor_id,
+            ArchiveChunk.table_name.in_(list(table_names))
+        )
+        if first_year is not None:
+            statement = statement.where(ArchiveChunk.year >= first_year)
+        if last_year is not None:
+            statement = statement.where(ArchiveChunk.year <= last_year)
+        rows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for table_name, payload in self.session.execute(statement):
+            rows[table_name].extend(decode_rows(ARCHIVED_TABLES[table_name][0], donor_id, payload))
+        return rows
+    
+    def year_rows(
+        self, table_name: str, year: int, chunk_size: int = 500
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """(donor_id, rows) for every chunk of ``year``, in donor id order, streamed."""
+        table = ARCHIVED_TABLES[table_name][0]
+        statement = (
+            select(ArchiveChunk.donor_id, ArchiveChunk.payload)
+            .where(ArchiveChunk.table_name == table_name, ArchiveChunk.year == year)
+            .order_by(ArchiveChunk.donor_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for donor_id, payload in self.session.execute(statement):
+            yield donor_id, decode_rows(table, donor_id, payload)
+    
+    def chunks_since(
+        self, table_name: str, since: Optional[datetime], chunk_size: int = 500
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """(donor_id, rows) for every chunk written at or after ``since``, or every chunk, streamed."""
+        table = ARCHIVED_TABLES[table_name][0]
+        statement = (
+            select(ArchiveChunk.donor_id, ArchiveChunk.payload)
+            .where(ArchiveChunk.table_name == table_name)
+            .execution_options(yield_per=chunk_size)
+        )
+        if since is not None:
+            statement = statement.where(ArchiveChunk.updated_at >= since)
+        for donor_id, payload in self.session.execute(statement):
+            yield donor_id, decode_rows(table, donor_id, payload)
+    
+    def holds_year(self, table_name: str, year: int) -> bool:
+        """Whether any rows of ``year`` have been archived."""
+        statement = select(ArchiveChunk.id).where(
+            ArchiveChunk.table_name == table_name, ArchiveChunk.year == year
+        ).limit(1)
+        return self.session.execute(statement).first() is not None
+    
+    def reassign_donor(self, from_donor_id: int, to_donor_id: int) -> None:
+        """Move a donor's chunks to another donor, merging chunks of the same table and year."""
+        statement = select(ArchiveChunk.table_name, ArchiveChunk.year).where(
+            ArchiveChunk.donor_id == from_donor_id
+        )
+        moving: Dict[str, List[int]] = defaultdict(list)
+        for table_name, year in self.session.execute(statement):
+            moving[table_name].append(year)
+        
+        for table_name, years in moving.items():
+            rows = self.chunk_rows(
+                table_name,
+                [(donor_id, year) for year in years for donor_id in (from_donor_id, to_donor_id)]
+            )
+            self._save(table_name, {
+                (to_donor_id, year): rows.get((to_donor_id, year), []) + rows[(from_donor_id, year)]
+                for year in years
+            })
+        self.session.execute(delete(ArchiveChunk).where(ArchiveChunk.donor_id == from_donor_id))
+        self.session.execute(
+            update(ArchivedTransaction)
+            .where(ArchivedTransaction.donor_id == from_donor_id)
+            .values(donor_id=to_donor_id)
+        )
+    
+    def _remember_transactions(self, rows: List[Dict[str, Any]]) -> None:
+        """Record the transaction keys of gifts moving to the archive."""
+        now = datetime.utcnow()
+        values = [
+            {
+                "created_at": now,
+                "source": row["source"],
+                "transaction_id": row["transaction_id"],
+                "gift_id": row["id"],
+                "donor_id": row["donor_id"],
+            }
+            for row in rows
+            if row["source"] is not None and row["transaction_id"] is not None
+        ]
+        if values:
+            statement = dialect_insert(self.session.connection(), ArchivedTransaction.__table__)
+            self.session.execute(
+                statement.on_conflict_do_nothing(index_elements=["source", "transaction_id"]), values
+            )
+    
+    def _save(self, table_name: str, chunks: Dict[ChunkKey, List[Dict[str, Any]]]) -> None:
+        """Write whole chunks with one executemany upsert, rows in (date, id) order."""
+        table, date_column = ARCHIVED_TABLES[table_name]
+        now = datetime.utcnow()
+        values = []
+        for (donor_id, year), rows in chunks.items():
+            rows = sorted(
+                {row["id"]: row for row in rows}.values(),
+                key=lambda row: (row[date_column], row["id"])
+            )
+            values.append({
+                "created_at": now,
+                "updated_at": now,
+                "table_name": table_name,
+                "donor_id": donor_id,
+                "year": year,
+                "row_count": len(rows),
+                "payload": encode_rows(table, rows),
+            })
+        statement = dialect_insert(self.session.connection(), ArchiveChunk.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=["donor_id", "table_name", "year"],
+            set_={
+                "row_count": statement.excluded.row_count,
+                "payload": statement.excluded.payload,
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+        self.session.execute(statement, values)
@@ -0,0 +1,44 @@
+"""Campaign total repository for progress reads and the live progress feed."""
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, select as select_columns, tuple_
+from sqlmodel import Session
+from models.donors.campaign_total import CampaignTotal
+from repositories.base import BaseRepository
+
+
+COLUMNS = (
+    CampaignTotal.campaign_id,
+    CampaignTotal.total_amount,
+    CampaignTotal.gift_count,
+    CampaignTotal.donor_count,
+    CampaignTotal.change_seq,
+)
+
+
+class CampaignTotalRepository(BaseRepository[CampaignTotal]):
+    """Repository for maintained campaign running totals."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, CampaignTotal)
+    
+    def totals(self, campaign_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Totals of the given campaigns, or of every campaign, in campaign order."""
+        statement = select_columns(*COLUMNS).order_by(CampaignTotal.campaign_id)
+        if campaign_ids is not None:
+            statement = statement.where(CampaignTotal.campaign_id.in_(campaign_ids))
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def changed_since(self, after: Tuple[int, int], limit: int) -> List[Dict[str, Any]]:
+        """Totals changed after the (change_seq, campaign_id) position, in that order."""
+        statement = (
+            select_columns(*COLUMNS)
+            .where(tuple_(CampaignTotal.change_seq, CampaignTotal.campaign_id) > tuple_(*after))
+            .order_by(CampaignTotal.change_seq, CampaignTotal.campaign_id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def latest_change_seq(self) -> int:
+        """Change number of the most recent totals write; 0 before any."""
+        statement = select_columns(func.coalesce(func.max(CampaignTotal.change_seq), 0))
+        return self.session.execute(statement).scalar_one()
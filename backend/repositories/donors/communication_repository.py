@@ -0,0 +1,50 @@
+"""Communication repository for database operations."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, select, tuple_
+from sqlmodel import Session
+from models.donors.communication import Communication
+from repositories.base import BaseRepository
+
+
+class CommunicationRepository(BaseRepository[Communication]):
+    """Repository for communication database operations."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, Communication)
+    
+    def insert_many(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert communications as multi-row INSERTs; returns the new ids.
+        
+        Rows must carry every non-nullable column. RETURNING makes
+        SQLAlchemy batch the rows into multi-row VALUES statements, split
+        only where the driver's parameter limit requires it.
+        """
+        if not rows:
+            return []
+        table = Communication.__table__
+        statement = (
+            insert(table)
+            .returning(table.c.id)
+            .execution_options(insertmanyvalues_page_size=len(rows))
+        )
+        return list(self.session.execute(statement, rows).scalars())
+    
+    def for_donor(
+        self, donor_id: int, before: Optional[Tuple[datetime, int]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """A donor's communications newest first, keyset-paged on (contact_date, id)."""
+        statement = (
+            select(
+                Communication.id, Communication.contact_date, Communication.communication_type,
+                Communication.direction, Communication.subject
+            )
+            .where(Communication.donor_id == donor_id)
+            .order_by(Communication.contact_date.desc(), Communication.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            statement = statement.where(
+                tuple_(Communication.contact_date, Communication.id) < tuple_(*before)
+            )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
@@ -0,0 +1,22 @@
+"""Donor audit repository for change history reads."""
+from typing import List, Optional
+from sqlmodel import Session, select
+from models.donors.donor_audit import DonorAuditEntry
+from repositories.base import BaseRepository
+
+
+class DonorAuditRepository(BaseRepository[DonorAuditEntry]):
+    """Repository for the donor audit log; rows are written by the audit writer."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, DonorAuditEntry)
+    
+    def history(
+        self, donor_id: int, before_id: Optional[int] = None, limit: int = 50
+    ) -> List[DonorAuditEntry]:
+        """A donor's entries newest first, keyset-paged by entry id."""
+        statement = select(DonorAuditEntry).where(DonorAuditEntry.donor_id == donor_id)
+        if before_id is not None:
+            statement = statement.where(DonorAuditEntry.id < before_id)
+        statement = statement.order_by(DonorAuditEntry.id.desc()).limit(limit)
+        return list(self.session.exec(statement).all())
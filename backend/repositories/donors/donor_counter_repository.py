@@ -0,0 +1,26 @@
+"""Donor counter repository for segment count lookups."""
+from typing import Optional
+from sqlmodel import Session, select
+from models.donors.donor_counter import DonorCounter
+from models.donors.tag import Tag
+from repositories.base import BaseRepository
+
+
+class DonorCounterRepository(BaseRepository[DonorCounter]):
+    """Repository for maintained donor counts."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, DonorCounter)
+    
+    def get_count(self, dimension: str, value: str) -> int:
+        """Maintained count for one segment; segments without a row are empty."""
+        statement = select(DonorCounter.count).where(
+            DonorCounter.dimension == dimension,
+            DonorCounter.value == value
+        )
+        return self.session.exec(statement).first() or 0
+    
+    def get_tag_count(self, tag_name: str) -> int:
+        """Maintained number of donors carrying a tag."""
+        statement = select(Tag.donor_count).where(Tag.name == tag_name)
+        return self.session.exec(statement).first() or 0
@@ -1,9 +1,25 @@
 """Donor repository for database operations."""
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import (
+    bindparam, case, delete, func, select as select_columns, tuple_, union_all, update
+)
 from sqlmodel import Session, select, and_, or_
+from models.donors.archive_chunk import ArchiveChunk
+from models.donors.archived_transaction import ArchivedTransaction
+from models.donors.communication import Communication
 from models.donors.donor import Donor
+from models.donors.gift import Gift
 from models.donors.tag import Tag, DonorTag
 from repositories.base import BaseRepository
+from repositories.donors.archive_repository import ArchiveRepository
+
+
+# Sorts after every character, so [prefix, prefix + PREFIX_END) is a prefix range
+PREFIX_END = "\U0010ffff"
+
+# Soft-deleted donors are invisible to every read
+LIVE = Donor.deleted_at.is_(None)
 
 
 class DonorRepository(BaseRepository[Donor]):
@@ -12,14 +28,201 @@ class DonorRepository(BaseRepository[Donor]):
     def __init__(self, session: Session):
         super().__init__(session, Donor)
     
+    def get_by_id(self, id: int) -> Optional[Donor]:
+        """Get a donor by ID unless it is soft-deleted."""
+        donor = super().get_by_id(id)
+        return donor if donor is not None and donor.deleted_at is None else None
+    
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[Donor]:
+        """Get donors with pagination, skipping soft-deleted ones."""
+        statement = select(Donor).where(LIVE).offset(skip).limit(limit)
+        return list(self.session.exec(statement).all())
+    
+    def get_by_ids(self, donor_ids: List[int]) -> List[Donor]:
+        """Get donors by id with a single IN query (order not guaranteed)."""
+        if not donor_ids:
+            return []
+        statement = select(Donor).where(Donor.id.in_(donor_ids), LIVE)
+        return list(self.session.exec(statement).all())
+    
+    def existing_ids(self, donor_ids: List[int]) -> set:
+        """The subset of ``donor_ids`` that exist, in one IN query."""
+        if not donor_ids:
+            return set()
+        statement = select_columns(Donor.id).where(Donor.id.in_(donor_ids), LIVE)
+        return set(self.session.execute(statement).scalars())
+    
+    def locations(self, donor_ids: List[int]) -> Dict[int, tuple]:
+        """(state_key, city_key, postal_key) per donor id, "" for missing parts."""
+        if not donor_ids:
+            return {}
+        statement = select_columns(
+            Donor.id, Donor.state_key, Donor.city_key, Donor.postal_key
+        ).where(Donor.id.in_(donor_ids))
+        return {
+            donor_id: (state or "", city or "", postal or "")
+            for donor_id, state, city, postal in self.session.execute(statement)
+        }
+    
+    def add_gift_totals(self, totals: List[Dict[str, Any]], change_seq: Optional[int] = None) -> None:
+        """Fold new gifts into donor aggregates with one executemany UPDATE.
+        
+        Each item holds ``donor_id``, ``amount`` (sum), ``count``,
+        ``first_date``, ``last_date`` and ``largest`` for that donor's new gifts.
+        ``change_seq`` stamps the donors for delta sync.
+        """
+        if not totals:
+            return
+        donors = Donor.__table__
+        new_total = donors.c.total_gifts + bindparam("b_amount")
+        new_count = donors.c.total_gift_count + bindparam("b_count")
+        statement = (
+            update(donors)
+            .where(donors.c.id == bindparam("b_donor_id"))
+            .values(
+                total_gifts=new_total,
+                total_gift_count=new_count,
+                average_gift=new_total / new_count,
+                largest_gift=case(
+                    (donors.c.largest_gift < bindparam("b_largest"), bindparam("b_largest")),
+                    else_=donors.c.largest_gift
+                ),
+                first_gift_date=case(
+                    (
+                        (donors.c.first_gift_date.is_(None))
+                        | (donors.c.first_gift_date > bindparam("b_first_date")),
+                        bindparam("b_first_date")
+                    ),
+                    else_=donors.c.first_gift_date
+                ),
+                last_gift_date=case(
+                    (
+                        (donors.c.last_gift_date.is_(None))
+                        | (donors.c.last_gift_date < bindparam("b_last_date")),
+                        bindparam("b_last_date")
+                    ),
+                    else_=donors.c.last_gift_date
+                ),
+            )
+        )
+        if change_seq is not None:
+            statement = statement.values(change_seq=change_seq)
+        self.session.execute(statement, [
+            {
+                "b_donor_id": item["donor_id"],
+                "b_amount": item["amount"],
+                "b_count": item["count"],
+                "b_largest": item["largest"],
+                "b_first_date": item["first_date"],
+                "b_last_date": item["last_date"],
+            }
+            for item in totals
+        ])
+    
+    def segment_ids(
+        self,
+        status: Optional[str] = None,
+        donor_type: Optional[str] = None,
+        tag_name: Optional[str] = None
+    ) -> List[int]:
+        """Ids of live donors in a segment, in id order."""
+        statement = self._filtered_ids(status, donor_type, tag_name, None).order_by(Donor.id)
+        return list(self.session.execute(statement).scalars())
+    
+    def expired_ids(self, deleted_before: datetime, limit: int) -> List[int]:
+        """Up to ``limit`` donors soft-deleted before the cutoff, earliest deletes first."""
+        statement = (
+            select_columns(Donor.id)
+            .where(Donor.deleted_at < deleted_before)
+            .order_by(Donor.deleted_at, Donor.id)
+            .limit(limit)
+        )
+        return list(self.session.execute(statement).scalars())
+    
+    def tag_ids(self, donor_ids: List[int]) -> List[int]:
+        """Tag id of every tag assignment held by the donors."""
+        statement = select_columns(DonorTag.tag_id).where(DonorTag.donor_id.in_(donor_ids))
+        return list(self.session.execute(statement).scalars())
+    
+    def delete_cascade(
+        self, donor_ids: List[int], soft_deleted: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Delete donors with their tags, communications, gifts and archive, one DELETE per table.
+        
+        Only live donors are deleted, or with ``soft_deleted`` only donors
+        that were soft-deleted. Returns the deleted donor rows and the tag id
+        of every tag assignment removed with them.
+        """
+        donors = Donor.__table__
+        state = donors.c.deleted_at.is_not(None) if soft_deleted else donors.c.deleted_at.is_(None)
+        targets = select_columns(donors.c.id).where(donors.c.id.in_(donor_ids), state)
+        
+        donor_tags = DonorTag.__table__
+        tag_ids = list(self.session.execute(
+            delete(donor_tags)
+            .where(donor_tags.c.donor_id.in_(targets))
+            .returning(donor_tags.c.tag_id)
+        ).scalars())
+        for table in (
+            Communication.__table__, Gift.__table__, ArchiveChunk.__table__, ArchivedTransaction.__table__
+        ):
+            self.session.execute(delete(table).where(table.c.donor_id.in_(targets)))
+        
+        rows = self.session.execute(
+            delete(donors).where(donors.c.id.in_(donor_ids), state).returning(*donors.c)
+        )
+        return [dict(row._mapping) for row in rows], tag_ids
+    
+    def soft_delete(
+        self, donor_ids: List[int], deleted_at: datetime, change_seq: int
+    ) -> List[Dict[str, Any]]:
+        """Mark live donors deleted in one UPDATE; returns their rows."""
+        donors = Donor.__table__
+        statement = (
+            update(donors)
+            .where(donors.c.id.in_(donor_ids), donors.c.deleted_at.is_(None))
+            .values(deleted_at=deleted_at, updated_at=deleted_at, change_seq=change_seq)
+            .returning(*donors.c)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def reassign_dependents(self, from_donor_id: int, to_donor_id: int) -> List[int]:
+        """Move gifts, communications, archive chunks and tags to another donor.
+        
+        Hot rows and tags move with set-based UPDATEs. Tags the target
+        already has are dropped from the source instead of moved; returns
+        the tag ids of those dropped assignments.
+        """
+        for table in (Gift.__table__, Communication.__table__):
+            self.session.execute(
+                update(table)
+                .where(table.c.donor_id == from_donor_id)
+                .values(donor_id=to_donor_id)
+            )
+        ArchiveRepository(self.session).reassign_donor(from_donor_id, to_donor_id)
+        
+        donor_tags = DonorTag.__table__
+        held = select_columns(donor_tags.c.tag_id).where(donor_tags.c.donor_id == to_donor_id)
+        dropped = list(self.session.execute(
+            delete(donor_tags)
+            .where(donor_tags.c.donor_id == from_donor_id, donor_tags.c.tag_id.in_(held))
+            .returning(donor_tags.c.tag_id)
+        ).scalars())
+        self.session.execute(
+            update(donor_tags)
+            .where(donor_tags.c.donor_id == from_donor_id)
+            .values(donor_id=to_donor_id)
+        )
+        return dropped
+    
     def find_by_email(self, email: str) -> Optional[Donor]:
         """Find donor by email address."""
-        statement = select(Donor).where(Donor.email == email)
+        statement = select(Donor).where(Donor.email == email, LIVE)
         return self.session.exec(statement).first()
     
     def find_by_phone(self, phone: str) -> Optional[Donor]:
         """Find donor by phone number."""
-        statement = select(Donor).where(Donor.phone == phone)
+        statement = select(Donor).where(Donor.phone == phone, LIVE)
         return self.session.exec(statement).first()
     
     def find_by_name_parts(self, first_name: str, last_name: str) -> List[Donor]:
@@ -27,26 +230,166 @@ class DonorRepository(BaseRepository[Donor]):
         statement = select(Donor).where(
             and_(
                 Donor.first_name.ilike(f"%{first_name}%"),
-                Donor.last_name.ilike(f"%{last_name}%")
+                Donor.last_name.ilike(f"%{last_name}%"),
+                LIVE
             )
         )
         return list(self.session.exec(statement).all())
     
     def search_donors(self, query: str, limit: int = 50) -> List[Donor]:
         """Search donors by name, email, or phone."""
-        search_term = f"%{query}%"
-        statement = select(Donor).where(
-            or_(
-                Donor.full_name.ilike(search_term),
-                Donor.first_name.ilike(search_term),
-                Donor.last_name.ilike(search_term),
-                Donor.email.ilike(search_term),
-                Donor.phone.ilike(search_term),
-                Donor.company.ilike(search_term)
-            )
-        ).limit(limit)
+        statement = select(Donor).where(self._search_condition(query), LIVE).limit(limit)
         return list(self.session.exec(statement).all())
     
+    def get_fields(self, donor_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only the given columns of one donor."""
+        statement = self._select_fields(fields).where(Donor.id == donor_id, LIVE)
+        row = self.session.execute(statement).first()
+        return dict(row._mapping) if row else None
+    
+    def list_fields(self, fields: List[str], skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """List donors reading only the given columns."""
+        statement = self._select_fields(fields).where(LIVE).offset(skip).limit(limit)
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def search_fields(self, query: str, fields: List[str], limit: int = 50) -> List[Dict[str, Any]]:
+        """Search donors reading only the given columns."""
+        statement = (
+            self._select_fields(fields).where(self._search_condition(query), LIVE).limit(limit)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def top_by_prefix(
+        self, name_prefix: str, email_prefix: str, fields: List[str], limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Donors whose name, company or email key starts with the prefix, largest givers first.
+        
+        Each key is read with an index range scan that keeps its own top
+        ``limit`` ids; only the merged winners are fetched from the table.
+        """
+        arms = []
+        for column, prefix in (
+            (Donor.name_key, name_prefix),
+            (Donor.company_key, name_prefix),
+            (Donor.email_key, email_prefix),
+        ):
+            if not prefix:
+                continue
+            arm = (
+                select_columns(Donor.id)
+                .where(column >= prefix, column < prefix + PREFIX_END, LIVE)
+                .order_by(Donor.total_gifts.desc(), Donor.id)
+                .limit(limit)
+                .subquery()
+            )
+            arms.append(select_columns(arm.c.id))
+        if not arms:
+            return []
+        
+        statement = (
+            self._select_fields(fields)
+            .where(Donor.id.in_(union_all(*arms)))
+            .order_by(Donor.total_gifts.desc(), Donor.id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def changed_since(
+        self, fields: List[str], after: Tuple[int, int], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Donors written after the (change_seq, id) position, in that order."""
+        statement = (
+            self._select_fields(fields)
+            .add_columns(Donor.change_seq.label("_change_seq"), Donor.id.label("_id"))
+            .where(tuple_(Donor.change_seq, Donor.id) > tuple_(*after), LIVE)
+            .order_by(Donor.change_seq, Donor.id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def iter_fields(self, fields: List[str], chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream every donor in id order, reading only the given columns."""
+        statement = (
+            self._select_fields(fields)
+            .where(LIVE)
+            .order_by(Donor.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for row in self.session.execute(statement):
+            yield dict(row._mapping)
+    
+    def count_matching(
+        self,
+        status: Optional[str] = None,
+        donor_type: Optional[str] = None,
+        tag_name: Optional[str] = None,
+        query: Optional[str] = None,
+        cap: Optional[int] = None
+    ) -> int:
+        """Count donors matching the filters, stopping after ``cap`` matches."""
+        statement = self._filtered_ids(status, donor_type, tag_name, query)
+        if cap is not None:
+            statement = statement.limit(cap)
+        count_statement = select_columns(func.count()).select_from(statement.subquery())
+        return self.session.execute(count_statement).scalar_one()
+    
+    def estimate_matching(
+        self,
+        status: Optional[str] = None,
+        donor_type: Optional[str] = None,
+        tag_name: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> Optional[int]:
+        """Planner row estimate for the filters, or None if the database has none."""
+        connection = self.session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+        statement = self._filtered_ids(status, donor_type, tag_name, query)
+        compiled = statement.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar_one()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
+    def _filtered_ids(
+        self,
+        status: Optional[str],
+        donor_type: Optional[str],
+        tag_name: Optional[str],
+        query: Optional[str]
+    ):
+        """SELECT of donor ids matching the segment and search filters."""
+        statement = select_columns(Donor.id).where(LIVE)
+        if status is not None:
+            statement = statement.where(Donor.donor_status == status)
+        if donor_type is not None:
+            statement = statement.where(Donor.donor_type == donor_type)
+        if tag_name is not None:
+            statement = (
+                statement.join(DonorTag, DonorTag.donor_id == Donor.id)
+                .join(Tag, Tag.id == DonorTag.tag_id)
+                .where(Tag.name == tag_name)
+            )
+        if query is not None:
+            statement = statement.where(self._search_condition(query))
+        return statement
+    
+    def _select_fields(self, fields: List[str]):
+        """SELECT of just the named donor columns."""
+        return select_columns(*(getattr(Donor, name) for name in fields))
+    
+    def _search_condition(self, query: str):
+        """Substring match over names, email, phone and company."""
+        search_term = f"%{query}%"
+        return or_(
+            Donor.full_name.ilike(search_term),
+            Donor.first_name.ilike(search_term),
+            Donor.last_name.ilike(search_term),
+            Donor.email.ilike(search_term),
+            Donor.phone.ilike(search_term),
+            Donor.company.ilike(search_term)
+        )
+    
     def find_potential_duplicates(self, donor: Donor) -> List[Donor]:
         """Find potential duplicate donors based on normalized keys."""
         conditions = []
@@ -69,7 +412,8 @@ class DonorRepository(BaseRepository[Donor]):
         statement = select(Donor).where(
             and_(
                 Donor.id != donor.id,  # Exclude the donor being checked
-                or_(*conditions)
+                or_(*conditions),
+                LIVE
             )
         )
         return list(self.session.exec(statement).all())
@@ -80,20 +424,20 @@ class DonorRepository(BaseRepository[Donor]):
             select(Donor)
             .join(DonorTag)
             .join(Tag)
-            .where(Tag.name == tag_name)
+            .where(Tag.name == tag_name, LIVE)
         )
         return list(self.session.exec(statement).all())
     
     def get_active_donors(self, limit: int = 100) -> List[Donor]:
         """Get active donors with recent giving activity."""
         statement = select(Donor).where(
-            Donor.donor_status == "active"
+            Donor.donor_status == "active", LIVE
         ).limit(limit)
         return list(self.session.exec(statement).all())
     
     def get_lapsed_donors(self, limit: int = 100) -> List[Donor]:
         """Get lapsed donors who haven't given recently."""
         statement = select(Donor).where(
-            Donor.donor_status == "lapsed"
+            Donor.donor_status == "lapsed", LIVE
         ).limit(limit)
         return list(self.session.exec(statement).all())
\ No newline at end of file
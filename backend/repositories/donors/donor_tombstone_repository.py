@@ -0,0 +1,26 @@
+"""Donor tombstone repository for delta sync reads."""
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import select as select_columns, tuple_
+from sqlmodel import Session
+from models.donors.donor_tombstone import DonorTombstone
+from repositories.base import BaseRepository
+
+
+class DonorTombstoneRepository(BaseRepository[DonorTombstone]):
+    """Repository for deleted-donor markers."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, DonorTombstone)
+    
+    def deleted_since(self, after: Tuple[int, int], limit: int) -> List[Dict[str, Any]]:
+        """Tombstones after the (change_seq, donor_id) position, in that order."""
+        statement = (
+            select_columns(
+                DonorTombstone.donor_id, DonorTombstone.change_seq, DonorTombstone.merged_into_id
+            )
+            .where(tuple_(DonorTombstone.change_seq, DonorTombstone.donor_id) > tuple_(*after))
+            .order_by(DonorTombstone.change_seq, DonorTombstone.donor_id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+
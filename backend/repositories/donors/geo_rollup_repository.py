@@ -0,0 +1,36 @@
+"""Geo rollup repository for geographic drill-downs."""
+from typing import Any, Dict, List
+from sqlalchemy import select as select_columns
+from sqlmodel import Session
+from models.donors.geo_rollup import GeoRollup
+from repositories.base import BaseRepository
+
+
+class GeoRollupRepository(BaseRepository[GeoRollup]):
+    """Repository for maintained geographic totals."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, GeoRollup)
+    
+    def areas(self, level: str, state: str = "", parent_code: str = "") -> List[Dict[str, Any]]:
+        """Non-empty areas of one level, optionally within a state and postal prefix.
+        
+        State rows are listed across all states; other levels are read
+        within ``state`` with a unique-index range scan.
+        """
+        statement = (
+            select_columns(
+                GeoRollup.state,
+                GeoRollup.code,
+                GeoRollup.donor_count,
+                GeoRollup.total_gifts,
+                GeoRollup.gift_count,
+            )
+            .where(GeoRollup.level == level, GeoRollup.donor_count > 0)
+            .order_by(GeoRollup.state, GeoRollup.code)
+        )
+        if level != "state":
+            statement = statement.where(
+                GeoRollup.state == state, GeoRollup.parent_code == parent_code
+            )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
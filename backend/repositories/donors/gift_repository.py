@@ -0,0 +1,297 @@
+"""Gift repository for database operations."""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, bindparam, func, or_, select, tuple_, update
+from sqlmodel import Session
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+from models.donors.receipt_sequence import ReceiptSequence
+from repositories.base import BaseRepository, dialect_insert
+
+
+TransactionKey = Tuple[str, str]
+
+# Gifts of soft-deleted donors are hidden; the partial ix_donors_deleted_at index
+# keeps the excluded set cheap to read
+OF_LIVE_DONOR = Gift.donor_id.not_in(select(Donor.id).where(Donor.deleted_at.is_not(None)))
+
+
+class GiftRepository(BaseRepository[Gift]):
+    """Repository for gift database operations."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, Gift)
+    
+    def insert_new(self, rows: List[Dict[str, Any]]) -> Dict[TransactionKey, int]:
+        """Insert gifts, skipping transactions that are already stored.
+        
+        The rows go out as a multi-row INSERT ... ON CONFLICT DO NOTHING
+        RETURNING (SQLAlchemy's insertmanyvalues batching, which reuses the
+        cached statement instead of compiling one bind per value). Returns
+        the new gift ids keyed by (source, transaction_id); rows whose key
+        already exists are left out.
+        """
+        if not rows:
+            return {}
+        table = Gift.__table__
+        statement = (
+            dialect_insert(self.session.connection(), table)
+            .on_conflict_do_nothing(index_elements=["source", "transaction_id"])
+            .returning(table.c.id, table.c.source, table.c.transaction_id)
+        )
+        return {
+            (source, transaction_id): gift_id
+            for gift_id, source, transaction_id in self.session.execute(statement, rows)
+        }
+    
+    def ids_for_transactions(self, keys: Iterable[TransactionKey]) -> Dict[TransactionKey, int]:
+        """Existing gift ids for (source, transaction_id) pairs.
+        
+        One IN list per source rather than a row-value IN, which SQLite
+        answers by scanning the whole unique index.
+        """
+        by_source: Dict[str, List[str]] = defaultdict(list)
+        for source, transaction_id in keys:
+            by_source[source].append(transaction_id)
+        if not by_source:
+            return {}
+        statement = select(Gift.id, Gift.source, Gift.transaction_id).where(or_(*(
+            and_(Gift.source == source, Gift.transaction_id.in_(transaction_ids))
+            for source, transaction_ids in by_source.items()
+        )))
+        return {
+            (source, transaction_id): gift_id
+            for gift_id, source, transaction_id in self.session.execute(statement)
+        }
+    
+    def for_donor(
+        self, donor_id: int, before: Optional[Tuple[datetime, int]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """A donor's gifts newest first, keyset-paged on (gift_date, id)."""
+        statement = (
+            select(
+                Gift.id, Gift.gift_date, Gift.amount, Gift.gift_type, Gift.designation,
+                Gift.gift_status
+            )
+            .where(Gift.donor_id == donor_id)
+            .order_by(Gift.gift_date.desc(), Gift.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            statement = statement.where(tuple_(Gift.gift_date, Gift.id) < tuple_(*before))
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def snapshot_rows(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Gifts with ids above ``after_id``, in id order, with the analytics snapshot's columns."""
+        statement = self._snapshot_select().where(Gift.id > after_id).order_by(Gift.id).limit(limit)
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def snapshot_rows_by_id(self, gift_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """The gifts among ``gift_ids`` that exist, in id order, with the analytics snapshot's columns."""
+        if not gift_ids:
+            return []
+        statement = self._snapshot_select().where(Gift.id.in_(gift_ids)).order_by(Gift.id)
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def feed_rows(
+        self, after_id: int, limit: int, gap_ids: Sequence[int] = ()
+    ) -> List[Dict[str, Any]]:
+        """Gifts of live donors with ids above ``after_id`` or among ``gap_ids``, in id order.
+        
+        Carries the donor name shown by the live gift ticker.
+        """
+        position = Gift.id > after_id
+        if gap_ids:
+            # Gaps sit just below the watermark; the lower bound keeps this a rowid range
+            position = and_(Gift.id >= min(gap_ids), or_(position, Gift.id.in_(gap_ids)))
+        statement = self._feed_select().where(position).order_by(Gift.id).limit(limit)
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def latest_feed_rows(self, limit: int) -> List[Dict[str, Any]]:
+        """The ``limit`` newest gifts of live donors, oldest of them first."""
+        statement = self._feed_select().order_by(Gift.id.desc()).limit(limit)
+        return [dict(row._mapping) for row in self.session.execute(statement)][::-1]
+    
+    def latest_id(self) -> int:
+        """Id of the newest gift; 0 when there are none."""
+        return self.session.execute(select(func.coalesce(func.max(Gift.id), 0))).scalar_one()
+    
+    def pending_receipts(self, year: int, limit: int, stale_before: datetime) -> List[Dict[str, Any]]:
+        """Completed gifts of ``year`` without a sent receipt or a live claim, oldest first.
+        
+        Served by the ix_gifts_receipt_pending partial index; includes the
+        donor name and address needed to render the receipt. Claims made
+        before ``stale_before`` are taken over. The rows are locked on
+        databases that support it, skipping rows another run has locked,
+        so two runs never pick the same gifts before claiming them.
+        """
+        statement = (
+            select(
+                Gift.id, Gift.donor_id, Gift.amount, Gift.tax_deductible_amount,
+                Gift.gift_date, Gift.gift_type, Gift.designation, Gift.receipt_number,
+                Donor.full_name.label("donor_name"), Donor.address_line_1,
+                Donor.address_line_2, Donor.city, Donor.state, Donor.postal_code
+            )
+            .join(Donor, Donor.id == Gift.donor_id)
+            .where(
+                Gift.receipt_sent.is_(False),
+                Gift.gift_status == "completed",
+                Gift.gift_date >= datetime(year, 1, 1),
+                Gift.gift_date < datetime(year + 1, 1, 1),
+                or_(Gift.receipt_claimed_at.is_(None), Gift.receipt_claimed_at < stale_before),
+                Donor.deleted_at.is_(None)
+            )
+            .order_by(Gift.gift_date, Gift.id)
+            .limit(limit)
+            .with_for_update(of=Gift, skip_locked=True)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def reserve_receipt_numbers(self, year: int, count: int) -> int:
+        """Reserve ``count`` consecutive receipt numbers; returns the first.
+        
+        A single UPDATE ... RETURNING on the year's sequence row, so
+        concurrent runs never hand out the same number.
+        """
+        connection = self.session.connection()
+        table = ReceiptSequence.__table__
+        now = datetime.utcnow()
+        connection.execute(
+            dialect_insert(connection, table)
+            .values(year=year, next_number=1, created_at=now)
+            .on_conflict_do_nothing(index_elements=["year"])
+        )
+        next_number = connection.execute(
+            update(table)
+            .where(table.c.year == year)
+            .values(next_number=table.c.next_number + count, updated_at=now)
+            .returning(table.c.next_number)
+        ).scalar_one()
+        return next_number - count
+    
+    def set_receipt_numbers(self, numbers: Dict[int, str]) -> None:
+        """Store receipt numbers by gift id with one executemany UPDATE."""
+        if not numbers:
+            return
+        table = Gift.__table__
+        self.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(receipt_number=bindparam("b_receipt_number")),
+            [{"b_id": gift_id, "b_receipt_number": number} for gift_id, number in numbers.items()]
+        )
+    
+    def claim_receipts(self, gift_ids: List[int], claimed_at: Optional[datetime]) -> None:
+        """Claim gifts for a receipt run in one UPDATE; ``None`` releases the claim."""
+        if not gift_ids:
+            return
+        table = Gift.__table__
+        self.session.execute(
+            update(table)
+            .where(table.c.id.in_(gift_ids))
+            .values(receipt_claimed_at=claimed_at)
+        )
+    
+    def mark_receipts_sent(self, gift_ids: List[int], sent_at: datetime) -> None:
+        """Flag gifts as receipted in one UPDATE."""
+        if not gift_ids:
+            return
+        table = Gift.__table__
+        self.session.execute(
+            update(table)
+            .where(table.c.id.in_(gift_ids))
+            .values(receipt_sent=True, receipt_sent_date=sent_at)
+        )
+    
+    def acknowledgement_queue(self, after_donor_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+        """Unacknowledged completed gifts for the next ``limit`` donors by id.
+        
+        Both queries run off the ix_gifts_ack_pending partial index: one
+        picks the page of donor ids (keyset on donor id), the other loads
+        their pending gifts with the donor contact fields.
+        """
+        pending = (Gift.acknowledged.is_(False), Gift.gift_status == "completed", OF_LIVE_DONOR)
+        page = select(Gift.donor_id).where(*pending).group_by(Gift.donor_id).order_by(Gift.donor_id).limit(limit)
+        if after_donor_id is not None:
+            page = page.where(Gift.donor_id > after_donor_id)
+        donor_ids = list(self.session.execute(page).scalars())
+        if not donor_ids:
+            return []
+        
+        statement = (
+            select(
+                Gift.id, Gift.donor_id, Gift.amount, Gift.gift_date, Gift.gift_type,
+                Gift.designation, Donor.full_name.label("donor_name"), Donor.email,
+                Donor.preferred_contact_method
+            )
+            .join(Donor, Donor.id == Gift.donor_id)
+            .where(*pending, Gift.donor_id.in_(donor_ids))
+            .order_by(Gift.donor_id, Gift.gift_date, Gift.id)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def acknowledge(self, gift_ids: List[int], acknowledged_by: str, acknowledged_at: datetime) -> List[Dict[str, Any]]:
+        """Stamp gifts that are in the acknowledgement queue in one UPDATE; returns the rows changed.
+        
+        Gifts that are not completed, belong to a deleted donor or are
+        already acknowledged are left alone.
+        """
+        if not gift_ids:
+            return []
+        table = Gift.__table__
+        statement = (
+            update(table)
+            .where(
+                table.c.id.in_(gift_ids), table.c.acknowledged.is_(False),
+                table.c.gift_status == "completed", OF_LIVE_DONOR
+            )
+            .values(
+                acknowledged=True,
+                acknowledged_date=acknowledged_at,
+                acknowledged_by=acknowledged_by,
+                updated_at=acknowledged_at
+            )
+            .returning(table.c.id, table.c.donor_id, table.c.amount)
+        )
+        return [dict(row._mapping) for row in self.session.execute(statement)]
+    
+    def yearly_gift_details(self, year: int, chunk_size: int = 2_000) -> Iterator[Dict[str, Any]]:
+        """Completed gifts in ``year`` ordered by donor, then date, streamed."""
+        statement = (
+            select(
+                Gift.id, Gift.donor_id, Gift.gift_date, Gift.amount,
+                Gift.tax_deductible_amount, Gift.gift_type, Gift.designation,
+                Gift.receipt_number
+            )
+            .where(*self._completed_in_year(year), OF_LIVE_DONOR)
+            .order_by(Gift.donor_id, Gift.gift_date, Gift.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for row in self.session.execute(statement):
+            yield dict(row._mapping)
+    
+    def _snapshot_select(self):
+        return select(
+            Gift.id, Gift.donor_id, Gift.amount, Gift.gift_date, Gift.gift_status,
+            Gift.gift_type, Gift.designation, Gift.campaign_id
+        )
+    
+    def _feed_select(self):
+        return (
+            select(
+                Gift.id, Gift.donor_id, Donor.full_name.label("donor_name"), Gift.amount,
+                Gift.gift_date, Gift.campaign_id, Gift.designation, Gift.gift_status,
+                Gift.is_anonymous
+            )
+            .join(Donor, Donor.id == Gift.donor_id)
+            .where(Donor.deleted_at.is_(None))
+        )
+    
+    def _completed_in_year(self, year: int) -> Tuple:
+        """WHERE terms for completed gifts dated in ``year``."""
+        return (
+            Gift.gift_status == "completed",
+            Gift.gift_date >= datetime(year, 1, 1),
+            Gift.gift_date < datetime(year + 1, 1, 1)
+        )
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""User repository modules."""
+from .user_repository import UserRepository
+
+__all__ = ["UserRepository"]
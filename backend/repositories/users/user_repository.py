@@ -0,0 +1,30 @@
+"""User repository for database operations."""
+from typing import Optional
+from sqlmodel import Session, or_, select
+from models.user import User
+from repositories.base import BaseRepository
+
+
+class UserRepository(BaseRepository[User]):
+    """Repository for user database operations."""
+    
+    def __init__(self, session: Session):
+        super().__init__(session, User)
+    
+    def find_by_email(self, email: str) -> Optional[User]:
+        """Find user by email address."""
+        statement = select(User).where(User.email == email)
+        return self.session.exec(statement).first()
+    
+    def find_by_username(self, username: str) -> Optional[User]:
+        """Find user by username."""
+        statement = select(User).where(User.username == username)
+        return self.session.exec(statement).first()
+
+    
+    def find_by_email_or_username(self, email: str, username: str) -> Optional[User]:
+        """Find a user holding either the email or the username."""
+        statement = select(User).where(
+            or_(User.email == email, User.username == username)
+        )
+        return self.session.exec(statement).first()
@@ -0,0 +1,91 @@
+"""Shared test fixtures."""
+import os
+
+os.environ.setdefault("ENVIRONMENT", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel
+
+import models.donors  # noqa: F401 - register donor tables
+import models.user  # noqa: F401 - register user table
+from api.dependencies.database import get_session
+from api.main import app
+from api.services.donors import donor_cache
+from api.services.donors.autocomplete_service import clear_autocomplete_cache
+from api.services.donors.count_service import clear_count_cache
+from api.services.users.auth_service import clear_auth_caches
+from api.utils.query_tracker import install_query_tracking
+from api.utils.security import create_access_token
+from models.user import User
+
+
+@pytest.fixture
+def engine():
+    """Fresh in-memory database with all tables created."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_tracking(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Database session bound to the test engine."""
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(engine):
+    """Test client whose requests use the test database."""
+    def _get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _get_session
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Cached users, donors and counts must not leak between test databases."""
+    clear_auth_caches()
+    donor_cache.clear()
+    clear_count_cache()
+    clear_autocomplete_cache()
+    yield
+    clear_auth_caches()
+    donor_cache.clear()
+    clear_count_cache()
+    clear_autocomplete_cache()
+
+
+@pytest.fixture
+def user(session):
+    """An active user in the test database."""
+    user = User(
+        username="admin",
+        email="admin@example.com",
+        hashed_password="not-a-real-hash",
+        is_superuser=True
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Authorization header carrying a valid token for ``user``."""
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
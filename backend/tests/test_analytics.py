@@ -0,0 +1,173 @@
+"""Test the columnar analytics snapshot and the reports served from it."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from api.config import get_settings
+from api.services.donors.analytics_service import GiftAnalyticsService
+from api.services.donors.analytics_snapshot import (
+    AnalyticsSnapshot, AnalyticsSnapshotService, SnapshotWriter,
+)
+from api.services.donors.archive_service import ArchiveService
+from api.utils.query_tracker import track_queries
+from models.donors.gift import Gift
+
+pytest.importorskip("numpy")
+
+
+ANALYTICS_URL = "/api/v1/analytics/gifts"
+DONORS_URL = "/api/v1/donors"
+GIFTS_URL = "/api/v1/gifts/batch"
+
+
+def _donor(client, auth_headers, name, state):
+    donor = {"first_name": name, "last_name": "Lovelace", "state": state}
+    return client.post(f"{DONORS_URL}/", json=donor, headers=auth_headers).json()["id"]
+
+
+def _gifts(client, session, auth_headers, donor_id, gifts):
+    """Ingest (transaction_id, amount, date, designation) gifts for a donor, receipted and thanked."""
+    items = [
+        {
+            "donor_id": donor_id, "amount": amount, "gift_date": date, "designation": designation,
+            "source": "stripe", "transaction_id": transaction_id,
+        }
+        for transaction_id, amount, date, designation in gifts
+    ]
+    response = client.post(GIFTS_URL, json={"gifts": items}, headers=auth_headers)
+    assert response.json()["created"] == len(items)
+    session.execute(
+        update(Gift)
+        .where(Gift.transaction_id.in_([item["transaction_id"] for item in items]))
+        .values(acknowledged=True, receipt_sent=True)
+    )
+    session.commit()
+
+
+@pytest.fixture
+def donors(client, session, auth_headers):
+    ada = _donor(client, auth_headers, "Ada", "WA")
+    bo = _donor(client, auth_headers, "Bo", "OR")
+    _gifts(client, session, auth_headers, ada, [
+        ("a1", 100.0, "2012-05-01T00:00:00", "general"),
+        ("a2", 50.0, "2024-01-15T00:00:00", "general"),
+        ("a3", 25.0, "2024-03-02T00:00:00", "scholarship"),
+    ])
+    _gifts(client, session, auth_headers, bo, [
+        ("b1", 10.0, "2024-01-20T00:00:00", "general"),
+        ("b2", 40.0, "2024-03-09T00:00:00", "capital"),
+    ])
+    return ada, bo
+
+
+def _refresh(session, path, batch_size=2):
+    counts = AnalyticsSnapshotService(session, path).refresh(batch_size)
+    return counts, GiftAnalyticsService(AnalyticsSnapshot(path))
+
+
+def test_snapshot_includes_archived_gifts_and_answers_reports(session, donors, tmp_path):
+    """Test a first refresh reads hot and archived gifts and reports match them."""
+    ArchiveService(session).archive(datetime(2019, 1, 1))
+
+    counts, analytics = _refresh(session, tmp_path)
+
+    assert counts == {"gifts": 5, "donors": 2, "removed": 0}
+    with track_queries(budget=0):
+        by_designation = analytics.group_by("designation")
+        by_state = analytics.group_by("state")
+        months = analytics.time_series("month", start=datetime(2024, 1, 1))
+        percentiles = analytics.percentiles([50], by="state")
+    assert by_designation == [
+        {"key": "general", "count": 3, "total": 160.0, "average": 53.33},
+        {"key": "capital", "count": 1, "total": 40.0, "average": 40.0},
+        {"key": "scholarship", "count": 1, "total": 25.0, "average": 25.0},
+    ]
+    assert [(group["key"], group["total"]) for group in by_state] == [("WA", 175.0), ("OR", 50.0)]
+    assert months == [
+        {"period": "2024-01", "count": 2, "total": 60.0},
+        {"period": "2024-02", "count": 0, "total": 0.0},
+        {"period": "2024-03", "count": 2, "total": 65.0},
+    ]
+    assert percentiles == [
+        {"key": "WA", "count": 3, "values": [50.0]},
+        {"key": "OR", "count": 2, "values": [25.0]},
+    ]
+
+
+def test_refresh_applies_new_gifts_merges_and_deletes(client, session, auth_headers, donors, tmp_path):
+    """Test incremental refreshes append only new gifts and follow donor merges and deletes."""
+    ada, bo = donors
+    _refresh(session, tmp_path)
+    cy = _donor(client, auth_headers, "Cy", "ID")
+    _gifts(client, session, auth_headers, cy, [("c1", 5.0, "2024-06-01T00:00:00", "general")])
+    # A late gift for an old year, archived before the next refresh
+    _gifts(client, session, auth_headers, bo, [("b0", 7.0, "2011-02-01T00:00:00", "general")])
+    ArchiveService(session).archive(datetime(2019, 1, 1))
+    client.post(
+        f"{DONORS_URL}/merge", json={"primary_donor_id": ada, "duplicate_donor_id": bo},
+        headers=auth_headers,
+    )
+    # Rows past the manifest from a refresh that never published are discarded
+    SnapshotWriter(tmp_path).append_gifts([{
+        "id": 999, "donor_id": ada, "amount": 1.0, "gift_date": datetime(2024, 1, 1),
+        "gift_status": "completed", "gift_type": "cash", "designation": "general", "campaign_id": None,
+    }])
+
+    counts, analytics = _refresh(session, tmp_path)
+
+    assert counts == {"gifts": 2, "donors": 2, "removed": 1}
+    assert analytics.group_by("state") == [
+        {"key": "WA", "count": 6, "total": 232.0, "average": 38.67},
+        {"key": "ID", "count": 1, "total": 5.0, "average": 5.0},
+    ]
+
+    client.delete(f"{DONORS_URL}/{cy}", headers=auth_headers)
+    counts, analytics = _refresh(session, tmp_path)
+    assert counts == {"gifts": 0, "donors": 0, "removed": 1}
+    assert [group["key"] for group in analytics.group_by("state")] == ["WA"]
+    assert analytics.group_by("year", status=None)[0] == {
+        "key": "2024", "count": 4, "total": 125.0, "average": 31.25,
+    }
+
+
+def test_refresh_picks_up_gifts_committed_behind_the_watermark(session, donors, tmp_path):
+    """Test a gift whose id was passed before it committed is added by a later refresh."""
+    ada, _ = donors
+    _refresh(session, tmp_path)
+    latest = int(max(AnalyticsSnapshot(tmp_path).gifts["id"]))
+
+    def insert(gift_id):
+        session.add(Gift(id=gift_id, donor_id=ada, amount=5.0, gift_date=datetime(2024, 1, 2)))
+        session.commit()
+
+    # Gift latest + 2 commits before gift latest + 1
+    insert(latest + 2)
+    assert _refresh(session, tmp_path)[0]["gifts"] == 1
+    assert [gift_id for gift_id, _ in SnapshotWriter(tmp_path).manifest["gift_gaps"]] == [latest + 1]
+    insert(latest + 1)
+    assert _refresh(session, tmp_path)[0]["gifts"] == 1
+    assert SnapshotWriter(tmp_path).manifest["gift_gaps"] == []
+    assert sorted(AnalyticsSnapshot(tmp_path).gifts["id"][-2:]) == [latest + 1, latest + 2]
+    assert _refresh(session, tmp_path)[0]["gifts"] == 0
+
+
+def test_analytics_endpoints(client, session, auth_headers, donors, tmp_path, monkeypatch):
+    """Test the endpoints read the configured snapshot and report a missing one."""
+    response = client.get(f"{ANALYTICS_URL}/group-by?by=designation", headers=auth_headers)
+    assert response.status_code == 503
+
+    monkeypatch.setattr(get_settings(), "analytics_snapshot_path", str(tmp_path))
+    _refresh(session, tmp_path)
+
+    body = client.get(f"{ANALYTICS_URL}/group-by?by=designation", headers=auth_headers).json()
+    assert body["groups"][0] == {"key": "general", "count": 3, "total": 160.0, "average": 53.33}
+    series = client.get(f"{ANALYTICS_URL}/time-series?interval=year", headers=auth_headers).json()
+    assert [(point["period"], point["count"]) for point in series["points"]][::12] == [
+        ("2012", 1), ("2024", 4),
+    ]
+    body = client.get(f"{ANALYTICS_URL}/percentiles?p=0&p=100", headers=auth_headers).json()
+    assert body["groups"] == [{"key": None, "count": 5, "values": [10.0, 100.0]}]
+
+    response = client.get(f"{ANALYTICS_URL}/group-by?by=email", headers=auth_headers)
+    assert response.status_code == 400
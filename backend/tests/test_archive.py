@@ -0,0 +1,191 @@
+"""Test archiving old gifts and communications and reading them back."""
+import zipfile
+from datetime import date, datetime
+
+from sqlalchemy import func, select, update
+
+from api.services.donors.archive_service import ArchiveService, archive_cutoff
+from api.services.donors.deletion_service import DonorDeletionService
+from api.services.donors.statement_service import StatementService
+from models.donors.archive_chunk import ArchiveChunk
+from models.donors.communication import Communication
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+from repositories.donors.archive_repository import ArchiveRepository
+
+
+DONORS_URL = "/api/v1/donors"
+GIFTS_URL = "/api/v1/gifts/batch"
+CUTOFF = datetime(2019, 1, 1)
+
+
+def _history(client, session, auth_headers, name="Ada"):
+    """A donor with gifts and communications on both sides of the cutoff."""
+    donor = Donor(first_name=name, last_name="Lovelace", full_name=f"{name} Lovelace")
+    session.add(donor)
+    session.commit()
+    gifts = [
+        {
+            "donor_id": donor.id, "amount": 10.0 + index, "gift_date": f"{year}-{month:02d}-01T12:00:00",
+            "source": "stripe", "transaction_id": f"{name}-{year}-{month}",
+        }
+        for index, (year, month) in enumerate(
+            [(2012, 3), (2012, 3), (2012, 7), (2014, 1), (2017, 12), (2018, 6), (2024, 2), (2025, 5)]
+        )
+    ]
+    gifts[1]["transaction_id"] += "-b"
+    client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers)
+    # Everything is receipted and acknowledged except the 2014 gift
+    session.execute(
+        update(Gift)
+        .where(Gift.donor_id == donor.id, Gift.transaction_id != f"{name}-2014-1")
+        .values(acknowledged=True, receipt_sent=True)
+    )
+    session.add_all([
+        Communication(
+            donor_id=donor.id, communication_type="email", subject=f"Note {year}",
+            contact_date=datetime(year, 4, 1), follow_up_required=year == 2013,
+        )
+        for year in (2012, 2013, 2016, 2023)
+    ])
+    session.commit()
+    return donor.id
+
+
+def _pages(client, auth_headers, donor_id, limit=3):
+    pages, before = [], None
+    while True:
+        params = {"limit": limit, **({"before": before} if before else {})}
+        body = client.get(f"{DONORS_URL}/{donor_id}/timeline", params=params, headers=auth_headers).json()
+        pages.append([
+            {key: value for key, value in event.items() if key != "archived"} for event in body["events"]
+        ])
+        before = body.get("next_before")
+        if before is None:
+            return pages
+
+
+def test_archive_moves_closed_old_rows_in_resumable_batches(client, session, auth_headers):
+    """Test closed rows move, open work stays hot and an interrupted run finishes later."""
+    donor_id = _history(client, session, auth_headers)
+    donor = session.get(Donor, donor_id)
+    totals = (donor.total_gifts, donor.total_gift_count, donor.first_gift_date)
+
+    # A run that stopped after its first batch
+    repository = ArchiveRepository(session)
+    repository.archive_rows("gifts", repository.archivable("gifts", CUTOFF, None, 2))
+    session.commit()
+    moved = ArchiveService(session).archive(CUTOFF, batch_size=2)
+
+    assert moved == {"gifts": 3, "communications": 2}
+    assert ArchiveService(session).archive(CUTOFF, batch_size=2) == {"gifts": 0, "communications": 0}
+    hot_gifts = session.execute(select(Gift.transaction_id).order_by(Gift.gift_date)).scalars().all()
+    assert hot_gifts == ["Ada-2014-1", "Ada-2024-2", "Ada-2025-5"]
+    hot_notes = session.execute(
+        select(Communication.subject).order_by(Communication.contact_date)
+    ).scalars().all()
+    assert hot_notes == ["Note 2013", "Note 2023"]
+
+    archived = repository.donor_rows(donor_id, ("gifts", "communications"))
+    assert sorted(row["transaction_id"] for row in archived["gifts"]) == [
+        "Ada-2012-3", "Ada-2012-3-b", "Ada-2012-7", "Ada-2017-12", "Ada-2018-6"
+    ]
+    assert all(isinstance(row["gift_date"], datetime) for row in archived["gifts"])
+    chunks = session.execute(
+        select(ArchiveChunk.table_name, ArchiveChunk.year, ArchiveChunk.row_count)
+    ).all()
+    assert sorted(chunks) == [
+        ("communications", 2012, 1), ("communications", 2016, 1),
+        ("gifts", 2012, 3), ("gifts", 2017, 1), ("gifts", 2018, 1),
+    ]
+
+    session.refresh(donor)
+    assert (donor.total_gifts, donor.total_gift_count, donor.first_gift_date) == totals
+    hot_total = session.execute(select(func.sum(Gift.amount))).scalar_one()
+    assert donor.total_gifts == hot_total + sum(row["amount"] for row in archived["gifts"])
+
+
+def test_timeline_and_statements_read_through_the_archive(client, session, auth_headers, tmp_path):
+    """Test timeline pages and an archived year's statements are unchanged by archiving."""
+    donor_id = _history(client, session, auth_headers)
+    _history(client, session, auth_headers, name="Bo")
+    pages = _pages(client, auth_headers, donor_id)
+    StatementService(session).generate(2012, tmp_path / "hot.zip")
+
+    ArchiveService(session).archive(CUTOFF)
+
+    assert _pages(client, auth_headers, donor_id) == pages
+    assert len(pages) == 4
+    body = client.get(f"{DONORS_URL}/{donor_id}/timeline?limit=20", headers=auth_headers).json()
+    archived = {event["date"][:4] for event in body["events"] if event["archived"]}
+    assert archived == {"2012", "2016", "2017", "2018"}
+
+    summary = StatementService(session).generate(2012, tmp_path / "archived.zip")
+    assert summary == {"statements": 2, "gifts": 6}
+    with zipfile.ZipFile(tmp_path / "hot.zip") as hot, zipfile.ZipFile(tmp_path / "archived.zip") as cold:
+        assert hot.namelist() == cold.namelist()
+        for name in hot.namelist():
+            assert hot.read(name) == cold.read(name)
+
+    response = client.get(f"{DONORS_URL}/{donor_id}/timeline?before=nope", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_timeline_of_deleted_or_unknown_donor_is_not_found(client, session, auth_headers):
+    """Test a soft-deleted donor's hot and archived events are not served, nor an unknown id's."""
+    donor_id = _history(client, session, auth_headers)
+    ArchiveService(session).archive(CUTOFF)
+    assert client.get(f"{DONORS_URL}/{donor_id}/timeline", headers=auth_headers).status_code == 200
+
+    DonorDeletionService(session).delete([donor_id], soft=True)
+
+    for missing in (donor_id, 9999):
+        response = client.get(f"{DONORS_URL}/{missing}/timeline", headers=auth_headers)
+        assert response.status_code == 404
+
+
+def test_reingesting_an_archived_gift_is_a_duplicate(client, session, auth_headers):
+    """Test that idempotent ingestion still sees archived transaction ids, even with a corrected donor or date."""
+    donor_id = _history(client, session, auth_headers)
+    other_id = _history(client, session, auth_headers, name="Bo")
+    ArchiveService(session).archive(CUTOFF)
+    chunks = ArchiveRepository(session).chunk_rows("gifts", [(donor_id, 2012)])
+    archived_id = chunks[(donor_id, 2012)][0]["id"]
+    assert archive_cutoff(7, date(2026, 10, 1)) == CUTOFF
+
+    replay = {
+        "donor_id": donor_id, "amount": 10.0, "gift_date": "2012-03-01T12:00:00",
+        "source": "stripe", "transaction_id": "Ada-2012-3",
+    }
+    corrected = [
+        {**replay, "gift_date": "2013-03-01T12:00:00"},
+        {**replay, "gift_date": "2025-03-01T12:00:00"},
+        {**replay, "donor_id": other_id},
+    ]
+    for gift in [replay] + corrected:
+        body = client.post(GIFTS_URL, json={"gifts": [gift]}, headers=auth_headers).json()
+        assert body["duplicates"] == 1
+        assert body["results"][0]["gift_id"] == archived_id
+    assert session.get(Donor, donor_id).total_gift_count == 8
+    assert session.get(Donor, other_id).total_gift_count == 8
+
+
+def test_merge_moves_and_delete_removes_archive_chunks(client, session, auth_headers):
+    """Test merged donors' chunks join the survivor's and deleted donors' chunks go."""
+    primary = _history(client, session, auth_headers)
+    duplicate = _history(client, session, auth_headers, name="Bo")
+    ArchiveService(session).archive(CUTOFF)
+
+    client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": primary, "duplicate_donor_id": duplicate},
+        headers=auth_headers,
+    )
+
+    archived = ArchiveRepository(session).donor_rows(primary, ("gifts",), 2012, 2012)["gifts"]
+    assert len(archived) == 6 and {row["donor_id"] for row in archived} == {primary}
+    donors = session.execute(select(ArchiveChunk.donor_id).distinct()).scalars().all()
+    assert donors == [primary]
+
+    client.delete(f"{DONORS_URL}/{primary}", headers=auth_headers)
+    assert session.execute(select(func.count(ArchiveChunk.id))).scalar_one() == 0
@@ -0,0 +1,108 @@
+"""Test the donor audit log and its background writer."""
+import time
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from api.services.donors.audit_log import AuditLogWriter, entry, flush_audit_log
+from models.donors.donor import Donor
+from models.donors.donor_audit import DonorAuditEntry
+
+
+DONORS_URL = "/api/v1/donors"
+
+
+def _donor(session, **fields):
+    donor = Donor(first_name="Ada", last_name="Lovelace", **fields)
+    session.add(donor)
+    session.commit()
+    return donor.id
+
+
+def test_history_records_field_diffs_with_actor(client, session, user, auth_headers):
+    """Test that updates, merges and deletes leave before/after history."""
+    primary = _donor(session, email="ada@example.com")
+    duplicate = _donor(session, phone="555-0100", total_gifts=40.0, total_gift_count=2)
+
+    client.put(f"{DONORS_URL}/{primary}", json={"city": "London", "notes": "Patron"}, headers=auth_headers)
+    client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": primary, "duplicate_donor_id": duplicate},
+        headers=auth_headers,
+    )
+    client.delete(f"{DONORS_URL}/{primary}", headers=auth_headers)
+    flush_audit_log()
+
+    history = client.get(f"{DONORS_URL}/{primary}/history", headers=auth_headers).json()
+    assert [item["action"] for item in history] == ["delete", "merge", "update"]
+    assert {item["actor"] for item in history} == {user.username}
+    assert history[2]["changes"] == {"city": [None, "London"], "notes": [None, "Patron"]}
+    assert history[1]["changes"]["phone"] == [None, "555-0100"]
+    assert history[1]["changes"]["total_gifts"] == [0.0, 40.0]
+    assert history[1]["changes"]["merged_donor_id"] == [None, duplicate]
+    assert history[0]["changes"]["email"] == ["ada@example.com", None]
+
+    merged = client.get(f"{DONORS_URL}/{duplicate}/history", headers=auth_headers).json()
+    assert merged[0]["action"] == "merged"
+    assert merged[0]["changes"]["merged_into_donor_id"] == [None, primary]
+
+    older = client.get(
+        f"{DONORS_URL}/{primary}/history?before_id={history[0]['id']}&limit=1", headers=auth_headers
+    ).json()
+    assert [item["action"] for item in older] == ["merge"]
+
+
+def test_unchanged_update_is_not_audited(client, session, auth_headers):
+    """Test that a no-op update writes no history."""
+    donor_id = _donor(session, city="London")
+
+    client.put(f"{DONORS_URL}/{donor_id}", json={"city": "London"}, headers=auth_headers)
+    flush_audit_log()
+
+    assert client.get(f"{DONORS_URL}/{donor_id}/history", headers=auth_headers).json() == []
+
+
+def test_writer_stores_batches_with_one_statement_each(engine, session):
+    """Test that queued rows are inserted in batch-sized executemany statements."""
+    inserts = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO donor_audit_log"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    writer = AuditLogWriter(batch_size=500, flush_interval=5.0)
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        writer.submit(engine, [entry(n, "update", {"notes": [None, str(n)]}) for n in range(1_200)])
+        writer.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+        writer.shutdown()
+
+    assert inserts == [500, 500, 200]
+    assert writer.written == 1_200
+    assert len(session.exec(select(DonorAuditEntry)).all()) == 1_200
+
+
+def test_durable_shutdown_writes_queued_rows(engine, session):
+    """Test that durable mode drains the queue on shutdown."""
+    writer = AuditLogWriter(flush_interval=60.0, durable=True)
+    writer.submit(engine, [entry(n, "delete", {}) for n in range(3)])
+
+    writer.shutdown()
+
+    assert writer.written == 3
+    assert len(session.exec(select(DonorAuditEntry)).all()) == 3
+
+
+def test_full_queue_delays_a_bulk_submit_by_one_timeout(engine, monkeypatch):
+    """Test that a submit waits for queue space once in all, then drops the rest."""
+    writer = AuditLogWriter(max_queue=2, durable=True, enqueue_timeout=0.2)
+    # No thread drains the queue, so it stays full
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+    started = time.monotonic()
+    writer.submit(engine, [entry(n, "update", {}) for n in range(10)])
+
+    assert time.monotonic() - started < 1.0
+    assert writer.dropped == 8
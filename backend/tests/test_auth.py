@@ -0,0 +1,40 @@
+"""Test token authentication."""
+from datetime import timedelta
+
+from api.utils.security import create_access_token
+
+
+DONORS_URL = "/api/v1/donors/"
+
+
+def test_missing_and_invalid_tokens_are_rejected(client):
+    """Test that donor endpoints require a valid bearer token."""
+    assert client.get(DONORS_URL).status_code == 401
+    response = client.get(DONORS_URL, headers={"Authorization": "Bearer garbage"})
+    assert response.status_code == 401
+
+
+def test_expired_token_is_rejected(client, user):
+    """Test that expired tokens are refused."""
+    token = create_access_token(user.id, expires_delta=timedelta(seconds=-1))
+    response = client.get(DONORS_URL, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_warm_requests_skip_the_user_lookup(client, auth_headers):
+    """Test that the second request is served from the auth caches."""
+    cold = client.get(DONORS_URL, headers=auth_headers)
+    warm = client.get(DONORS_URL, headers=auth_headers)
+    assert cold.status_code == warm.status_code == 200
+    assert int(warm.headers["X-Query-Count"]) == int(cold.headers["X-Query-Count"]) - 1
+
+
+def test_deactivating_a_user_invalidates_the_cache(client, session, user, auth_headers):
+    """Test that a committed deactivation takes effect immediately."""
+    assert client.get(DONORS_URL, headers=auth_headers).status_code == 200
+
+    user.is_active = False
+    session.add(user)
+    session.commit()
+
+    assert client.get(DONORS_URL, headers=auth_headers).status_code == 401
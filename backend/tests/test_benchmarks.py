@@ -0,0 +1,51 @@
+"""Test the synthetic data generator and benchmark comparison."""
+from sqlalchemy import func
+from sqlmodel import select
+
+from benchmarks.data_generator import DatasetSize, SyntheticDataGenerator
+from benchmarks.suite import compare
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+
+
+SIZE = DatasetSize(donors=50, gifts=300, communications=40, tags=5)
+
+
+def test_generator_is_deterministic():
+    """Test that the same seed yields the same rows."""
+    first = list(SyntheticDataGenerator(seed=7).donor_rows(SIZE))
+    second = list(SyntheticDataGenerator(seed=7).donor_rows(SIZE))
+    other = list(SyntheticDataGenerator(seed=8).donor_rows(SIZE))
+    assert first == second
+    assert first != other
+
+
+def test_donor_aggregates_match_gifts(engine, session):
+    """Test that generated donor totals agree with the gifts table."""
+    counts = SyntheticDataGenerator(seed=7, chunk_size=64).populate(engine, SIZE)
+    assert counts["donors"] == 50
+    assert counts["gifts"] == 300
+
+    totals = dict(session.exec(
+        select(Gift.donor_id, func.count())
+        .where(Gift.gift_status == "completed")
+        .group_by(Gift.donor_id)
+    ).all())
+    for donor in session.exec(select(Donor)).all():
+        assert donor.total_gift_count == totals.get(donor.id, 0)
+
+
+def test_compare_flags_only_real_regressions():
+    """Test that regressions respect the threshold and noise floor."""
+    baseline = {"results": {"tiny": {"cases": {
+        "slow": {"median_ms": 10.0},
+        "noisy": {"median_ms": 0.1},
+        "fine": {"median_ms": 10.0},
+    }}}}
+    current = {"results": {"tiny": {"cases": {
+        "slow": {"median_ms": 20.0},
+        "noisy": {"median_ms": 0.3},
+        "fine": {"median_ms": 11.0},
+    }}}}
+    regressions = compare(current, baseline, threshold=0.25)
+    assert [r["case"] for r in regressions] == ["slow"]
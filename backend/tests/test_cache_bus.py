@@ -0,0 +1,68 @@
+"""Test cache invalidation across worker processes."""
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import update
+
+from api.utils import invalidation
+from api.utils.invalidation import VersionTable
+from models.donors.donor import Donor
+
+
+DONORS_URL = "/api/v1/donors"
+
+
+@pytest.fixture
+def shared_table(tmp_path, monkeypatch):
+    """This process's version table, backed by a file other workers can map."""
+    path = str(tmp_path / "cache-versions")
+    table = VersionTable(path, slots=1024)
+    monkeypatch.setattr(invalidation, "_table", table)
+    return table
+
+
+def test_bumps_in_another_process_change_versions(shared_table):
+    """Test that a bump written by a separate process is visible here."""
+    before = shared_table.versions([("donor", 7), ("donor", 8)])
+    script = (
+        "from api.utils.invalidation import VersionTable; "
+        f"VersionTable({shared_table.path!r}, slots=1024).bump([('donor', 7)])"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    after = shared_table.versions([("donor", 7), ("donor", 8)])
+    assert after[0] != before[0]
+    assert after[1] == before[1]
+
+
+def test_cached_donors_and_counts_expire_on_another_workers_write(
+    client, session, auth_headers, shared_table
+):
+    """Test that entries cached here are reloaded after a write elsewhere."""
+    donor = Donor(first_name="Ann", last_name="Lee")
+    session.add(donor)
+    session.commit()
+    other_worker = VersionTable(shared_table.path, slots=1024)
+
+    def batch_name():
+        response = client.post(f"{DONORS_URL}/batch", json={"ids": [donor.id]}, headers=auth_headers)
+        return response.json()["donors"][0]["first_name"]
+
+    def count(source):
+        response = client.get(f"{DONORS_URL}/count?q=Ann&status=active", headers=auth_headers)
+        assert response.json()["source"] == source
+        return response.json()["count"]
+
+    assert batch_name() == "Ann"
+    assert count("query") == 1
+    assert count("cache") == 1
+
+    # Another worker renames the donor and publishes the change
+    session.execute(update(Donor).where(Donor.id == donor.id).values(first_name="Annie"))
+    session.commit()
+    assert batch_name() == "Ann"
+    other_worker.bump([("donor", donor.id), ("donor_counts",)])
+
+    assert batch_name() == "Annie"
+    assert count("query") == 1
@@ -0,0 +1,141 @@
+"""Test campaign running totals and the live totals stream."""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+from api.routers.donors.campaigns import totals_events
+from api.services.donors.campaign_service import CampaignService, CampaignTotalsFeed
+from api.services.donors.deletion_service import DonorDeletionService
+from api.services.donors.gift_service import GiftService
+from api.utils.broadcast import Broadcaster, SubscriptionClosed
+from models.donors.donor import Donor
+
+
+CAMPAIGNS_URL = "/api/v1/campaigns"
+DONORS_URL = "/api/v1/donors"
+GIFTS_URL = "/api/v1/gifts/batch"
+
+
+def _donor(client, auth_headers, name):
+    donor = {"first_name": name, "last_name": "Lovelace"}
+    return client.post(f"{DONORS_URL}/", json=donor, headers=auth_headers).json()["id"]
+
+
+def _gift(donor_id, transaction_id, amount, campaign_id, status="completed"):
+    return {
+        "donor_id": donor_id, "amount": amount, "gift_date": "2024-05-01T00:00:00",
+        "source": "stripe", "transaction_id": transaction_id, "campaign_id": campaign_id,
+        "gift_status": status,
+    }
+
+
+def _totals(client, auth_headers):
+    body = client.get(f"{CAMPAIGNS_URL}/totals", headers=auth_headers).json()
+    return {
+        row["campaign_id"]: (row["total_amount"], row["gift_count"], row["donor_count"])
+        for row in body["campaigns"]
+    }
+
+
+def test_totals_follow_ingestion_merges_and_deletes(client, session, auth_headers):
+    """Test totals count completed gifts once and distinct donors through merges and deletes."""
+    ada = _donor(client, auth_headers, "Ada")
+    bo = _donor(client, auth_headers, "Bo")
+    cy = _donor(client, auth_headers, "Cy")
+    gifts = [
+        _gift(ada, "a1", 100.0, 1), _gift(ada, "a2", 50.0, 1), _gift(ada, "a3", 10.0, 2, "pending"),
+        _gift(bo, "b1", 25.0, 1), _gift(bo, "b2", 5.0, 2), _gift(cy, "c1", 40.0, 2),
+        _gift(cy, "c2", 1.0, None),
+    ]
+    client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers)
+    # A replayed batch changes nothing
+    client.post(GIFTS_URL, json={"gifts": gifts[:2]}, headers=auth_headers)
+
+    assert _totals(client, auth_headers) == {1: (175.0, 3, 2), 2: (45.0, 2, 2)}
+    empty = client.get(f"{CAMPAIGNS_URL}/99/totals", headers=auth_headers).json()
+    assert empty == {"campaign_id": 99, "total_amount": 0.0, "gift_count": 0, "donor_count": 0, "change_seq": 0}
+
+    # Both gave to campaign 1; Bo's campaign 2 gift is Ada's first completed one there
+    client.post(
+        f"{DONORS_URL}/merge", json={"primary_donor_id": ada, "duplicate_donor_id": bo},
+        headers=auth_headers,
+    )
+    assert _totals(client, auth_headers) == {1: (175.0, 3, 1), 2: (45.0, 2, 2)}
+
+    client.delete(f"{DONORS_URL}/{cy}", headers=auth_headers)
+    assert _totals(client, auth_headers) == {1: (175.0, 3, 1), 2: (5.0, 1, 1)}
+
+    DonorDeletionService(session).delete([ada], soft=True)
+    assert _totals(client, auth_headers) == {1: (0.0, 0, 0), 2: (0.0, 0, 0)}
+    assert DonorDeletionService(session).purge_expired(0) == 1
+    assert _totals(client, auth_headers) == {1: (0.0, 0, 0), 2: (0.0, 0, 0)}
+
+
+def test_stream_pushes_committed_changes_from_one_feed(tmp_path):
+    """Test streams start from a snapshot, get each change once and stop the feed when they leave."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'feed.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        donor = Donor(first_name="Ada", last_name="Lovelace", full_name="Ada Lovelace")
+        session.add(donor)
+        session.commit()
+        donor_id = donor.id
+        GiftService(session).ingest_gifts([{**_gift(donor_id, "a1", 10.0, 1), "gift_date": datetime(2024, 1, 1)}])
+
+    def ingest(transaction_id, campaign_id):
+        with Session(engine) as session:
+            gift = {**_gift(donor_id, transaction_id, 5.0, campaign_id), "gift_date": datetime(2024, 1, 2)}
+            GiftService(session).ingest_gifts([gift])
+
+    async def scenario():
+        feed = CampaignTotalsFeed(engine, interval_seconds=0.01)
+        streams = []
+        for _ in range(2):
+            subscription = await feed.subscribe()
+            with Session(engine) as session:
+                snapshot = CampaignService(session).totals([1])
+            streams.append(totals_events(subscription, snapshot, [1], heartbeat_seconds=0.5))
+        assert feed.subscriber_count == 2
+
+        for stream in streams:
+            assert await stream.__anext__() == "retry: 3000\n\n"
+            assert '"total_amount":10.0' in await stream.__anext__()
+        await asyncio.to_thread(ingest, "a2", 2)
+        await asyncio.to_thread(ingest, "a3", 1)
+        for stream in streams:
+            event = await asyncio.wait_for(stream.__anext__(), 5)
+            assert event.startswith("event: totals\n")
+            assert '"campaign_id":1,"total_amount":15.0,"gift_count":2,"donor_count":1' in event
+        assert await asyncio.wait_for(streams[0].__anext__(), 5) == ": keepalive\n\n"
+
+        for stream in streams:
+            await stream.aclose()
+        assert feed.subscriber_count == 0 and feed._task is None
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        engine.dispose()
+
+
+def test_slow_subscribers_are_dropped():
+    """Test a full queue drops its subscriber without holding up the others."""
+    async def scenario():
+        broadcaster = Broadcaster(max_queued=2)
+        slow = await broadcaster.subscribe()
+        fast = await broadcaster.subscribe()
+        received = []
+        for message in range(4):
+            broadcaster.publish(message)
+            received.append(await fast.next(1))
+
+        assert received == [0, 1, 2, 3]
+        assert slow.dropped and broadcaster.subscriber_count == 1
+        with pytest.raises(SubscriptionClosed):
+            await slow.next(1)
+        assert await fast.next(0.01) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,542 @@
+"""Test the donors router."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from api.config import get_settings
+from api.services.donors.deletion_service import DonorDeletionService
+from api.services.donors.donor_counters import rebuild_donor_counters
+from api.services.donors.geo_rollups import rebuild_geo_rollups
+from models.donors.communication import Communication
+from models.donors.donor import Donor
+from models.donors.donor_counter import DonorCounter
+from models.donors.geo_rollup import GeoRollup
+from models.donors.gift import Gift
+from models.donors.tag import DonorTag, Tag
+
+
+DONORS_URL = "/api/v1/donors"
+
+
+def _add_donors(session, count):
+    donors = [
+        Donor(first_name=f"First{i}", last_name=f"Last{i}", full_name=f"First{i} Last{i}")
+        for i in range(count)
+    ]
+    session.add_all(donors)
+    session.commit()
+    return [donor.id for donor in donors]
+
+
+def test_batch_returns_request_order_and_missing_ids(client, session, auth_headers):
+    """Test that batch fetch keeps request order and reports unknown ids."""
+    ids = _add_donors(session, 5)
+    requested = [ids[3], 9999, ids[0], ids[3], ids[1]]
+
+    response = client.post(f"{DONORS_URL}/batch", json={"ids": requested}, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [donor["id"] for donor in body["donors"]] == [ids[3], ids[0], ids[1]]
+    assert body["missing"] == [9999]
+
+
+def test_batch_uses_one_query_then_the_cache(client, engine, session, auth_headers):
+    """Test that donors are loaded with one IN query and then served from cache."""
+    ids = _add_donors(session, 50)
+    donor_selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM donors" in statement:
+            donor_selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        client.post(f"{DONORS_URL}/batch", json={"ids": ids}, headers=auth_headers)
+        assert len(donor_selects) == 1
+
+        response = client.post(f"{DONORS_URL}/batch", json={"ids": ids}, headers=auth_headers)
+        assert len(response.json()["donors"]) == 50
+        assert len(donor_selects) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_batch_sees_updates_and_deletes(client, session, auth_headers):
+    """Test that writes through the API invalidate cached donors."""
+    first, second = _add_donors(session, 2)
+    client.post(f"{DONORS_URL}/batch", json={"ids": [first, second]}, headers=auth_headers)
+
+    client.put(f"{DONORS_URL}/{first}", json={"city": "Juneau"}, headers=auth_headers)
+    client.delete(f"{DONORS_URL}/{second}", headers=auth_headers)
+
+    body = client.post(
+        f"{DONORS_URL}/batch", json={"ids": [first, second]}, headers=auth_headers
+    ).json()
+    assert body["donors"][0]["city"] == "Juneau"
+    assert body["missing"] == [second]
+
+
+def test_batch_limits_request_size(client, auth_headers):
+    """Test that empty and oversized id lists are rejected."""
+    assert client.post(f"{DONORS_URL}/batch", json={"ids": []}, headers=auth_headers).status_code == 422
+    too_many = {"ids": list(range(1, 502))}
+    assert client.post(f"{DONORS_URL}/batch", json=too_many, headers=auth_headers).status_code == 422
+
+
+def test_fields_are_pushed_down_into_the_select(client, engine, session, auth_headers):
+    """Test that only the requested columns are read and returned."""
+    _add_donors(session, 3)
+    donor_selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM donors" in statement:
+            donor_selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(f"{DONORS_URL}/?fields=city,phone", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    assert all(set(row) == {"id", "city", "phone"} for row in response.json())
+    assert len(donor_selects) == 1
+    assert "notes" not in donor_selects[0]
+    assert "first_name" not in donor_selects[0]
+
+
+def test_default_fields_skip_wide_columns(client, engine, session, auth_headers):
+    """Test that the default response keeps its shape without loading notes."""
+    donor_id = _add_donors(session, 1)[0]
+    donor_selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM donors" in statement:
+            donor_selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        body = client.get(f"{DONORS_URL}/{donor_id}", headers=auth_headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert body["full_name"] == "First0 Last0"
+    assert body["total_gift_count"] == 0
+    assert "notes" not in body
+    assert not any("communication_preferences" in s or "notes" in s for s in donor_selects)
+
+    searched = client.get(
+        f"{DONORS_URL}/search?q=First0&fields=notes", headers=auth_headers
+    ).json()
+    assert searched == [{"id": donor_id, "notes": None}]
+
+
+def test_unknown_fields_are_rejected(client, auth_headers):
+    """Test that fields outside the allow-list return 400."""
+    response = client.get(f"{DONORS_URL}/?fields=email,name_key", headers=auth_headers)
+    assert response.status_code == 400
+    assert "name_key" in response.json()["detail"]
+
+
+def test_export_streams_selected_fields_as_csv(client, session, auth_headers):
+    """Test that export writes a header and one CSV line per donor."""
+    ids = _add_donors(session, 3)
+
+    response = client.get(f"{DONORS_URL}/export?fields=last_name", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "id,last_name"
+    assert lines[1:] == [f"{donor_id},Last{i}" for i, donor_id in enumerate(ids)]
+
+
+def test_counts_follow_donor_writes(client, session, auth_headers):
+    """Test that segment counters track creates, updates, tags and deletes."""
+    for name in ("Ann", "Bob", "Cy"):
+        client.post(f"{DONORS_URL}/", json={"first_name": name, "last_name": "Lee"}, headers=auth_headers)
+    ids = [donor.id for donor in session.exec(select(Donor)).all()]
+
+    def count(query=""):
+        return client.get(f"{DONORS_URL}/count{query}", headers=auth_headers).json()
+
+    assert count() == {"count": 3, "exact": True, "source": "counter"}
+    assert count("?status=active")["count"] == 3
+
+    client.put(f"{DONORS_URL}/{ids[0]}", json={"donor_status": "lapsed"}, headers=auth_headers)
+    tag = Tag(name="board")
+    session.add(tag)
+    session.commit()
+    session.add(DonorTag(id=1, donor_id=ids[1], tag_id=tag.id))
+    session.commit()
+    client.delete(f"{DONORS_URL}/{ids[2]}", headers=auth_headers)
+
+    assert count()["count"] == 2
+    assert count("?status=active")["count"] == 1
+    assert count("?status=lapsed")["count"] == 1
+    assert count("?donor_type=individual")["count"] == 2
+    assert count("?tag=board") == {"count": 1, "exact": True, "source": "counter"}
+    assert count("?tag=missing")["count"] == 0
+
+
+def test_filtered_counts_are_capped_and_cached(client, session, auth_headers, monkeypatch):
+    """Test that counts without a counter are bounded and then served from cache."""
+    monkeypatch.setattr(get_settings(), "donor_count_scan_limit", 3)
+    _add_donors(session, 5)
+
+    first = client.get(f"{DONORS_URL}/count?q=First&status=active", headers=auth_headers).json()
+    assert first == {"count": 3, "exact": False, "source": "query"}
+
+    again = client.get(f"{DONORS_URL}/count?q=First&status=active", headers=auth_headers).json()
+    assert again == {"count": 3, "exact": False, "source": "cache"}
+
+    small = client.get(
+        f"{DONORS_URL}/count?q=First1&approximate=true", headers=auth_headers
+    ).json()
+    assert small == {"count": 1, "exact": True, "source": "query"}
+
+
+def _create_donor(client, auth_headers, **fields):
+    response = client.post(f"{DONORS_URL}/", json=fields, headers=auth_headers)
+    return response.json()["id"]
+
+
+def test_autocomplete_ranks_prefix_matches_by_giving(client, session, auth_headers):
+    """Test that name, company and email prefixes match, largest givers first."""
+    ann = _create_donor(client, auth_headers, first_name="Ann", last_name="Lee")
+    acme = _create_donor(client, auth_headers, first_name="Bo", last_name="Ng", company="ACME, Inc.")
+    email = _create_donor(client, auth_headers, first_name="Cy", last_name="Oz", email="A.cy@example.org")
+    _create_donor(client, auth_headers, first_name="Dee", last_name="Ash")
+    for donor_id, total in ((ann, 10.0), (acme, 300.0), (email, 50.0)):
+        donor = session.get(Donor, donor_id)
+        donor.total_gifts = total
+        session.add(donor)
+    session.commit()
+
+    response = client.get(f"{DONORS_URL}/autocomplete?q=A", headers=auth_headers)
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == [acme, email, ann]
+
+    limited = client.get(f"{DONORS_URL}/autocomplete?q=a&limit=1", headers=auth_headers).json()
+    assert limited == [
+        {"id": acme, "full_name": "Bo Ng", "email": None, "company": "ACME, Inc.", "total_gifts": 300.0}
+    ]
+    acme_inc = client.get(f"{DONORS_URL}/autocomplete?q=acme inc", headers=auth_headers).json()
+    assert [row["id"] for row in acme_inc] == [acme]
+    assert client.get(f"{DONORS_URL}/autocomplete?q=zz", headers=auth_headers).json() == []
+
+
+def test_autocomplete_cache_follows_donor_writes(client, engine, session, auth_headers):
+    """Test that cached short prefixes are dropped when a matching donor changes."""
+    ann = _create_donor(client, auth_headers, first_name="Ann", last_name="Lee")
+    _create_donor(client, auth_headers, first_name="Bea", last_name="Lee")
+    donor_selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM donors" in statement:
+            donor_selects.append(statement)
+
+    def suggest(prefix):
+        response = client.get(f"{DONORS_URL}/autocomplete?q={prefix}", headers=auth_headers)
+        return [row["full_name"] for row in response.json()]
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert suggest("an") == ["Ann Lee"]
+        assert suggest("an") == ["Ann Lee"]
+        assert len(donor_selects) == 1
+
+        client.put(f"{DONORS_URL}/{ann}", json={"first_name": "Bob"}, headers=auth_headers)
+        donor_selects.clear()
+        assert suggest("an") == []
+        assert suggest("b") == ["Bob Lee", "Bea Lee"]
+        assert len(donor_selects) == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _rollup_rows(session):
+    rows = session.exec(select(GeoRollup)).all()
+    return sorted(
+        (row.level, row.state, row.parent_code, row.code, row.donor_count,
+         round(row.total_gifts, 2), row.gift_count)
+        for row in rows
+        if row.donor_count
+    )
+
+
+def test_geography_drills_down_from_maintained_rollups(client, session, auth_headers):
+    """Test that normalized keys roll up by state, postal prefix, postal code and city."""
+    for first, state, city, postal in (
+        ("Ann", "California", "San Jose", "95112-1234"),
+        ("Bo", " ca ", "san jose.", "95113"),
+        ("Cy", "CA", "Fresno", "93701"),
+        ("Di", "NY", "Albany", "12207"),
+    ):
+        _create_donor(
+            client, auth_headers, first_name=first, last_name="Lee",
+            state=state, city=city, postal_code=postal,
+        )
+
+    def geography(query=""):
+        response = client.get(f"{DONORS_URL}/geography{query}", headers=auth_headers)
+        assert response.status_code == 200
+        return response.json()
+
+    states = geography()
+    assert states["level"] == "state"
+    assert [(area["code"], area["donor_count"]) for area in states["areas"]] == [("CA", 3), ("NY", 1)]
+
+    prefixes = geography("?state=california")
+    assert prefixes["state"] == "CA"
+    assert [(area["code"], area["donor_count"]) for area in prefixes["areas"]] == [("937", 1), ("951", 2)]
+
+    codes = geography("?state=CA&postal_prefix=951")
+    assert [area["code"] for area in codes["areas"]] == ["95112", "95113"]
+
+    cities = geography("?state=CA&group_by=city")
+    assert [(area["code"], area["donor_count"]) for area in cities["areas"]] == [
+        ("fresno", 1), ("san jose", 2)
+    ]
+
+    response = client.get(f"{DONORS_URL}/geography?postal_prefix=951", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_geo_rollups_match_a_rebuild_after_writes(client, session, auth_headers):
+    """Test that incremental rollup maintenance agrees with a full recompute."""
+    ids = [
+        _create_donor(
+            client, auth_headers, first_name=name, last_name="Lee",
+            state="WA", city="Seattle", postal_code=postal,
+        )
+        for name, postal in (("Ann", "98101"), ("Bo", "98102"), ("Cy", "98103"), ("Dee", "98104"))
+    ]
+    gifts = [
+        {"donor_id": donor_id, "amount": amount, "gift_date": "2026-03-01T12:00:00",
+         "source": "stripe", "transaction_id": f"t{index}"}
+        for index, (donor_id, amount) in enumerate(
+            [(ids[0], 100.0), (ids[0], 50.0), (ids[1], 25.0), (ids[2], 10.0)]
+        )
+    ]
+    client.post("/api/v1/gifts/batch", json={"gifts": gifts}, headers=auth_headers)
+    client.put(
+        f"{DONORS_URL}/{ids[1]}", json={"state": "Oregon", "city": "Portland", "postal_code": "97201"},
+        headers=auth_headers,
+    )
+    client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": ids[0], "duplicate_donor_id": ids[3]},
+        headers=auth_headers,
+    )
+
+    states = client.get(f"{DONORS_URL}/geography", headers=auth_headers).json()["areas"]
+    assert [tuple(area.values()) for area in states] == [
+        ("OR", 1, 25.0, 1), ("WA", 2, 160.0, 3)
+    ]
+
+    maintained = _rollup_rows(session)
+    rebuild_geo_rollups(session.connection())
+    session.commit()
+    assert _rollup_rows(session) == maintained
+
+
+def test_changes_pages_a_full_load_then_returns_only_deltas(client, session, auth_headers):
+    """Test that the change feed pages by token and then returns only new writes."""
+    ids = [_create_donor(client, auth_headers, first_name=name, last_name="Lee") for name in ("Ann", "Bo", "Cy")]
+
+    def changes(token=None, limit=500):
+        query = f"?limit={limit}&fields=id,first_name" + (f"&since={token}" if token else "")
+        response = client.get(f"{DONORS_URL}/changes{query}", headers=auth_headers)
+        assert response.status_code == 200
+        return response.json()
+
+    first = changes(limit=2)
+    assert [donor["id"] for donor in first["donors"]] == ids[:2]
+    assert first["has_more"] is True
+    rest = changes(first["next_token"], limit=2)
+    assert [donor["id"] for donor in rest["donors"]] == ids[2:]
+    assert rest["has_more"] is False
+    token = rest["next_token"]
+    assert changes(token) == {"donors": [], "deleted": [], "next_token": token, "has_more": False}
+
+    client.put(f"{DONORS_URL}/{ids[1]}", json={"first_name": "Bob", "phone": "555-0100"}, headers=auth_headers)
+    client.delete(f"{DONORS_URL}/{ids[2]}", headers=auth_headers)
+    delta = changes(token)
+    assert delta["donors"] == [{"id": ids[1], "first_name": "Bob"}]
+    assert delta["deleted"] == [{"id": ids[2], "merged_into_id": None}]
+
+    token = delta["next_token"]
+    client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": ids[0], "duplicate_donor_id": ids[1]},
+        headers=auth_headers,
+    )
+    merged = changes(token)
+    assert [donor["id"] for donor in merged["donors"]] == [ids[0]]
+    assert merged["deleted"] == [{"id": ids[1], "merged_into_id": ids[0]}]
+
+    token = merged["next_token"]
+    gift = {"donor_id": ids[0], "amount": 5.0, "gift_date": "2026-03-01T12:00:00",
+            "source": "stripe", "transaction_id": "sync-1"}
+    client.post("/api/v1/gifts/batch", json={"gifts": [gift]}, headers=auth_headers)
+    assert [donor["id"] for donor in changes(token)["donors"]] == [ids[0]]
+
+
+def test_changes_rejects_unknown_tokens(client, auth_headers):
+    """Test that a malformed change token is a client error."""
+    response = client.get(f"{DONORS_URL}/changes?since=yesterday", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def _counter_rows(session):
+    counters = sorted(
+        (row.dimension, row.value, row.count)
+        for row in session.exec(select(DonorCounter)).all()
+        if row.count
+    )
+    tags = sorted((tag.name, tag.donor_count) for tag in session.exec(select(Tag)).all())
+    return counters, tags
+
+
+def _assert_derived_state_matches_rebuild(session):
+    session.expire_all()
+    maintained = _counter_rows(session), _rollup_rows(session)
+    rebuild_donor_counters(session.connection())
+    rebuild_geo_rollups(session.connection())
+    session.commit()
+    session.expire_all()
+    assert (_counter_rows(session), _rollup_rows(session)) == maintained
+
+
+def _donor_with_dependents(client, session, auth_headers, name, tags, transaction_id):
+    donor_id = _create_donor(
+        client, auth_headers, first_name=name, last_name="Lee", state="WA", postal_code="98101"
+    )
+    gift = {"donor_id": donor_id, "amount": 40.0, "gift_date": "2026-03-01T12:00:00",
+            "source": "stripe", "transaction_id": transaction_id}
+    client.post("/api/v1/gifts/batch", json={"gifts": [gift]}, headers=auth_headers)
+    for tag_name in tags:
+        tag = session.exec(select(Tag).where(Tag.name == tag_name)).first() or Tag(name=tag_name)
+        session.add(tag)
+        session.commit()
+        assigned = session.exec(select(DonorTag.id)).all()
+        session.add(DonorTag(id=max(assigned, default=0) + 1, donor_id=donor_id, tag_id=tag.id))
+    session.add(Communication(donor_id=donor_id, communication_type="email"))
+    session.commit()
+    return donor_id
+
+
+def test_delete_removes_dependents_with_one_statement_per_table(client, engine, session, auth_headers):
+    """Test that a delete cascades to gifts, communications and tags set-based."""
+    keep = _donor_with_dependents(client, session, auth_headers, "Ann", ["board"], "t1")
+    gone = _donor_with_dependents(client, session, auth_headers, "Bo", ["board", "gala"], "t2")
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.delete(f"{DONORS_URL}/{gone}", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # Gifts, communications, tags, archive chunks and keys, the donor and its campaign totals
+    assert statements.count("DELETE") == 7
+    assert "SELECT" not in statements
+    session.expire_all()
+    for model in (Gift, Communication, DonorTag):
+        assert {row.donor_id for row in session.exec(select(model)).all()} == {keep}
+    counts = client.get(f"{DONORS_URL}/count?tag=gala", headers=auth_headers).json()
+    assert counts["count"] == 0
+    assert client.delete(f"{DONORS_URL}/{gone}", headers=auth_headers).status_code == 404
+    _assert_derived_state_matches_rebuild(session)
+
+
+def test_merge_moves_gifts_communications_and_tags(client, session, auth_headers):
+    """Test that merging a donor with gifts moves its dependents to the primary."""
+    primary = _donor_with_dependents(client, session, auth_headers, "Ann", ["board"], "t1")
+    duplicate = _donor_with_dependents(client, session, auth_headers, "Ann", ["board", "gala"], "t2")
+
+    response = client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": primary, "duplicate_donor_id": duplicate},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["total_gifts"] == 80.0
+    session.expire_all()
+    for model in (Gift, Communication):
+        assert [row.donor_id for row in session.exec(select(model)).all()] == [primary, primary]
+    assert sorted(
+        (row.donor_id, row.tag_id) for row in session.exec(select(DonorTag)).all()
+    ) == [(primary, 1), (primary, 2)]
+    _assert_derived_state_matches_rebuild(session)
+
+    response = client.post(
+        f"{DONORS_URL}/merge",
+        json={"primary_donor_id": primary, "duplicate_donor_id": primary},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_soft_delete_hides_donor_until_retention_purge(client, session, auth_headers):
+    """Test that soft-deleted donors vanish from reads and are purged after retention."""
+    keep = _donor_with_dependents(client, session, auth_headers, "Ann", ["board"], "t1")
+    gone = _donor_with_dependents(client, session, auth_headers, "Annie", ["board"], "t2")
+    assert len(client.get(f"{DONORS_URL}/autocomplete?q=an", headers=auth_headers).json()) == 2
+
+    response = client.delete(f"{DONORS_URL}/{gone}?soft=true", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert client.get(f"{DONORS_URL}/{gone}", headers=auth_headers).status_code == 404
+    listed = client.get(f"{DONORS_URL}/?fields=id", headers=auth_headers).json()
+    assert listed == [{"id": keep}]
+    batch = client.post(f"{DONORS_URL}/batch", json={"ids": [keep, gone]}, headers=auth_headers).json()
+    assert batch["missing"] == [gone]
+    suggestions = client.get(f"{DONORS_URL}/autocomplete?q=an", headers=auth_headers).json()
+    assert [suggestion["id"] for suggestion in suggestions] == [keep]
+    assert client.get(f"{DONORS_URL}/count?tag=board", headers=auth_headers).json()["count"] == 1
+    queue = client.get("/api/v1/gifts/acknowledgements", headers=auth_headers).json()
+    assert [donor["donor_id"] for donor in queue["donors"]] == [keep]
+    assert client.delete(f"{DONORS_URL}/{gone}", headers=auth_headers).status_code == 404
+    _assert_derived_state_matches_rebuild(session)
+
+    service = DonorDeletionService(session)
+    assert service.purge_expired(retention_days=30) == 0
+    purged = service.purge_expired(retention_days=30, now=datetime.utcnow() + timedelta(days=31))
+
+    assert purged == 1
+    session.expire_all()
+    assert [donor.id for donor in session.exec(select(Donor)).all()] == [keep]
+    assert {row.donor_id for row in session.exec(select(Gift)).all()} == {keep}
+    _assert_derived_state_matches_rebuild(session)
+
+
+def test_bulk_delete_by_segment_or_ids(client, session, auth_headers):
+    """Test that bulk deletes take either an id list or segment filters."""
+    ids = _add_donors(session, 5)
+    for donor_id in ids[:3]:
+        client.put(f"{DONORS_URL}/{donor_id}", json={"donor_status": "lapsed"}, headers=auth_headers)
+
+    response = client.post(
+        f"{DONORS_URL}/bulk-delete", json={"status": "lapsed"}, headers=auth_headers
+    )
+    assert response.json() == {"deleted": 3}
+    response = client.post(
+        f"{DONORS_URL}/bulk-delete", json={"ids": [ids[3], ids[0]], "soft": True}, headers=auth_headers
+    )
+    assert response.json() == {"deleted": 1}
+
+    assert client.get(f"{DONORS_URL}/count", headers=auth_headers).json()["count"] == 1
+    for body in ({}, {"ids": [ids[4]], "status": "active"}):
+        response = client.post(f"{DONORS_URL}/bulk-delete", json=body, headers=auth_headers)
+        assert response.status_code == 400
+    _assert_derived_state_matches_rebuild(session)
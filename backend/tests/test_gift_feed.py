@@ -0,0 +1,127 @@
+"""Test the live new-gift feed and the ticker stream."""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+from api.routers.donors.gifts import gift_events
+from api.services.donors.gift_feed import GiftFeed, recent_gifts
+from api.services.donors.gift_service import GiftService
+from api.utils.broadcast import Broadcaster, PollingBroadcaster
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+
+
+@pytest.fixture
+def feed_engine(tmp_path):
+    """A file database, so the feed's worker threads get their own connections."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'feed.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _donor(engine, name="Ada"):
+    with Session(engine) as session:
+        donor = Donor(first_name=name, last_name="Lovelace", full_name=f"{name} Lovelace")
+        session.add(donor)
+        session.commit()
+        return donor.id
+
+
+def _ingest(engine, donor_id, *transaction_ids, anonymous=False):
+    gifts = [
+        {
+            "donor_id": donor_id, "amount": 10.0, "gift_date": datetime(2024, 1, 1), "source": "stripe",
+            "transaction_id": transaction_id, "is_anonymous": anonymous,
+        }
+        for transaction_id in transaction_ids
+    ]
+    with Session(engine) as session:
+        GiftService(session).ingest_gifts(gifts)
+
+
+def _data(event):
+    name, data = event.strip().split("\n")
+    return name.split(": ")[1], json.loads(data.split(": ", 1)[1])
+
+
+def test_ticker_sends_recent_gifts_then_new_batches(feed_engine):
+    """Test a ticker gets the newest gifts, then each new gift once, with anonymous donors hidden."""
+    ada = _donor(feed_engine)
+    _ingest(feed_engine, ada, "t1", "t2", "t3")
+
+    async def scenario():
+        feed = GiftFeed(feed_engine, interval_seconds=0.01)
+        subscription = await feed.subscribe("skip")
+        with Session(feed_engine) as session:
+            recent = recent_gifts(session, 2)
+        stream = gift_events(subscription, recent, heartbeat_seconds=5)
+
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        name, gifts = _data(await stream.__anext__())
+        assert name == "gifts" and [gift["id"] for gift in gifts] == [2, 3]
+        assert gifts[0]["donor_name"] == "Ada Lovelace"
+
+        await asyncio.to_thread(_ingest, feed_engine, ada, "t4", "t5", anonymous=True)
+        name, gifts = _data(await asyncio.wait_for(stream.__anext__(), 5))
+        assert [gift["id"] for gift in gifts] == [4, 5]
+        assert (gifts[0]["donor_id"], gifts[0]["donor_name"]) == (None, "Anonymous")
+
+        await stream.aclose()
+        assert feed.subscriber_count == 0 and feed._task is None
+
+    asyncio.run(scenario())
+
+
+def test_feed_picks_up_gifts_committed_behind_the_watermark(feed_engine):
+    """Test a gift whose id was passed before it committed is still published."""
+    ada = _donor(feed_engine)
+    _ingest(feed_engine, ada, "t1")
+    feed = GiftFeed(feed_engine)
+    feed.start()
+
+    def insert(gift_id):
+        with Session(feed_engine) as session:
+            session.add(Gift(id=gift_id, donor_id=ada, amount=5.0, gift_date=datetime(2024, 1, 2)))
+            session.commit()
+
+    # Gift 3 commits before gift 2
+    insert(3)
+    assert [[gift["id"] for gift in batch] for batch in feed.poll()] == [[3]]
+    assert list(feed.gaps) == [2]
+    insert(2)
+    assert [[gift["id"] for gift in batch] for batch in feed.poll()] == [[2]]
+    assert feed.gaps == {} and feed.poll() == []
+
+
+def test_downsampled_ticker_reports_skipped_gifts():
+    """Test a slow ticker loses its oldest batches and is told how many gifts it missed."""
+    async def scenario():
+        broadcaster = Broadcaster(max_queued=2)
+        subscription = await broadcaster.subscribe("skip")
+        for batch in ([{"id": 1}], [{"id": 2}, {"id": 3}], [{"id": 4}]):
+            broadcaster.publish(batch)
+        stream = gift_events(subscription, [], heartbeat_seconds=1)
+
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        assert _data(await stream.__anext__()) == ("skipped", {"gifts": 1})
+        assert _data(await stream.__anext__()) == ("gifts", [{"id": 2}, {"id": 3}])
+        assert _data(await stream.__anext__()) == ("gifts", [{"id": 4}])
+        assert broadcaster.subscriber_count == 1
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_polling_broadcaster_needs_start_and_poll():
+    """Test a polling broadcaster that does not implement ``poll`` cannot be created."""
+    class NoPoll(PollingBroadcaster):
+        def start(self):
+            pass
+
+    with pytest.raises(TypeError):
+        NoPoll()
@@ -0,0 +1,126 @@
+"""Test batch gift ingestion and acknowledgements."""
+from sqlmodel import select
+
+from api.services.donors.deletion_service import DonorDeletionService
+from models.donors.communication import Communication
+from models.donors.donor import Donor
+
+
+GIFTS_URL = "/api/v1/gifts/batch"
+
+
+def _gift(donor_id, transaction_id, amount=25.0, day=1, **extra):
+    return {
+        "donor_id": donor_id,
+        "amount": amount,
+        "gift_date": f"2026-03-{day:02d}T12:00:00",
+        "source": "stripe",
+        "transaction_id": transaction_id,
+        **extra,
+    }
+
+
+def _donor(session):
+    donor = Donor(first_name="Ada", last_name="Lovelace")
+    session.add(donor)
+    session.commit()
+    return donor.id
+
+
+def test_ingest_reports_created_duplicate_and_error(client, session, auth_headers):
+    """Test per-item statuses and that replays create nothing."""
+    donor_id = _donor(session)
+    gifts = [
+        _gift(donor_id, "t1", 100.0, day=5),
+        _gift(donor_id, "t2", 40.0, day=2),
+        _gift(donor_id, "t1", 100.0, day=5),
+        _gift(9999, "t3"),
+        {"donor_id": donor_id, "amount": -5, "source": "stripe", "transaction_id": "t4"},
+    ]
+
+    body = client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers).json()
+
+    assert (body["created"], body["duplicates"], body["errors"]) == (2, 1, 2)
+    statuses = [result["status"] for result in body["results"]]
+    assert statuses == ["created", "created", "duplicate", "error", "error"]
+    assert body["results"][2]["gift_id"] == body["results"][0]["gift_id"]
+    assert body["results"][3]["detail"] == "Donor not found"
+
+    replay = client.post(GIFTS_URL, json={"gifts": gifts[:2]}, headers=auth_headers).json()
+    assert (replay["created"], replay["duplicates"]) == (0, 2)
+
+    donor = session.get(Donor, donor_id)
+    session.refresh(donor)
+    assert donor.total_gifts == 140.0
+    assert donor.total_gift_count == 2
+    assert donor.largest_gift == 100.0
+    assert donor.average_gift == 70.0
+    assert donor.first_gift_date.day == 2
+    assert donor.last_gift_date.day == 5
+
+
+def test_ingest_uses_one_insert_per_chunk(client, session, auth_headers):
+    """Test that a large batch is written in chunked multi-row statements."""
+    donor_id = _donor(session)
+    gifts = [_gift(donor_id, f"bulk-{i}", day=1 + i % 28) for i in range(1_200)]
+
+    response = client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers)
+
+    assert response.json()["created"] == 1_200
+    # auth lookup, donor check, three chunk inserts, change number, one
+    # aggregate update, donor locations and one geo rollup upsert
+    assert int(response.headers["X-Query-Count"]) <= 10
+
+
+def test_acknowledgement_queue_pages_by_donor(client, session, auth_headers):
+    """Test the queue groups pending gifts by donor and pages with a keyset."""
+    donors = [_donor(session) for _ in range(3)]
+    gifts = [_gift(donor_id, f"q-{donor_id}-{n}", day=n + 1) for donor_id in donors for n in range(2)]
+    gifts.append(_gift(donors[0], "pending", gift_status="pending"))
+    client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers)
+
+    url = "/api/v1/gifts/acknowledgements"
+    first = client.get(f"{url}?limit=2", headers=auth_headers).json()
+    assert [donor["donor_id"] for donor in first["donors"]] == donors[:2]
+    assert len(first["donors"][0]["gifts"]) == 2
+    assert first["donors"][0]["total_amount"] == 50.0
+
+    after = first["next_after_donor_id"]
+    second = client.get(f"{url}?limit=2&after_donor_id={after}", headers=auth_headers).json()
+    assert [donor["donor_id"] for donor in second["donors"]] == donors[2:]
+    assert second["next_after_donor_id"] is None
+
+
+def test_bulk_acknowledge_stamps_gifts_and_logs_communications(client, session, auth_headers):
+    """Test one request acknowledges gifts and writes one communication per donor."""
+    donors = [_donor(session) for _ in range(2)]
+    gifts = [_gift(donor_id, f"a-{donor_id}-{n}") for donor_id in donors for n in range(3)]
+    created = client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers).json()
+    gift_ids = [result["gift_id"] for result in created["results"]]
+
+    url = "/api/v1/gifts/acknowledgements"
+    response = client.post(url, json={"gift_ids": gift_ids + [9999]}, headers=auth_headers)
+    assert response.json() == {"acknowledged": 6, "communications": 2, "skipped_gift_ids": [9999]}
+
+    again = client.post(url, json={"gift_ids": gift_ids[:1]}, headers=auth_headers).json()
+    assert again["acknowledged"] == 0
+
+    assert client.get(url, headers=auth_headers).json()["donors"] == []
+    communications = session.exec(select(Communication)).all()
+    assert {c.donor_id for c in communications} == set(donors)
+    assert all(c.contact_person == "admin" and c.communication_type == "letter" for c in communications)
+
+
+def test_bulk_acknowledge_skips_gifts_outside_the_queue(client, session, auth_headers):
+    """Test pending gifts and gifts of deleted donors are reported as skipped, with no communication."""
+    donors = [_donor(session) for _ in range(2)]
+    gifts = [_gift(donors[0], "pending", gift_status="pending"), _gift(donors[1], "deleted")]
+    created = client.post(GIFTS_URL, json={"gifts": gifts}, headers=auth_headers).json()
+    gift_ids = [result["gift_id"] for result in created["results"]]
+    DonorDeletionService(session).delete([donors[1]], soft=True)
+
+    url = "/api/v1/gifts/acknowledgements"
+    response = client.post(url, json={"gift_ids": gift_ids}, headers=auth_headers)
+
+    assert response.json() == {"acknowledged": 0, "communications": 0, "skipped_gift_ids": gift_ids}
+    assert session.exec(select(Communication)).all() == []
@@ -0,0 +1,27 @@
+"""Test the load test reporting helpers."""
+import pytest
+
+from benchmarks.load_test import LoadResult, parse_mix, percentile, summarize
+
+
+def test_parse_mix_rejects_unknown_endpoints():
+    """Test that the request mix only accepts known endpoints."""
+    assert parse_mix("list=3,merge=1") == {"list": 3, "merge": 1}
+    with pytest.raises(ValueError):
+        parse_mix("list=3,export=1")
+
+
+def test_summarize_reports_percentiles_and_error_rate():
+    """Test per-endpoint and total summaries."""
+    results = {
+        "get": LoadResult(latencies_ms=[float(i) for i in range(1, 101)], errors=2),
+        "list": LoadResult(latencies_ms=[5.0] * 100),
+    }
+    report = summarize(results, elapsed=10.0)
+
+    assert report["get"]["p50_ms"] == 50.0
+    assert report["get"]["p99_ms"] == 99.0
+    assert report["get"]["error_rate"] == 0.02
+    assert report["total"]["requests"] == 200
+    assert report["total"]["throughput_rps"] == 20.0
+    assert percentile([], 95) == 0.0
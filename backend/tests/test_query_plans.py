@@ -0,0 +1,472 @@
+"""Test that repository and service queries keep using their indexes."""
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event
+from sqlmodel import Session, SQLModel
+
+from api.config import get_settings
+from api.services.donors.archive_service import ArchiveService
+from api.services.donors.autocomplete_service import AutocompleteService
+from api.services.donors.change_tracking import add_tombstones, next_change_seq
+from api.services.donors.count_service import DonorCountService
+from api.services.donors.deletion_service import DonorDeletionService
+from api.services.donors.donor_counters import ALL_DONORS, apply_counter_deltas
+from api.services.donors.donor_service import DonorService
+from api.services.donors.geo_rollups import apply_geo_deltas
+from api.services.donors.geography_service import GeographyService
+from api.services.donors.gift_service import GiftService
+from api.services.donors.sync_service import DonorSyncService
+from api.services.donors.timeline_service import DonorTimelineService
+from benchmarks.data_generator import DatasetSize, SyntheticDataGenerator
+from models.donors.donor import Donor
+from repositories.base import BaseRepository
+from repositories.donors.archive_repository import ArchiveRepository
+from repositories.donors.campaign_total_repository import CampaignTotalRepository
+from repositories.donors.communication_repository import CommunicationRepository
+from repositories.donors.donor_audit_repository import DonorAuditRepository
+from repositories.donors.donor_counter_repository import DonorCounterRepository
+from repositories.donors.donor_repository import DonorRepository
+from repositories.donors.donor_tombstone_repository import DonorTombstoneRepository
+from repositories.donors.geo_rollup_repository import GeoRollupRepository
+from repositories.donors.gift_repository import GiftRepository
+from repositories.users.user_repository import UserRepository
+
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Enough rows that the planner's statistics favour indexes where they exist
+SIZE = DatasetSize(donors=3_000, gifts=12_000, communications=3_000, tags=20)
+
+# Tables that grow with the donor base; reading one without an index is a regression
+BIG_TABLES = {
+    "donors", "gifts", "communications", "donor_tags", "donor_audit_log", "donor_tombstones",
+    "archive_chunks", "archived_transactions", "campaign_donors",
+}
+
+# Rows dated before this are archived while seeding, so both tiers have data
+ARCHIVED_BEFORE = datetime(2018, 1, 1)
+
+# Full scans that are the point of the query, by case and table
+EXPECTED_SCANS = {
+    "DonorRepository.get_all": ({"donors"}, "offset pagination walks the table"),
+    "DonorRepository.list_fields": ({"donors"}, "offset pagination walks the table"),
+    "DonorRepository.iter_fields": ({"donors"}, "the export reads every donor"),
+    "DonorRepository.find_by_name_parts": ({"donors"}, "substring match"),
+    "DonorRepository.search_donors": ({"donors"}, "substring match"),
+    "DonorRepository.search_fields": ({"donors"}, "substring match"),
+    "DonorRepository.count_matching(query)": ({"donors"}, "substring match, capped"),
+    "DonorCountService.count(query)": ({"donors"}, "substring match, capped"),
+    "GiftRepository.latest_feed_rows": ({"gifts"}, "walks gift ids back from the newest, stops at the limit"),
+}
+
+# Public repository methods without a case, and why
+NOT_PLANNED = {
+    "DonorRepository.estimate_matching": "runs EXPLAIN itself, Postgres only",
+}
+
+GIFT = {
+    "donor_id": 12, "amount": 25.0, "gift_date": datetime(2024, 5, 1), "gift_type": "one-time",
+    "payment_method": "card", "gift_status": "completed", "source": "plans",
+    "transaction_id": "plan-1", "campaign_id": 7,
+}
+COMMUNICATION = {
+    "donor_id": 12, "communication_type": "email", "direction": "outgoing",
+    "subject": "Thanks", "created_at": datetime(2024, 5, 2),
+}
+
+
+def _donor(session, donor_id=12):
+    return session.get(Donor, donor_id)
+
+
+def _update_donor(session):
+    donor = _donor(session)
+    donor.city = "Boise"
+    return DonorRepository(session).update(donor)
+
+
+def _create_donor(session):
+    return DonorRepository(session).create(Donor(first_name="Plan", last_name="Case"))
+
+
+def _archive_gifts(session):
+    repository = ArchiveRepository(session)
+    repository.archive_rows("gifts", repository.archivable("gifts", datetime(2019, 1, 1), None, 50))
+
+
+def _delete_donor(session):
+    # The ORM delete only suits donors without gifts or communications
+    repository = DonorRepository(session)
+    repository.delete(_create_donor(session).id)
+
+
+CASES = {
+    # BaseRepository methods, through the donor repository
+    "DonorRepository.get_by_id": lambda s: DonorRepository(s).get_by_id(12),
+    "DonorRepository.get_all": lambda s: DonorRepository(s).get_all(skip=200, limit=50),
+    "DonorRepository.create": _create_donor,
+    "DonorRepository.update": _update_donor,
+    "DonorRepository.delete": _delete_donor,
+    # DonorRepository
+    "DonorRepository.get_by_ids": lambda s: DonorRepository(s).get_by_ids([3, 12, 40]),
+    "DonorRepository.existing_ids": lambda s: DonorRepository(s).existing_ids([3, 12, 40]),
+    "DonorRepository.locations": lambda s: DonorRepository(s).locations([3, 12, 40]),
+    "DonorRepository.add_gift_totals": lambda s: DonorRepository(s).add_gift_totals([{
+        "donor_id": 12, "amount": 25.0, "count": 1, "largest": 25.0,
+        "first_date": datetime(2024, 5, 1), "last_date": datetime(2024, 5, 1),
+    }], change_seq=1),
+    "DonorRepository.segment_ids": lambda s: DonorRepository(s).segment_ids(tag_name="tag-0003"),
+    "DonorRepository.segment_ids(status)": lambda s: DonorRepository(s).segment_ids(status="lapsed"),
+    "DonorRepository.expired_ids": lambda s: DonorRepository(s).expired_ids(datetime(2030, 1, 1), 100),
+    "DonorRepository.tag_ids": lambda s: DonorRepository(s).tag_ids([3, 12, 40]),
+    "DonorRepository.delete_cascade": lambda s: DonorRepository(s).delete_cascade([3, 12, 40]),
+    "DonorRepository.soft_delete": lambda s: DonorRepository(s).soft_delete(
+        [3, 12, 40], datetime(2024, 1, 1), 1
+    ),
+    "DonorRepository.reassign_dependents": lambda s: DonorRepository(s).reassign_dependents(12, 3),
+    "DonorRepository.find_by_email": lambda s: DonorRepository(s).find_by_email("ann@example.com"),
+    "DonorRepository.find_by_phone": lambda s: DonorRepository(s).find_by_phone("(555) 555-0100"),
+    "DonorRepository.find_by_name_parts": lambda s: DonorRepository(s).find_by_name_parts("Mary", "Smith"),
+    "DonorRepository.search_donors": lambda s: DonorRepository(s).search_donors("smith"),
+    "DonorRepository.get_fields": lambda s: DonorRepository(s).get_fields(12, ["id", "full_name"]),
+    "DonorRepository.list_fields": lambda s: DonorRepository(s).list_fields(["id", "full_name"], 200, 50),
+    "DonorRepository.search_fields": lambda s: DonorRepository(s).search_fields("smith", ["id"]),
+    "DonorRepository.top_by_prefix": lambda s: DonorRepository(s).top_by_prefix(
+        "mar", "mar", ["id", "full_name", "email"]
+    ),
+    "DonorRepository.changed_since": lambda s: DonorRepository(s).changed_since(["id"], (0, 0), 100),
+    "DonorRepository.iter_fields": lambda s: list(DonorRepository(s).iter_fields(["id", "email"])),
+    "DonorRepository.count_matching": lambda s: DonorRepository(s).count_matching(tag_name="tag-0003"),
+    "DonorRepository.count_matching(query)": lambda s: DonorRepository(s).count_matching(
+        query="smith", cap=1_000
+    ),
+    "DonorRepository.find_potential_duplicates": lambda s: DonorRepository(s).find_potential_duplicates(
+        _donor(s)
+    ),
+    "DonorRepository.get_donors_by_tag": lambda s: DonorRepository(s).get_donors_by_tag("tag-0003"),
+    "DonorRepository.get_active_donors": lambda s: DonorRepository(s).get_active_donors(),
+    "DonorRepository.get_lapsed_donors": lambda s: DonorRepository(s).get_lapsed_donors(),
+    # GiftRepository
+    "GiftRepository.insert_new": lambda s: GiftRepository(s).insert_new([dict(GIFT)]),
+    "GiftRepository.ids_for_transactions": lambda s: GiftRepository(s).ids_for_transactions(
+        [("plans", "plan-1"), ("plans", "plan-2")]
+    ),
+    "GiftRepository.pending_receipts": lambda s: GiftRepository(s).pending_receipts(
+        2020, 100, datetime(2024, 1, 1)
+    ),
+    "GiftRepository.reserve_receipt_numbers": lambda s: GiftRepository(s).reserve_receipt_numbers(2020, 10),
+    "GiftRepository.set_receipt_numbers": lambda s: GiftRepository(s).set_receipt_numbers({1: "2020-1"}),
+    "GiftRepository.claim_receipts": lambda s: GiftRepository(s).claim_receipts([1, 2], datetime(2024, 1, 1)),
+    "GiftRepository.mark_receipts_sent": lambda s: GiftRepository(s).mark_receipts_sent(
+        [1, 2], datetime(2024, 1, 1)
+    ),
+    "GiftRepository.acknowledgement_queue": lambda s: GiftRepository(s).acknowledgement_queue(100, 50),
+    "GiftRepository.acknowledge": lambda s: GiftRepository(s).acknowledge(
+        [1, 2], "plans", datetime(2024, 1, 1)
+    ),
+    "GiftRepository.yearly_gift_details": lambda s: list(GiftRepository(s).yearly_gift_details(2020)),
+    "GiftRepository.get_by_id": lambda s: GiftRepository(s).get_by_id(1),
+    "GiftRepository.snapshot_rows": lambda s: GiftRepository(s).snapshot_rows(6_000, 500),
+    "GiftRepository.snapshot_rows_by_id": lambda s: GiftRepository(s).snapshot_rows_by_id([6_001, 6_003, 6_010]),
+    "GiftRepository.for_donor": lambda s: GiftRepository(s).for_donor(12, (datetime(2024, 1, 1), 0), 51),
+    "GiftRepository.feed_rows": lambda s: GiftRepository(s).feed_rows(8_000, 1_000),
+    "GiftRepository.feed_rows(gaps)": lambda s: GiftRepository(s).feed_rows(8_000, 1_000, [7_990, 7_995]),
+    "GiftRepository.latest_feed_rows": lambda s: GiftRepository(s).latest_feed_rows(20),
+    "GiftRepository.latest_id": lambda s: GiftRepository(s).latest_id(),
+    # ArchiveRepository
+    "ArchiveRepository.archivable": lambda s: ArchiveRepository(s).archivable(
+        "gifts", datetime(2019, 1, 1), (ARCHIVED_BEFORE, 0), 100
+    ),
+    "ArchiveRepository.archivable(communications)": lambda s: ArchiveRepository(s).archivable(
+        "communications", datetime(2019, 1, 1), None, 100
+    ),
+    "ArchiveRepository.archive_rows": _archive_gifts,
+    "ArchiveRepository.chunk_rows": lambda s: ArchiveRepository(s).chunk_rows(
+        "gifts", [(12, 2016), (40, 2017)]
+    ),
+    "ArchiveRepository.archived_gift_ids": lambda s: ArchiveRepository(s).archived_gift_ids(
+        [("generator", "txn-0000000003"), ("generator", "txn-0000000040")]
+    ),
+    "ArchiveRepository.donor_rows": lambda s: ArchiveRepository(s).donor_rows(
+        12, ("gifts", "communications"), 2015, 2017
+    ),
+    "ArchiveRepository.year_rows": lambda s: list(ArchiveRepository(s).year_rows("gifts", 2016)),
+    "ArchiveRepository.chunks_since": lambda s: list(ArchiveRepository(s).chunks_since(
+        "gifts", datetime(2030, 1, 1)
+    )),
+    "ArchiveRepository.chunks_since(all)": lambda s: list(ArchiveRepository(s).chunks_since("gifts", None)),
+    "ArchiveRepository.holds_year": lambda s: ArchiveRepository(s).holds_year("gifts", 2016),
+    "ArchiveRepository.reassign_donor": lambda s: ArchiveRepository(s).reassign_donor(12, 3),
+    # Other repositories
+    "CommunicationRepository.insert_many": lambda s: CommunicationRepository(s).insert_many(
+        [dict(COMMUNICATION)]
+    ),
+    "CommunicationRepository.for_donor": lambda s: CommunicationRepository(s).for_donor(
+        12, (datetime(2024, 1, 1), 0), 51
+    ),
+    "DonorAuditRepository.history": lambda s: DonorAuditRepository(s).history(12, before_id=500),
+    "DonorCounterRepository.get_count": lambda s: DonorCounterRepository(s).get_count(*ALL_DONORS),
+    "DonorCounterRepository.get_tag_count": lambda s: DonorCounterRepository(s).get_tag_count("tag-0003"),
+    "DonorTombstoneRepository.deleted_since": lambda s: DonorTombstoneRepository(s).deleted_since(
+        (0, 0), 100
+    ),
+    "GeoRollupRepository.areas": lambda s: GeoRollupRepository(s).areas("postal_code", "WA", "981"),
+    "CampaignTotalRepository.totals": lambda s: CampaignTotalRepository(s).totals([3, 7]),
+    "CampaignTotalRepository.totals(all)": lambda s: CampaignTotalRepository(s).totals(),
+    "CampaignTotalRepository.changed_since": lambda s: CampaignTotalRepository(s).changed_since(
+        (40, 0), 100
+    ),
+    "CampaignTotalRepository.latest_change_seq": lambda s: CampaignTotalRepository(s).latest_change_seq(),
+    "UserRepository.find_by_email": lambda s: UserRepository(s).find_by_email("benchmark@example.com"),
+    "UserRepository.find_by_username": lambda s: UserRepository(s).find_by_username("benchmark"),
+    "UserRepository.find_by_email_or_username": lambda s: UserRepository(s).find_by_email_or_username(
+        "benchmark@example.com", "benchmark"
+    ),
+    # Services, including the statements their session listeners add
+    "DonorService.get_donors_by_ids": lambda s: DonorService(s).get_donors_by_ids([3, 12, 40]),
+    "DonorService.update_donor": lambda s: DonorService(s).update_donor(12, {"city": "Boise"}),
+    "DonorService.merge_donors": lambda s: DonorService(s).merge_donors(3, 12),
+    "DonorDeletionService.delete": lambda s: DonorDeletionService(s).delete([3, 12, 40], soft=False),
+    "DonorDeletionService.delete(soft)": lambda s: DonorDeletionService(s).delete([3, 12, 40], soft=True),
+    "DonorDeletionService.purge_expired": lambda s: DonorDeletionService(s).purge_expired(0),
+    "DonorCountService.count": lambda s: DonorCountService(s).count(status="active", tag_name="tag-0003"),
+    "DonorCountService.count(query)": lambda s: DonorCountService(s).count(query="smith"),
+    "AutocompleteService.suggest": lambda s: AutocompleteService(s).suggest("mary sm"),
+    "DonorSyncService.changes": lambda s: DonorSyncService(s).changes(None, ["id", "email"]),
+    "GeographyService.drill_down": lambda s: GeographyService(s).drill_down("WA", "981"),
+    "GiftService.ingest_gifts": lambda s: GiftService(s).ingest_gifts([dict(GIFT)]),
+    "GiftService.acknowledge_gifts": lambda s: GiftService(s).acknowledge_gifts([1, 2], "plans"),
+    "ArchiveService.archive": lambda s: ArchiveService(s).archive(datetime(2019, 1, 1), 500),
+    "DonorTimelineService.timeline": lambda s: DonorTimelineService(s).timeline(12, limit=20),
+    "DonorTimelineService.timeline(archived)": lambda s: DonorTimelineService(s).timeline(
+        12, before="2018-01-01T00:00:00~0~0", limit=20
+    ),
+    "apply_counter_deltas": lambda s: apply_counter_deltas(
+        s.connection(), {ALL_DONORS: -1}, {3: -1}
+    ),
+    "apply_geo_deltas": lambda s: apply_geo_deltas(
+        s.connection(), {("postal_code", "WA", "981", "98101"): [-1, -10.0, -1]}
+    ),
+    "add_tombstones": lambda s: add_tombstones(s.connection(), [3], next_change_seq(s.connection())),
+}
+
+
+def _migrate(url: str) -> None:
+    """Build the schema the way deployments do, through the migrations."""
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    with pytest.MonkeyPatch.context() as patch:
+        # env.py prefers DATABASE_URL over the configured URL
+        patch.setenv("DATABASE_URL", url)
+        command.upgrade(config, "head")
+
+
+def _seed(engine) -> None:
+    SyntheticDataGenerator(seed=11, chunk_size=2_000).populate(engine, SIZE)
+    with engine.begin() as connection:
+        # Soft-deleted donors and audit rows so their indexes have statistics
+        connection.exec_driver_sql(
+            "UPDATE donors SET deleted_at = created_at WHERE id % 50 = 0"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO donor_audit_log (donor_id, action, changes, created_at) "
+            "SELECT id, 'update', '{}', created_at FROM donors"
+        )
+        # Campaign totals as gift ingestion keeps them; the generator writes gifts directly
+        connection.exec_driver_sql(
+            "INSERT INTO campaign_donors (created_at, campaign_id, donor_id, total_amount, gift_count) "
+            "SELECT CURRENT_TIMESTAMP, campaign_id, donor_id, SUM(amount), COUNT(*) FROM gifts "
+            "WHERE campaign_id IS NOT NULL AND gift_status = 'completed' GROUP BY campaign_id, donor_id"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO campaign_totals "
+            "(created_at, campaign_id, total_amount, gift_count, donor_count, change_seq) "
+            "SELECT CURRENT_TIMESTAMP, campaign_id, SUM(total_amount), SUM(gift_count), COUNT(*), "
+            "campaign_id FROM campaign_donors GROUP BY campaign_id"
+        )
+    with Session(engine) as session:
+        ArchiveService(session).archive(ARCHIVED_BEFORE)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine(tmp_path_factory):
+    """Migrated and seeded SQLite database file."""
+    url = f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    _migrate(url)
+    engine = create_engine(url)
+    _seed(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    """Migrated and seeded scratch Postgres database named by TEST_POSTGRES_URL."""
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        SQLModel.metadata.drop_all(connection)
+        connection.exec_driver_sql("DROP TABLE IF EXISTS alembic_version")
+    _migrate(url)
+    _seed(engine)
+    yield engine
+    engine.dispose()
+
+
+def _capture(engine, case):
+    """Run a case in a transaction that is rolled back; returns its statements.
+
+    Commits become flushes so writes stay inside the transaction, and the
+    audit writer is off so only this session's statements are captured.
+    """
+    statements = []
+    with Session(engine) as session, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(get_settings(), "audit_log_enabled", False)
+        patch.setattr(session, "commit", session.flush)
+        connection = session.connection()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if conn is connection:
+                # RETURNING executemany batches arrive as one flat tuple of values
+                if executemany and isinstance(parameters, list):
+                    parameters = parameters[0]
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            CASES[case](session)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        plans = [
+            (statement, _explain(connection, statement, parameters))
+            for statement, parameters in statements
+        ]
+        session.rollback()
+    return plans
+
+
+def _explain(connection, statement, parameters):
+    if connection.dialect.name == "postgresql":
+        return connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar_one()
+    return [
+        row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    ]
+
+
+# SCAN <table> [AS <alias>] [USING [COVERING] INDEX <index>]
+SQLITE_SCAN = re.compile(r"SCAN (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?")
+
+
+def _partial_indexes(engine):
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '%WHERE%'"
+        )
+        return {name for name, in rows}
+
+
+def _sqlite_full_scans(plan, partial_indexes):
+    """Big tables read start to end; walking a partial index only reads matching rows."""
+    scanned = set()
+    for detail in plan:
+        match = SQLITE_SCAN.search(detail)
+        if match and match.group(1) in BIG_TABLES and match.group(2) not in partial_indexes:
+            scanned.add(match.group(1))
+    return scanned
+
+
+def _postgres_full_scans(plan):
+    scanned = set()
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"] in BIG_TABLES:
+            scanned.add(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scanned
+
+
+def _assert_no_unexpected_scans(case, plans, full_scans):
+    expected = EXPECTED_SCANS.get(case, (set(), None))[0]
+    for statement, plan in plans:
+        unexpected = full_scans(plan) - expected
+        assert not unexpected, (
+            f"{case} scans {', '.join(sorted(unexpected))} without an index\n"
+            f"{statement}\n{json.dumps(plan, indent=2)}"
+        )
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_sqlite_plan_uses_indexes(case, sqlite_engine):
+    """Test that the case reads big tables through an index on SQLite."""
+    plans = _capture(sqlite_engine, case)
+    assert plans, f"{case} ran no SQL; was it answered from a cache?"
+    partial_indexes = _partial_indexes(sqlite_engine)
+    _assert_no_unexpected_scans(case, plans, lambda plan: _sqlite_full_scans(plan, partial_indexes))
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_postgres_plan_uses_indexes(case, postgres_engine):
+    """Test that the case reads big tables through an index on Postgres.
+
+    Sequential scans are disabled so the planner picks any usable index
+    even on a small seed; a Seq Scan that remains has no index to use.
+    """
+    @event.listens_for(postgres_engine, "connect")
+    def disable_seqscan(dbapi_connection, connection_record):
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+    postgres_engine.dispose()
+    try:
+        plans = _capture(postgres_engine, case)
+    finally:
+        event.remove(postgres_engine, "connect", disable_seqscan)
+    _assert_no_unexpected_scans(case, plans, _postgres_full_scans)
+
+
+def test_expected_scans_are_still_needed(sqlite_engine):
+    """Test that every allowed full scan still happens, so stale entries go."""
+    partial_indexes = _partial_indexes(sqlite_engine)
+    for case, (tables, reason) in EXPECTED_SCANS.items():
+        scanned = set()
+        for _, plan in _capture(sqlite_engine, case):
+            scanned |= _sqlite_full_scans(plan, partial_indexes)
+        assert tables <= scanned, f"{case} no longer scans {tables - scanned} ({reason})"
+
+
+def test_every_repository_method_has_a_case():
+    """Test that new repository methods get a plan case or a reason not to."""
+    repositories = [
+        DonorRepository, GiftRepository, CommunicationRepository, ArchiveRepository,
+        DonorAuditRepository, DonorCounterRepository, DonorTombstoneRepository,
+        GeoRollupRepository, CampaignTotalRepository, UserRepository,
+    ]
+    inherited = {name for name in vars(BaseRepository) if not name.startswith("_")}
+    covered = {case.split("(")[0] for case in CASES} | set(NOT_PLANNED)
+    missing = []
+    for repository in repositories:
+        own = {name for name in vars(repository) if not name.startswith("_")}
+        # Inherited CRUD is covered once, through the donor repository
+        if repository is DonorRepository:
+            own |= inherited
+        missing += [
+            f"{repository.__name__}.{name}"
+            for name in sorted(own)
+            if callable(getattr(repository, name)) and f"{repository.__name__}.{name}" not in covered
+        ]
+    assert not missing, f"add query plan cases for {missing}"
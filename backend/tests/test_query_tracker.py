@@ -0,0 +1,66 @@
+"""Test the query guard."""
+import pytest
+from sqlmodel import select
+
+from api.utils.query_tracker import (
+    NPlusOneDetected,
+    QueryBudgetExceeded,
+    statement_shape,
+    track_queries,
+)
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+from repositories.donors.donor_repository import DonorRepository
+
+
+DONORS_URL = "/api/v1/donors/"
+
+
+def _seed_donors(session, count):
+    """Create donors that each have one gift."""
+    for i in range(count):
+        donor = Donor(first_name=f"First{i}", last_name=f"Last{i}")
+        session.add(donor)
+        session.flush()
+        session.add(Gift(donor_id=donor.id, amount=10.0 + i, gift_date=donor.created_at))
+    session.commit()
+    session.expunge_all()
+
+
+def test_statement_shape_collapses_literals_and_in_lists():
+    """Test that statements differing only in values share a shape."""
+    first = statement_shape("SELECT * FROM donors WHERE id IN (?, ?, ?) AND name = 'a'")
+    second = statement_shape("SELECT * FROM donors WHERE id IN (?) AND name = 'bb'")
+    assert first == second
+
+
+def test_lazy_relationship_loop_is_flagged(session):
+    """Test that touching a lazy relationship per row is reported as N+1."""
+    _seed_donors(session, 6)
+
+    with pytest.raises(NPlusOneDetected):
+        with track_queries():
+            donors = session.exec(select(Donor)).all()
+            for donor in donors:
+                donor.gifts
+
+
+def test_budget_exceeded_fails_loudly(session):
+    """Test that running more statements than budgeted raises."""
+    _seed_donors(session, 2)
+    repository = DonorRepository(session)
+
+    with pytest.raises(QueryBudgetExceeded):
+        with track_queries(budget=1):
+            repository.get_all()
+            repository.get_active_donors()
+
+
+def test_list_endpoint_stays_within_budget(client, session, auth_headers):
+    """Test that the donor list reports its statement count."""
+    _seed_donors(session, 10)
+
+    response = client.get(DONORS_URL, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert int(response.headers["X-Query-Count"]) <= 3
@@ -0,0 +1,140 @@
+"""Test tax receipt and giving statement generation."""
+import zipfile
+from datetime import datetime
+
+import pytest
+from sqlmodel import select
+
+from api.services.donors import receipt_service, statement_service
+from api.services.donors.receipt_renderer import render_receipt
+from api.services.donors.receipt_service import ReceiptService
+from api.services.donors.statement_service import StatementService
+from api.utils.query_tracker import track_queries
+from models.donors.donor import Donor
+from models.donors.gift import Gift
+
+
+def _gifts(session, count, year=2025, **extra):
+    donor = Donor(first_name="Ada", last_name="Lovelace", full_name="Ada Lovelace", city="Sitka")
+    session.add(donor)
+    session.commit()
+    gifts = [
+        Gift(donor_id=donor.id, amount=10.0 + i, gift_date=datetime(year, 1 + i % 12, 1), **extra)
+        for i in range(count)
+    ]
+    session.add_all(gifts)
+    session.commit()
+    return gifts
+
+
+def test_receipts_are_numbered_rendered_and_marked_sent(session, tmp_path):
+    """Test a zip run numbers receipts in gift date order and flags them sent."""
+    _gifts(session, 5)
+    _gifts(session, 1, gift_status="refunded")
+    _gifts(session, 1, year=2024)
+    output = tmp_path / "receipts.zip"
+
+    summary = ReceiptService(session).generate(2025, output, workers=0, chunk_size=2)
+
+    assert summary == {"receipts": 5, "numbered": 5}
+    with zipfile.ZipFile(output) as archive:
+        names = sorted(archive.namelist())
+        assert names == [f"receipt-2025-{n:06d}.html" for n in range(1, 6)]
+        assert "Ada Lovelace" in archive.read(names[0]).decode()
+
+    session.expire_all()
+    sent = session.exec(select(Gift).where(Gift.receipt_sent == True)).all()  # noqa: E712
+    assert len(sent) == 5
+    assert sorted(gift.receipt_number for gift in sent)[-1] == "2025-000005"
+
+    rerun = ReceiptService(session).generate(2025, tmp_path / "again.zip", workers=0)
+    assert rerun == {"receipts": 0, "numbered": 0}
+
+
+def test_numbers_continue_and_render_in_a_process_pool(session, tmp_path):
+    """Test that later runs continue the sequence and per-file output works."""
+    _gifts(session, 2)
+    ReceiptService(session).generate(2025, tmp_path / "first.zip", workers=0)
+    _gifts(session, 3)
+
+    summary = ReceiptService(session).generate(2025, tmp_path / "out", per_file=True, workers=2)
+
+    assert summary["receipts"] == 3
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [
+        f"receipt-2025-{n:06d}.html" for n in range(3, 6)
+    ]
+
+
+def test_receipts_are_sent_only_once_the_output_is_complete(session, tmp_path, monkeypatch):
+    """Test a failed run flags nothing and releases its claims, and other runs skip live claims."""
+    gifts = _gifts(session, 5)
+    rendered = []
+
+    def render_then_fail(receipt):
+        if len(rendered) == 3:
+            raise OSError("disk full")
+        rendered.append(receipt["id"])
+        return render_receipt(receipt)
+
+    monkeypatch.setattr(receipt_service, "render_receipt", render_then_fail)
+    with pytest.raises(OSError):
+        ReceiptService(session).generate(2025, tmp_path / "failed.zip", workers=0, chunk_size=2)
+    session.expire_all()
+    assert not any(gift.receipt_sent or gift.receipt_claimed_at for gift in gifts)
+    monkeypatch.undo()
+
+    # Another run is still issuing the first two
+    service = ReceiptService(session)
+    service.repository.claim_receipts([gifts[0].id, gifts[1].id], datetime.utcnow())
+    session.commit()
+    summary = service.generate(2025, tmp_path / "rest.zip", workers=0, chunk_size=2)
+
+    # Gifts keep the numbers the failed run gave them
+    assert summary == {"receipts": 3, "numbered": 1}
+    session.expire_all()
+    assert [gift.receipt_sent for gift in gifts] == [False, False, True, True, True]
+
+
+def test_statements_use_one_cursor_and_a_donor_lookup(session, tmp_path):
+    """Test every giving donor gets a statement from the gift cursor, a donor batch and a probe."""
+    _gifts(session, 3)
+    _gifts(session, 2, tax_deductible_amount=5.0)
+    _gifts(session, 2, year=2024)
+    output = tmp_path / "statements.zip"
+
+    # The archive probe, the gift cursor and one batch of donors
+    with track_queries(budget=3):
+        summary = StatementService(session).generate(2025, output)
+
+    assert summary == {"statements": 2, "gifts": 5}
+    with zipfile.ZipFile(output) as archive:
+        names = sorted(archive.namelist())
+        assert len(names) == 2
+        second = archive.read(names[1]).decode()
+    assert "Total (2 gifts)" in second
+    assert "$21.00" in second and "$10.00" in second
+
+
+def test_statement_totals_match_their_lines(session, tmp_path, monkeypatch):
+    """Test a gift read by the cursor mid-run (ingested after it started) counts in its donor's totals."""
+    gifts = _gifts(session, 2)
+    service = StatementService(session)
+    read_details = service.repository.yearly_gift_details
+    rendered = []
+
+    def with_a_late_gift(year):
+        rows = list(read_details(year))
+        yield from rows
+        yield {**rows[-1], "id": gifts[-1].id + 1, "amount": 5.0, "tax_deductible_amount": None}
+
+    def render(year, summary, lines, organization):
+        rendered.append((summary, lines))
+        return "statement.html", b""
+
+    monkeypatch.setattr(service.repository, "yearly_gift_details", with_a_late_gift)
+    monkeypatch.setattr(statement_service, "render_statement", render)
+    service.generate(2025, tmp_path / "statements.zip")
+
+    [(summary, lines)] = rendered
+    assert summary["gift_count"] == len(lines) == 3
+    assert summary["total_amount"] == summary["deductible_amount"] == 26.0
@@ -0,0 +1,87 @@
+"""Test columnar and MessagePack donor responses and response compression."""
+import json
+import zlib
+
+import pytest
+
+from api.utils.compression import choose_encoding
+from api.utils.response_formats import negotiate
+from tests.test_donors import DONORS_URL, _add_donors
+
+
+COLUMNAR = "application/vnd.columnar+json"
+
+
+def _get(client, url, auth_headers, **headers):
+    return client.get(url, headers={**auth_headers, **headers})
+
+
+def test_negotiation_follows_accept_quality():
+    """Test the most specific matching range decides, with the first format as default."""
+    offered = ["json", "columnar", "msgpack"]
+    assert negotiate(None, offered) == "json"
+    assert negotiate("*/*", offered) == "json"
+    assert negotiate(f"application/json;q=0.5, {COLUMNAR}", offered) == "columnar"
+    assert negotiate("application/*;q=0.2, application/x-msgpack", offered) == "msgpack"
+    assert negotiate("application/*, application/json;q=0", offered) == "columnar"
+    assert negotiate("text/html", offered) is None
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("identity") is None
+
+
+def test_list_and_search_return_columns(client, session, auth_headers):
+    """Test the columnar layout carries the same values as the row layout, keys once."""
+    _add_donors(session, 3)
+    url = f"{DONORS_URL}/?fields=last_name,created_at"
+
+    rows = _get(client, url, auth_headers).json()
+    response = _get(client, url, auth_headers, Accept=COLUMNAR)
+
+    assert response.headers["content-type"] == COLUMNAR
+    assert "Accept" in response.headers["vary"]
+    columns = response.json()["columns"]
+    assert list(columns) == ["id", "last_name", "created_at"]
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+
+    search = _get(client, f"{DONORS_URL}/search?q=Last1&fields=full_name", auth_headers, Accept=COLUMNAR)
+    assert search.json()["columns"]["full_name"] == ["First1 Last1"]
+    assert _get(client, url, auth_headers, Accept="text/html").status_code == 406
+
+
+def test_msgpack_list_and_export(client, session, auth_headers):
+    """Test MessagePack pages and exports decode to the columnar documents."""
+    msgpack = pytest.importorskip("msgpack")
+    ids = _add_donors(session, 3)
+
+    page = _get(client, f"{DONORS_URL}/?fields=last_name", auth_headers, Accept="application/msgpack")
+    assert page.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(page.content) == {
+        "columns": {"id": ids, "last_name": ["Last0", "Last1", "Last2"]}
+    }
+
+    export = _get(client, f"{DONORS_URL}/export?fields=last_name", auth_headers, Accept="application/msgpack")
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(export.content)
+    assert list(unpacker) == [{"id": ids, "last_name": ["Last0", "Last1", "Last2"]}]
+
+
+def test_large_and_streamed_responses_are_compressed(client, session, auth_headers):
+    """Test bodies past the threshold are gzipped, streamed exports chunk by chunk, small ones not."""
+    _add_donors(session, 60)
+
+    small = _get(client, f"{DONORS_URL}/?limit=1&fields=last_name", auth_headers, **{"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    page = _get(client, f"{DONORS_URL}/", auth_headers, **{"Accept-Encoding": "gzip"})
+    assert page.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in page.headers["vary"]
+    assert len(page.json()) == 60
+
+    with client.stream(
+        "GET", f"{DONORS_URL}/export", headers={**auth_headers, "Accept-Encoding": "gzip", "Accept": COLUMNAR}
+    ) as export:
+        assert export.headers["content-encoding"] == "gzip"
+        assert "content-length" not in export.headers
+        raw = b"".join(export.iter_raw())
+    body = json.loads(zlib.decompress(raw, zlib.MAX_WBITS | 16))
+    assert len(body["blocks"][0]["id"]) == 60
@@ -0,0 +1,61 @@
+"""Test the users and auth routers."""
+import asyncio
+
+import pytest
+
+from api.config import get_settings
+from api.utils import security
+
+
+def test_register_then_login(client, monkeypatch):
+    """Test that a registered user can log in and call /me."""
+    monkeypatch.setattr(get_settings(), "bcrypt_rounds", 4)
+    payload = {"email": "ada@example.com", "password": "s3cret-pass", "username": "ada"}
+
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 200
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 400
+
+    bad = client.post("/api/v1/auth/login", json={**payload, "password": "wrong"})
+    assert bad.status_code == 401
+    unknown = client.post("/api/v1/auth/login", json={**payload, "email": "no@example.com"})
+    assert unknown.status_code == 401
+
+    response = client.post("/api/v1/auth/login", json=payload)
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+
+    me = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.status_code == 200
+    assert me.json()["username"] == "ada"
+
+
+def test_user_crud_uses_the_database(client, auth_headers, monkeypatch):
+    """Test create, update and delete against the users table."""
+    monkeypatch.setattr(get_settings(), "bcrypt_rounds", 4)
+    created = client.post(
+        "/api/v1/users/",
+        json={"username": "bob", "email": "bob@example.com", "password": "pw"},
+        headers=auth_headers,
+    )
+    assert created.status_code == 200
+    user_id = created.json()["id"]
+
+    updated = client.put(
+        f"/api/v1/users/{user_id}", json={"is_active": False}, headers=auth_headers
+    )
+    assert updated.json()["is_active"] is False
+
+    taken = client.put(
+        f"/api/v1/users/{user_id}", json={"email": "admin@example.com"}, headers=auth_headers
+    )
+    assert taken.status_code == 400
+
+    assert client.delete(f"/api/v1/users/{user_id}", headers=auth_headers).status_code == 200
+    assert client.get(f"/api/v1/users/{user_id}", headers=auth_headers).status_code == 404
+
+
+def test_hashing_queue_is_bounded(monkeypatch):
+    """Test that hash requests beyond the pending limit fail fast."""
+    monkeypatch.setattr(get_settings(), "password_hash_max_pending", 0)
+    with pytest.raises(security.PasswordHashingBusy):
+        asyncio.run(security.hash_password_async("pw"))